@@ -0,0 +1,382 @@
+"""
+Análise de desempenho a partir do leveros_rpa.log
+Lê os logs no formato `%(asctime)s - %(levelname)s - %(message)s`, linha a linha e em memória
+constante, e reconstrói a linha do tempo de cada execução: tempo por categoria, por página e por
+produto, tempo perdido em novas tentativas e tempo nas seções de espera conhecidas (as pausas
+fixas da versão original do RPA e as esperas de carregamento que as substituíram).
+
+O tempo entre duas linhas do log é atribuído ao estado indicado pela primeira: a categoria, a
+página e o produto em andamento e a atividade da última mensagem reconhecida. Linhas de traceback
+(sem data) são ignoradas. O log não identifica a thread, então execuções com --workers ou --abas
+intercalam categorias e não têm linha do tempo confiável; para elas, use os Intervalos_*.jsonl.
+
+Saídas:
+- resumo no estilo de flame graph (árvore de tempo por categoria, página, produto e atividade);
+- <prefixo>.folded: pilhas no formato "collapsed" (flamegraph.pl, speedscope), em milissegundos;
+- <prefixo>.csv: uma linha por execução, categoria, página e produto, gravada conforme cada um termina.
+
+Uso:
+    python analisar_log.py leveros_rpa.log
+    python analisar_log.py logs/leveros_rpa.log.1.gz logs/leveros_rpa.log --saida Perfil_abril --por-execucao
+"""
+
+import re
+import csv
+import gzip
+import argparse
+from datetime import datetime
+
+REGEX_LINHA = re.compile(r"^(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d),(\d{3}) - (\w+) - (.*)$")
+
+# Intervalo sem registros acima do qual o tempo não é atribuído à atividade em andamento
+INTERVALO_MAXIMO = 600
+
+CAMPOS_CSV = ["nivel", "execucao", "categoria", "pagina", "produto", "inicio", "fim", "duracao_s",
+              "esperas_s", "novas_tentativas_s", "erros", "produtos"]
+
+# Seções de espera conhecidas: (atividade, expressão, pausa fixa da versão original em segundos).
+# O tempo até a linha seguinte é espera; a pausa fixa é a parte que não dependia do site.
+ESPERAS = [
+    ("login", re.compile(r"^Acessando a página de login"), 3),
+    ("popup_boas_vindas", re.compile(r"^Verificando se há popup de boas-vindas"), 2),
+    ("fechar_popup", re.compile(r"^Fechando popup de boas-vindas"), 1),
+    ("overlay", re.compile(r"^Detectado overlay/popup"), 1),
+    ("navegacao_categoria", re.compile(r"^Navegando para a categoria: "), 3),
+    ("clique_categoria", re.compile(r"^Clicando na categoria .* usando JavaScript"), 1),
+    ("aguardar_produtos", re.compile(r"^Aguardando carregamento dos produtos"), 0),
+    ("aguardar_cards", re.compile(r"^Extraindo produtos da página atual"), 3),
+    ("clique_proxima", re.compile(r"^Botão de próxima página encontrado"), 4),
+]
+
+# Novas tentativas: a espera anunciada e, até o próximo sucesso, o trabalho repetido
+REGEX_ESPERA_NOVA_TENTATIVA = [
+    re.compile(r"^Tentando novamente em ([\d.]+) segundos"),
+    re.compile(r"Nova tentativa em ([\d.]+)s"),
+]
+REGEX_NOVA_TENTATIVA = [
+    (re.compile(r"^Timeout ao aguardar produtos"), 2),
+    (re.compile(r"^Nenhum produto encontrado\. Tentando rolar a página"), 4),
+]
+REGEX_FALHA_TENTATIVA = re.compile(r"\(tentativa \d+/\d+\)|tentativa \d+/\d+ falhou|^Aguardando carregamento "
+                                   r"dos produtos \(tentativa [2-9]")
+REGEX_SUCESSO = re.compile(r"^(Encontrados \d+ produtos|Produto extraído|Navegação para categoria .* sucesso|"
+                           r"Extraídos \d+ produtos|Login realizado|Sessão restaurada)")
+
+REGEX_INICIO_EXECUCAO = re.compile(r"^Iniciando execução do RPA")
+REGEX_FIM_EXECUCAO = re.compile(r"^(Navegador finalizado\.|Não foi possível .*Abortando execução)")
+REGEX_CATEGORIA = re.compile(r"^(?:Iniciando|Retomando) processamento da categoria: (.+?)(?: \(API\))?$|"
+                             r"^Retomando a categoria (.+?) a partir da página|"
+                             r"^Navegando para a categoria: (.+)$")
+REGEX_PAGINA = re.compile(r"^Processando página (\d+) da categoria (.+)\.\.\.$")
+REGEX_PRODUTO = re.compile(r"^Processando produto (\d+)/\d+")
+REGEX_PRODUTOS_PAGINA = re.compile(r"^Extraídos (\d+) produtos da página")
+REGEX_FIM_CATEGORIA = re.compile(r"^Não há mais páginas para a categoria (.+)\.$")
+
+# Demais atividades reconhecidas (sem espera fixa)
+ATIVIDADES = [
+    ("inicializar_navegador", re.compile(r"^Inicializando o navegador Chrome")),
+    ("login", re.compile(r"^(Preenchendo campo|Clicando no botão Entrar|Restaurando sessão)")),
+    ("reinicio_navegador", re.compile(r"^Navegador fechado ou travado")),
+    ("reciclagem_navegador", re.compile(r"^Reciclando o navegador")),
+    ("localizar_cards", re.compile(r"^Tentando encontrar produtos")),
+    ("paginacao", re.compile(r"^Verificando se existe próxima página")),
+    ("imagens", re.compile(r"^(Baixando|Processando) imagens")),
+    ("exportacao_excel", re.compile(r"^Salvando \d+ produtos no Excel")),
+    ("encerramento", re.compile(r"^(Execução do RPA concluída|Finalizando navegador)")),
+]
+
+
+def ler_registros(caminhos):
+    """(instante, nível, mensagem) de cada linha com data dos logs, na ordem (.gz aceito)"""
+    for caminho in caminhos:
+        abrir = gzip.open if caminho.endswith(".gz") else open
+        with abrir(caminho, "rt", encoding="utf-8", errors="replace") as f:
+            for linha in f:
+                m = REGEX_LINHA.match(linha)
+                if not m:
+                    continue
+                ano, mes, dia, hora, minuto, segundo, milissegundo = (int(v) for v in m.groups()[:7])
+                instante = datetime(ano, mes, dia, hora, minuto, segundo, milissegundo * 1000)
+                yield instante, m.group(8), m.group(9).rstrip()
+
+
+class AnalisadorLog:
+    """
+    Máquina de estados sobre as mensagens do log. Mantém só o que está em andamento (execução,
+    categoria, página, produto) e os totais agregados; cada registro terminado vai para o CSV.
+    """
+
+    def __init__(self, escritor_csv=None, por_execucao=False, intervalo_maximo=INTERVALO_MAXIMO):
+        self.escritor_csv = escritor_csv
+        self.por_execucao = por_execucao
+        self.intervalo_maximo = intervalo_maximo
+        self.pilhas = {}
+        self.esperas = {}
+        self.execucoes = 0
+        self.total_s = 0.0
+        self.novas_tentativas_s = 0.0
+        self.instante_anterior = None
+        # Registros em andamento, do mais externo ao mais interno
+        self.abertos = {"execucao": None, "categoria": None, "pagina": None, "produto": None}
+        self.atividade = None
+        self.espera = None
+        self.repetindo = False
+
+    # Registros em andamento
+
+    def abrir(self, nivel, instante, **campos):
+        self.fechar(nivel, instante)
+        registro = {campo: "" for campo in CAMPOS_CSV}
+        registro.update(nivel=nivel, execucao=self.execucoes, inicio=instante, duracao_s=0.0, esperas_s=0.0,
+                        novas_tentativas_s=0.0, erros=0)
+        for externo in ("categoria", "pagina"):
+            if self.abertos.get(externo):
+                registro[externo] = self.abertos[externo][externo]
+        registro.update(campos)
+        self.abertos[nivel] = registro
+
+    def fechar(self, nivel, instante):
+        """Fecha o registro do nível e os internos a ele, gravando-os no CSV"""
+        niveis = list(self.abertos)
+        for interno in reversed(niveis[niveis.index(nivel):]):
+            registro = self.abertos[interno]
+            if registro is None:
+                continue
+            self.abertos[interno] = None
+            if self.escritor_csv is not None:
+                linha = dict(registro, inicio=registro["inicio"].isoformat(sep=" ", timespec="milliseconds"),
+                             fim=instante.isoformat(sep=" ", timespec="milliseconds"))
+                for campo in ("duracao_s", "esperas_s", "novas_tentativas_s"):
+                    linha[campo] = round(linha[campo], 3)
+                self.escritor_csv.writerow(linha)
+
+    def encerrar(self):
+        """Fecha o que ficou em andamento ao fim dos logs"""
+        if self.instante_anterior is not None:
+            self.fechar("execucao", self.instante_anterior)
+
+    # Atribuição do tempo
+
+    def pilha(self):
+        quadros = []
+        if self.por_execucao:
+            quadros.append(f"execucao {self.execucoes}")
+        categoria = self.abertos["categoria"]
+        if categoria:
+            quadros.append(f"categoria {categoria['categoria']}")
+            if self.abertos["pagina"]:
+                quadros.append("pagina")
+                if self.abertos["produto"]:
+                    quadros.append("produto")
+        if self.repetindo:
+            quadros.append("nova_tentativa")
+        quadros.append(self.atividade or "outros")
+        return ";".join(quadros)
+
+    def atribuir(self, segundos):
+        if segundos > self.intervalo_maximo:
+            pilha = ";".join(self.pilha().split(";")[:-1] + ["(sem registros)"])
+        else:
+            pilha = self.pilha()
+        self.pilhas[pilha] = self.pilhas.get(pilha, 0.0) + segundos
+        self.total_s += segundos
+        if self.repetindo:
+            self.novas_tentativas_s += segundos
+        if self.espera is not None:
+            # A pausa fixa não passa do tempo até a linha seguinte (a etapa pode ter falhado antes dela)
+            nome, pausa_fixa = self.espera
+            estatistica = self.esperas[nome]
+            estatistica[1] += segundos
+            estatistica[2] += min(segundos, pausa_fixa)
+        for registro in self.abertos.values():
+            if registro is None:
+                continue
+            registro["duracao_s"] += segundos
+            if self.espera is not None:
+                registro["esperas_s"] += segundos
+            if self.repetindo:
+                registro["novas_tentativas_s"] += segundos
+
+    def definir_espera(self, nome, pausa_fixa):
+        self.atividade = nome
+        self.espera = (nome, pausa_fixa)
+        self.esperas.setdefault(nome, [0, 0.0, 0.0])[0] += 1
+
+    # Mensagens
+
+    def processar(self, instante, nivel, mensagem):
+        if self.instante_anterior is not None and self.abertos["execucao"] is not None:
+            intervalo = (instante - self.instante_anterior).total_seconds()
+            if intervalo > 0 and not REGEX_INICIO_EXECUCAO.match(mensagem):
+                self.atribuir(intervalo)
+        self.instante_anterior = instante
+
+        if REGEX_INICIO_EXECUCAO.match(mensagem):
+            self.fechar("execucao", instante)
+            self.execucoes += 1
+            self.abrir("execucao", instante)
+            self.atividade, self.espera, self.repetindo = "inicializacao", None, False
+            return
+        if self.abertos["execucao"] is None:
+            return
+        if REGEX_FIM_EXECUCAO.match(mensagem):
+            self.fechar("execucao", instante)
+            return
+
+        if nivel in ("ERROR", "CRITICAL"):
+            for registro in self.abertos.values():
+                if registro is not None:
+                    registro["erros"] += 1
+        if REGEX_SUCESSO.match(mensagem):
+            self.repetindo = False
+        elif REGEX_FALHA_TENTATIVA.search(mensagem):
+            self.repetindo = True
+        self.espera = None
+
+        m = REGEX_CATEGORIA.match(mensagem)
+        if m:
+            categoria = next(grupo for grupo in m.groups() if grupo)
+            if not self.abertos["categoria"] or self.abertos["categoria"]["categoria"] != categoria:
+                self.abrir("categoria", instante, categoria=categoria)
+            else:
+                self.fechar("pagina", instante)
+        m = REGEX_PAGINA.match(mensagem)
+        if m:
+            if not self.abertos["categoria"] or self.abertos["categoria"]["categoria"] != m.group(2):
+                self.abrir("categoria", instante, categoria=m.group(2))
+            self.abrir("pagina", instante, pagina=int(m.group(1)))
+            self.atividade = "extracao_pagina"
+        m = REGEX_PRODUTO.match(mensagem)
+        if m and self.abertos["pagina"]:
+            self.abrir("produto", instante, produto=int(m.group(1)))
+            self.atividade = "extracao_produto"
+        m = REGEX_PRODUTOS_PAGINA.match(mensagem)
+        if m:
+            self.fechar("produto", instante)
+            if self.abertos["pagina"]:
+                self.abertos["pagina"]["produtos"] = int(m.group(1))
+            self.atividade = "gravacao_pagina"
+        m = REGEX_FIM_CATEGORIA.match(mensagem)
+        if m:
+            self.fechar("categoria", instante)
+            self.atividade = None
+
+        for nome, regex, pausa_fixa in ESPERAS:
+            if regex.match(mensagem):
+                self.definir_espera(nome, pausa_fixa)
+                if nome in ("aguardar_cards", "clique_proxima", "navegacao_categoria"):
+                    self.fechar("produto", instante)
+                return
+        for regex in REGEX_ESPERA_NOVA_TENTATIVA:
+            m = regex.search(mensagem)
+            if m:
+                self.repetindo = True
+                self.definir_espera("espera_nova_tentativa", float(m.group(1)))
+                return
+        for regex, pausa_fixa in REGEX_NOVA_TENTATIVA:
+            if regex.match(mensagem):
+                self.repetindo = True
+                self.definir_espera("espera_nova_tentativa", pausa_fixa)
+                return
+        for nome, regex in ATIVIDADES:
+            if regex.match(mensagem):
+                if nome in ("paginacao", "exportacao_excel", "encerramento"):
+                    self.fechar("produto" if nome == "paginacao" else "categoria", instante)
+                self.atividade = nome
+                return
+
+    # Relatórios
+
+    def arvore(self):
+        """Pilhas agregadas em árvore: {quadro: [segundos, {filhos}]}"""
+        raiz = {}
+        for pilha, segundos in self.pilhas.items():
+            nivel = raiz
+            for quadro in pilha.split(";"):
+                no = nivel.setdefault(quadro, [0.0, {}])
+                no[0] += segundos
+                nivel = no[1]
+        return raiz
+
+    def resumo(self, profundidade=4, largura_barra=30, minimo=0.005):
+        """Resumo em texto: árvore de tempo no estilo de flame graph, esperas e novas tentativas"""
+        total = self.total_s or 1.0
+        linhas = [f"Execuções: {self.execucoes}; tempo atribuído: {formatar_duracao(self.total_s)}", ""]
+
+        def descer(nos, nivel):
+            for quadro, (segundos, filhos) in sorted(nos.items(), key=lambda item: -item[1][0]):
+                if segundos / total < minimo:
+                    continue
+                barra = "█" * max(1, round(largura_barra * segundos / total))
+                linhas.append(f"{formatar_duracao(segundos):>10} {segundos / total:6.1%}  "
+                              f"{'  ' * nivel}{quadro:<{40 - 2 * min(nivel, 10)}} {barra}")
+                if nivel + 1 < profundidade:
+                    descer(filhos, nivel + 1)
+
+        descer(self.arvore(), 0)
+
+        linhas += ["", f"{'seção de espera':<24} {'ocorrências':>11} {'tempo':>10} {'pausa fixa':>11}"]
+        tempo_esperas = 0.0
+        for nome, (ocorrencias, segundos, pausa_fixa) in sorted(self.esperas.items(), key=lambda item: -item[1][1]):
+            tempo_esperas += segundos
+            linhas.append(f"{nome:<24} {ocorrencias:>11} {formatar_duracao(segundos):>10} "
+                          f"{formatar_duracao(pausa_fixa):>11}")
+        linhas += ["", f"Tempo em seções de espera: {formatar_duracao(tempo_esperas)} ({tempo_esperas / total:.1%})",
+                   f"Tempo perdido em novas tentativas: {formatar_duracao(self.novas_tentativas_s)} "
+                   f"({self.novas_tentativas_s / total:.1%})"]
+        return "\n".join(linhas)
+
+    def salvar_folded(self, caminho):
+        """Pilhas no formato "collapsed" (uma por linha: quadros separados por ';' e milissegundos)"""
+        with open(caminho, "w", encoding="utf-8") as f:
+            for pilha, segundos in sorted(self.pilhas.items()):
+                milissegundos = round(segundos * 1000)
+                if milissegundos:
+                    f.write(f"{pilha} {milissegundos}\n")
+
+
+def formatar_duracao(segundos):
+    segundos = int(round(segundos))
+    horas, resto = divmod(segundos, 3600)
+    minutos, segundos = divmod(resto, 60)
+    if horas:
+        return f"{horas}h{minutos:02d}m{segundos:02d}s"
+    if minutos:
+        return f"{minutos}m{segundos:02d}s"
+    return f"{segundos}s"
+
+
+def analisar(caminhos, prefixo_saida, por_execucao=False, intervalo_maximo=INTERVALO_MAXIMO):
+    """Analisa os logs, grava <prefixo>.csv e <prefixo>.folded e retorna o analisador"""
+    with open(f"{prefixo_saida}.csv", "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=CAMPOS_CSV)
+        escritor.writeheader()
+        analisador = AnalisadorLog(escritor, por_execucao=por_execucao, intervalo_maximo=intervalo_maximo)
+        for instante, nivel, mensagem in ler_registros(caminhos):
+            analisador.processar(instante, nivel, mensagem)
+        analisador.encerrar()
+    analisador.salvar_folded(f"{prefixo_saida}.folded")
+    return analisador
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de tempo das execuções a partir do leveros_rpa.log")
+    parser.add_argument("logs", nargs="+", help="arquivos de log, em ordem cronológica (.gz aceito)")
+    parser.add_argument("--saida", default="Perfil_leveros_rpa", metavar="PREFIXO",
+                        help="prefixo dos arquivos .csv e .folded (padrão: Perfil_leveros_rpa)")
+    parser.add_argument("--por-execucao", action="store_true",
+                        help="separa cada execução na árvore e no arquivo .folded")
+    parser.add_argument("--profundidade", type=int, default=4, help="níveis da árvore no resumo (padrão: 4)")
+    parser.add_argument("--intervalo-maximo", type=float, default=INTERVALO_MAXIMO, metavar="SEGUNDOS",
+                        help="intervalos sem registros maiores que este não são atribuídos à atividade "
+                             f"(padrão: {INTERVALO_MAXIMO})")
+    args = parser.parse_args()
+
+    analisador = analisar(args.logs, args.saida, por_execucao=args.por_execucao,
+                          intervalo_maximo=args.intervalo_maximo)
+    print(analisador.resumo(profundidade=args.profundidade))
+    print(f"\nArquivos gravados: {args.saida}.csv, {args.saida}.folded")
+
+
+if __name__ == "__main__":
+    main()
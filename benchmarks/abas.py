@@ -0,0 +1,74 @@
+"""
+Benchmark do modo de abas (--abas) contra uma aba e contra vários navegadores
+Sobe o servidor_mock.py com latência (para que as esperas de carregamento dominem, como no site
+real) e executa o RPA completo, headless, com uma aba, com N abas em um único navegador e,
+opcionalmente, com N workers (N navegadores). Cada execução roda em um processo e diretório
+temporário próprios (ver fluxo_completo.executar_medicao). Compara produtos por segundo e o pico
+de memória somada de todos os processos (Python, ChromeDriver e Chrome).
+
+Uso:
+    python benchmarks/abas.py
+    python benchmarks/abas.py --abas 4 --categorias 8 --latencia 0.3 --comparar-workers
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fluxo_completo import executar_medicao  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do modo de abas contra uma aba e contra vários navegadores")
+    parser.add_argument("--abas", type=int, default=4, help="abas do modo de abas (padrão: 4)")
+    parser.add_argument("--categorias", type=int, default=4, help="quantidade de categorias extraídas")
+    parser.add_argument("--produtos-por-categoria", type=int, default=60)
+    parser.add_argument("--tamanho-pagina", type=int, default=12)
+    parser.add_argument("--latencia", type=float, default=0.3, metavar="SEGUNDOS",
+                        help="atraso de cada resposta do servidor simulado (padrão: 0.3)")
+    parser.add_argument("--comparar-workers", action="store_true",
+                        help="mede também --workers com a mesma quantidade de navegadores")
+    parser.add_argument("--com-interface", action="store_true", help="mostra o navegador")
+    args = parser.parse_args()
+    # Valores usados por executar_medicao
+    args.workers = 1
+
+    configuracoes = [("1 aba", 1, 1), (f"{args.abas} abas", args.abas, 1)]
+    if args.comparar_workers:
+        configuracoes.append((f"{args.abas} workers", 1, args.abas))
+
+    import servidor_mock
+    servidor, url_base = servidor_mock.iniciar_em_segundo_plano(
+        produtos_por_categoria=args.produtos_por_categoria, tamanho_pagina=args.tamanho_pagina,
+        latencia=args.latencia)
+    resultados = []
+    try:
+        print(f"{'configuração':<14} {'produtos':>9} {'tempo (s)':>10} {'produtos/s':>11} "
+              f"{'s/página':>9} {'RSS total (MB)':>15}")
+        for nome, abas, workers in configuracoes:
+            resultado = executar_medicao(f"{url_base}/login", args, abas=abas, workers=workers)
+            resultados.append((nome, resultado))
+            print(f"{nome:<14} {resultado['produtos']:>9} {resultado['segundos']:>10} "
+                  f"{resultado['produtos_por_segundo']:>11} {resultado['segundos_por_pagina']:>9} "
+                  f"{resultado['pico_rss_total_mb']:>15}")
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    _, base = resultados[0]
+    print()
+    for nome, resultado in resultados[1:]:
+        vazao = resultado["produtos_por_segundo"] / base["produtos_por_segundo"] if base["produtos_por_segundo"] else 0
+        memoria = resultado["pico_rss_total_mb"] / base["pico_rss_total_mb"] if base["pico_rss_total_mb"] else 0
+        print(f"{nome}: {vazao:.2f}x a vazão e {memoria:.2f}x a memória de 1 aba")
+
+    if any(not r["sucesso"] or not r["produtos"] for _, r in resultados):
+        print("Alguma execução falhou ou não extraiu produtos.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
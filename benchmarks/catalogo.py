@@ -0,0 +1,63 @@
+"""
+Benchmark do catálogo pesquisável
+Carrega catálogos sintéticos (os mesmos produtos de benchmarks/excel.py) em um catálogo SQLite
+temporário e mede o tempo da carga e de consultas típicas: busca livre com atributos, texto no
+índice FTS5, filtros por atributos e faixa de preço.
+
+Uso:
+    python benchmarks/catalogo.py
+    python benchmarks/catalogo.py --linhas 100000 500000 --repeticoes 50
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel import produto_sintetico  # noqa: E402
+from leveros_catalogo import CatalogoProdutos  # noqa: E402
+
+CONSULTAS = [
+    ("busca livre", {"texto": "12.000 BTUs 220V"}),
+    ("texto (FTS5)", {"texto": "0001234", "interpretar": False}),
+    ("atributos", {"btus": 24000, "voltagem": "220V", "categoria": "Ar Janela"}),
+    ("preço", {"btus_minimo": 18000, "preco_maximo": 3000}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do catálogo pesquisável")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--repeticoes", type=int, default=20, help="repetições de cada consulta (mediana)")
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'carga (s)':>10} " + " ".join(f"{nome + ' (ms)':>18}" for nome, _ in CONSULTAS))
+    for linhas in args.linhas:
+        diretorio = tempfile.mkdtemp(prefix="catalogo_leveros_")
+        try:
+            catalogo = CatalogoProdutos(os.path.join(diretorio, "catalogo.sqlite3"))
+            inicio = time.perf_counter()
+            catalogo.carregar_execucao("sintetico", (produto_sintetico(i) for i in range(linhas)))
+            carga = time.perf_counter() - inicio
+
+            medianas = []
+            for _, parametros in CONSULTAS:
+                tempos = []
+                for _ in range(args.repeticoes):
+                    inicio = time.perf_counter()
+                    catalogo.buscar(**parametros)
+                    tempos.append((time.perf_counter() - inicio) * 1000)
+                medianas.append(statistics.median(tempos))
+            catalogo.fechar()
+            print(f"{linhas:>10} {carga:>10.1f} " + " ".join(f"{mediana:>18.2f}" for mediana in medianas))
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
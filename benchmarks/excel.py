@@ -0,0 +1,152 @@
+"""
+Benchmark da exportação para Excel
+Gera catálogos sintéticos (10 mil, 100 mil e 1 milhão de produtos por padrão) em uma saída JSONL
+e mede o tempo e o pico de memória (RSS) da exportação. Cada medição roda em um processo separado,
+para que o pico de uma não contamine a seguinte.
+
+Modos:
+- streaming: leveros_exportacao.exportar_excel (constant_memory, uma passada por blocos)
+- dataframe: a exportação anterior (DataFrame completo, um filtro por categoria e xlsxwriter em memória)
+
+Uso:
+    python benchmarks/excel.py
+    python benchmarks/excel.py --linhas 10000 100000 --modos streaming dataframe
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leveros_saida import SaidaJsonl  # noqa: E402
+
+CATEGORIAS = [
+    "Inverter", "Convencional", "Multi-Split", "Ar Janela",
+    "Cassete", "Piso Teto", "VRF", "Ar Portátil",
+    "Climatizador", "Ventilador"
+]
+
+
+def produto_sintetico(indice):
+    """Registro de produto determinístico, com os mesmos campos do RPA"""
+    categoria = CATEGORIAS[indice % len(CATEGORIAS)]
+    btus = [9000, 12000, 18000, 24000, 30000, 36000][indice % 6]
+    preco = 1499 + (indice * 37) % 9000 + 0.9
+    parcelas = 8 if preco > 2000 else 4
+    return {
+        "Categoria": categoria,
+        "Nome do Produto": f"Ar-Condicionado {categoria} Modelo {indice:07d} {btus:,} BTUs Só Frio 220V".replace(",", "."),
+        "Voltagem": "220  V" if indice % 4 else "127  V",
+        "BTU": f"{btus:,} BTUs".replace(",", ".") if indice % 7 else "N/A",
+        "Preço Principal": f"R$ {preco:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."),
+        "Preço à Vista": f"ou R$ {preco * 0.95:,.2f} à vista".replace(",", "X").replace(".", ",").replace("X", "."),
+        "Qtd. Parcelas": f"{parcelas}x",
+        "Valor Parcela": f"R$ {preco / parcelas:,.2f} sem juros".replace(",", "X").replace(".", ",").replace("X", "."),
+        "URL da Imagem": f"https://leverosintegra.dev.br/storage/produtos/produto-{indice:07d}.webp",
+        "URL Pública da Imagem": f"https://leverosintegra.dev.br/storage/produtos/produto-{indice:07d}.webp",
+    }
+
+
+def gerar_saida(caminho, linhas, tamanho_pagina=1000):
+    """Grava o catálogo sintético em uma saída JSONL, página a página, como o RPA faz"""
+    saida = SaidaJsonl(caminho)
+    for pagina, inicio in enumerate(range(0, linhas, tamanho_pagina), start=1):
+        produtos = [produto_sintetico(i) for i in range(inicio, min(inicio + tamanho_pagina, linhas))]
+        saida.escrever_pagina("sintetico", pagina, produtos)
+    saida.fechar()
+    return saida
+
+
+def exportar_excel_dataframe(produtos, caminho, categorias):
+    """Exportação anterior: DataFrame completo, um filtro por categoria e groupby separado para o resumo"""
+    import pandas as pd
+    df = pd.DataFrame(produtos)
+    writer = pd.ExcelWriter(caminho, engine="xlsxwriter")
+    df.to_excel(writer, sheet_name="Produtos Leveros", index=False)
+    for categoria in categorias:
+        df_categoria = df[df["Categoria"] == categoria]
+        if not df_categoria.empty:
+            df_categoria.to_excel(writer, sheet_name=categoria[:31], index=False)
+    resumo = df.groupby("Categoria").agg({"Nome do Produto": "count"}).reset_index()
+    resumo.columns = ["Categoria", "Quantidade de Produtos"]
+    resumo.to_excel(writer, sheet_name="Resumo", index=False)
+    writer.close()
+
+
+def pico_rss_mb():
+    """Pico de memória residente do processo atual, em MB (Linux e macOS)"""
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def medir(modo, linhas, diretorio, tamanho_bloco):
+    """Executa uma exportação no processo atual e retorna as medições"""
+    saida = gerar_saida(os.path.join(diretorio, f"produtos_{linhas}.jsonl"), linhas)
+    rss_antes = pico_rss_mb()
+    caminho = os.path.join(diretorio, f"produtos_{modo}_{linhas}.xlsx")
+
+    inicio = time.perf_counter()
+    if modo == "streaming":
+        from leveros_exportacao import exportar_excel
+        exportar_excel(saida, caminho, CATEGORIAS, tamanho_bloco)
+    else:
+        exportar_excel_dataframe(list(saida.produtos()), caminho, CATEGORIAS)
+    segundos = time.perf_counter() - inicio
+
+    return {
+        "modo": modo,
+        "linhas": linhas,
+        "segundos": round(segundos, 2),
+        "pico_rss_mb": round(pico_rss_mb(), 1),
+        "rss_antes_mb": round(rss_antes, 1),
+        "tamanho_arquivo_mb": round(os.path.getsize(caminho) / (1024 * 1024), 1),
+    }
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark da exportação para Excel")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--modos", nargs="+", choices=["streaming", "dataframe"], default=["streaming", "dataframe"])
+    parser.add_argument("--tamanho-bloco", type=int, default=5000)
+    parser.add_argument("--medicao", nargs=2, metavar=("MODO", "LINHAS"), help=argparse.SUPPRESS)
+    parser.add_argument("--diretorio", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medicao:
+        # Processo filho: uma única medição, impressa em JSON
+        modo, linhas = args.medicao[0], int(args.medicao[1])
+        print(json.dumps(medir(modo, linhas, args.diretorio, args.tamanho_bloco)))
+        return
+
+    diretorio = tempfile.mkdtemp(prefix="benchmark_excel_")
+    try:
+        print(f"{'modo':<10} {'linhas':>10} {'tempo (s)':>10} {'pico RSS (MB)':>14} {'xlsx (MB)':>10}")
+        for linhas in args.linhas:
+            for modo in args.modos:
+                processo = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--medicao", modo, str(linhas),
+                     "--diretorio", diretorio, "--tamanho-bloco", str(args.tamanho_bloco)],
+                    capture_output=True, text=True)
+                if processo.returncode != 0:
+                    print(f"{modo:<10} {linhas:>10} falhou: {processo.stderr.strip().splitlines()[-1:]}")
+                    continue
+                resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+                print(f"{modo:<10} {linhas:>10} {resultado['segundos']:>10} {resultado['pico_rss_mb']:>14} "
+                      f"{resultado['tamanho_arquivo_mb']:>10}")
+                for arquivo in os.listdir(diretorio):
+                    if arquivo.endswith(".xlsx"):
+                        os.remove(os.path.join(diretorio, arquivo))
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
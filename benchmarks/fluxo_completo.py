@@ -0,0 +1,224 @@
+"""
+Benchmark de ponta a ponta contra o servidor simulado
+Sobe o servidor_mock.py com o catálogo e a latência configurados e executa LeverosRPA.executar
+(headless) em um processo separado, em um diretório temporário. Mede produtos por segundo, segundos
+por página, o pico de memória do Python e do maior processo filho (Chrome ou ChromeDriver) e o pico
+da memória somada do processo e de todos os descendentes (todos os processos do Chrome).
+
+Com --referencia, compara o resultado com uma execução salva por --salvar-referencia e termina
+com código 1 se alguma medida piorar além da --tolerancia, para uso como verificação de regressão.
+
+Uso:
+    python benchmarks/fluxo_completo.py
+    python benchmarks/fluxo_completo.py --categorias 5 --produtos-por-categoria 120 --latencia 0.05
+    python benchmarks/fluxo_completo.py --salvar-referencia referencia_fluxo.json
+    python benchmarks/fluxo_completo.py --referencia referencia_fluxo.json --tolerancia 0.2
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import statistics
+import tempfile
+import threading
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel import pico_rss_mb  # noqa: E402
+from leveros_saude import rss_arvore_mb  # noqa: E402
+
+# Medidas comparadas com a referência: (chave, maior é melhor)
+MEDIDAS_REGRESSAO = [
+    ("produtos_por_segundo", True),
+    ("segundos_por_pagina", False),
+    ("pico_rss_python_mb", False),
+    ("pico_rss_filhos_mb", False),
+    ("pico_rss_total_mb", False),
+]
+
+
+def pico_rss_filhos_mb():
+    """Pico de memória residente do maior processo filho já encerrado, em MB"""
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+class AmostradorMemoria:
+    """Amostra, em uma thread, a memória somada da árvore de processos e guarda o pico"""
+
+    def __init__(self, pid, intervalo=0.5):
+        self.pid = pid
+        self.intervalo = intervalo
+        self.pico_mb = 0.0
+        self.parar = threading.Event()
+        self.thread = threading.Thread(target=self.amostrar, daemon=True)
+
+    def amostrar(self):
+        while True:
+            rss = rss_arvore_mb(self.pid)
+            if rss is None:
+                return
+            self.pico_mb = max(self.pico_mb, rss)
+            if self.parar.wait(self.intervalo):
+                return
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *excecao):
+        self.parar.set()
+        self.thread.join()
+
+
+def medir(url_login, quantidade_categorias, workers, headless=True, abas=1):
+    """Executa o RPA no processo atual (e no diretório atual) e retorna as medições"""
+    from leveros_rpa import LeverosRPA
+
+    rpa = LeverosRPA(headless=headless, workers=workers, usar_cache_sessao=False, abas=abas)
+    rpa.url_login = url_login
+    rpa.categorias = rpa.categorias[:quantidade_categorias]
+
+    with AmostradorMemoria(os.getpid()) as amostrador:
+        inicio = time.perf_counter()
+        sucesso = rpa.executar()
+        segundos = time.perf_counter() - inicio
+
+    produtos = rpa.saida.total if rpa.saida else 0
+    paginas = rpa.metricas.total_contador("leveros_paginas_extraidas_total")
+    fases = rpa.metricas.duracao_fases()
+    # Tempo de navegador dedicado às categorias (com vários workers, somado entre eles)
+    segundos_categorias = fases.get("categoria", (0, 0.0))[1]
+    return {
+        "sucesso": bool(sucesso),
+        "produtos": produtos,
+        "paginas": paginas,
+        "segundos": round(segundos, 2),
+        "produtos_por_segundo": round(produtos / segundos, 2) if segundos else 0.0,
+        "segundos_por_pagina": round(segundos_categorias / paginas, 3) if paginas else 0.0,
+        "pico_rss_python_mb": round(pico_rss_mb(), 1),
+        "pico_rss_filhos_mb": round(pico_rss_filhos_mb(), 1),
+        "pico_rss_total_mb": round(amostrador.pico_mb, 1),
+        "fases": {fase: round(soma, 2) for fase, (_, soma) in sorted(fases.items())},
+    }
+
+
+def executar_medicao(url_login, args, abas=None, workers=None):
+    """
+    Executa uma medição em um processo filho, em um diretório temporário próprio. `abas` e
+    `workers` substituem os valores de `args`.
+    """
+    diretorio = tempfile.mkdtemp(prefix="fluxo_completo_")
+    try:
+        comando = [sys.executable, os.path.abspath(__file__), "--medicao", url_login,
+                   "--categorias", str(args.categorias), "--workers", str(workers or args.workers),
+                   "--abas", str(abas or args.abas)]
+        if args.com_interface:
+            comando.append("--com-interface")
+        processo = subprocess.run(comando, capture_output=True, text=True, cwd=diretorio)
+        if processo.returncode != 0:
+            raise RuntimeError(processo.stderr.strip().splitlines()[-1:] or "falha sem mensagem")
+        return json.loads(processo.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def comparar_com_referencia(resultado, referencia, tolerancia):
+    """Imprime a variação de cada medida e retorna as que pioraram além da tolerância"""
+    regressoes = []
+    print(f"\n{'medida':<22} {'referência':>11} {'atual':>10} {'variação':>9}")
+    for chave, maior_melhor in MEDIDAS_REGRESSAO:
+        antes, agora = referencia.get(chave), resultado.get(chave)
+        if not antes or agora is None:
+            continue
+        variacao = (agora - antes) / antes
+        piorou = -variacao > tolerancia if maior_melhor else variacao > tolerancia
+        if piorou:
+            regressoes.append(chave)
+        print(f"{chave:<22} {antes:>11} {agora:>10} {variacao:>+8.0%}{'  REGRESSÃO' if piorou else ''}")
+    return regressoes
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark de ponta a ponta contra o servidor simulado")
+    parser.add_argument("--categorias", type=int, default=3, help="quantidade de categorias extraídas")
+    parser.add_argument("--produtos-por-categoria", type=int, default=60)
+    parser.add_argument("--tamanho-pagina", type=int, default=12)
+    parser.add_argument("--latencia", type=float, default=0.0, metavar="SEGUNDOS",
+                        help="atraso de cada resposta do servidor simulado")
+    parser.add_argument("--variacao-latencia", type=float, default=0.0, metavar="SEGUNDOS")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--abas", type=int, default=1, help="categorias processadas ao mesmo tempo em abas")
+    parser.add_argument("--repeticoes", type=int, default=1, help="execuções; é reportada a mediana")
+    parser.add_argument("--com-interface", action="store_true", help="mostra o navegador")
+    parser.add_argument("--salvar-referencia", metavar="ARQUIVO", help="grava o resultado como referência")
+    parser.add_argument("--referencia", metavar="ARQUIVO", help="compara com uma referência salva")
+    parser.add_argument("--tolerancia", type=float, default=0.15,
+                        help="piora relativa aceita em relação à referência (padrão: 0.15)")
+    parser.add_argument("--medicao", metavar="URL_LOGIN", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medicao:
+        # Processo filho: uma única execução, impressa em JSON
+        print(json.dumps(medir(args.medicao, args.categorias, args.workers, headless=not args.com_interface,
+                               abas=args.abas)))
+        return
+
+    import servidor_mock
+    servidor, url_base = servidor_mock.iniciar_em_segundo_plano(
+        produtos_por_categoria=args.produtos_por_categoria, tamanho_pagina=args.tamanho_pagina,
+        latencia=args.latencia, variacao_latencia=args.variacao_latencia)
+    try:
+        resultados = []
+        print(f"{'execução':>8} {'produtos':>9} {'páginas':>8} {'tempo (s)':>10} {'produtos/s':>11} "
+              f"{'s/página':>9} {'RSS py (MB)':>12} {'RSS filho (MB)':>15} {'RSS total (MB)':>15}")
+        for repeticao in range(1, args.repeticoes + 1):
+            resultado = executar_medicao(f"{url_base}/login", args)
+            resultados.append(resultado)
+            print(f"{repeticao:>8} {resultado['produtos']:>9} {resultado['paginas']:>8} {resultado['segundos']:>10} "
+                  f"{resultado['produtos_por_segundo']:>11} {resultado['segundos_por_pagina']:>9} "
+                  f"{resultado['pico_rss_python_mb']:>12} {resultado['pico_rss_filhos_mb']:>15} "
+                  f"{resultado['pico_rss_total_mb']:>15}")
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    # Mediana de cada medida entre as repetições
+    resultado = dict(resultados[-1])
+    for chave, _ in MEDIDAS_REGRESSAO + [("segundos", False)]:
+        resultado[chave] = statistics.median(r[chave] for r in resultados)
+    resultado["configuracao"] = {
+        "categorias": args.categorias, "produtos_por_categoria": args.produtos_por_categoria,
+        "tamanho_pagina": args.tamanho_pagina, "latencia": args.latencia, "workers": args.workers,
+        "abas": args.abas,
+    }
+    print("\nTempo por fase (s): " + ", ".join(f"{fase} {soma}" for fase, soma in resultado["fases"].items()))
+
+    validas = sum(1 for r in resultados if r["sucesso"] and r["produtos"])
+    if validas < len(resultados):
+        print(f"{len(resultados) - validas} execução(ões) falharam ou não extraíram produtos.")
+        sys.exit(1)
+
+    if args.salvar_referencia:
+        with open(args.salvar_referencia, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+        print(f"Referência salva em {args.salvar_referencia}")
+
+    if args.referencia:
+        with open(args.referencia, encoding="utf-8") as f:
+            referencia = json.load(f)
+        if referencia.get("configuracao") != resultado["configuracao"]:
+            print("Atenção: a referência foi gerada com outra configuração.")
+        regressoes = comparar_com_referencia(resultado, referencia, args.tolerancia)
+        if regressoes:
+            print(f"\nRegressão de desempenho: {', '.join(regressoes)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark da inicialização do ChromeDriver
+Mede o tempo de resolução do executável com o cache frio (download, conferência e extração em um
+diretório vazio) e com o cache quente (apenas a conferência do SHA-256, sem rede), e compara com o
+ChromeDriverManager().install() usado antes. Com --com-navegador, mede também a inicialização
+completa do Chrome (webdriver.Chrome até o primeiro about:blank) com o driver em cache.
+
+Uso:
+    python benchmarks/inicializacao.py
+    python benchmarks/inicializacao.py --repeticoes 20 --com-navegador
+"""
+
+import os
+import sys
+import time
+import shutil
+import statistics
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leveros_driver import ResolvedorChromeDriver, VERSAO_CHROMEDRIVER  # noqa: E402
+
+
+def cronometrar(funcao, repeticoes):
+    """Executa `funcao` `repeticoes` vezes e retorna os tempos em segundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def imprimir(nome, tempos):
+    print(f"{nome:<32} {len(tempos):>5} {statistics.median(tempos) * 1000:>12.1f} "
+          f"{min(tempos) * 1000:>10.1f} {max(tempos) * 1000:>10.1f}")
+
+
+def iniciar_navegador(caminho_driver):
+    """Inicia o Chrome headless com o driver informado e o encerra"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    opcoes = webdriver.ChromeOptions()
+    opcoes.add_argument("--headless")
+    driver = webdriver.Chrome(service=Service(executable_path=caminho_driver), options=opcoes)
+    try:
+        driver.get("about:blank")
+    finally:
+        driver.quit()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Tempo de inicialização do ChromeDriver com cache frio e quente")
+    parser.add_argument("--versao", default=VERSAO_CHROMEDRIVER)
+    parser.add_argument("--repeticoes", type=int, default=10, help="repetições das medições com cache quente")
+    parser.add_argument("--frio", type=int, default=2, help="repetições das medições com cache frio")
+    parser.add_argument("--sem-webdriver-manager", action="store_true",
+                        help="não mede o ChromeDriverManager().install()")
+    parser.add_argument("--com-navegador", action="store_true",
+                        help="mede também a inicialização completa do Chrome headless")
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix="cache_chromedriver_")
+    try:
+        resolvedor = ResolvedorChromeDriver(args.versao, diretorio)
+
+        def frio():
+            shutil.rmtree(diretorio, ignore_errors=True)
+            resolvedor.resolver()
+
+        print(f"ChromeDriver {args.versao} ({resolvedor.plataforma})\n")
+        print(f"{'medição':<32} {'vezes':>5} {'mediana (ms)':>12} {'mín (ms)':>10} {'máx (ms)':>10}")
+        imprimir("cache frio (download)", cronometrar(frio, args.frio))
+        imprimir("cache quente (sem rede)", cronometrar(lambda: resolvedor.resolver(permitir_download=False),
+                                                        args.repeticoes))
+
+        if not args.sem_webdriver_manager:
+            from webdriver_manager.chrome import ChromeDriverManager
+            ChromeDriverManager().install()  # preenche o cache próprio do webdriver-manager
+            imprimir("ChromeDriverManager().install()", cronometrar(lambda: ChromeDriverManager().install(),
+                                                                    args.repeticoes))
+
+        if args.com_navegador:
+            caminho = resolvedor.resolver(permitir_download=False)
+            imprimir("Chrome completo (cache quente)", cronometrar(lambda: iniciar_navegador(caminho),
+                                                                   max(1, args.repeticoes // 2)))
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
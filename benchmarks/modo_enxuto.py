@@ -0,0 +1,115 @@
+"""
+Economia do modo enxuto por página
+Compara dois relatórios por página (RelatorioPaginas_<timestamp>.csv), um gerado no modo completo
+(--relatorio-paginas) e outro no modo enxuto (--modo-enxuto), e mostra os bytes e o tempo de
+carregamento economizados em cada página. Sem relatórios, executa o RPA nos dois modos contra o
+servidor simulado (ou contra --url-login) e compara as execuções.
+
+Uso:
+    python benchmarks/modo_enxuto.py --relatorios RelatorioPaginas_completo.csv RelatorioPaginas_enxuto.csv
+    python benchmarks/modo_enxuto.py --categorias 3
+"""
+
+import os
+import sys
+import csv
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def ler_relatorio(caminho):
+    """Lê um relatório por página: {(categoria, página): (bytes, segundos)}"""
+    with open(caminho, newline="", encoding="utf-8-sig") as f:
+        return {
+            (linha["Categoria"], int(linha["Página"])):
+                (int(linha["Bytes Transferidos"]), float(linha["Tempo de Carregamento (s)"]))
+            for linha in csv.DictReader(f)
+        }
+
+
+def indexar_metricas(metricas):
+    """Converte as métricas de LeverosRPA.metricas_paginas para o formato de ler_relatorio"""
+    return {(m["Categoria"], m["Página"]): (m["Bytes Transferidos"], m["Tempo de Carregamento (s)"])
+            for m in metricas}
+
+
+def comparar(completo, enxuto):
+    """Imprime a economia por página e a total, considerando as páginas presentes nos dois relatórios"""
+    paginas = sorted(set(completo) & set(enxuto))
+    if not paginas:
+        print("Nenhuma página em comum entre os relatórios.")
+        return
+
+    print(f"{'categoria':<14} {'pág.':>4} {'KB completo':>12} {'KB enxuto':>10} {'KB economia':>12} "
+          f"{'s completo':>11} {'s enxuto':>9} {'s economia':>11}")
+    totais = [0, 0, 0.0, 0.0]
+    for chave in paginas:
+        (bytes_completo, tempo_completo), (bytes_enxuto, tempo_enxuto) = completo[chave], enxuto[chave]
+        totais[0] += bytes_completo
+        totais[1] += bytes_enxuto
+        totais[2] += tempo_completo
+        totais[3] += tempo_enxuto
+        print(f"{chave[0]:<14} {chave[1]:>4} {bytes_completo / 1024:>12.1f} {bytes_enxuto / 1024:>10.1f} "
+              f"{(bytes_completo - bytes_enxuto) / 1024:>12.1f} {tempo_completo:>11.2f} {tempo_enxuto:>9.2f} "
+              f"{tempo_completo - tempo_enxuto:>11.2f}")
+
+    n = len(paginas)
+    print(f"\n{n} páginas. Média por página: {(totais[0] - totais[1]) / n / 1024:.1f} KB e "
+          f"{(totais[2] - totais[3]) / n:.2f}s economizados "
+          f"({100 * (1 - totais[1] / totais[0]) if totais[0] else 0:.0f}% dos bytes, "
+          f"{100 * (1 - totais[3] / totais[2]) if totais[2] else 0:.0f}% do tempo).")
+
+
+def executar_modos(quantidade_categorias, url_login=None, headless=True):
+    """Executa o RPA no modo completo e no enxuto e retorna as métricas por página de cada um"""
+    import servidor_mock
+    from leveros_rpa import LeverosRPA
+
+    servidor = None
+    if url_login is None:
+        servidor, url_base = servidor_mock.iniciar_em_segundo_plano(produtos_por_categoria=40)
+        url_login = f"{url_base}/login"
+
+    diretorio_original = os.getcwd()
+    diretorio = tempfile.mkdtemp(prefix="modo_enxuto_")
+    resultados = {}
+    try:
+        # Os arquivos das execuções (saída, Excel, PDF, checkpoint) ficam no diretório temporário
+        os.chdir(diretorio)
+        for modo_enxuto in (False, True):
+            rpa = LeverosRPA(headless=headless, usar_cache_sessao=False, modo_enxuto=modo_enxuto,
+                             relatorio_paginas=True)
+            rpa.url_login = url_login
+            rpa.categorias = rpa.categorias[:quantidade_categorias]
+            rpa.executar()
+            resultados[modo_enxuto] = indexar_metricas(rpa.metricas_paginas)
+    finally:
+        os.chdir(diretorio_original)
+        shutil.rmtree(diretorio, ignore_errors=True)
+        if servidor:
+            servidor.shutdown()
+            servidor.server_close()
+    return resultados[False], resultados[True]
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Economia de bytes e tempo do modo enxuto por página")
+    parser.add_argument("--relatorios", nargs=2, metavar=("COMPLETO", "ENXUTO"),
+                        help="compara dois relatórios existentes em vez de executar o RPA")
+    parser.add_argument("--categorias", type=int, default=3, help="quantidade de categorias por execução")
+    parser.add_argument("--url-login", metavar="URL", help="site a usar no lugar do servidor simulado")
+    parser.add_argument("--com-interface", action="store_true", help="mostra o navegador")
+    args = parser.parse_args()
+
+    if args.relatorios:
+        completo, enxuto = ler_relatorio(args.relatorios[0]), ler_relatorio(args.relatorios[1])
+    else:
+        completo, enxuto = executar_modos(args.categorias, args.url_login, headless=not args.com_interface)
+    comparar(completo, enxuto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark da normalização de preços e parcelamento
+Compara a normalização vetorizada (leveros_normalizacao.normalizar_precos, sobre o DataFrame inteiro)
+com a conversão produto a produto (normalizar_produto), em catálogos sintéticos de 10 mil, 100 mil
+e 1 milhão de produtos, e confere que as duas produzem os mesmos valores.
+
+Uso:
+    python benchmarks/normalizacao.py
+    python benchmarks/normalizacao.py --linhas 10000 100000
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+from excel import produto_sintetico  # noqa: E402
+from leveros_normalizacao import normalizar_precos, normalizar_produto, CAMPOS_NUMERICOS  # noqa: E402
+
+
+def gerar_produtos(linhas):
+    """Catálogo sintético com alguns valores ausentes e alguns textos que não são preços"""
+    produtos = []
+    for indice in range(linhas):
+        produto = produto_sintetico(indice)
+        if indice % 97 == 0:
+            produto["Preço Principal"] = "Consulte"
+        if indice % 89 == 0:
+            produto["Qtd. Parcelas"] = "N/A"
+            produto["Valor Parcela"] = "N/A"
+        produtos.append(produto)
+    return produtos
+
+
+def conferir(vetorizado, por_linha):
+    """Confere que as duas normalizações produziram os mesmos valores"""
+    for coluna, _, _, _ in CAMPOS_NUMERICOS:
+        a = pd.to_numeric(vetorizado[coluna], errors="coerce").astype("float64")
+        b = pd.to_numeric(por_linha[coluna], errors="coerce").astype("float64")
+        if not a.equals(b):
+            return False
+    return vetorizado["campos_invalidos"].tolist() == por_linha["campos_invalidos"].tolist()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark da normalização de preços")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'vetorizado (s)':>15} {'por linha (s)':>14} {'ganho':>7} {'inválidos':>10} {'iguais':>7}")
+    for linhas in args.linhas:
+        produtos = gerar_produtos(linhas)
+        df = pd.DataFrame(produtos)
+
+        inicio = time.perf_counter()
+        vetorizado = normalizar_precos(df)
+        tempo_vetorizado = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        por_linha = pd.DataFrame([normalizar_produto(produto) for produto in produtos])
+        tempo_por_linha = time.perf_counter() - inicio
+
+        invalidos = int((vetorizado["campos_invalidos"] != "").sum())
+        print(f"{linhas:>10} {tempo_vetorizado:>15.2f} {tempo_por_linha:>14.2f} "
+              f"{tempo_por_linha / tempo_vetorizado:>6.1f}x {invalidos:>10} "
+              f"{'sim' if conferir(vetorizado, por_linha) else 'NÃO':>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark do registro de produto e da saída em Parquet
+Mede a memória ocupada por um catálogo sintético mantido como dicionários (um por produto, com as
+dez colunas como chaves) e como leveros_produtos.Produto (__slots__, Categoria e Voltagem
+internadas), e o tempo para reler o catálogo das saídas JSONL, CSV e Parquet (esta com Categoria
+e Voltagem em dicionário), com o tamanho de cada arquivo. O Parquet requer o pyarrow.
+
+Uso:
+    python benchmarks/registros.py
+    python benchmarks/registros.py --linhas 100000 1000000
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel import produto_sintetico  # noqa: E402
+from leveros_produtos import Produto  # noqa: E402
+from leveros_saida import criar_saida, pq  # noqa: E402
+
+
+def memoria_mb(construir, linhas):
+    """Memória alocada (MB) para manter os registros construídos por construir(indice)"""
+    tracemalloc.start()
+    registros = [construir(indice) for indice in range(linhas)]
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del registros
+    return memoria / (1024 * 1024)
+
+
+def medir_leitura(formato, diretorio, linhas, tamanho_pagina=1000):
+    """Grava o catálogo sintético no formato e retorna (MB em disco, segundos para reler tudo)"""
+    caminho = os.path.join(diretorio, f"produtos.{formato}")
+    saida = criar_saida(formato, caminho)
+    for pagina, inicio in enumerate(range(0, linhas, tamanho_pagina), start=1):
+        produtos = [Produto.de_registro(produto_sintetico(i))
+                    for i in range(inicio, min(inicio + tamanho_pagina, linhas))]
+        saida.escrever_pagina("sintetico", pagina, produtos)
+    saida.fechar()
+
+    inicio = time.perf_counter()
+    lidos = sum(1 for _ in saida.produtos())
+    segundos = time.perf_counter() - inicio
+    if lidos != linhas:
+        raise Exception(f"{formato}: {lidos} produtos lidos de {linhas}")
+    return os.path.getsize(caminho) / (1024 * 1024), segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do registro de produto e da saída em Parquet")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    formatos = ["jsonl", "csv"] + (["parquet"] if pq is not None else [])
+    if pq is None:
+        print("pyarrow não instalado: Parquet fora da comparação.\n")
+
+    print(f"{'linhas':>10} {'dict (MB)':>10} {'Produto (MB)':>13} {'redução':>8}")
+    for linhas in args.linhas:
+        como_dict = memoria_mb(produto_sintetico, linhas)
+        como_produto = memoria_mb(lambda indice: Produto.de_registro(produto_sintetico(indice)), linhas)
+        print(f"{linhas:>10} {como_dict:>10.1f} {como_produto:>13.1f} {1 - como_produto / como_dict:>7.0%}")
+
+    print(f"\n{'linhas':>10} {'formato':>8} {'arquivo (MB)':>13} {'leitura (s)':>12}")
+    for linhas in args.linhas:
+        diretorio = tempfile.mkdtemp(prefix="registros_leveros_")
+        try:
+            for formato in formatos:
+                tamanho, segundos = medir_leitura(formato, diretorio, linhas)
+                print(f"{linhas:>10} {formato:>8} {tamanho:>13.1f} {segundos:>12.2f}")
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
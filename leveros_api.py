@@ -0,0 +1,378 @@
+"""
+Extração sem navegador pela API JSON do catálogo da Leveros Integra
+O catálogo é um SPA (Quasar) que carrega os cards de endpoints JSON. Este módulo descobre esses
+endpoints a partir do log de performance (rede) do Chrome, aprende como cada campo do card é
+gerado a partir do JSON e depois busca as páginas diretamente com uma requests.Session.
+"""
+
+import os
+import re
+import json
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Nomes usuais do parâmetro de paginação, usados quando não foi possível observar a página 2
+PARAMETROS_PAGINA_CONHECIDOS = ["pagina", "page", "p", "offset", "skip"]
+
+# Cabeçalhos que não devem ser repetidos nas requisições diretas
+CABECALHOS_IGNORADOS = {"content-length", "host", "cookie", "connection", "accept-encoding"}
+
+
+class SessaoApiExpirada(Exception):
+    """A API recusou as credenciais capturadas (HTTP 401/403)"""
+
+
+def formatar_numero_br(valor, casas=2):
+    """Formata um número no padrão brasileiro: 7999.5 -> '7.999,50'"""
+    texto = f"{float(valor):,.{casas}f}"
+    return texto.replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def url_publica_imagem(url_privada):
+    """Equivalente em Python da função getPublicImageUrl do script de extração"""
+    if not url_privada or url_privada == "N/A":
+        return "N/A"
+    url = urlparse(url_privada)
+    if not url.scheme or not url.netloc:
+        return url_privada
+    nome_arquivo = url.path.split("/")[-1]
+    return f"https://www.vendas.leveros.com.br/upload/produto/imagem/{nome_arquivo}"
+
+
+def requisicoes_json(entradas_log):
+    """Agrupa as entradas do log de performance do Chrome nas requisições que retornaram JSON"""
+    requisicoes = {}
+    for entrada in entradas_log:
+        try:
+            mensagem = json.loads(entrada["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        metodo = mensagem.get("method")
+        parametros = mensagem.get("params", {})
+        id_requisicao = parametros.get("requestId")
+
+        if metodo == "Network.requestWillBeSent":
+            requisicao = parametros["request"]
+            requisicoes[id_requisicao] = {
+                "id": id_requisicao,
+                "url": requisicao["url"],
+                "metodo": requisicao["method"],
+                "cabecalhos": dict(requisicao.get("headers", {})),
+                "corpo": requisicao.get("postData"),
+                "tipo": None,
+                "status": None,
+            }
+        elif metodo == "Network.requestWillBeSentExtraInfo" and id_requisicao in requisicoes:
+            requisicoes[id_requisicao]["cabecalhos"].update(parametros.get("headers", {}))
+        elif metodo == "Network.responseReceived" and id_requisicao in requisicoes:
+            resposta = parametros.get("response", {})
+            requisicoes[id_requisicao]["tipo"] = resposta.get("mimeType")
+            requisicoes[id_requisicao]["status"] = resposta.get("status")
+
+    return [r for r in requisicoes.values()
+            if r["tipo"] and "json" in r["tipo"] and r["status"] == 200]
+
+
+def folhas(objeto, caminho=()):
+    """Percorre um objeto JSON e gera (caminho, valor) para cada valor escalar dentro de dicionários"""
+    if isinstance(objeto, dict):
+        for chave, valor in objeto.items():
+            yield from folhas(valor, caminho + (chave,))
+    elif not isinstance(objeto, list):
+        yield caminho, objeto
+
+
+def obter_caminho(objeto, caminho):
+    """Retorna o valor em um caminho (tupla de chaves) do objeto JSON, ou None"""
+    for chave in caminho:
+        if not isinstance(objeto, dict) or chave not in objeto:
+            return None
+        objeto = objeto[chave]
+    return objeto
+
+
+def encontrar_lista_produtos(dados, nomes, caminho=()):
+    """
+    Procura no JSON a lista de objetos que contém os nomes dos produtos exibidos na página.
+    Retorna (caminho, quantidade de nomes encontrados) da melhor lista.
+    """
+    melhor = (None, 0)
+    if isinstance(dados, list):
+        encontrados = sum(
+            1 for item in dados if isinstance(item, dict)
+            and any(isinstance(valor, str) and valor.strip() in nomes for _, valor in folhas(item))
+        )
+        if encontrados > melhor[1]:
+            melhor = (list(caminho), encontrados)
+    elif isinstance(dados, dict):
+        for chave, valor in dados.items():
+            candidato = encontrar_lista_produtos(valor, nomes, caminho + (chave,))
+            if candidato[1] > melhor[1]:
+                melhor = candidato
+    return melhor
+
+
+def representacoes(valor):
+    """Formas textuais em que um valor do JSON pode aparecer no card: [(texto, formato), ...]"""
+    if isinstance(valor, bool) or valor is None:
+        return []
+    if isinstance(valor, str):
+        numero = valor.strip()
+        reps = [(valor, "texto")] if len(valor.strip()) >= 2 else []
+        if re.fullmatch(r"-?\d+(\.\d+)?", numero):
+            reps.append((formatar_numero_br(float(numero)), "moeda"))
+        return reps
+    reps = [(formatar_numero_br(valor), "moeda")]
+    if float(valor).is_integer():
+        reps.append((str(int(valor)), "inteiro"))
+    return reps
+
+
+def aprender_modelo(texto, item):
+    """
+    Aprende como um texto do card é formado a partir de um item do JSON.
+    Retorna uma lista de segmentos: textos literais e referências {"caminho": [...], "formato": ...}.
+    """
+    segmentos = [texto]
+    candidatos = []
+    for caminho, valor in folhas(item):
+        for representacao, formato in representacoes(valor):
+            candidatos.append((representacao, formato, list(caminho)))
+    # As representações mais longas primeiro, para que "8" não seja encontrado dentro de "999,88"
+    candidatos.sort(key=lambda c: len(c[0]), reverse=True)
+
+    for representacao, formato, caminho in candidatos:
+        if formato == "texto":
+            padrao = re.compile(re.escape(representacao))
+        else:
+            padrao = re.compile(r"(?<![\d.,])" + re.escape(representacao) + r"(?![\d]|[.,]\d)")
+        novos = []
+        for segmento in segmentos:
+            if not isinstance(segmento, str):
+                novos.append(segmento)
+                continue
+            partes = padrao.split(segmento)
+            for i, parte in enumerate(partes):
+                if i > 0:
+                    novos.append({"caminho": caminho, "formato": formato})
+                novos.append(parte)
+        segmentos = [s for s in novos if s != ""]
+    return segmentos
+
+
+def renderizar_modelo(modelo, item, padrao="N/A"):
+    """Gera o texto de um campo do card a partir do modelo aprendido e de um item do JSON"""
+    partes = []
+    for segmento in modelo:
+        if isinstance(segmento, str):
+            partes.append(segmento)
+            continue
+        valor = obter_caminho(item, segmento["caminho"])
+        if valor is None or valor == "":
+            return padrao
+        if segmento["formato"] == "moeda":
+            partes.append(formatar_numero_br(float(valor)))
+        elif segmento["formato"] == "inteiro":
+            partes.append(str(int(float(valor))))
+        else:
+            partes.append(str(valor))
+    return "".join(partes)
+
+
+def aprender_campos(resultados_dom, itens):
+    """
+    Aprende um modelo para cada campo do resultado do script de extração, comparando os cards
+    extraídos do DOM com os itens do JSON de mesmo nome. Usa o modelo mais frequente de cada campo.
+    """
+    itens_por_nome = {}
+    for item in itens:
+        for _, valor in folhas(item):
+            if isinstance(valor, str):
+                itens_por_nome.setdefault(valor.strip(), item)
+
+    modelos = {}
+    campos = [campo for campo in resultados_dom[0] if campo != "urlImagemPublica"] if resultados_dom else []
+    for campo in campos:
+        contagem = Counter()
+        for resultado in resultados_dom:
+            item = itens_por_nome.get(resultado.get("nome", "").strip())
+            if item is None or not isinstance(resultado.get(campo), str):
+                continue
+            contagem[json.dumps(aprender_modelo(resultado[campo], item), ensure_ascii=False)] += 1
+        if contagem:
+            modelo, ocorrencias = contagem.most_common(1)[0]
+            modelos[campo] = json.loads(modelo)
+            logger.info(f"Campo '{campo}' mapeado em {ocorrencias}/{sum(contagem.values())} cards: {modelo}")
+    return modelos
+
+
+def modelo_requisicao(requisicao):
+    """Converte uma requisição capturada em um modelo reutilizável: URL, parâmetros e corpo JSON"""
+    partes = urlsplit(requisicao["url"])
+    corpo = None
+    if requisicao.get("corpo"):
+        try:
+            corpo = json.loads(requisicao["corpo"])
+        except ValueError:
+            corpo = None
+    return {
+        "metodo": requisicao["metodo"],
+        "url": urlunsplit((partes.scheme, partes.netloc, partes.path, "", "")),
+        "parametros": parse_qsl(partes.query, keep_blank_values=True),
+        "corpo": corpo,
+    }
+
+
+def valores_requisicao(modelo):
+    """Retorna os parâmetros de query e do corpo JSON de primeiro nível de um modelo de requisição"""
+    valores = {("query", chave): valor for chave, valor in modelo["parametros"]}
+    if isinstance(modelo["corpo"], dict):
+        valores.update({("corpo", chave): valor for chave, valor in modelo["corpo"].items()})
+    return valores
+
+
+def aprender_paginacao(modelo_pagina_1, modelo_pagina_2=None):
+    """
+    Identifica o parâmetro de paginação comparando as requisições das páginas 1 e 2.
+    Retorna {"origem", "nome", "inicio", "passo"} ou None.
+    """
+    valores_1 = valores_requisicao(modelo_pagina_1)
+    if modelo_pagina_2 is not None:
+        valores_2 = valores_requisicao(modelo_pagina_2)
+        for chave, valor in valores_1.items():
+            try:
+                inicio, seguinte = int(valor), int(valores_2.get(chave))
+            except (TypeError, ValueError):
+                continue
+            if seguinte != inicio:
+                return {"origem": chave[0], "nome": chave[1], "inicio": inicio, "passo": seguinte - inicio}
+
+    # Sem a página 2, tenta um parâmetro de nome conhecido
+    for (origem, nome), valor in valores_1.items():
+        if nome.lower() in PARAMETROS_PAGINA_CONHECIDOS and str(valor).isdigit():
+            logger.warning(f"Paginação inferida pelo nome do parâmetro '{nome}'. Confirme com uma categoria de várias páginas.")
+            return {"origem": origem, "nome": nome, "inicio": int(valor), "passo": 1}
+    return None
+
+
+def cabecalhos_reutilizaveis(cabecalhos):
+    """Filtra os cabeçalhos capturados que podem ser enviados nas requisições diretas"""
+    return {chave: valor for chave, valor in cabecalhos.items()
+            if not chave.startswith(":") and chave.lower() not in CABECALHOS_IGNORADOS}
+
+
+def salvar_configuracao(configuracao, caminho):
+    """Salva a configuração da API (contém credenciais da sessão, por isso com permissão restrita)"""
+    arquivo_temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(arquivo_temporario, "w", encoding="utf-8") as f:
+        json.dump(configuracao, f, ensure_ascii=False, indent=2)
+    os.chmod(arquivo_temporario, 0o600)
+    os.replace(arquivo_temporario, caminho)
+
+
+def carregar_configuracao(caminho):
+    """Carrega a configuração da API descoberta, ou None se ainda não existir"""
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ClienteApiLeveros:
+    """Busca os produtos diretamente na API JSON descoberta, sem navegador"""
+
+    def __init__(self, configuracao, paralelismo=8, timeout=30):
+        self.configuracao = configuracao
+        self.paralelismo = paralelismo
+        self.timeout = timeout
+
+        # Sessão com pool de conexões do tamanho do paralelismo e retentativas para erros 5xx
+        self.sessao = requests.Session()
+        retentativas = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504],
+                             allowed_methods=None)
+        adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=paralelismo, max_retries=retentativas)
+        self.sessao.mount("https://", adaptador)
+        self.sessao.mount("http://", adaptador)
+        self.sessao.headers.update(configuracao.get("cabecalhos", {}))
+        for cookie in configuracao.get("cookies", []):
+            self.sessao.cookies.set(cookie["name"], cookie["value"],
+                                    domain=cookie.get("domain"), path=cookie.get("path", "/"))
+
+        self.executor = ThreadPoolExecutor(max_workers=paralelismo, thread_name_prefix="api")
+
+    def buscar_pagina(self, modelo, pagina):
+        """Busca uma página de uma categoria e retorna a lista de itens do JSON"""
+        parametros = list(modelo["parametros"])
+        corpo = dict(modelo["corpo"]) if isinstance(modelo["corpo"], dict) else modelo["corpo"]
+
+        paginacao = self.configuracao.get("paginacao")
+        if paginacao:
+            valor = paginacao["inicio"] + (pagina - 1) * paginacao["passo"]
+            if paginacao["origem"] == "query":
+                parametros = [(chave, str(valor) if chave == paginacao["nome"] else v) for chave, v in parametros]
+            else:
+                corpo[paginacao["nome"]] = valor
+
+        resposta = self.sessao.request(modelo["metodo"], modelo["url"], params=parametros,
+                                       json=corpo, timeout=self.timeout)
+        if resposta.status_code in (401, 403):
+            raise SessaoApiExpirada(f"HTTP {resposta.status_code} em {resposta.url}")
+        resposta.raise_for_status()
+
+        itens = obter_caminho(resposta.json(), self.configuracao["caminho_lista"])
+        return itens if isinstance(itens, list) else []
+
+    def converter_item(self, item):
+        """Gera, a partir de um item do JSON, o mesmo resultado que o script de extração retorna do card"""
+        resultado = {campo: renderizar_modelo(modelo, item)
+                     for campo, modelo in self.configuracao["campos"].items()}
+        resultado["urlImagemPublica"] = url_publica_imagem(resultado.get("urlImagem"))
+        return resultado
+
+    def extrair_categoria(self, categoria, pagina_inicial, ao_concluir_pagina):
+        """
+        Busca as páginas de uma categoria a partir de pagina_inicial, várias em paralelo.
+        Chama ao_concluir_pagina(número, resultados) para cada página, na ordem, e retorna
+        o número da última página.
+        """
+        modelo = self.configuracao["categorias"].get(categoria)
+        if not modelo:
+            logger.warning(f"Endpoint da categoria {categoria} não foi descoberto. Categoria ignorada.")
+            return pagina_inicial - 1
+
+        ultima_pagina = pagina_inicial - 1
+        primeiro_anterior = None
+        pagina = pagina_inicial
+        while True:
+            # Sem parâmetro de paginação conhecido, só é possível buscar a primeira página
+            janela = self.paralelismo if self.configuracao.get("paginacao") else 1
+            paginas = list(range(pagina, pagina + janela))
+            respostas = list(self.executor.map(lambda p: self.buscar_pagina(modelo, p), paginas))
+
+            fim = janela == 1 and not self.configuracao.get("paginacao")
+            for numero, itens in zip(paginas, respostas):
+                # Página vazia, ou a API repetindo a última página, indica o fim da categoria
+                if not itens or itens[0] == primeiro_anterior:
+                    fim = True
+                    break
+                primeiro_anterior = itens[0]
+                ao_concluir_pagina(numero, [self.converter_item(item) for item in itens])
+                ultima_pagina = numero
+                logger.info(f"API: {len(itens)} produtos na página {numero} da categoria {categoria}.")
+            if fim:
+                break
+            pagina += janela
+
+        return ultima_pagina
+
+    def fechar(self):
+        """Libera as threads e conexões do cliente"""
+        self.executor.shutdown(wait=True)
+        self.sessao.close()
@@ -0,0 +1,451 @@
+"""
+Catálogo local pesquisável dos produtos da Leveros Integra
+Carrega cada execução em SQLite, com um índice FTS5 sobre o nome do produto e colunas de
+atributos extraídas do nome (BTUs, voltagem, fases, marca, fluido refrigerante, ciclo
+quente/frio ou só frio e inverter), indexadas para consulta. Uma busca como
+"12.000 BTUs inverter 220V" vira filtros nas colunas de atributos e o restante do texto é
+procurado no índice de texto, em milissegundos mesmo com centenas de milhares de produtos.
+
+Uso:
+    python leveros_catalogo.py buscar "12.000 BTUs inverter 220V"
+    python leveros_catalogo.py buscar daikin --ciclo quente_frio --preco-maximo 5000
+    python leveros_catalogo.py carregar ProdutosLeveros_20250408_095246.csv
+    python leveros_catalogo.py execucoes
+"""
+
+import os
+import re
+import csv
+import json
+import sqlite3
+from datetime import datetime
+from leveros_produtos import COLUNAS_PRODUTO, Produto, valor_vazio
+from leveros_normalizacao import converter_valor
+
+# Capacidade: "12.000 BTUs", "9000 BTU" e, nos códigos da LG, "12K" ou "48.1K"
+PADRAO_BTUS = re.compile(r"\b(\d{1,3}(?:\.\d{3})+|\d+)\s*BTUs?\b", re.IGNORECASE)
+PADRAO_BTUS_K = re.compile(r"\b(\d{1,3}(?:[.,]\d)?)\s?K\b")
+# Nas buscas, também "12k" e o número sozinho: "9000", "12.000" (sem zero à esquerda, para não
+# confundir com códigos de modelo)
+PADRAO_BTUS_K_CONSULTA = re.compile(PADRAO_BTUS_K.pattern, re.IGNORECASE)
+PADRAO_BTUS_NUMERO = re.compile(r"(?<![\w.,])([1-9]\d{0,2}\.\d{3}|[1-9]\d{3,5})(?![\w.,])")
+PADRAO_VOLTAGEM = re.compile(r"\b(127|220|380|440)\s*V\b|\b(bivolt)\b", re.IGNORECASE)
+PADRAO_FASES = re.compile(r"\b(monof[aá]sico|bif[aá]sico|trif[aá]sico)\b|\b([123])F\b", re.IGNORECASE)
+PADRAO_REFRIGERANTE = re.compile(r"\bR-?(32|410A|22|407C|290)(?![\dA-Z])", re.IGNORECASE)
+PADRAO_QUENTE_FRIO = re.compile(r"\bquente\s*/\s*frio\b|\bquente\s+e\s+frio\b|\bQF\b", re.IGNORECASE)
+PADRAO_SO_FRIO = re.compile(r"\bs[oó]\s+frio\b|(?<![/\w])frio\b", re.IGNORECASE)
+PADRAO_INVERTER = re.compile(r"\binverter\b", re.IGNORECASE)
+
+# Marcas conhecidas, das compostas para as simples ("Springer Midea" antes de "Midea")
+MARCAS = [
+    "Springer Midea", "Springer", "Midea", "Carrier", "Daikin", "Fujitsu", "LG", "Gree", "Elgin",
+    "Philco", "Hitachi", "TCL", "Agratto", "Samsung", "Electrolux", "Consul", "Komeco", "Trane",
+    "York", "Hisense", "Comfee", "Ventisol", "Britânia", "Mondial", "Arno", "Cadence", "EOS",
+]
+# Grafias alternativas das marcas nos nomes. Nas marcas compostas, as palavras podem vir
+# separadas por espaço ou hífen ("[SPRINGER-MIDEA]")
+APELIDOS_MARCAS = {"Britania": "Britânia"}
+PADRAO_MARCA = re.compile(r"\b(" + "|".join("[ -]".join(map(re.escape, marca.split()))
+                                            for marca in MARCAS + list(APELIDOS_MARCAS)) + r")\b",
+                          re.IGNORECASE)
+MARCA_CANONICA = {marca.casefold(): APELIDOS_MARCAS.get(marca, marca) for marca in MARCAS + list(APELIDOS_MARCAS)}
+
+FASES = {"monofasico": "monofásico", "monofásico": "monofásico", "1": "monofásico",
+         "bifasico": "bifásico", "bifásico": "bifásico", "2": "bifásico",
+         "trifasico": "trifásico", "trifásico": "trifásico", "3": "trifásico"}
+
+CICLOS = ("quente_frio", "so_frio")
+
+# Colunas de atributos e de preço, depois das colunas do registro de produto
+COLUNAS_ATRIBUTOS = ["btus", "voltagem", "fases", "marca", "refrigerante", "ciclo", "inverter", "preco", "preco_vista"]
+
+# Colunas do registro de produto no banco (nomes sem espaços nem acentos)
+COLUNAS_BANCO = {
+    "Categoria": "categoria", "Nome do Produto": "nome", "Voltagem": "voltagem_card", "BTU": "btu_card",
+    "Preço Principal": "preco_principal_texto", "Preço à Vista": "preco_vista_texto",
+    "Qtd. Parcelas": "qtd_parcelas", "Valor Parcela": "valor_parcela", "URL da Imagem": "url_imagem",
+    "URL Pública da Imagem": "url_publica_imagem",
+}
+
+
+def btus_do_texto(texto):
+    """Primeira capacidade em BTUs do texto (em nomes de multi split, a capacidade total), ou None"""
+    correspondencia = PADRAO_BTUS.search(texto)
+    if correspondencia:
+        return int(correspondencia.group(1).replace(".", ""))
+    correspondencia = PADRAO_BTUS_K.search(texto)
+    if correspondencia:
+        return int(round(float(correspondencia.group(1).replace(",", ".")) * 1000))
+    return None
+
+
+def marca_canonica(texto):
+    """Nome canônico da marca encontrada por PADRAO_MARCA: 'SPRINGER-MIDEA' -> 'Springer Midea'"""
+    return MARCA_CANONICA[" ".join(texto.replace("-", " ").split()).casefold()]
+
+
+def voltagem_do_texto(texto):
+    correspondencia = PADRAO_VOLTAGEM.search(texto)
+    if not correspondencia:
+        return None
+    return f"{correspondencia.group(1)}V" if correspondencia.group(1) else "bivolt"
+
+
+def extrair_atributos(nome, voltagem_card=None):
+    """
+    Atributos do produto a partir do nome: {"btus", "voltagem", "fases", "marca", "refrigerante",
+    "ciclo", "inverter"} (None no que o nome não informar). A voltagem do card é usada quando o
+    nome não traz a voltagem.
+    """
+    nome = "" if valor_vazio(nome) else str(nome)
+    voltagem = voltagem_do_texto(nome)
+    if voltagem is None and not valor_vazio(voltagem_card):
+        voltagem = voltagem_do_texto(str(voltagem_card))
+
+    fases = PADRAO_FASES.search(nome)
+    if fases:
+        fases = FASES.get((fases.group(1) or fases.group(2)).casefold())
+    marca = PADRAO_MARCA.search(nome)
+    if marca:
+        marca = marca_canonica(marca.group(1))
+    elif "[LG-" in nome or nome.endswith("- LG"):
+        marca = "LG"
+    refrigerante = PADRAO_REFRIGERANTE.search(nome)
+    if refrigerante:
+        refrigerante = f"R-{refrigerante.group(1).upper()}"
+    ciclo = None
+    if PADRAO_QUENTE_FRIO.search(nome):
+        ciclo = "quente_frio"
+    elif PADRAO_SO_FRIO.search(nome):
+        ciclo = "so_frio"
+
+    return {
+        "btus": btus_do_texto(nome),
+        "voltagem": voltagem,
+        "fases": fases,
+        "marca": marca,
+        "refrigerante": refrigerante,
+        "ciclo": ciclo,
+        "inverter": bool(PADRAO_INVERTER.search(nome)),
+    }
+
+
+def interpretar_consulta(texto):
+    """
+    Separa uma busca livre em filtros de atributos e texto restante:
+    "12.000 BTUs inverter 220V daikin" -> ("", {"btus": 12000, "inverter": True, "voltagem": "220V", "marca": "Daikin"})
+    A capacidade também pode vir sem "BTUs": "9000", "12.000" ou "12K".
+    """
+    filtros = {}
+    restante = texto
+    for chave, padrao, valor in (
+        ("btus", PADRAO_BTUS, lambda m: btus_do_texto(m.group(0))),
+        ("btus", PADRAO_BTUS_K_CONSULTA, lambda m: btus_do_texto(m.group(0).upper())),
+        ("btus", PADRAO_BTUS_NUMERO, lambda m: int(m.group(1).replace(".", ""))),
+        ("voltagem", PADRAO_VOLTAGEM, lambda m: f"{m.group(1)}V" if m.group(1) else "bivolt"),
+        ("refrigerante", PADRAO_REFRIGERANTE, lambda m: f"R-{m.group(1).upper()}"),
+        ("ciclo", PADRAO_QUENTE_FRIO, lambda m: "quente_frio"),
+        ("ciclo", PADRAO_SO_FRIO, lambda m: "so_frio"),
+        ("inverter", PADRAO_INVERTER, lambda m: True),
+        ("marca", PADRAO_MARCA, lambda m: marca_canonica(m.group(1))),
+    ):
+        correspondencia = padrao.search(restante)
+        if correspondencia and chave not in filtros:
+            filtros[chave] = valor(correspondencia)
+            restante = restante[:correspondencia.start()] + " " + restante[correspondencia.end():]
+    return " ".join(restante.split()), filtros
+
+
+def consulta_fts(texto):
+    """Expressão FTS5 com todas as palavras do texto, cada uma como prefixo ("split" acha "splits")"""
+    palavras = re.findall(r"\w+", texto)
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+
+class CatalogoProdutos:
+    """Produtos de cada execução, com busca por texto e por atributos"""
+
+    def __init__(self, caminho="catalogo_leveros.sqlite3"):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.row_factory = sqlite3.Row
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        colunas_registro = ",\n                ".join(f"{coluna} TEXT" for coluna in COLUNAS_BANCO.values())
+        self.conexao.executescript(f"""
+            CREATE TABLE IF NOT EXISTS execucoes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL UNIQUE,
+                origem TEXT,
+                registrada_em TEXT NOT NULL,
+                total_produtos INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS produtos (
+                id INTEGER PRIMARY KEY,
+                execucao_id INTEGER NOT NULL REFERENCES execucoes (id),
+                {colunas_registro},
+                btus INTEGER,
+                voltagem TEXT,
+                fases TEXT,
+                marca TEXT,
+                refrigerante TEXT,
+                ciclo TEXT,
+                inverter INTEGER NOT NULL,
+                preco REAL,
+                preco_vista REAL
+            );
+            -- O preço no fim dos índices permite listar os mais baratos sem ordenar todos os encontrados
+            CREATE INDEX IF NOT EXISTS idx_produtos_btus ON produtos (execucao_id, btus, preco);
+            CREATE INDEX IF NOT EXISTS idx_produtos_voltagem ON produtos (execucao_id, voltagem, preco);
+            CREATE INDEX IF NOT EXISTS idx_produtos_marca ON produtos (execucao_id, marca COLLATE NOCASE, preco);
+            CREATE INDEX IF NOT EXISTS idx_produtos_categoria ON produtos (execucao_id, categoria COLLATE NOCASE, preco);
+            CREATE INDEX IF NOT EXISTS idx_produtos_preco ON produtos (execucao_id, preco);
+            CREATE VIRTUAL TABLE IF NOT EXISTS produtos_fts USING fts5 (
+                nome, tokenize = "unicode61 remove_diacritics 2"
+            );
+        """)
+        self.conexao.commit()
+
+    def carregar_execucao(self, timestamp, produtos, origem=None):
+        """
+        Carrega os produtos de uma execução (qualquer iterável de registros) em uma transação,
+        substituindo a execução de mesmo timestamp se já tiver sido carregada. Retorna o id da execução.
+        """
+        with self.conexao:
+            anterior = self.conexao.execute("SELECT id FROM execucoes WHERE timestamp = ?", (timestamp,)).fetchone()
+            if anterior is not None:
+                self.remover_execucao(anterior["id"])
+            execucao_id = self.conexao.execute(
+                "INSERT INTO execucoes (timestamp, origem, registrada_em, total_produtos) VALUES (?, ?, ?, 0)",
+                (timestamp, origem, datetime.now().isoformat(timespec="seconds"))).lastrowid
+
+            colunas = ["id", "execucao_id"] + list(COLUNAS_BANCO.values()) + COLUNAS_ATRIBUTOS
+            insercao = f"INSERT INTO produtos ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})"
+            proximo_id = (self.conexao.execute("SELECT MAX(id) FROM produtos").fetchone()[0] or 0) + 1
+            total = 0
+            for lote in self._linhas_em_lotes(execucao_id, produtos, proximo_id):
+                self.conexao.executemany(insercao, lote)
+                # O índice de texto usa o id do produto como rowid
+                self.conexao.executemany("INSERT INTO produtos_fts (rowid, nome) VALUES (?, ?)",
+                                         [(linha[0], linha[3]) for linha in lote])
+                total += len(lote)
+            self.conexao.execute("UPDATE execucoes SET total_produtos = ? WHERE id = ?", (total, execucao_id))
+        # Estatísticas dos índices para o planejador de consultas escolher o mais seletivo
+        self.conexao.execute("ANALYZE")
+        return execucao_id
+
+    def _linhas_em_lotes(self, execucao_id, produtos, proximo_id, tamanho_lote=5000):
+        """Lotes de linhas da tabela produtos (id, execução, colunas do registro e atributos extraídos do nome)"""
+        lote = []
+        for produto in produtos:
+            valores = [produto.get(coluna) for coluna in COLUNAS_PRODUTO]
+            atributos = extrair_atributos(produto.get("Nome do Produto"), produto.get("Voltagem"))
+            preco, _ = converter_valor(produto.get("Preço Principal"))
+            preco_vista, _ = converter_valor(produto.get("Preço à Vista"))
+            linha = [proximo_id, execucao_id] + [None if valor is None else str(valor) for valor in valores] + [
+                atributos["btus"], atributos["voltagem"], atributos["fases"], atributos["marca"],
+                atributos["refrigerante"], atributos["ciclo"], int(atributos["inverter"]), preco, preco_vista]
+            lote.append(linha)
+            proximo_id += 1
+            if len(lote) >= tamanho_lote:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+
+    def remover_execucao(self, execucao_id):
+        self.conexao.execute("DELETE FROM produtos_fts WHERE rowid IN (SELECT id FROM produtos WHERE execucao_id = ?)",
+                             (execucao_id,))
+        self.conexao.execute("DELETE FROM produtos WHERE execucao_id = ?", (execucao_id,))
+        self.conexao.execute("DELETE FROM execucoes WHERE id = ?", (execucao_id,))
+
+    def execucoes(self):
+        """Execuções carregadas, da mais recente para a mais antiga"""
+        linhas = self.conexao.execute("SELECT * FROM execucoes ORDER BY id DESC").fetchall()
+        return [dict(linha) for linha in linhas]
+
+    def ultima_execucao(self):
+        """Retorna o id da execução mais recente, ou None"""
+        return self.conexao.execute("SELECT MAX(id) FROM execucoes").fetchone()[0]
+
+    def buscar(self, texto="", execucao_id=None, categoria=None, btus=None, btus_minimo=None, btus_maximo=None,
+               voltagem=None, fases=None, marca=None, refrigerante=None, ciclo=None, inverter=None,
+               preco_maximo=None, limite=50, interpretar=True):
+        """
+        Busca produtos de uma execução (por padrão, a mais recente). Com `interpretar`, os atributos
+        reconhecidos no texto ("12.000 BTUs", "220V", "inverter", "quente/frio", marca...) viram
+        filtros; o restante é procurado no nome pelo índice de texto (sem acentos, por prefixo).
+        Filtros informados explicitamente prevalecem sobre os do texto. A marca é comparada com cada
+        palavra da marca do produto, então "springer" também acha os produtos da Springer Midea. Retorna uma lista de
+        dicionários com as colunas do registro de produto e os atributos: os mais relevantes primeiro
+        na busca por texto e, só com filtros, os mais baratos primeiro.
+        """
+        filtros = {}
+        if interpretar and texto:
+            texto, filtros = interpretar_consulta(texto)
+        explicitos = {"categoria": categoria, "btus": btus, "voltagem": voltagem, "fases": fases, "marca": marca,
+                      "refrigerante": refrigerante, "ciclo": ciclo, "inverter": inverter}
+        filtros.update({chave: valor for chave, valor in explicitos.items() if valor is not None})
+        if execucao_id is None:
+            execucao_id = self.ultima_execucao()
+
+        condicoes = ["p.execucao_id = ?"]
+        parametros = [execucao_id]
+        for chave, valor in filtros.items():
+            if chave == "inverter":
+                valor = int(bool(valor))
+            elif chave == "marca":
+                # Palavra (ou início de palavra) da marca: "Springer" e "Midea" acham "Springer Midea"
+                condicoes.append("(' ' || p.marca) LIKE ?")
+                parametros.append(f"% {valor}%")
+                continue
+            elif chave == "categoria":
+                condicoes.append(f"p.{chave} = ? COLLATE NOCASE")
+                parametros.append(valor)
+                continue
+            condicoes.append(f"p.{chave} = ?")
+            parametros.append(valor)
+        for condicao, valor in (("p.btus >= ?", btus_minimo), ("p.btus <= ?", btus_maximo),
+                                ("p.preco <= ?", preco_maximo)):
+            if valor is not None:
+                condicoes.append(condicao)
+                parametros.append(valor)
+
+        expressao = consulta_fts(texto) if texto else ""
+        if expressao:
+            consulta = (f"SELECT p.* FROM produtos_fts f JOIN produtos p ON p.id = f.rowid "
+                        f"WHERE produtos_fts MATCH ? AND {' AND '.join(condicoes)} "
+                        f"ORDER BY f.rank, p.preco LIMIT ?")
+            parametros = [expressao] + parametros
+        else:
+            consulta = f"SELECT p.* FROM produtos p WHERE {' AND '.join(condicoes)} ORDER BY p.preco LIMIT ?"
+        linhas = self.conexao.execute(consulta, parametros + [limite]).fetchall()
+        return [self.registro(linha) for linha in linhas]
+
+    @staticmethod
+    def registro(linha):
+        """Linha do banco como dicionário com as colunas do registro de produto e os atributos"""
+        registro = {coluna: linha[coluna_banco] for coluna, coluna_banco in COLUNAS_BANCO.items()}
+        registro.update({coluna: linha[coluna] for coluna in COLUNAS_ATRIBUTOS})
+        registro["inverter"] = bool(registro["inverter"])
+        return registro
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.conexao.close()
+
+
+def ler_exportacao(caminho):
+    """
+    Produtos de um arquivo exportado em execuções anteriores: saída .jsonl, .csv ou .parquet,
+    planilha .xlsx (planilha "Produtos Leveros") ou .txt (UTF-16, separado por tabulação)
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == ".jsonl":
+        with open(caminho, encoding="utf-8") as f:
+            for linha in f:
+                if linha.strip():
+                    yield Produto.de_registro(json.loads(linha))
+    elif extensao in (".csv", ".txt"):
+        parametros = {"encoding": "utf-8-sig"} if extensao == ".csv" else {"encoding": "utf-16"}
+        with open(caminho, newline="", **parametros) as f:
+            for registro in csv.DictReader(f, delimiter="," if extensao == ".csv" else "\t"):
+                yield Produto.de_registro(registro)
+    elif extensao == ".parquet":
+        import pyarrow.parquet as pq
+        for lote in pq.ParquetFile(caminho).iter_batches(batch_size=5000):
+            for registro in lote.to_pylist():
+                yield Produto.de_registro(registro)
+    elif extensao == ".xlsx":
+        from openpyxl import load_workbook
+        pasta = load_workbook(caminho, read_only=True)
+        try:
+            planilha = pasta["Produtos Leveros"] if "Produtos Leveros" in pasta.sheetnames else pasta.worksheets[0]
+            linhas = planilha.iter_rows(values_only=True)
+            cabecalho = next(linhas, None) or ()
+            for valores in linhas:
+                yield Produto.de_registro(dict(zip(cabecalho, valores)))
+        finally:
+            pasta.close()
+    else:
+        raise ValueError(f"Formato de arquivo não suportado: {caminho}")
+
+
+def timestamp_do_arquivo(caminho):
+    """Timestamp da execução pelo nome do arquivo (ProdutosLeveros_20250408_095246.csv) ou pela data de modificação"""
+    correspondencia = re.search(r"(\d{8}_\d{6})", os.path.basename(caminho))
+    if correspondencia:
+        return correspondencia.group(1)
+    return datetime.fromtimestamp(os.path.getmtime(caminho)).strftime("%Y%m%d_%H%M%S")
+
+
+def formatar_resultado(registro):
+    atributos = [str(registro[coluna]) for coluna in ("marca", "voltagem", "refrigerante") if registro[coluna]]
+    if registro["btus"]:
+        atributos.insert(0, f"{registro['btus']:,} BTUs".replace(",", "."))
+    if registro["ciclo"]:
+        atributos.append("quente/frio" if registro["ciclo"] == "quente_frio" else "só frio")
+    preco = registro["Preço Principal"] or "N/A"
+    return f"{registro['Categoria'] or '':<13} {preco:>14}  {registro['Nome do Produto']}  [{', '.join(atributos)}]"
+
+
+if __name__ == "__main__":
+    import time
+    import argparse
+    parser = argparse.ArgumentParser(description="Catálogo local pesquisável dos produtos da Leveros Integra")
+    parser.add_argument("--banco", default="catalogo_leveros.sqlite3", help="arquivo do catálogo")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    busca = subcomandos.add_parser("buscar", help="busca por texto e atributos na execução mais recente")
+    busca.add_argument("texto", nargs="?", default="", help='por exemplo, "12.000 BTUs inverter 220V"')
+    busca.add_argument("--execucao", type=int, help="id da execução (padrão: a mais recente)")
+    busca.add_argument("--categoria")
+    busca.add_argument("--btus", type=int)
+    busca.add_argument("--btus-minimo", type=int)
+    busca.add_argument("--btus-maximo", type=int)
+    busca.add_argument("--voltagem", help="127V, 220V, 380V ou bivolt")
+    busca.add_argument("--marca")
+    busca.add_argument("--refrigerante", help="por exemplo, R-32")
+    busca.add_argument("--ciclo", choices=CICLOS)
+    busca.add_argument("--inverter", action="store_true", default=None)
+    busca.add_argument("--preco-maximo", type=float, metavar="REAIS")
+    busca.add_argument("--limite", type=int, default=50)
+    busca.add_argument("--literal", action="store_true",
+                       help="procura o texto inteiro no nome, sem convertê-lo em filtros de atributos")
+    busca.add_argument("--json", action="store_true", help="resultado em JSON")
+
+    carga = subcomandos.add_parser("carregar", help="carrega exportações de execuções anteriores")
+    carga.add_argument("arquivos", nargs="+", help=".jsonl, .csv, .parquet, .xlsx ou .txt")
+
+    subcomandos.add_parser("execucoes", help="lista as execuções carregadas")
+    args = parser.parse_args()
+
+    catalogo = CatalogoProdutos(args.banco)
+    try:
+        if args.comando == "buscar":
+            inicio = time.perf_counter()
+            resultados = catalogo.buscar(
+                args.texto, execucao_id=args.execucao, categoria=args.categoria, btus=args.btus,
+                btus_minimo=args.btus_minimo, btus_maximo=args.btus_maximo, voltagem=args.voltagem,
+                marca=args.marca, refrigerante=args.refrigerante, ciclo=args.ciclo, inverter=args.inverter,
+                preco_maximo=args.preco_maximo, limite=args.limite, interpretar=not args.literal)
+            milissegundos = (time.perf_counter() - inicio) * 1000
+            if args.json:
+                print(json.dumps(resultados, ensure_ascii=False, indent=2))
+            else:
+                for registro in resultados:
+                    print(formatar_resultado(registro))
+                print(f"{len(resultados)} produtos em {milissegundos:.1f} ms")
+        elif args.comando == "carregar":
+            for arquivo in args.arquivos:
+                execucao_id = catalogo.carregar_execucao(timestamp_do_arquivo(arquivo), ler_exportacao(arquivo),
+                                                         origem=arquivo)
+                total = catalogo.conexao.execute("SELECT total_produtos FROM execucoes WHERE id = ?",
+                                                 (execucao_id,)).fetchone()[0]
+                print(f"{arquivo}: {total} produtos carregados (execução {execucao_id})")
+        else:
+            for execucao in catalogo.execucoes():
+                print(f"{execucao['id']:>4}  {execucao['timestamp']}  {execucao['total_produtos']:>8} produtos  "
+                      f"{execucao['origem'] or ''}")
+    finally:
+        catalogo.fechar()
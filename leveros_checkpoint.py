@@ -0,0 +1,123 @@
+"""
+Checkpoint da extração em SQLite
+Cada página extraída é gravada (e confirmada) assim que termina, indexada por categoria e número
+da página. Permite retomar uma execução interrompida a partir da primeira página pendente e
+reconstruir as exportações sem extrair novamente.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from leveros_produtos import Produto
+
+
+class CheckpointExtracao:
+    """Armazena o progresso da extração página a página"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.trava = threading.Lock()
+        # A mesma conexão é compartilhada pelos workers; o acesso é serializado pela trava
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS execucao (
+                chave TEXT PRIMARY KEY,
+                valor TEXT
+            );
+            CREATE TABLE IF NOT EXISTS paginas (
+                categoria TEXT NOT NULL,
+                pagina INTEGER NOT NULL,
+                produtos TEXT NOT NULL,
+                registrada_em TEXT NOT NULL,
+                PRIMARY KEY (categoria, pagina)
+            );
+            CREATE TABLE IF NOT EXISTS categorias (
+                categoria TEXT PRIMARY KEY,
+                paginas INTEGER NOT NULL,
+                concluida_em TEXT NOT NULL
+            );
+        """)
+        self.conexao.commit()
+
+    def iniciar(self, categorias):
+        """Descarta o progresso anterior e registra o início de uma nova execução"""
+        with self.trava, self.conexao:
+            self.conexao.execute("DELETE FROM paginas")
+            self.conexao.execute("DELETE FROM categorias")
+            self.conexao.execute("DELETE FROM execucao")
+            self.conexao.executemany("INSERT INTO execucao (chave, valor) VALUES (?, ?)", [
+                ("iniciada_em", datetime.now().isoformat(timespec="seconds")),
+                ("categorias", json.dumps(categorias, ensure_ascii=False)),
+            ])
+
+    def registrar_pagina(self, categoria, pagina, produtos):
+        """Grava os produtos de uma página e confirma a transação imediatamente"""
+        with self.trava, self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO paginas (categoria, pagina, produtos, registrada_em) VALUES (?, ?, ?, ?)",
+                (categoria, pagina, json.dumps([dict(produto) for produto in produtos], ensure_ascii=False),
+                 datetime.now().isoformat(timespec="seconds")))
+
+    def concluir_categoria(self, categoria, paginas):
+        """Marca a categoria como concluída"""
+        with self.trava, self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO categorias (categoria, paginas, concluida_em) VALUES (?, ?, ?)",
+                (categoria, paginas, datetime.now().isoformat(timespec="seconds")))
+
+    def categoria_concluida(self, categoria):
+        """Indica se a categoria já foi totalmente extraída"""
+        with self.trava:
+            linha = self.conexao.execute(
+                "SELECT 1 FROM categorias WHERE categoria = ?", (categoria,)).fetchone()
+        return linha is not None
+
+    def primeira_pagina_pendente(self, categoria):
+        """Retorna o número da primeira página da categoria que ainda não foi gravada"""
+        with self.trava:
+            paginas = [linha[0] for linha in self.conexao.execute(
+                "SELECT pagina FROM paginas WHERE categoria = ? ORDER BY pagina", (categoria,))]
+        pendente = 1
+        for pagina in paginas:
+            if pagina != pendente:
+                break
+            pendente += 1
+        return pendente
+
+    def paginas_da_categoria(self, categoria, de_pagina=1, ate_pagina=None):
+        """Itera (número da página, produtos) das páginas gravadas da categoria, na ordem"""
+        consulta = "SELECT pagina, produtos FROM paginas WHERE categoria = ? AND pagina >= ?"
+        parametros = [categoria, de_pagina]
+        if ate_pagina is not None:
+            consulta += " AND pagina <= ?"
+            parametros.append(ate_pagina)
+        with self.trava:
+            linhas = self.conexao.execute(consulta + " ORDER BY pagina", parametros).fetchall()
+        for pagina, dados in linhas:
+            yield pagina, [Produto.de_registro(registro) for registro in json.loads(dados)]
+
+    def produtos_da_categoria(self, categoria, ate_pagina=None):
+        """Retorna os produtos gravados da categoria, na ordem das páginas"""
+        produtos = []
+        for _, produtos_da_pagina in self.paginas_da_categoria(categoria, ate_pagina=ate_pagina):
+            produtos.extend(produtos_da_pagina)
+        return produtos
+
+    def concluido(self, categorias):
+        """Indica se todas as categorias já foram concluídas"""
+        return all(self.categoria_concluida(categoria) for categoria in categorias)
+
+    def resumo(self):
+        """Retorna (páginas gravadas, categorias concluídas)"""
+        with self.trava:
+            paginas = self.conexao.execute("SELECT COUNT(*) FROM paginas").fetchone()[0]
+            categorias = self.conexao.execute("SELECT COUNT(*) FROM categorias").fetchone()[0]
+        return paginas, categorias
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        with self.trava:
+            self.conexao.close()
@@ -0,0 +1,343 @@
+"""
+ChromeDriver fixado e em cache
+Resolve o executável do ChromeDriver de uma versão fixa (Chrome for Testing) a partir de um cache
+local estável. O download acontece uma única vez por versão e plataforma e é conferido com o
+SHA-256 fixado em chromedriver_sha256.json (gerado com --fixar-sha256); sem SHA-256 fixado, o do
+primeiro download é registrado, com um aviso. O SHA-256 do executável fica no manifesto do cache e
+é conferido a cada uso. Se o Chrome instalado for de
+outra versão principal, usa o ChromeDriver dessa versão, consultado uma única vez no Chrome for
+Testing e guardado no cache. Com o cache pronto, a resolução não acessa a rede.
+"""
+
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+import platform
+import functools
+import subprocess
+import tempfile
+import threading
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+VERSAO_CHROMEDRIVER = "135.0.7049.42"
+URL_CHROMEDRIVER = ("https://storage.googleapis.com/chrome-for-testing-public/"
+                    "{versao}/{plataforma}/chromedriver-{plataforma}.zip")
+URL_VERSOES_POR_MARCO = ("https://googlechromelabs.github.io/chrome-for-testing/"
+                         "latest-versions-per-milestone.json")
+DIRETORIO_CACHE_DRIVER = os.path.join(os.path.expanduser("~"), ".cache", "leveros_rpa", "chromedriver")
+PLATAFORMAS = ("linux64", "mac-arm64", "mac-x64", "win32", "win64")
+
+# SHA-256 dos pacotes publicados, por versão e plataforma: {"135.0.7049.42": {"linux64": "...", ...}}
+ARQUIVO_SHA256 = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chromedriver_sha256.json")
+
+# Executáveis do Chrome procurados no PATH (Linux) para descobrir a versão instalada
+EXECUTAVEIS_CHROME = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")
+CHROME_MAC = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+
+_trava = threading.Lock()
+
+
+class ChecksumInvalido(Exception):
+    """O pacote ou o executável do ChromeDriver não confere com o SHA-256 registrado"""
+
+
+class Sha256NaoFixado(Exception):
+    """Não há SHA-256 fixado para o pacote do ChromeDriver desta versão e plataforma"""
+
+
+def carregar_sha256_fixados(caminho=ARQUIVO_SHA256):
+    """{(versão, plataforma): SHA-256} do arquivo de SHA-256 fixados ({} se não existir)"""
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            fixados = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {(versao, plataforma): sha256
+            for versao, por_plataforma in fixados.items() for plataforma, sha256 in por_plataforma.items()}
+
+
+SHA256_PACOTES = carregar_sha256_fixados()
+
+
+def plataforma_chrome_for_testing():
+    """Nome da plataforma no Chrome for Testing (linux64, mac-arm64, mac-x64, win32, win64)"""
+    sistema = platform.system()
+    arquitetura = platform.machine().lower()
+    if sistema == "Darwin":
+        return "mac-arm64" if arquitetura in ("arm64", "aarch64") else "mac-x64"
+    if sistema == "Windows":
+        return "win64" if arquitetura.endswith("64") else "win32"
+    return "linux64"
+
+
+def sha256_arquivo(caminho):
+    """SHA-256 de um arquivo, lido em blocos"""
+    resumo = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def versao_principal(versao):
+    """'135.0.7049.42' -> '135'"""
+    return versao.split(".")[0]
+
+
+@functools.lru_cache(maxsize=None)
+def versao_chrome_instalado(binario=None):
+    """
+    Versão do Chrome instalado ('135.0.7049.84'), pelo --version do executável (ou pelo registro,
+    no Windows), ou None se não for encontrada. Calculada uma vez por processo.
+    """
+    if not binario and platform.system() == "Windows":
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as chave:
+                return winreg.QueryValueEx(chave, "version")[0]
+        except OSError:
+            return None
+
+    if binario:
+        candidatos = [binario]
+    elif platform.system() == "Darwin":
+        candidatos = [CHROME_MAC]
+    else:
+        candidatos = [caminho for caminho in map(shutil.which, EXECUTAVEIS_CHROME) if caminho]
+    for executavel in candidatos:
+        try:
+            saida = subprocess.run([executavel, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        correspondencia = re.search(r"\d+\.\d+\.\d+\.\d+", saida)
+        if correspondencia:
+            return correspondencia.group(0)
+    return None
+
+
+def versao_chromedriver_para(versao_chrome, diretorio=DIRETORIO_CACHE_DRIVER, plataforma=None):
+    """
+    Versão do ChromeDriver para a versão principal do Chrome instalado: a mais recente com SHA-256
+    fixado ou, sem nenhuma, a indicada pelo Chrome for Testing, consultada uma única vez e guardada
+    em <diretorio>/versoes.json
+    """
+    principal = versao_principal(versao_chrome)
+    plataforma = plataforma or plataforma_chrome_for_testing()
+    fixadas = [versao for versao, plataforma_fixada in SHA256_PACOTES
+               if plataforma_fixada == plataforma and versao_principal(versao) == principal]
+    if fixadas:
+        return max(fixadas, key=lambda versao: tuple(map(int, versao.split("."))))
+
+    caminho = os.path.join(diretorio, "versoes.json")
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            versoes = json.load(f)
+    except (OSError, ValueError):
+        versoes = {}
+    if principal not in versoes:
+        import requests
+        logger.info(f"Consultando a versão do ChromeDriver para o Chrome {principal} em {URL_VERSOES_POR_MARCO}")
+        resposta = requests.get(URL_VERSOES_POR_MARCO, timeout=30)
+        resposta.raise_for_status()
+        marco = resposta.json().get("milestones", {}).get(principal)
+        if not marco:
+            raise Exception(f"O Chrome for Testing não publica ChromeDriver para o Chrome {principal}")
+        versoes[principal] = marco["version"]
+        os.makedirs(diretorio, exist_ok=True)
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(versoes, f, indent=2)
+    return versoes[principal]
+
+
+def baixar_pacote(url, destino, timeout=60):
+    """Baixa o pacote do ChromeDriver (único ponto que acessa a rede)"""
+    import requests
+    logger.info(f"Baixando ChromeDriver de {url}")
+    with requests.get(url, stream=True, timeout=timeout) as resposta:
+        resposta.raise_for_status()
+        with open(destino, "wb") as f:
+            for bloco in resposta.iter_content(1024 * 1024):
+                f.write(bloco)
+
+
+class ResolvedorChromeDriver:
+    """
+    Cache do ChromeDriver em <diretorio>/<versão>/<plataforma>/:
+    - chromedriver(.exe): o executável
+    - manifesto.json: URL de origem e SHA-256 do pacote e do executável
+    """
+
+    def __init__(self, versao=VERSAO_CHROMEDRIVER, diretorio=DIRETORIO_CACHE_DRIVER, plataforma=None,
+                 sha256_pacote=None):
+        self.versao = versao
+        self.plataforma = plataforma or plataforma_chrome_for_testing()
+        self.diretorio = os.path.join(diretorio, versao, self.plataforma)
+        self.sha256_pacote = (sha256_pacote or os.environ.get("LEVEROS_CHROMEDRIVER_SHA256")
+                              or SHA256_PACOTES.get((versao, self.plataforma)))
+        nome_executavel = "chromedriver.exe" if self.plataforma.startswith("win") else "chromedriver"
+        self.caminho_executavel = os.path.join(self.diretorio, nome_executavel)
+        self.caminho_manifesto = os.path.join(self.diretorio, "manifesto.json")
+
+    @property
+    def url(self):
+        return URL_CHROMEDRIVER.format(versao=self.versao, plataforma=self.plataforma)
+
+    def em_cache(self):
+        """
+        Retorna o caminho do executável em cache, conferido pelo SHA-256 do manifesto, ou None.
+        Não acessa a rede.
+        """
+        try:
+            with open(self.caminho_manifesto, encoding="utf-8") as f:
+                manifesto = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self.caminho_executavel):
+            return None
+        if self.sha256_pacote and manifesto.get("sha256_pacote") != self.sha256_pacote:
+            raise ChecksumInvalido(f"O ChromeDriver em cache ({self.diretorio}) não veio do pacote esperado")
+        if sha256_arquivo(self.caminho_executavel) != manifesto.get("sha256_executavel"):
+            raise ChecksumInvalido(f"O executável do ChromeDriver em cache foi alterado: {self.caminho_executavel}")
+        return self.caminho_executavel
+
+    def instalar(self):
+        """Baixa, confere e extrai o ChromeDriver para o cache. Retorna o caminho do executável."""
+        os.makedirs(os.path.dirname(self.diretorio), exist_ok=True)
+        temporario = tempfile.mkdtemp(prefix=".instalando_", dir=os.path.dirname(self.diretorio))
+        try:
+            caminho_pacote = os.path.join(temporario, "chromedriver.zip")
+            baixar_pacote(self.url, caminho_pacote)
+            sha256_pacote = sha256_arquivo(caminho_pacote)
+            if self.sha256_pacote and sha256_pacote != self.sha256_pacote:
+                raise ChecksumInvalido(f"SHA-256 do pacote baixado ({sha256_pacote}) diferente do esperado "
+                                       f"({self.sha256_pacote})")
+
+            extraido = os.path.join(temporario, "extraido")
+            with zipfile.ZipFile(caminho_pacote) as pacote:
+                pacote.extractall(extraido)
+            nome_executavel = os.path.basename(self.caminho_executavel)
+            origem = next((os.path.join(raiz, nome_executavel) for raiz, _, arquivos in os.walk(extraido)
+                           if nome_executavel in arquivos), None)
+            if not origem:
+                raise Exception("Não foi possível encontrar o executável chromedriver no pacote baixado")
+
+            final = os.path.join(temporario, "final")
+            os.makedirs(final)
+            shutil.move(origem, os.path.join(final, nome_executavel))
+            os.chmod(os.path.join(final, nome_executavel), 0o755)
+            with open(os.path.join(final, "manifesto.json"), "w", encoding="utf-8") as f:
+                json.dump({
+                    "versao": self.versao,
+                    "plataforma": self.plataforma,
+                    "url": self.url,
+                    "sha256_pacote": sha256_pacote,
+                    "sha256_executavel": sha256_arquivo(os.path.join(final, nome_executavel)),
+                }, f, indent=2)
+
+            # Publica o diretório de uma vez; se outro processo publicou antes, usa o dele
+            shutil.rmtree(self.diretorio, ignore_errors=True)
+            try:
+                os.replace(final, self.diretorio)
+            except OSError:
+                if not os.path.exists(self.caminho_manifesto):
+                    raise
+            logger.info(f"ChromeDriver {self.versao} ({self.plataforma}) instalado em {self.diretorio}")
+        finally:
+            shutil.rmtree(temporario, ignore_errors=True)
+        return self.em_cache()
+
+    def resolver(self, permitir_download=True):
+        """
+        Caminho do executável: do cache (sem rede) ou, se ausente ou inválido, baixado uma vez.
+        Sem SHA-256 fixado para a versão e a plataforma, o SHA-256 do primeiro download é registrado
+        no manifesto e passa a ser exigido (com um aviso); com LEVEROS_CHROMEDRIVER_EXIGIR_SHA256,
+        falha com Sha256NaoFixado.
+        """
+        if not self.sha256_pacote:
+            mensagem = (f"Não há SHA-256 fixado para o ChromeDriver {self.versao} ({self.plataforma}). Fixe-o com "
+                        f"'python leveros_driver.py --versao {self.versao} --fixar-sha256' (e confira o arquivo "
+                        f"{os.path.basename(ARQUIVO_SHA256)}) ou defina LEVEROS_CHROMEDRIVER_SHA256")
+            if os.environ.get("LEVEROS_CHROMEDRIVER_EXIGIR_SHA256"):
+                raise Sha256NaoFixado(mensagem)
+        with _trava:
+            try:
+                caminho = self.em_cache()
+                if caminho:
+                    return caminho
+            except ChecksumInvalido as e:
+                logger.warning(f"{str(e)}. Reinstalando...")
+            if not permitir_download:
+                raise FileNotFoundError(f"ChromeDriver {self.versao} ({self.plataforma}) não está em cache "
+                                        f"em {self.diretorio}")
+            if not self.sha256_pacote:
+                logger.warning(f"{mensagem}. O SHA-256 deste download será registrado e exigido nos próximos usos.")
+            return self.instalar()
+
+
+def resolver_chromedriver(versao=VERSAO_CHROMEDRIVER, diretorio=DIRETORIO_CACHE_DRIVER, permitir_download=True,
+                          binario_chrome=None):
+    """
+    Caminho do ChromeDriver a usar. A variável de ambiente CHROMEDRIVER, se definida, aponta
+    diretamente para um executável e dispensa o cache. Se o Chrome instalado for de outra versão
+    principal, resolve o ChromeDriver dessa versão (versao_chromedriver_para).
+    """
+    explicito = os.environ.get("CHROMEDRIVER")
+    if explicito:
+        return explicito
+    versao_chrome = versao_chrome_instalado(binario_chrome)
+    if not versao_chrome:
+        logger.warning(f"Versão do Chrome instalado não encontrada; usando o ChromeDriver {versao}")
+    elif versao_principal(versao_chrome) != versao_principal(versao):
+        try:
+            versao = versao_chromedriver_para(versao_chrome, diretorio)
+            logger.info(f"Chrome {versao_chrome} instalado: usando o ChromeDriver {versao}")
+        except Exception as e:
+            logger.warning(f"ChromeDriver para o Chrome {versao_chrome} não encontrado ({str(e)}); "
+                           f"usando o ChromeDriver {versao}")
+    return ResolvedorChromeDriver(versao, diretorio).resolver(permitir_download)
+
+
+def fixar_sha256(versao=VERSAO_CHROMEDRIVER, plataformas=PLATAFORMAS, caminho=ARQUIVO_SHA256):
+    """
+    Baixa o pacote publicado de cada plataforma e grava o SHA-256 dele no arquivo de SHA-256
+    fixados, que deve ser revisado e versionado junto com o código. Retorna {plataforma: SHA-256}.
+    """
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            fixados = json.load(f)
+    except FileNotFoundError:
+        fixados = {}
+    temporario = tempfile.mkdtemp(prefix="chromedriver_sha256_")
+    try:
+        for plataforma in plataformas:
+            destino = os.path.join(temporario, f"{plataforma}.zip")
+            baixar_pacote(URL_CHROMEDRIVER.format(versao=versao, plataforma=plataforma), destino)
+            fixados.setdefault(versao, {})[plataforma] = sha256_arquivo(destino)
+    finally:
+        shutil.rmtree(temporario, ignore_errors=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(fixados, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return fixados[versao]
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Instala ou confere o ChromeDriver fixado no cache local")
+    parser.add_argument("--versao", default=VERSAO_CHROMEDRIVER)
+    parser.add_argument("--diretorio", default=DIRETORIO_CACHE_DRIVER)
+    parser.add_argument("--offline", action="store_true", help="apenas confere o cache, sem baixar")
+    parser.add_argument("--fixar-sha256", action="store_true",
+                        help=f"baixa os pacotes publicados da versão e grava o SHA-256 em {os.path.basename(ARQUIVO_SHA256)}")
+    args = parser.parse_args()
+    if args.fixar_sha256:
+        for plataforma, sha256 in fixar_sha256(args.versao).items():
+            print(f"{args.versao} {plataforma} {sha256}")
+    else:
+        print(resolver_chromedriver(args.versao, args.diretorio, permitir_download=not args.offline))
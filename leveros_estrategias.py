@@ -0,0 +1,78 @@
+"""
+Cache das estratégias de localização que funcionaram
+Para cada tipo de busca (seletor dos cards, método de localização da categoria) e cada chave
+(a categoria), guarda a última estratégia que funcionou, para que ela seja tentada primeiro na
+próxima página ou execução. A cascata completa só é percorrida quando a estratégia lembrada falha.
+O cache é salvo em JSON entre as execuções, com contadores de acertos e falhas por chave: uma
+mudança no layout do site aparece como falhas no cache e nas métricas, e não como lentidão.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+
+
+class CacheEstrategias:
+    """
+    Estrutura do arquivo:
+    {tipo: {chave: {"estrategia": ..., "acertos": n, "falhas": n, "atualizado_em": ...}}}
+    """
+
+    def __init__(self, caminho=".estrategias_leveros.json"):
+        self.caminho = caminho
+        self.trava = threading.Lock()
+        self.estrategias = self.carregar()
+
+    def carregar(self):
+        try:
+            with open(self.caminho, encoding="utf-8") as f:
+                dados = json.load(f)
+            return dados if isinstance(dados, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def salvar(self):
+        """Grava o cache de forma atômica"""
+        with self.trava:
+            conteudo = json.dumps(self.estrategias, ensure_ascii=False, indent=2, sort_keys=True)
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(conteudo)
+        os.replace(temporario, self.caminho)
+
+    def lembrada(self, tipo, chave):
+        with self.trava:
+            return self.estrategias.get(tipo, {}).get(chave, {}).get("estrategia")
+
+    def ordenar(self, tipo, chave, opcoes):
+        """As opções na ordem da cascata, com a estratégia lembrada (se houver) em primeiro lugar"""
+        lembrada = self.lembrada(tipo, chave)
+        if lembrada not in opcoes:
+            return list(opcoes)
+        return [lembrada] + [opcao for opcao in opcoes if opcao != lembrada]
+
+    def registrar(self, tipo, chave, estrategia):
+        """
+        Registra a estratégia que funcionou e retorna o resultado da consulta ao cache:
+        "acerto" (era a lembrada), "falha" (a lembrada deixou de funcionar) ou "nova" (não havia
+        estratégia lembrada).
+        """
+        with self.trava:
+            registro = self.estrategias.setdefault(tipo, {}).setdefault(
+                chave, {"estrategia": None, "acertos": 0, "falhas": 0})
+            if registro["estrategia"] == estrategia:
+                registro["acertos"] += 1
+                return "acerto"
+            resultado = "nova" if registro["estrategia"] is None else "falha"
+            if resultado == "falha":
+                registro["falhas"] += 1
+            registro["estrategia"] = estrategia
+            registro["atualizado_em"] = datetime.now().isoformat(timespec="seconds")
+            return resultado
+
+    def resumo(self):
+        """{tipo: (acertos, falhas)} acumulados no cache"""
+        with self.trava:
+            return {tipo: (sum(r["acertos"] for r in chaves.values()), sum(r["falhas"] for r in chaves.values()))
+                    for tipo, chaves in self.estrategias.items()}
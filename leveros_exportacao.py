@@ -0,0 +1,109 @@
+"""
+Exportação do catálogo para Excel em memória constante
+Os produtos são lidos da saída em blocos e escritos com o modo constant_memory do xlsxwriter
+(cada linha vai para o disco assim que a seguinte é iniciada). Um único groupby por bloco
+distribui as linhas entre as planilhas das categorias e alimenta as contagens do resumo.
+"""
+
+import pandas as pd
+import xlsxwriter
+from leveros_produtos import COLUNAS_PRODUTO, como_produto
+from leveros_imagens import miniatura_do_produto
+
+# Largura das colunas da planilha principal
+LARGURAS_COLUNAS = [
+    ("A:A", 15),  # Categoria
+    ("B:B", 40),  # Nome do Produto
+    ("C:C", 10),  # Voltagem
+    ("D:D", 12),  # BTU
+    ("E:F", 15),  # Preços
+    ("G:H", 15),  # Parcelas
+    ("I:I", 40),  # URL da Imagem
+    ("J:J", 40),  # URL Pública da Imagem
+]
+
+# Coluna e altura das linhas da planilha principal quando as miniaturas são incluídas
+COLUNA_MINIATURA = len(COLUNAS_PRODUTO)
+LARGURA_COLUNA_MINIATURA = 14
+ALTURA_LINHA_MINIATURA = 75
+
+
+def exportar_excel(saida, caminho, categorias, tamanho_bloco=5000, miniaturas=None):
+    """
+    Escreve o Excel com a planilha principal, uma planilha por categoria com produtos (na ordem de
+    `categorias`) e a planilha de resumo, percorrendo a saída uma única vez. Com `miniaturas`
+    ({URL da Imagem: arquivo}, de CacheImagens.preparar), a planilha principal ganha a coluna
+    Miniatura com as imagens do cache.
+    Retorna {categoria: quantidade de produtos}, o conteúdo do resumo.
+    """
+    # constant_memory exige que cada planilha seja escrita linha a linha, em ordem crescente.
+    # strings_to_urls=False grava as URLs como texto: o Excel aceita no máximo 65.530 links por planilha.
+    workbook = xlsxwriter.Workbook(caminho, {"constant_memory": True, "strings_to_urls": False})
+    try:
+        formato_cabecalho_principal = workbook.add_format({
+            "bold": True,
+            "text_wrap": True,
+            "valign": "top",
+            "fg_color": "#4F6228",
+            "font_color": "white",
+            "border": 1
+        })
+        formato_cabecalho = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+
+        principal = workbook.add_worksheet("Produtos Leveros")
+        principal.write_row(0, 0, COLUNAS_PRODUTO, formato_cabecalho_principal)
+        for intervalo, largura in LARGURAS_COLUNAS:
+            principal.set_column(intervalo, largura)
+        if miniaturas:
+            principal.write(0, COLUNA_MINIATURA, "Miniatura", formato_cabecalho_principal)
+            principal.set_column(COLUNA_MINIATURA, COLUNA_MINIATURA, LARGURA_COLUNA_MINIATURA)
+
+        # As planilhas são criadas antes da passada para manter a ordem das categorias;
+        # cada uma guarda a próxima linha livre
+        planilhas = {}
+        for categoria in categorias:
+            if saida.contagem_por_categoria.get(categoria):
+                # Limita o nome da planilha a 31 caracteres (limite do Excel)
+                planilha = workbook.add_worksheet(categoria[:31])
+                planilha.write_row(0, 0, COLUNAS_PRODUTO, formato_cabecalho)
+                planilhas[categoria] = [planilha, 1]
+
+        linha_principal = 1
+        contagens = {}
+        for bloco in saida.ler_em_blocos(tamanho_bloco):
+            linhas = [como_produto(produto).valores() for produto in bloco]
+            for produto, valores in zip(bloco, linhas):
+                miniatura = miniatura_do_produto(miniaturas, produto)
+                if miniatura:
+                    # Em constant_memory a altura precisa ser definida antes de escrever a linha
+                    principal.set_row(linha_principal, ALTURA_LINHA_MINIATURA)
+                    principal.insert_image(linha_principal, COLUNA_MINIATURA, miniatura,
+                                           {"x_scale": 0.6, "y_scale": 0.6, "x_offset": 2, "y_offset": 2,
+                                            "object_position": 1})
+                principal.write_row(linha_principal, 0, valores)
+                linha_principal += 1
+
+            # Uma única passada de groupby: posições das linhas de cada categoria no bloco
+            grupos = pd.DataFrame({"Categoria": [valores[0] for valores in linhas]}).groupby(
+                "Categoria", sort=False).indices
+            for categoria, posicoes in grupos.items():
+                contagens[categoria] = contagens.get(categoria, 0) + len(posicoes)
+                if categoria not in planilhas:
+                    continue
+                planilha, linha = planilhas[categoria]
+                for posicao in posicoes:
+                    planilha.write_row(linha, 0, linhas[posicao])
+                    linha += 1
+                planilhas[categoria][1] = linha
+
+        resumo = workbook.add_worksheet("Resumo")
+        resumo.write_row(0, 0, ["Categoria", "Quantidade de Produtos"], formato_cabecalho)
+        for linha, categoria in enumerate(sorted(contagens), start=1):
+            resumo.write_row(linha, 0, [categoria, contagens[categoria]])
+
+        # Adiciona filtros automáticos
+        principal.autofilter(0, 0, linha_principal - 1, len(COLUNAS_PRODUTO) - 1)
+    finally:
+        workbook.close()
+
+    return contagens
@@ -0,0 +1,322 @@
+"""
+Histórico de preços dos produtos da Leveros Integra
+Armazena, em SQLite indexado pela identidade do produto, os preços e o parcelamento de cada
+execução. Gera exportações apenas com as diferenças (produtos novos, removidos e com preço
+alterado) e permite consultar o histórico de preços de um produto.
+
+Um produto listado em mais de uma categoria é acompanhado separadamente em cada uma. Cada
+execução guarda as categorias que extraiu por completo: em uma execução parcial, só os produtos
+dessas categorias podem ser dados como removidos.
+"""
+
+import csv
+import json
+import sqlite3
+from datetime import datetime
+from leveros_produtos import chave_produto, normalizar_nome
+
+# Campos de preço acompanhados no histórico: (coluna no banco, coluna no registro do produto)
+CAMPOS_PRECO = [
+    ("preco_principal", "Preço Principal"),
+    ("preco_vista", "Preço à Vista"),
+    ("qtd_parcelas", "Qtd. Parcelas"),
+    ("valor_parcela", "Valor Parcela"),
+]
+
+
+class HistoricoPrecos:
+    """Armazena os preços de cada execução e calcula as diferenças entre execuções"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.row_factory = sqlite3.Row
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS execucoes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL UNIQUE,
+                registrada_em TEXT NOT NULL,
+                total_produtos INTEGER NOT NULL,
+                categorias_concluidas TEXT
+            );
+            CREATE TABLE IF NOT EXISTS produtos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nome_normalizado TEXT NOT NULL,
+                url_imagem TEXT NOT NULL,
+                nome TEXT NOT NULL,
+                categoria TEXT NOT NULL DEFAULT '',
+                UNIQUE (nome_normalizado, url_imagem, categoria)
+            );
+            CREATE TABLE IF NOT EXISTS precos (
+                execucao_id INTEGER NOT NULL REFERENCES execucoes (id),
+                produto_id INTEGER NOT NULL REFERENCES produtos (id),
+                preco_principal TEXT,
+                preco_vista TEXT,
+                qtd_parcelas TEXT,
+                valor_parcela TEXT,
+                PRIMARY KEY (execucao_id, produto_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_precos_produto ON precos (produto_id, execucao_id);
+        """)
+        self.migrar()
+        self.conexao.commit()
+
+    def migrar(self):
+        """Atualiza bancos criados antes das categorias concluídas e da categoria na identidade do produto"""
+        colunas = [linha["name"] for linha in self.conexao.execute("PRAGMA table_info(execucoes)")]
+        if "categorias_concluidas" not in colunas:
+            self.conexao.execute("ALTER TABLE execucoes ADD COLUMN categorias_concluidas TEXT")
+        definicao = self.conexao.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'produtos'").fetchone()[0]
+        if "UNIQUE (nome_normalizado, url_imagem)" in definicao:
+            # A restrição UNIQUE não pode ser alterada: a tabela é recriada com os mesmos ids
+            with self.conexao:
+                self.conexao.executescript("""
+                    ALTER TABLE produtos RENAME TO produtos_antigos;
+                    CREATE TABLE produtos (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        nome_normalizado TEXT NOT NULL,
+                        url_imagem TEXT NOT NULL,
+                        nome TEXT NOT NULL,
+                        categoria TEXT NOT NULL DEFAULT '',
+                        UNIQUE (nome_normalizado, url_imagem, categoria)
+                    );
+                    INSERT INTO produtos (id, nome_normalizado, url_imagem, nome, categoria)
+                        SELECT id, nome_normalizado, url_imagem, nome, COALESCE(categoria, '') FROM produtos_antigos;
+                    DROP TABLE produtos_antigos;
+                """)
+
+    def registrar_execucao(self, timestamp, produtos, categorias_concluidas=None):
+        """
+        Registra os preços de uma execução (produtos pode ser qualquer iterável) e retorna o id da
+        execução. categorias_concluidas são as categorias extraídas por completo; None indica uma
+        execução completa.
+        """
+        if categorias_concluidas is not None:
+            categorias_concluidas = json.dumps(sorted(categorias_concluidas), ensure_ascii=False)
+        with self.conexao:
+            cursor = self.conexao.execute(
+                "INSERT INTO execucoes (timestamp, registrada_em, total_produtos, categorias_concluidas) "
+                "VALUES (?, ?, 0, ?)",
+                (timestamp, datetime.now().isoformat(timespec="seconds"), categorias_concluidas))
+            execucao_id = cursor.lastrowid
+
+            total_produtos = 0
+            for produto in produtos:
+                total_produtos += 1
+                chave = chave_produto(produto)
+                if chave is None:
+                    continue
+                nome_normalizado, url_imagem = chave
+                categoria = produto.get("Categoria") or ""
+                self.conexao.execute("""
+                    INSERT INTO produtos (nome_normalizado, url_imagem, nome, categoria) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (nome_normalizado, url_imagem, categoria) DO UPDATE SET nome = excluded.nome
+                """, (nome_normalizado, url_imagem, produto.get("Nome do Produto"), categoria))
+                produto_id = self.conexao.execute(
+                    "SELECT id FROM produtos WHERE nome_normalizado = ? AND url_imagem = ? AND categoria = ?",
+                    (nome_normalizado, url_imagem, categoria)).fetchone()[0]
+                self.conexao.execute(
+                    "INSERT OR REPLACE INTO precos (execucao_id, produto_id, preco_principal, preco_vista, "
+                    "qtd_parcelas, valor_parcela) VALUES (?, ?, ?, ?, ?, ?)",
+                    [execucao_id, produto_id] + [produto.get(campo) for _, campo in CAMPOS_PRECO])
+            self.conexao.execute("UPDATE execucoes SET total_produtos = ? WHERE id = ?",
+                                 (total_produtos, execucao_id))
+        return execucao_id
+
+    def execucao_anterior(self, execucao_id):
+        """Retorna o id da execução imediatamente anterior, ou None"""
+        linha = self.conexao.execute(
+            "SELECT MAX(id) FROM execucoes WHERE id < ?", (execucao_id,)).fetchone()
+        return linha[0]
+
+    def ultima_execucao(self):
+        """Retorna o id da execução mais recente, ou None"""
+        return self.conexao.execute("SELECT MAX(id) FROM execucoes").fetchone()[0]
+
+    def categorias_concluidas(self, execucao_id):
+        """Categorias extraídas por completo na execução, ou None se a execução foi completa"""
+        linha = self.conexao.execute(
+            "SELECT categorias_concluidas FROM execucoes WHERE id = ?", (execucao_id,)).fetchone()
+        if linha is None or linha[0] is None:
+            return None
+        return json.loads(linha[0])
+
+    def delta(self, execucao_id, anterior_id=None):
+        """
+        Compara uma execução com as anteriores e retorna
+        {"novos": [...], "removidos": [...], "reprecificados": [...]}.
+        Sem execução anterior, todos os produtos são considerados novos.
+
+        Cada categoria é comparada com a última execução anterior que a concluiu (ver
+        execucoes_base), de modo que uma execução parcial no meio não esconde as mudanças das
+        categorias que ela não processou; com anterior_id, todas são comparadas com essa execução.
+        Removidos são só os produtos das categorias concluídas na execução: uma categoria
+        interrompida ou não processada não tem seus produtos dados como removidos. Da mesma forma,
+        um produto de uma categoria que a execução de comparação não concluiu só é novo se nunca
+        apareceu antes.
+        """
+        bases = self.execucoes_base(execucao_id, anterior_id)
+        if bases:
+            tabela_bases = "VALUES " + ", ".join("(?, ?, ?)" for _ in bases)
+            parametros_bases = [valor for categoria, (base_id, concluida) in bases.items()
+                                for valor in (categoria, base_id, int(concluida))]
+        else:
+            tabela_bases, parametros_bases = "SELECT NULL, NULL, NULL WHERE 0", []
+        com_bases = f"WITH bases (categoria, execucao_id, concluida) AS ({tabela_bases})"
+        colunas = ", ".join(f"p.{coluna}" for coluna, _ in CAMPOS_PRECO)
+
+        novos = self.conexao.execute(f"""
+            {com_bases}
+            SELECT pr.categoria, pr.nome, pr.url_imagem, {colunas}
+            FROM precos p JOIN produtos pr ON pr.id = p.produto_id
+            LEFT JOIN bases b ON b.categoria = pr.categoria
+            WHERE p.execucao_id = ?
+              AND NOT EXISTS (SELECT 1 FROM precos a WHERE a.execucao_id = b.execucao_id AND a.produto_id = p.produto_id)
+              AND (b.concluida = 1 OR NOT EXISTS (
+                  SELECT 1 FROM precos a WHERE a.execucao_id < ? AND a.produto_id = p.produto_id))
+            ORDER BY pr.categoria, pr.nome
+        """, [*parametros_bases, execucao_id, execucao_id]).fetchall()
+
+        filtro_removidos, parametros_removidos = self.filtro_categorias(execucao_id)
+        removidos = self.conexao.execute(f"""
+            {com_bases}
+            SELECT pr.categoria, pr.nome, pr.url_imagem, {colunas}
+            FROM precos p JOIN produtos pr ON pr.id = p.produto_id
+            JOIN bases b ON b.categoria = pr.categoria AND b.execucao_id = p.execucao_id
+            WHERE NOT EXISTS (SELECT 1 FROM precos a WHERE a.execucao_id = ? AND a.produto_id = p.produto_id)
+              AND {filtro_removidos}
+            ORDER BY pr.categoria, pr.nome
+        """, [*parametros_bases, execucao_id, *parametros_removidos]).fetchall()
+
+        diferente = " OR ".join(f"a.{coluna} IS NOT p.{coluna}" for coluna, _ in CAMPOS_PRECO)
+        anteriores = ", ".join(f"a.{coluna} AS {coluna}_anterior" for coluna, _ in CAMPOS_PRECO)
+        reprecificados = self.conexao.execute(f"""
+            {com_bases}
+            SELECT pr.categoria, pr.nome, pr.url_imagem, {colunas}, {anteriores}
+            FROM precos p
+            JOIN produtos pr ON pr.id = p.produto_id
+            JOIN bases b ON b.categoria = pr.categoria
+            JOIN precos a ON a.produto_id = p.produto_id AND a.execucao_id = b.execucao_id
+            WHERE p.execucao_id = ? AND ({diferente})
+            ORDER BY pr.categoria, pr.nome
+        """, [*parametros_bases, execucao_id]).fetchall()
+
+        return {
+            "novos": [dict(linha) for linha in novos],
+            "removidos": [dict(linha) for linha in removidos],
+            "reprecificados": [dict(linha) for linha in reprecificados],
+        }
+
+    def execucoes_base(self, execucao_id, anterior_id=None):
+        """
+        {categoria: (id da execução de comparação, se ela concluiu a categoria)} para o delta da
+        execução: a última execução anterior que concluiu a categoria ou, se nenhuma concluiu, a
+        última que tem preços dela. Com anterior_id, essa execução para todas as categorias.
+        """
+        categorias = [linha[0] for linha in self.conexao.execute("""
+            SELECT DISTINCT pr.categoria FROM precos p JOIN produtos pr ON pr.id = p.produto_id
+            WHERE p.execucao_id <= ?
+        """, (execucao_id,))]
+        if anterior_id is not None:
+            concluidas = self.categorias_concluidas(anterior_id)
+            return {categoria: (anterior_id, concluidas is None or categoria in concluidas) for categoria in categorias}
+
+        anteriores = [(linha[0], None if linha[1] is None else set(json.loads(linha[1])))
+                      for linha in self.conexao.execute(
+                          "SELECT id, categorias_concluidas FROM execucoes WHERE id < ? ORDER BY id DESC",
+                          (execucao_id,))]
+        bases = {}
+        for categoria in categorias:
+            base_id = next((id_anterior for id_anterior, concluidas in anteriores
+                            if concluidas is None or categoria in concluidas), None)
+            if base_id is not None:
+                bases[categoria] = (base_id, True)
+                continue
+            linha = self.conexao.execute("""
+                SELECT MAX(p.execucao_id) FROM precos p JOIN produtos pr ON pr.id = p.produto_id
+                WHERE p.execucao_id < ? AND pr.categoria = ?
+            """, (execucao_id, categoria)).fetchone()
+            if linha[0] is not None:
+                bases[categoria] = (linha[0], False)
+        return bases
+
+    def filtro_categorias(self, execucao_id):
+        """Condição SQL (e parâmetros) sobre pr.categoria: categorias concluídas na execução, ou sempre verdadeira"""
+        categorias = self.categorias_concluidas(execucao_id) if execucao_id is not None else None
+        if categorias is None:
+            return "1", []
+        return f"pr.categoria IN ({', '.join('?' * len(categorias))})" if categorias else "0", categorias
+
+    def exportar_delta(self, execucao_id, caminho):
+        """Grava em CSV apenas os produtos novos, removidos e com preço alterado. Retorna o delta."""
+        delta = self.delta(execucao_id)
+        cabecalho = ["Tipo", "Categoria", "Nome do Produto", "URL da Imagem"]
+        for _, campo in CAMPOS_PRECO:
+            cabecalho += [f"{campo} (anterior)", f"{campo} (atual)"]
+
+        with open(caminho, "w", newline="", encoding="utf-8-sig") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(cabecalho)
+            for tipo, chave in (("novo", "novos"), ("removido", "removidos"), ("reprecificado", "reprecificados")):
+                for linha in delta[chave]:
+                    valores = [tipo, linha["categoria"], linha["nome"], linha["url_imagem"]]
+                    for coluna, _ in CAMPOS_PRECO:
+                        if tipo == "novo":
+                            valores += ["", linha[coluna]]
+                        elif tipo == "removido":
+                            valores += [linha[coluna], ""]
+                        else:
+                            valores += [linha[f"{coluna}_anterior"], linha[coluna]]
+                    escritor.writerow(valores)
+        return delta
+
+    def historico_produto(self, nome, url_imagem=None):
+        """Retorna o histórico de preços dos produtos com o nome informado (comparação normalizada)"""
+        consulta = f"""
+            SELECT e.timestamp, pr.categoria, pr.nome, pr.url_imagem,
+                   {", ".join(f"p.{coluna}" for coluna, _ in CAMPOS_PRECO)}
+            FROM produtos pr
+            JOIN precos p ON p.produto_id = pr.id
+            JOIN execucoes e ON e.id = p.execucao_id
+            WHERE pr.nome_normalizado = ?
+        """
+        parametros = [normalizar_nome(nome)]
+        if url_imagem is not None:
+            consulta += " AND pr.url_imagem = ?"
+            parametros.append(url_imagem)
+        linhas = self.conexao.execute(consulta + " ORDER BY pr.url_imagem, pr.categoria, e.id", parametros).fetchall()
+        return [dict(linha) for linha in linhas]
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.conexao.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Consulta o histórico de preços da Leveros Integra")
+    parser.add_argument("--banco", default="historico_precos.sqlite3", help="arquivo do histórico")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    consulta_produto = subcomandos.add_parser("produto", help="histórico de preços de um produto")
+    consulta_produto.add_argument("nome", help="nome do produto (comparação sem acentos e sem diferenciar maiúsculas)")
+    consulta_delta = subcomandos.add_parser("delta", help="exporta as diferenças da última execução")
+    consulta_delta.add_argument("arquivo", help="arquivo CSV de saída")
+    args = parser.parse_args()
+
+    historico = HistoricoPrecos(args.banco)
+    try:
+        if args.comando == "produto":
+            for linha in historico.historico_produto(args.nome):
+                print(f"{linha['timestamp']}  {linha['categoria'] or '':<14} {linha['preco_principal'] or '':<14} "
+                      f"{linha['preco_vista'] or '':<26} {linha['qtd_parcelas']} de {linha['valor_parcela']}")
+        else:
+            ultima = historico.ultima_execucao()
+            if ultima is None:
+                print("Nenhuma execução registrada.")
+            else:
+                delta = historico.exportar_delta(ultima, args.arquivo)
+                print(f"{len(delta['novos'])} novos, {len(delta['removidos'])} removidos, "
+                      f"{len(delta['reprecificados'])} reprecificados -> {args.arquivo}")
+    finally:
+        historico.fechar()
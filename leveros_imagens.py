@@ -0,0 +1,231 @@
+"""
+Imagens dos produtos da Leveros Integra
+Baixa as imagens dos produtos em paralelo, com uma requests.Session com pool de conexões, para um
+cache em disco endereçado pelo conteúdo (SHA-256). Cada URL guarda o ETag e o Last-Modified da
+última resposta, e as execuções seguintes fazem requisições condicionais: imagens inalteradas
+(HTTP 304) não são baixadas novamente. As miniaturas, usadas no PDF e no Excel, são geradas em um
+pool de processos e também ficam no cache.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from leveros_produtos import valor_vazio
+
+logger = logging.getLogger(__name__)
+
+
+def criar_miniatura(origem, destino, largura, altura):
+    """Gera a miniatura JPEG de uma imagem (executada nos processos do pool). Retorna o destino ou None."""
+    from PIL import Image
+    try:
+        with Image.open(origem) as imagem:
+            imagem.thumbnail((largura, altura))
+            if imagem.mode not in ("RGB", "L"):
+                # JPEG não tem transparência: compõe sobre fundo branco
+                fundo = Image.new("RGB", imagem.size, "white")
+                fundo.paste(imagem.convert("RGBA"), mask=imagem.convert("RGBA").split()[-1])
+                imagem = fundo
+            arquivo_temporario = f"{destino}.{os.getpid()}.tmp"
+            imagem.save(arquivo_temporario, "JPEG", quality=85)
+        os.replace(arquivo_temporario, destino)
+        return destino
+    except Exception as e:
+        logger.warning(f"Não foi possível gerar a miniatura de {origem}: {str(e)}")
+        return None
+
+
+def urls_do_produto(produto):
+    """URLs candidatas da imagem de um produto, na ordem de tentativa: a da área logada e a pública"""
+    urls = []
+    for campo in ("URL da Imagem", "URL Pública da Imagem"):
+        url = produto.get(campo)
+        if not valor_vazio(url) and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def miniatura_do_produto(miniaturas, produto):
+    """Caminho da miniatura do produto no mapa retornado por CacheImagens.preparar, ou None"""
+    urls = urls_do_produto(produto)
+    return miniaturas.get(urls[0]) if urls and miniaturas else None
+
+
+class CacheImagens:
+    """
+    Cache em disco das imagens dos produtos:
+    - objetos/<2 primeiros>/<sha256>: conteúdo das imagens (imagens iguais em URLs diferentes são gravadas uma vez)
+    - miniaturas/<sha256>_<largura>x<altura>.jpg: miniaturas
+    - indice.json: para cada URL, o SHA-256 do conteúdo, o ETag e o Last-Modified
+    """
+
+    def __init__(self, diretorio=".cache_imagens", paralelismo=8, processos=None, timeout=30,
+                 tamanho_miniatura=(160, 160), cookies=None):
+        self.diretorio = diretorio
+        self.paralelismo = paralelismo
+        self.processos = processos
+        self.timeout = timeout
+        self.tamanho_miniatura = tamanho_miniatura
+        self.arquivo_indice = os.path.join(diretorio, "indice.json")
+        self.trava = threading.Lock()
+        self.estatisticas = {"baixadas": 0, "nao_modificadas": 0, "falhas": 0}
+        os.makedirs(os.path.join(diretorio, "objetos"), exist_ok=True)
+        os.makedirs(os.path.join(diretorio, "miniaturas"), exist_ok=True)
+        self.indice = self.carregar_indice()
+
+        # Sessão com pool de conexões do tamanho do paralelismo e retentativas para erros 5xx
+        self.sessao = requests.Session()
+        retentativas = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+        adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=paralelismo, max_retries=retentativas)
+        self.sessao.mount("https://", adaptador)
+        self.sessao.mount("http://", adaptador)
+        # Cookies da sessão autenticada (formato do Selenium), para as imagens da área logada
+        for cookie in cookies or []:
+            self.sessao.cookies.set(cookie["name"], cookie["value"],
+                                    domain=cookie.get("domain"), path=cookie.get("path", "/"))
+
+    def carregar_indice(self):
+        """Carrega o índice de URLs do cache, ou um índice vazio"""
+        try:
+            with open(self.arquivo_indice, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def salvar_indice(self):
+        """Grava o índice em um arquivo temporário e o substitui, para nunca deixar um índice parcial"""
+        with self.trava:
+            dados = json.dumps(self.indice, ensure_ascii=False)
+        arquivo_temporario = f"{self.arquivo_indice}.{os.getpid()}.tmp"
+        with open(arquivo_temporario, "w", encoding="utf-8") as f:
+            f.write(dados)
+        os.replace(arquivo_temporario, self.arquivo_indice)
+
+    def caminho_objeto(self, sha256):
+        """Caminho do conteúdo de uma imagem no cache"""
+        return os.path.join(self.diretorio, "objetos", sha256[:2], sha256)
+
+    def caminho_miniatura(self, sha256):
+        """Caminho da miniatura de uma imagem no cache"""
+        largura, altura = self.tamanho_miniatura
+        return os.path.join(self.diretorio, "miniaturas", f"{sha256}_{largura}x{altura}.jpg")
+
+    def gravar_objeto(self, conteudo):
+        """Grava o conteúdo no cache (se ainda não existir) e retorna o SHA-256"""
+        sha256 = hashlib.sha256(conteudo).hexdigest()
+        caminho = self.caminho_objeto(sha256)
+        if not os.path.exists(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            arquivo_temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(arquivo_temporario, "wb") as f:
+                f.write(conteudo)
+            os.replace(arquivo_temporario, caminho)
+        return sha256
+
+    def baixar(self, url):
+        """
+        Garante a imagem da URL no cache, com requisição condicional se ela já foi baixada.
+        Retorna o SHA-256 do conteúdo ou None se não foi possível obtê-la.
+        """
+        with self.trava:
+            entrada = dict(self.indice.get(url, {}))
+        cabecalhos = {}
+        if entrada.get("sha256") and os.path.exists(self.caminho_objeto(entrada["sha256"])):
+            if entrada.get("etag"):
+                cabecalhos["If-None-Match"] = entrada["etag"]
+            if entrada.get("last_modified"):
+                cabecalhos["If-Modified-Since"] = entrada["last_modified"]
+
+        try:
+            resposta = self.sessao.get(url, headers=cabecalhos, timeout=self.timeout)
+            if resposta.status_code == 304 and cabecalhos:
+                with self.trava:
+                    self.indice[url]["verificada_em"] = time.time()
+                    self.estatisticas["nao_modificadas"] += 1
+                return entrada["sha256"]
+            resposta.raise_for_status()
+            if not resposta.headers.get("Content-Type", "").startswith("image/"):
+                # Por exemplo, a página de login devolvida no lugar de uma imagem da área logada
+                raise ValueError(f"resposta não é uma imagem ({resposta.headers.get('Content-Type')})")
+
+            sha256 = self.gravar_objeto(resposta.content)
+            with self.trava:
+                self.indice[url] = {
+                    "sha256": sha256,
+                    "etag": resposta.headers.get("ETag"),
+                    "last_modified": resposta.headers.get("Last-Modified"),
+                    "content_type": resposta.headers.get("Content-Type"),
+                    "verificada_em": time.time(),
+                }
+                self.estatisticas["baixadas"] += 1
+            return sha256
+        except Exception as e:
+            logger.debug(f"Falha ao baixar a imagem {url}: {str(e)}")
+            return None
+
+    def baixar_produto(self, urls):
+        """Tenta as URLs candidatas de um produto na ordem e retorna o SHA-256 da primeira obtida"""
+        for url in urls:
+            sha256 = self.baixar(url)
+            if sha256:
+                return sha256
+        with self.trava:
+            self.estatisticas["falhas"] += 1
+        return None
+
+    def gerar_miniaturas(self, hashes):
+        """Gera em um pool de processos as miniaturas que ainda não estão no cache. Retorna {sha256: caminho}."""
+        miniaturas = {}
+        pendentes = []
+        for sha256 in set(hashes):
+            caminho = self.caminho_miniatura(sha256)
+            if os.path.exists(caminho):
+                miniaturas[sha256] = caminho
+            else:
+                pendentes.append(sha256)
+
+        if pendentes:
+            largura, altura = self.tamanho_miniatura
+            with ProcessPoolExecutor(max_workers=self.processos) as executor:
+                resultados = executor.map(
+                    criar_miniatura,
+                    [self.caminho_objeto(sha256) for sha256 in pendentes],
+                    [self.caminho_miniatura(sha256) for sha256 in pendentes],
+                    [largura] * len(pendentes), [altura] * len(pendentes),
+                    chunksize=16)
+                for sha256, caminho in zip(pendentes, resultados):
+                    if caminho:
+                        miniaturas[sha256] = caminho
+        return miniaturas
+
+    def preparar(self, produtos):
+        """
+        Baixa (ou revalida) as imagens dos produtos em paralelo e gera as miniaturas.
+        Retorna {URL da Imagem: caminho da miniatura} para os produtos cujas imagens foram obtidas.
+        """
+        candidatas = {}
+        for produto in produtos:
+            urls = urls_do_produto(produto)
+            if urls:
+                candidatas.setdefault(urls[0], urls)
+
+        with ThreadPoolExecutor(max_workers=self.paralelismo, thread_name_prefix="imagens") as executor:
+            hashes = dict(zip(candidatas, executor.map(self.baixar_produto, candidatas.values())))
+        self.salvar_indice()
+
+        miniaturas = self.gerar_miniaturas(sha256 for sha256 in hashes.values() if sha256)
+        logger.info(f"Imagens: {self.estatisticas['baixadas']} baixadas, "
+                    f"{self.estatisticas['nao_modificadas']} não modificadas (HTTP 304), "
+                    f"{self.estatisticas['falhas']} falhas, {len(miniaturas)} miniaturas disponíveis.")
+        return {url: miniaturas[sha256] for url, sha256 in hashes.items() if sha256 in miniaturas}
+
+    def fechar(self):
+        """Libera as conexões da sessão"""
+        self.sessao.close()
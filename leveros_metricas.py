@@ -0,0 +1,215 @@
+"""
+Intervalos de tempo e métricas da execução
+Cada fase medida (login, navegação, extração de página, paginação, exportações) gera um intervalo
+com início, duração e resultado. Os intervalos são enviados por um QueueHandler e gravados em JSON
+Lines por um QueueListener em outra thread, sem I/O no laço de extração. As durações também
+alimentam histogramas que, com os contadores, são gravados ao fim da execução no formato texto do
+Prometheus (compatível com o textfile collector do node_exporter).
+"""
+
+import os
+import json
+import time
+import queue
+import logging
+import itertools
+import threading
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+# Limites superiores (segundos) dos buckets dos histogramas de duração
+BUCKETS_DURACAO = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+METRICA_INTERVALOS = "leveros_intervalo_segundos"
+
+DESCRICOES = {
+    METRICA_INTERVALOS: "Duração das fases da execução, por fase",
+    "leveros_intervalos_total": "Intervalos concluídos, por fase e resultado",
+    "leveros_paginas_extraidas_total": "Páginas extraídas, por categoria",
+    "leveros_paginas_com_falha_total": "Páginas cuja extração falhou (não gravadas no checkpoint), por categoria",
+    "leveros_produtos_extraidos_total": "Produtos extraídos, por categoria",
+    "leveros_tentativas_repetidas_total": "Tentativas repetidas após falha, por etapa",
+    "leveros_reinicios_navegador_total": "Reinícios do navegador",
+    "leveros_tentativas_negadas_total": "Novas tentativas negadas por prazo, orçamento ou circuito aberto, por etapa e motivo",
+    "leveros_reciclagens_navegador_total": "Reciclagens preventivas do navegador pelo monitor de saúde, por motivo",
+    "leveros_circuitos_abertos_total": "Aberturas de disjuntor, por circuito (site ou categoria)",
+    "leveros_estrategias_total": "Consultas ao cache de estratégias de localização, por tipo e resultado",
+}
+
+
+class FormatadorJson(logging.Formatter):
+    """Formata o registro de um intervalo como uma linha JSON"""
+
+    def format(self, record):
+        return json.dumps(getattr(record, "intervalo", {"mensagem": record.getMessage()}),
+                          ensure_ascii=False, default=str)
+
+
+def escapar_rotulo(valor):
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def formatar_rotulos(rotulos):
+    if not rotulos:
+        return ""
+    return "{" + ",".join(f'{nome}="{escapar_rotulo(valor)}"' for nome, valor in rotulos) + "}"
+
+
+class Metricas:
+    """
+    Contadores, histogramas e intervalos de uma execução. Seguro para uso pelos workers
+    (threads) que compartilham a mesma instância.
+    """
+
+    def __init__(self, buckets=BUCKETS_DURACAO):
+        self.buckets = tuple(buckets)
+        self.trava = threading.Lock()
+        self.contadores = {}    # (nome, rótulos) -> valor
+        self.histogramas = {}   # (nome, rótulos) -> [contagens por bucket, soma, contagem]
+        self.ids = itertools.count(1)
+        self.pilha = threading.local()
+        self.fila = queue.SimpleQueue()
+        self.manipulador_fila = None
+        self.ouvinte = None
+
+    def iniciar(self, caminho):
+        """Começa a gravar os intervalos em `caminho` (JSON Lines), a partir de uma thread própria"""
+        manipulador_arquivo = logging.FileHandler(caminho, encoding="utf-8")
+        manipulador_arquivo.setFormatter(FormatadorJson())
+        self.ouvinte = QueueListener(self.fila, manipulador_arquivo)
+        self.ouvinte.start()
+        self.manipulador_fila = QueueHandler(self.fila)
+
+    def encerrar(self):
+        """Grava os intervalos pendentes e fecha o arquivo"""
+        if self.ouvinte is None:
+            return
+        self.manipulador_fila = None
+        self.ouvinte.stop()
+        for manipulador in self.ouvinte.handlers:
+            manipulador.close()
+        self.ouvinte = None
+
+    def contador(self, nome, valor=1, **rotulos):
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self.trava:
+            self.contadores[chave] = self.contadores.get(chave, 0) + valor
+
+    def observar(self, nome, valor, **rotulos):
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self.trava:
+            histograma = self.histogramas.get(chave)
+            if histograma is None:
+                histograma = self.histogramas[chave] = [[0] * len(self.buckets), 0.0, 0]
+            for posicao, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    histograma[0][posicao] += 1
+            histograma[1] += valor
+            histograma[2] += 1
+
+    @contextmanager
+    def intervalo(self, fase, **atributos):
+        """
+        Mede o bloco como um intervalo da fase. Produz o dicionário de atributos do intervalo, que
+        o bloco pode completar (por exemplo, com a quantidade de produtos). Uma exceção marca o
+        intervalo com resultado "erro" e é propagada.
+        """
+        pilha = getattr(self.pilha, "ids", None)
+        if pilha is None:
+            pilha = self.pilha.ids = []
+        identificador = next(self.ids)
+        pai = pilha[-1] if pilha else None
+        pilha.append(identificador)
+
+        inicio_relogio = time.time()
+        inicio = time.perf_counter()
+        resultado = "ok"
+        erro = None
+        try:
+            yield atributos
+        except BaseException as e:
+            resultado = "erro"
+            erro = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            pilha.pop()
+            self.registrar_intervalo(fase, inicio_relogio, time.perf_counter() - inicio, resultado, erro,
+                                     identificador=identificador, pai=pai, **atributos)
+
+    def registrar_intervalo(self, fase, inicio_relogio, duracao, resultado="ok", erro=None,
+                            identificador=None, pai=None, **atributos):
+        """
+        Registra um intervalo já medido. Usado diretamente quando o bloco medido não cabe em um
+        `with` (por exemplo, uma categoria processada por etapas intercaladas com outras abas).
+        """
+        if identificador is None:
+            identificador = next(self.ids)
+        if atributos.get("sucesso") is False:
+            resultado = "falha"
+        self.observar(METRICA_INTERVALOS, duracao, fase=fase)
+        self.contador("leveros_intervalos_total", fase=fase, resultado=resultado)
+        manipulador = self.manipulador_fila
+        if manipulador is None:
+            return
+        registro = {
+            "id": identificador,
+            "pai": pai,
+            "fase": fase,
+            "inicio": round(inicio_relogio, 6),
+            "duracao_s": round(duracao, 6),
+            "resultado": resultado,
+            "thread": threading.current_thread().name,
+        }
+        registro.update(atributos)
+        if erro:
+            registro["erro"] = erro
+        # O QueueHandler só enfileira o registro; a gravação fica com a thread do QueueListener
+        manipulador.handle(logging.makeLogRecord({
+            "name": __name__, "levelno": logging.INFO, "levelname": "INFO", "msg": fase,
+            "intervalo": registro,
+        }))
+
+    def total_contador(self, nome):
+        """Soma de um contador em todos os rótulos"""
+        with self.trava:
+            return sum(valor for (nome_contador, _), valor in self.contadores.items() if nome_contador == nome)
+
+    def duracao_fases(self):
+        """{fase: (quantidade de intervalos, soma das durações em segundos)}"""
+        with self.trava:
+            return {dict(rotulos)["fase"]: (h[2], h[1]) for (nome, rotulos), h in self.histogramas.items()
+                    if nome == METRICA_INTERVALOS}
+
+    def texto_prometheus(self):
+        """Contadores e histogramas no formato texto de exposição do Prometheus"""
+        with self.trava:
+            contadores = dict(self.contadores)
+            histogramas = {chave: [list(h[0]), h[1], h[2]] for chave, h in self.histogramas.items()}
+
+        linhas = []
+        for nome in sorted({nome for nome, _ in contadores}):
+            linhas.append(f"# HELP {nome} {DESCRICOES.get(nome, nome)}")
+            linhas.append(f"# TYPE {nome} counter")
+            for (nome_contador, rotulos), valor in sorted(contadores.items()):
+                if nome_contador == nome:
+                    linhas.append(f"{nome}{formatar_rotulos(rotulos)} {valor}")
+
+        for nome in sorted({nome for nome, _ in histogramas}):
+            linhas.append(f"# HELP {nome} {DESCRICOES.get(nome, nome)}")
+            linhas.append(f"# TYPE {nome} histogram")
+            for (nome_histograma, rotulos), (contagens, soma, contagem) in sorted(histogramas.items()):
+                if nome_histograma != nome:
+                    continue
+                for limite, acumulado in zip(self.buckets, contagens):
+                    linhas.append(f"{nome}_bucket{formatar_rotulos(rotulos + (('le', limite),))} {acumulado}")
+                linhas.append(f"{nome}_bucket{formatar_rotulos(rotulos + (('le', '+Inf'),))} {contagem}")
+                linhas.append(f"{nome}_sum{formatar_rotulos(rotulos)} {soma:.6f}")
+                linhas.append(f"{nome}_count{formatar_rotulos(rotulos)} {contagem}")
+        return "\n".join(linhas) + "\n"
+
+    def salvar_prometheus(self, caminho):
+        """Grava as métricas em `caminho` de forma atômica (o coletor nunca lê um arquivo pela metade)"""
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(self.texto_prometheus())
+        os.replace(temporario, caminho)
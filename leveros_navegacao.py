@@ -0,0 +1,98 @@
+"""
+Índice de navegação direta do catálogo
+Na primeira visita a cada página de uma categoria, guarda a URL (rota do SPA) em que o navegador
+estava. Nas visitas seguintes (retomada no meio da categoria, nova tentativa depois de reiniciar o
+navegador, faixas de páginas de um worker), o RPA abre essa URL com driver.get em vez de voltar à
+página inicial, clicar na categoria e clicar em "próxima" uma vez por página.
+
+Uma URL só é usada se identifica a página: se o site mantiver a mesma URL em várias páginas de uma
+categoria (estado só em memória), essas páginas não têm navegação direta e o RPA volta aos cliques.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+
+
+class IndiceNavegacao:
+    """
+    Estrutura do arquivo:
+    {categoria: {"paginas": {"<página>": url}, "total_paginas": n ou null, "atualizado_em": ...}}
+    """
+
+    def __init__(self, caminho="indice_navegacao.json"):
+        self.caminho = caminho
+        self.trava = threading.Lock()
+        self.categorias = self.carregar()
+
+    def carregar(self):
+        try:
+            with open(self.caminho, encoding="utf-8") as f:
+                dados = json.load(f)
+            return dados if isinstance(dados, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def salvar(self):
+        """Grava o índice de forma atômica"""
+        with self.trava:
+            conteudo = json.dumps(self.categorias, ensure_ascii=False, indent=2, sort_keys=True)
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(conteudo)
+        os.replace(temporario, self.caminho)
+
+    def registro(self, categoria):
+        return self.categorias.setdefault(categoria, {"paginas": {}, "total_paginas": None})
+
+    def registrar(self, categoria, pagina, url):
+        """Guarda a URL em que a página da categoria foi encontrada"""
+        if not url:
+            return
+        with self.trava:
+            registro = self.registro(categoria)
+            registro["paginas"][str(pagina)] = url
+            registro["atualizado_em"] = datetime.now().isoformat(timespec="seconds")
+
+    def registrar_total(self, categoria, total_paginas):
+        """Guarda a quantidade de páginas da categoria (a última página tem o botão de próxima desativado)"""
+        with self.trava:
+            registro = self.registro(categoria)
+            registro["total_paginas"] = total_paginas
+            registro["atualizado_em"] = datetime.now().isoformat(timespec="seconds")
+
+    def descartar(self, categoria, pagina):
+        """Remove a URL de uma página que não levou a ela"""
+        with self.trava:
+            self.categorias.get(categoria, {}).get("paginas", {}).pop(str(pagina), None)
+
+    def url(self, categoria, pagina):
+        """URL de navegação direta da página, ou None se ela não for conhecida ou não identificar a página"""
+        with self.trava:
+            paginas = self.categorias.get(categoria, {}).get("paginas", {})
+            url = paginas.get(str(pagina))
+            if url is None:
+                return None
+            if sum(1 for outra in paginas.values() if outra == url) > 1:
+                return None
+            return url
+
+    def total_paginas(self, categoria):
+        with self.trava:
+            return self.categorias.get(categoria, {}).get("total_paginas")
+
+    def faixas(self, categoria, paginas_por_faixa, de_pagina=1):
+        """
+        Divide as páginas da categoria a partir de de_pagina em faixas [(primeira, última)] de até
+        paginas_por_faixa páginas. Só divide se o total de páginas for conhecido e cada faixa
+        começar em uma página com navegação direta; caso contrário, retorna uma única faixa aberta.
+        A última faixa fica aberta (None), para incluir páginas novas desde a execução anterior.
+        """
+        total = self.total_paginas(categoria)
+        if not total or paginas_por_faixa < 1 or de_pagina > total:
+            return [(de_pagina, None)]
+        inicios = list(range(de_pagina, total + 1, paginas_por_faixa))
+        if any(inicio > 1 and self.url(categoria, inicio) is None for inicio in inicios):
+            return [(de_pagina, None)]
+        return [(inicio, inicio + paginas_por_faixa - 1) for inicio in inicios[:-1]] + [(inicios[-1], None)]
@@ -0,0 +1,121 @@
+"""
+Normalização dos preços e do parcelamento dos produtos
+Converte os textos dos cards ("R$ 7.999,00", "ou R$ 7.599,05 à vista", "8x", "R$ 999,88 sem juros")
+em colunas numéricas, com operações vetorizadas do pandas sobre blocos inteiros de produtos.
+Valores presentes mas que não puderam ser convertidos são sinalizados em `campos_invalidos`.
+"""
+
+import re
+from contextlib import nullcontext
+import pandas as pd
+from leveros_produtos import COLUNAS_PRODUTO, valor_vazio, como_produto
+
+# Valor em reais no padrão brasileiro: "R$ 7.999,00", "R$ 999,88", "R$ 1500"
+PADRAO_VALOR = r"R\$\s*(\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d+(?:,\d{1,2})?)"
+# Quantidade de parcelas: "8x", "10 x"
+PADRAO_PARCELAS = r"(\d+)\s*[xX]"
+
+# Colunas numéricas: (coluna numérica, coluna de texto de origem, padrão, tipo)
+CAMPOS_NUMERICOS = [
+    ("preco_principal", "Preço Principal", PADRAO_VALOR, "valor"),
+    ("preco_vista", "Preço à Vista", PADRAO_VALOR, "valor"),
+    ("parcelas", "Qtd. Parcelas", PADRAO_PARCELAS, "inteiro"),
+    ("valor_parcela", "Valor Parcela", PADRAO_VALOR, "valor"),
+]
+
+COLUNAS_NORMALIZADAS = COLUNAS_PRODUTO + [coluna for coluna, _, _, _ in CAMPOS_NUMERICOS] + ["campos_invalidos"]
+
+
+def converter_coluna(serie, padrao, tipo):
+    """
+    Converte uma coluna de texto de forma vetorizada.
+    Retorna (valores numéricos, máscara dos valores presentes que não puderam ser convertidos).
+    """
+    texto = serie.astype(object).astype(str)
+    ausente = serie.isna() | texto.str.strip().isin(["", "N/A"])
+    numero = texto.str.extract(padrao, expand=False)
+    if tipo == "valor":
+        numero = numero.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+        valores = pd.to_numeric(numero, errors="coerce").astype("float64")
+    else:
+        valores = pd.to_numeric(numero, errors="coerce").astype("Int64")
+    invalido = (~ausente & valores.isna()).fillna(False).astype(bool)
+    return valores, invalido
+
+
+def normalizar_precos(df):
+    """
+    Acrescenta ao DataFrame de produtos as colunas numéricas preco_principal, preco_vista, parcelas
+    e valor_parcela, e a coluna campos_invalidos com os nomes (separados por vírgula) das colunas
+    cujo texto estava presente mas não pôde ser convertido.
+    """
+    df = df.copy()
+    invalidos = pd.DataFrame(index=df.index)
+    for coluna, origem, padrao, tipo in CAMPOS_NUMERICOS:
+        texto = df[origem] if origem in df else pd.Series(None, index=df.index, dtype=object)
+        df[coluna], invalidos[coluna] = converter_coluna(texto, padrao, tipo)
+    # Produto da matriz booleana pelos nomes das colunas: concatena os nomes das colunas inválidas
+    df["campos_invalidos"] = invalidos.dot(invalidos.columns + ",").str.rstrip(",")
+    return df
+
+
+def converter_valor(texto, padrao=PADRAO_VALOR, tipo="valor"):
+    """Versão por valor de converter_coluna. Retorna (número ou None, inválido)."""
+    if valor_vazio(texto):
+        return None, False
+    correspondencia = re.search(padrao, str(texto))
+    if not correspondencia:
+        return None, True
+    numero = correspondencia.group(1)
+    if tipo == "valor":
+        return float(numero.replace(".", "").replace(",", ".")), False
+    return int(numero), False
+
+
+def normalizar_produto(produto):
+    """Versão por produto de normalizar_precos (uma linha por vez), usada como referência no benchmark"""
+    normalizado = dict(produto)
+    invalidos = []
+    for coluna, origem, padrao, tipo in CAMPOS_NUMERICOS:
+        normalizado[coluna], invalido = converter_valor(produto.get(origem), padrao, tipo)
+        if invalido:
+            invalidos.append(coluna)
+    normalizado["campos_invalidos"] = ",".join(invalidos)
+    return normalizado
+
+
+def normalizar_saida(saida, caminho, formato, tamanho_bloco=5000):
+    """
+    Lê a saída incremental em blocos, normaliza cada bloco e grava o conjunto normalizado em
+    `caminho` no formato informado (jsonl, csv ou parquet).
+    Retorna (total de produtos, produtos com campos inválidos).
+    """
+    total = 0
+    com_invalidos = 0
+    escritor_parquet = None
+    esquema = None
+    if formato == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        tipos = {"preco_principal": pa.float64(), "preco_vista": pa.float64(),
+                 "parcelas": pa.int64(), "valor_parcela": pa.float64()}
+        esquema = pa.schema([(coluna, tipos.get(coluna, pa.string())) for coluna in COLUNAS_NORMALIZADAS])
+        escritor_parquet = pq.ParquetWriter(caminho, esquema)
+
+    with open(caminho, "w", newline="", encoding="utf-8") if escritor_parquet is None else nullcontext() as arquivo:
+        for bloco in saida.ler_em_blocos(tamanho_bloco):
+            df = normalizar_precos(pd.DataFrame([como_produto(produto).valores() for produto in bloco],
+                                                columns=COLUNAS_PRODUTO))[COLUNAS_NORMALIZADAS]
+            if formato == "jsonl":
+                linhas = df.to_json(orient="records", lines=True, force_ascii=False)
+                arquivo.write(linhas if linhas.endswith("\n") else linhas + "\n")
+            elif formato == "csv":
+                df.to_csv(arquivo, index=False, header=total == 0)
+            else:
+                escritor_parquet.write_table(pa.Table.from_pandas(df, schema=esquema, preserve_index=False))
+            total += len(df)
+            com_invalidos += int((df["campos_invalidos"] != "").sum())
+
+    if escritor_parquet is not None:
+        escritor_parquet.close()
+    return total, com_invalidos
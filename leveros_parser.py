@@ -0,0 +1,174 @@
+"""
+Captura e análise offline das páginas do catálogo
+No modo de captura, o navegador só lê o HTML renderizado dos cards de cada página (uma leitura do
+DOM por página) e o grava em um armazém de snapshots. A análise dos snapshots é feita fora do
+navegador, com lxml, em um pool de processos, e produz os mesmos campos que o script
+extrairDadosCard do RPA. Como os snapshots ficam em disco, uma correção nos seletores pode ser
+aplicada reprocessando-os, sem nova raspagem.
+
+Formato do snapshot: <diretório>/<categoria (URL-encoded)>/<página com 5 dígitos>.html.gz, um
+documento HTML com os metadados da captura em <meta> e os cards mais externos no <body>.
+"""
+
+import os
+import re
+import gzip
+import html
+from datetime import datetime
+from urllib.parse import quote, unquote, urlparse
+
+# Seletores dos cards, na ordem em que são tentados (os mesmos de extrair_produtos_da_pagina)
+SELETORES_CARDS = [
+    "div.q-card.q-hoverable",
+    "div.q-card",
+    "div.my-card",
+    "div.q-card.my-card",
+    'div[class*="card"]',
+]
+
+# Lê em uma única chamada o HTML dos cards mais externos do primeiro seletor que encontrar cards
+# (arguments[0]: lista de seletores). Sem cards pelos seletores, procura os cards pelos preços
+# e pelo parcelamento, como a extração no navegador.
+SCRIPT_CAPTURA_CARDS = """
+function apenasCardsExternos(cards) {
+    return cards.filter(card => !cards.some(outro => outro !== card && outro.contains(card)));
+}
+for (const seletor of arguments[0]) {
+    const cards = apenasCardsExternos(Array.from(document.querySelectorAll(seletor)));
+    if (cards.length) {
+        return {seletor: seletor, url: location.href, cards: cards.map(card => card.outerHTML)};
+    }
+}
+const candidatos = [];
+document.querySelectorAll('div.text-h6.text-weight-bold.text-teal-9, div.text-caption.text-weight-bold')
+    .forEach(el => {
+        const card = el.closest('div.q-card') || el.closest('div[class*="card"]');
+        if (card && !candidatos.includes(card)) candidatos.push(card);
+    });
+return {seletor: 'estrutura', url: location.href, cards: apenasCardsExternos(candidatos).map(card => card.outerHTML)};
+"""
+
+URL_IMAGEM_PUBLICA = "https://www.vendas.leveros.com.br/upload/produto/imagem/{arquivo}"
+
+
+def xpath_classes(tag, *classes):
+    """XPath relativo equivalente ao seletor CSS tag.classe1.classe2 (sem depender do cssselect)"""
+    condicoes = " and ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {classe} ')"
+                             for classe in classes)
+    return f".//{tag}[{condicoes}]"
+
+
+XPATH_NOME = xpath_classes("div", "menuItems", "text-caption", "q-pt-sm", "ellipsis-2-lines")
+XPATH_CHIPS = xpath_classes("div", "q-chip--outline")
+XPATH_PRECO_PRINCIPAL = xpath_classes("div", "text-h6", "text-weight-bold", "text-teal-9")
+XPATH_PARCELAMENTO = xpath_classes("div", "text-caption", "text-weight-bold")
+XPATH_CAPTION = xpath_classes("div", "text-caption")
+XPATH_IMAGEM = xpath_classes("div", "q-img") + "//img"
+
+PADRAO_CHIP_VOLTAGEM = re.compile(r"\d\s*v\b", re.IGNORECASE)
+PADRAO_CHIP_BTU = re.compile(r"btu", re.IGNORECASE)
+
+
+def texto_ou_padrao(card, xpath, padrao="N/A"):
+    elementos = card.xpath(xpath)
+    return elementos[0].text_content().strip() if elementos else padrao
+
+
+def url_imagem_publica(url_privada):
+    """URL da imagem no site público de vendas, a partir do nome do arquivo da URL privada"""
+    if not url_privada or url_privada == "N/A":
+        return "N/A"
+    partes = urlparse(url_privada)
+    if not partes.scheme or not partes.netloc:
+        # new URL() do navegador falha com URLs relativas; o script devolve a URL original
+        return url_privada
+    return URL_IMAGEM_PUBLICA.format(arquivo=partes.path.split("/")[-1])
+
+
+def extrair_dados_card_html(card):
+    """Campos de um card (elemento lxml), com os mesmos nomes e regras de extrairDadosCard"""
+    chips = [chip.text_content().strip() for chip in card.xpath(XPATH_CHIPS)]
+    voltagem = next((chip for chip in chips if PADRAO_CHIP_VOLTAGEM.search(chip) and not PADRAO_CHIP_BTU.search(chip)),
+                    None) or next((chip for chip in chips if not PADRAO_CHIP_BTU.search(chip)), None) or "N/A"
+
+    preco_vista = ""
+    for caption in card.xpath(XPATH_CAPTION):
+        texto = caption.text_content()
+        if texto and "à vista" in texto:
+            preco_vista = texto.strip()
+            break
+    if not preco_vista:
+        preco_vista = texto_ou_padrao(card, XPATH_CAPTION)
+
+    imagens = card.xpath(XPATH_IMAGEM)
+    url_imagem = (imagens[0].get("src") or "N/A") if imagens else "N/A"
+
+    return {
+        "nome": texto_ou_padrao(card, XPATH_NOME),
+        "voltagem": voltagem,
+        "btu": next((chip for chip in chips if PADRAO_CHIP_BTU.search(chip)), None) or "N/A",
+        "precoPrincipal": texto_ou_padrao(card, XPATH_PRECO_PRINCIPAL),
+        "infoParcelamento": texto_ou_padrao(card, XPATH_PARCELAMENTO),
+        "precoVista": preco_vista,
+        "urlImagem": url_imagem,
+        "urlImagemPublica": url_imagem_publica(url_imagem),
+    }
+
+
+def analisar_snapshot(caminho):
+    """
+    Lê e analisa um snapshot. Função de nível de módulo para poder rodar no pool de processos.
+    Retorna (metadados, [campos de cada card]).
+    """
+    import lxml.html
+    with gzip.open(caminho, "rb") as f:
+        documento = lxml.html.document_fromstring(f.read())
+    metadados = {meta.get("name"): meta.get("content") for meta in documento.xpath("//head/meta[@name]")}
+    corpo = documento.find("body")
+    cards = list(corpo) if corpo is not None else []
+    return metadados, [extrair_dados_card_html(card) for card in cards]
+
+
+class ArmazemSnapshots:
+    """Snapshots do HTML dos cards, um arquivo por página de cada categoria"""
+
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+
+    def caminho(self, categoria, pagina):
+        return os.path.join(self.diretorio, quote(categoria, safe=""), f"{pagina:05d}.html.gz")
+
+    def gravar(self, categoria, pagina, captura):
+        """Grava a captura ({seletor, url, cards}) de uma página de forma atômica. Retorna o caminho."""
+        caminho = self.caminho(categoria, pagina)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        metadados = {
+            "categoria": categoria,
+            "pagina": pagina,
+            "url": captura.get("url", ""),
+            "seletor": captura.get("seletor", ""),
+            "capturado_em": datetime.now().isoformat(timespec="seconds"),
+        }
+        cabecalho = "".join(f'<meta name="{nome}" content="{html.escape(str(valor))}">'
+                            for nome, valor in metadados.items())
+        documento = (f'<!DOCTYPE html><html><head><meta charset="utf-8">{cabecalho}</head><body>'
+                     + "\n".join(captura.get("cards") or []) + "</body></html>")
+        temporario = f"{caminho}.tmp"
+        with gzip.open(temporario, "wb", compresslevel=5) as f:
+            f.write(documento.encode("utf-8"))
+        os.replace(temporario, caminho)
+        return caminho
+
+    def categorias(self):
+        if not os.path.isdir(self.diretorio):
+            return []
+        return sorted(unquote(nome) for nome in os.listdir(self.diretorio)
+                      if os.path.isdir(os.path.join(self.diretorio, nome)))
+
+    def paginas(self, categoria):
+        """[(página, caminho)] da categoria, em ordem de página"""
+        diretorio = os.path.join(self.diretorio, quote(categoria, safe=""))
+        if not os.path.isdir(diretorio):
+            return []
+        return sorted((int(nome.split(".")[0]), os.path.join(diretorio, nome))
+                      for nome in os.listdir(diretorio) if nome.endswith(".html.gz"))
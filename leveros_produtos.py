@@ -0,0 +1,180 @@
+"""
+Registros de produtos da Leveros Integra
+Colunas do registro, identidade do produto e mesclagem de registros duplicados.
+"""
+
+import re
+import sys
+import unicodedata
+from collections.abc import Mapping
+
+# Colunas do registro de produto, na ordem das exportações
+COLUNAS_PRODUTO = [
+    "Categoria", "Nome do Produto", "Voltagem", "BTU", "Preço Principal", "Preço à Vista",
+    "Qtd. Parcelas", "Valor Parcela", "URL da Imagem", "URL Pública da Imagem"
+]
+
+# Atributos do Produto correspondentes às colunas, na mesma ordem
+ATRIBUTOS_PRODUTO = [
+    "categoria", "nome", "voltagem", "btu", "preco_principal", "preco_vista",
+    "qtd_parcelas", "valor_parcela", "url_imagem", "url_publica_imagem"
+]
+ATRIBUTO_DA_COLUNA = dict(zip(COLUNAS_PRODUTO, ATRIBUTOS_PRODUTO))
+
+# Colunas com poucos valores distintos, repetidos em todo o catálogo: os textos são internados
+# (uma única cópia de "Multi-Split" ou "220V" na memória) e, em Parquet, gravados como dicionário
+COLUNAS_CATEGORICAS = ("Categoria", "Voltagem")
+
+
+class Produto(Mapping):
+    """
+    Registro de produto com um atributo por coluna (__slots__, sem dicionário por instância).
+    Também é acessado como um dicionário somente das colunas de COLUNAS_PRODUTO, na mesma ordem
+    (produto["Nome do Produto"], produto.get(...), dict(produto)), para os módulos que tratam os
+    registros pelos nomes das colunas. Só os campos existentes podem ser alterados.
+    """
+
+    __slots__ = tuple(ATRIBUTOS_PRODUTO)
+
+    def __init__(self, categoria="N/A", nome="N/A", voltagem="N/A", btu="N/A", preco_principal="N/A",
+                 preco_vista="N/A", qtd_parcelas="N/A", valor_parcela="N/A", url_imagem="N/A",
+                 url_publica_imagem="N/A"):
+        self.categoria = internar(categoria)
+        self.nome = nome
+        self.voltagem = internar(voltagem)
+        self.btu = btu
+        self.preco_principal = preco_principal
+        self.preco_vista = preco_vista
+        self.qtd_parcelas = qtd_parcelas
+        self.valor_parcela = valor_parcela
+        self.url_imagem = url_imagem
+        self.url_publica_imagem = url_publica_imagem
+
+    @classmethod
+    def de_registro(cls, registro):
+        """Produto a partir de um dicionário (ou outro Produto) com as colunas de COLUNAS_PRODUTO"""
+        return cls(*(registro.get(coluna) for coluna in COLUNAS_PRODUTO))
+
+    def valores(self):
+        """Valores das colunas, na ordem de COLUNAS_PRODUTO"""
+        return [getattr(self, atributo) for atributo in ATRIBUTOS_PRODUTO]
+
+    def __getitem__(self, coluna):
+        try:
+            return getattr(self, ATRIBUTO_DA_COLUNA[coluna])
+        except (KeyError, TypeError):
+            raise KeyError(coluna) from None
+
+    def __setitem__(self, coluna, valor):
+        atributo = ATRIBUTO_DA_COLUNA.get(coluna)
+        if atributo is None:
+            raise KeyError(coluna)
+        if coluna in COLUNAS_CATEGORICAS:
+            valor = internar(valor)
+        setattr(self, atributo, valor)
+
+    def __iter__(self):
+        return iter(COLUNAS_PRODUTO)
+
+    def __len__(self):
+        return len(COLUNAS_PRODUTO)
+
+    def __repr__(self):
+        return f"Produto({dict(self)!r})"
+
+    def __getstate__(self):
+        return self.valores()
+
+    def __setstate__(self, valores):
+        self.__init__(*valores)
+
+
+def como_produto(registro):
+    """O próprio registro, se já for um Produto, ou um Produto com os campos do dicionário"""
+    return registro if isinstance(registro, Produto) else Produto.de_registro(registro)
+
+
+def internar(valor):
+    """Mesma instância para textos iguais (valores repetidos em muitos registros)"""
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+def valor_vazio(valor):
+    """Indica se o valor de um campo está ausente"""
+    return valor is None or str(valor).strip() in ("", "N/A")
+
+
+def normalizar_nome(nome):
+    """Normaliza o nome do produto para comparação: sem acentos, minúsculo e com espaços simples"""
+    nome = unicodedata.normalize("NFKD", nome or "")
+    nome = "".join(c for c in nome if not unicodedata.combining(c))
+    return " ".join(nome.casefold().split())
+
+
+def chave_produto(produto):
+    """Identidade do produto: nome normalizado e URL da imagem. Retorna None para produtos sem nome."""
+    nome = produto.get("Nome do Produto")
+    if valor_vazio(nome):
+        return None
+    return normalizar_nome(nome), (produto.get("URL da Imagem") or "N/A").strip()
+
+
+def limpar_preco(texto):
+    """Corrige o preço dos cards aninhados: 'R$ R$ 7.999,00 à prazo' -> 'R$ 7.999,00'"""
+    if valor_vazio(texto):
+        return texto
+    texto = re.sub(r"^(R\$\s*)+", "R$ ", texto.strip())
+    return re.sub(r"\s*à prazo$", "", texto)
+
+
+# Texto de parcelamento do card: "8x de R$ 999,88 sem juros"
+PADRAO_PARCELAMENTO = re.compile(r"^\s*(\d+\s*x)\s+de\s+(.+?)\s*$", re.IGNORECASE)
+
+
+def separar_parcelamento(texto):
+    """Separa o parcelamento em quantidade e valor: '8x de R$ 999,88 sem juros' -> ('8x', 'R$ 999,88 sem juros')"""
+    correspondencia = None if valor_vazio(texto) else PADRAO_PARCELAMENTO.match(texto)
+    if not correspondencia:
+        return "N/A", "N/A"
+    return correspondencia.group(1), correspondencia.group(2)
+
+
+def produto_do_resultado(resultado, categoria):
+    """Produto a partir dos campos de um card (extrairDadosCard ou extrair_dados_card_html)"""
+    qtd_parcelas, valor_parcela = separar_parcelamento(resultado.get("infoParcelamento", "N/A"))
+    return Produto(
+        categoria=categoria,
+        nome=resultado.get("nome", "N/A"),
+        voltagem=resultado.get("voltagem", "N/A"),
+        btu=resultado.get("btu", "N/A"),
+        preco_principal=limpar_preco(resultado.get("precoPrincipal", "N/A")),
+        preco_vista=resultado.get("precoVista", "N/A"),
+        qtd_parcelas=qtd_parcelas,
+        valor_parcela=valor_parcela,
+        url_imagem=resultado.get("urlImagem", "N/A"),
+        url_publica_imagem=resultado.get("urlImagemPublica", "N/A")
+    )
+
+
+def mesclar_produtos(produtos):
+    """
+    Mescla os registros do mesmo produto (mesmo nome normalizado e URL da imagem) em um só,
+    preenchendo os campos ausentes de um com os do outro (por exemplo, Voltagem e BTU vindos
+    de chips de cards diferentes). Preserva a ordem da primeira ocorrência.
+    """
+    mesclados = []
+    por_chave = {}
+    for produto in produtos:
+        chave = chave_produto(produto)
+        if chave is None or chave not in por_chave:
+            registro = Produto.de_registro(produto)
+            mesclados.append(registro)
+            if chave is not None:
+                por_chave[chave] = registro
+            continue
+
+        registro = por_chave[chave]
+        for campo, valor in produto.items():
+            if valor_vazio(registro.get(campo)) and not valor_vazio(valor):
+                registro[campo] = valor
+    return mesclados
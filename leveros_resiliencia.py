@@ -0,0 +1,252 @@
+"""
+Política de novas tentativas da extração
+Substitui as tentativas fixas espalhadas pelo RPA (N tentativas com pausas fixas, aninhadas entre
+navegação, página e card) por uma política única:
+
+- espera exponencial com jitter entre as tentativas;
+- prazos (por página e por categoria): nenhuma tentativa começa, nem espera, além do prazo;
+- orçamento compartilhado de novas tentativas: cada nova tentativa consome uma ficha e cada
+  sucesso devolve uma fração dela, então uma degradação geral do site não multiplica as tentativas;
+- disjuntores (por categoria e para o site inteiro): quando a taxa de erros recentes passa do
+  limite, as chamadas falham na hora por um tempo, em vez de insistir no site degradado.
+"""
+
+import time
+import random
+import logging
+import threading
+import traceback
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class PrazoEsgotado(Exception):
+    """O prazo da operação terminou antes de ela ter sucesso"""
+
+    def __init__(self, prazo):
+        super().__init__(f"prazo {prazo.descricao} de {prazo.segundos:.0f}s esgotado")
+        self.prazo = prazo
+
+
+class CircuitoAberto(Exception):
+    """O disjuntor está aberto: as chamadas falham na hora até o fim do tempo de abertura"""
+
+    def __init__(self, disjuntor):
+        super().__init__(f"circuito {disjuntor.nome} aberto (taxa de erros {disjuntor.taxa_erros():.0%})")
+        self.disjuntor = disjuntor
+
+
+class Prazo:
+    """Instante limite de uma operação (None: sem prazo)"""
+
+    def __init__(self, segundos, descricao=""):
+        self.segundos = segundos
+        self.descricao = descricao
+        self.limite = time.monotonic() + segundos if segundos else None
+
+    def restante(self):
+        if self.limite is None:
+            return float("inf")
+        return max(0.0, self.limite - time.monotonic())
+
+    def esgotado(self):
+        return self.restante() <= 0
+
+    @staticmethod
+    def mais_proximo(*prazos):
+        """O prazo que termina primeiro entre os informados (ignora None)"""
+        prazos = [prazo for prazo in prazos if prazo is not None]
+        return min(prazos, key=Prazo.restante) if prazos else None
+
+
+class OrcamentoTentativas:
+    """
+    Orçamento de novas tentativas compartilhado pelas etapas (e pelos workers): começa com
+    `maximo` fichas, cada nova tentativa consome uma e cada sucesso devolve `recarga_por_sucesso`.
+    """
+
+    def __init__(self, maximo=20, recarga_por_sucesso=0.1):
+        self.maximo = maximo
+        self.recarga_por_sucesso = recarga_por_sucesso
+        self.fichas = float(maximo)
+        self.trava = threading.Lock()
+
+    def consumir(self):
+        """Reserva uma nova tentativa. Retorna False se o orçamento estiver esgotado."""
+        with self.trava:
+            if self.fichas < 1:
+                return False
+            self.fichas -= 1
+            return True
+
+    def registrar_sucesso(self):
+        with self.trava:
+            self.fichas = min(self.maximo, self.fichas + self.recarga_por_sucesso)
+
+
+class Disjuntor:
+    """
+    Disjuntor por taxa de erros. Fechado, registra o resultado das últimas `janela` chamadas e abre
+    quando há pelo menos `minimo_chamadas` e a taxa de erros chega a `limiar`. Aberto, recusa as
+    chamadas por `tempo_aberto` segundos; depois deixa passar uma chamada de teste (meio aberto),
+    que fecha o disjuntor se tiver sucesso ou o abre de novo se falhar.
+    """
+
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    MEIO_ABERTO = "meio_aberto"
+
+    def __init__(self, nome, limiar=0.5, janela=20, minimo_chamadas=6, tempo_aberto=60, ao_abrir=None):
+        self.nome = nome
+        self.limiar = limiar
+        self.minimo_chamadas = minimo_chamadas
+        self.tempo_aberto = tempo_aberto
+        self.ao_abrir = ao_abrir
+        self.resultados = deque(maxlen=janela)
+        self.estado = self.FECHADO
+        self.aberto_em = None
+        self.teste_em_andamento = False
+        self.trava = threading.Lock()
+
+    def taxa_erros(self):
+        if not self.resultados:
+            return 0.0
+        return sum(1 for sucesso in self.resultados if not sucesso) / len(self.resultados)
+
+    def permitir(self):
+        """Indica se uma chamada pode ser feita agora"""
+        with self.trava:
+            if self.estado == self.FECHADO:
+                return True
+            if self.estado == self.ABERTO and time.monotonic() - self.aberto_em >= self.tempo_aberto:
+                self.estado = self.MEIO_ABERTO
+                self.teste_em_andamento = False
+            if self.estado == self.MEIO_ABERTO and not self.teste_em_andamento:
+                self.teste_em_andamento = True
+                return True
+            return False
+
+    def registrar(self, sucesso):
+        with self.trava:
+            if self.estado == self.MEIO_ABERTO:
+                if sucesso:
+                    self.estado = self.FECHADO
+                    self.resultados.clear()
+                    logger.info(f"Circuito {self.nome} fechado após a chamada de teste.")
+                else:
+                    self.abrir()
+                return
+            self.resultados.append(sucesso)
+            if self.estado == self.FECHADO and len(self.resultados) >= self.minimo_chamadas \
+                    and self.taxa_erros() >= self.limiar:
+                self.abrir()
+
+    def abrir(self):
+        self.estado = self.ABERTO
+        self.aberto_em = time.monotonic()
+        self.teste_em_andamento = False
+        logger.warning(f"Circuito {self.nome} aberto por {self.tempo_aberto:.0f}s "
+                       f"(taxa de erros {self.taxa_erros():.0%}).")
+        if self.ao_abrir:
+            self.ao_abrir(self)
+
+
+class PoliticaTentativas:
+    """
+    Executa uma etapa com novas tentativas: até `tentativas` execuções, com espera exponencial
+    (espera_inicial * multiplicador^n, limitada a espera_maxima) e jitter completo, dentro do prazo,
+    do orçamento e dos disjuntores informados. `metricas` (opcional) recebe os contadores.
+    """
+
+    def __init__(self, tentativas=3, espera_inicial=0.5, espera_maxima=8.0, multiplicador=2.0,
+                 orcamento=None, metricas=None):
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self.multiplicador = multiplicador
+        self.orcamento = orcamento
+        self.metricas = metricas
+
+    def espera(self, tentativa):
+        """Espera antes da nova tentativa seguinte à `tentativa` (1, 2, ...), com jitter completo"""
+        teto = min(self.espera_maxima, self.espera_inicial * self.multiplicador ** (tentativa - 1))
+        return random.uniform(0, teto)
+
+    def contador(self, nome, **rotulos):
+        if self.metricas is not None:
+            self.metricas.contador(nome, **rotulos)
+
+    def executar(self, funcao, etapa, prazo=None, disjuntores=(), tentativas=None, fatal=None,
+                 repetir_resultado=None, antes_de_repetir=None):
+        """
+        Executa `funcao()` e retorna o resultado.
+
+        - `fatal(erro)`: erros que não devem ser repetidos (propagados na hora);
+        - `repetir_resultado(resultado)`: resultados válidos, mas que merecem nova tentativa (por
+          exemplo, página sem cards). Esgotadas as tentativas, o último resultado é retornado.
+          Não contam como erro nos disjuntores;
+        - `antes_de_repetir()`: chamada antes de cada nova tentativa (por exemplo, rolar a página).
+
+        Levanta PrazoEsgotado, CircuitoAberto ou o último erro da função.
+        """
+        tentativas = tentativas or self.tentativas
+        tentativa = 1
+        while True:
+            if prazo is not None and prazo.esgotado():
+                self.contador("leveros_tentativas_negadas_total", etapa=etapa, motivo="prazo")
+                raise PrazoEsgotado(prazo)
+            for disjuntor in disjuntores:
+                if not disjuntor.permitir():
+                    self.contador("leveros_tentativas_negadas_total", etapa=etapa, motivo="circuito")
+                    raise CircuitoAberto(disjuntor)
+
+            try:
+                resultado = funcao()
+            except (PrazoEsgotado, CircuitoAberto):
+                # De uma etapa interna (por exemplo, um card dentro da página): não é repetido
+                raise
+            except Exception as e:
+                for disjuntor in disjuntores:
+                    disjuntor.registrar(False)
+                if fatal is not None and fatal(e):
+                    raise
+                motivo = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+                detalhe = traceback.format_exc()
+                erro = e
+            else:
+                for disjuntor in disjuntores:
+                    disjuntor.registrar(True)
+                if repetir_resultado is None or not repetir_resultado(resultado):
+                    if self.orcamento is not None:
+                        self.orcamento.registrar_sucesso()
+                    return resultado
+                motivo = "resultado vazio"
+                detalhe = None
+                erro = None
+
+            # Nova tentativa: dentro do limite de tentativas, do orçamento e do prazo
+            if tentativa >= tentativas:
+                if erro is not None:
+                    raise erro
+                return resultado
+            if self.orcamento is not None and not self.orcamento.consumir():
+                self.contador("leveros_tentativas_negadas_total", etapa=etapa, motivo="orcamento")
+                logger.warning(f"{etapa}: orçamento de novas tentativas esgotado ({motivo}).")
+                if erro is not None:
+                    raise erro
+                return resultado
+            espera = self.espera(tentativa)
+            if prazo is not None and espera >= prazo.restante():
+                self.contador("leveros_tentativas_negadas_total", etapa=etapa, motivo="prazo")
+                raise PrazoEsgotado(prazo)
+
+            logger.warning(f"{etapa}: tentativa {tentativa}/{tentativas} falhou ({motivo}). "
+                           f"Nova tentativa em {espera:.1f}s...")
+            if detalhe:
+                logger.debug(detalhe)
+            self.contador("leveros_tentativas_repetidas_total", etapa=etapa)
+            time.sleep(espera)
+            if antes_de_repetir is not None:
+                antes_de_repetir()
+            tentativa += 1
@@ -4,10 +4,16 @@ Script principal de automação para extrair dados de produtos de ar-condicionad
 """
 
 import os
+import csv
+import json
+import base64
 import time
 import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
-import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -15,18 +21,29 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
 import platform
 import subprocess
 import traceback
-import requests
-import zipfile
 import shutil
-import tempfile
 from fpdf import FPDF
 from urllib.parse import urlparse
-from io import BytesIO
-from PIL import Image
+import leveros_api
+from leveros_checkpoint import CheckpointExtracao
+from leveros_produtos import mesclar_produtos, produto_do_resultado, valor_vazio
+from leveros_historico import HistoricoPrecos
+from leveros_catalogo import CatalogoProdutos
+from leveros_saida import criar_saida, FORMATOS_SAIDA
+from leveros_exportacao import exportar_excel
+from leveros_imagens import CacheImagens, miniatura_do_produto
+from leveros_normalizacao import normalizar_saida
+from leveros_driver import resolver_chromedriver, VERSAO_CHROMEDRIVER, DIRETORIO_CACHE_DRIVER
+from leveros_metricas import Metricas
+from leveros_estrategias import CacheEstrategias
+from leveros_navegacao import IndiceNavegacao
+from leveros_saude import MonitorNavegador
+from leveros_resiliencia import (PoliticaTentativas, OrcamentoTentativas, Disjuntor, Prazo, PrazoEsgotado,
+                                 CircuitoAberto)
+from leveros_parser import ArmazemSnapshots, analisar_snapshot, SCRIPT_CAPTURA_CARDS, SELETORES_CARDS
 
 # Configuração de logging
 logging.basicConfig(
@@ -39,10 +56,225 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Funções JavaScript para extrair os dados de um card de produto. São compartilhadas
+# entre a extração card a card e a extração em lote (uma chamada por página).
+FUNCOES_JS_CARD = """
+function getTextOrDefault(card, selector, defaultValue = "N/A") {
+    const el = card.querySelector(selector);
+    return el ? el.textContent.trim() : defaultValue;
+}
+
+function getAttributeOrDefault(card, selector, attribute, defaultValue = "N/A") {
+    const el = card.querySelector(selector);
+    return el ? (el.getAttribute(attribute) || defaultValue) : defaultValue;
+}
+
+function findElementWithText(card, selector, text) {
+    const elements = card.querySelectorAll(selector);
+    for(let el of elements) {
+        if(el.textContent && el.textContent.includes(text)) {
+            return el.textContent.trim();
+        }
+    }
+    return "";
+}
+
+function getPublicImageUrl(privateUrl) {
+    // Extrair o ID da imagem ou caminho da URL privada
+    if (!privateUrl || privateUrl === 'N/A') return 'N/A';
+
+    try {
+        // Tentar extrair o nome do arquivo da URL
+        const urlObj = new URL(privateUrl);
+        const pathname = urlObj.pathname;
+        const filename = pathname.split('/').pop();
+
+        // Construir URL pública baseada no domínio de vendas da Leveros
+        return `https://www.vendas.leveros.com.br/upload/produto/imagem/${filename}`;
+    } catch (e) {
+        // Se falhar, retornar a URL original
+        return privateUrl;
+    }
+}
+
+function extrairDadosCard(card) {
+    const result = {};
+
+    // Nome do produto
+    result.nome = getTextOrDefault(card, 'div.menuItems.text-caption.q-pt-sm.ellipsis-2-lines');
+
+    // Chips: voltagem (ex.: "220 V") e capacidade (ex.: "30000 BTUs")
+    const chips = Array.from(card.querySelectorAll('div.q-chip--outline')).map(el => el.textContent.trim());
+    result.voltagem = chips.find(chip => /\d\s*v\b/i.test(chip) && !/btu/i.test(chip))
+        || chips.find(chip => !/btu/i.test(chip)) || "N/A";
+    result.btu = chips.find(chip => /btu/i.test(chip)) || "N/A";
+
+    // Preço principal
+    result.precoPrincipal = getTextOrDefault(card, 'div.text-h6.text-weight-bold.text-teal-9');
+
+    // Info de parcelamento
+    result.infoParcelamento = getTextOrDefault(card, 'div.text-caption.text-weight-bold');
+
+    // Preço à vista (usando função personalizada para encontrar o elemento com o texto "à vista")
+    result.precoVista = findElementWithText(card, 'div.text-caption', 'à vista');
+
+    // Se não encontrou "à vista", pega qualquer text-caption como fallback
+    if (!result.precoVista) {
+        result.precoVista = getTextOrDefault(card, 'div.text-caption');
+    }
+
+    // URL da imagem privada (área logada)
+    result.urlImagem = getAttributeOrDefault(card, 'div.q-img img', 'src');
+
+    // URL pública da imagem
+    result.urlImagemPublica = getPublicImageUrl(result.urlImagem);
+
+    return result;
+}
+"""
+
+# Extrai os dados de um único card (arguments[0] é o card)
+SCRIPT_DADOS_CARD = FUNCOES_JS_CARD + "\nreturn extrairDadosCard(arguments[0]);\n"
+
+# Extrai os dados de todos os cards da página em uma única chamada (arguments[0] é a lista de cards)
+SCRIPT_DADOS_PAGINA = FUNCOES_JS_CARD + "\nreturn Array.from(arguments[0]).map(extrairDadosCard);\n"
+
+# Mantém apenas o card mais externo quando um card de produto contém outro (cards aninhados
+# fariam o mesmo produto ser extraído duas vezes)
+FUNCAO_JS_CARDS_EXTERNOS = """
+function apenasCardsExternos(cards) {
+    return cards.filter(card => !cards.some(outro => outro !== card && outro.contains(card)));
+}
+"""
+
+# Cards mais externos que correspondem a um seletor (arguments[0])
+SCRIPT_CARDS_SELETOR = FUNCAO_JS_CARDS_EXTERNOS + """
+return apenasCardsExternos(Array.from(document.querySelectorAll(arguments[0])));
+"""
+
+# Cards encontrados pelo conteúdo característico (preços e parcelamento), quando nenhum seletor funciona
+ESTRATEGIA_ESTRUTURA = "estrutura"
+SCRIPT_CARDS_ESTRUTURA = FUNCAO_JS_CARDS_EXTERNOS + """
+// Buscar elementos que provavelmente são cards de produtos
+let potentialCards = [];
+
+// Cards geralmente contêm preços
+document.querySelectorAll('div.text-h6.text-weight-bold.text-teal-9').forEach(priceEl => {
+    let card = priceEl.closest('div.q-card') || priceEl.closest('div[class*="card"]');
+    if (card && !potentialCards.includes(card)) {
+        potentialCards.push(card);
+    }
+});
+
+// Cards também podem conter informações de parcelamento
+document.querySelectorAll('div.text-caption.text-weight-bold').forEach(infoEl => {
+    let card = infoEl.closest('div.q-card') || infoEl.closest('div[class*="card"]');
+    if (card && !potentialCards.includes(card)) {
+        potentialCards.push(card);
+    }
+});
+
+return apenasCardsExternos(potentialCards);
+"""
+
+# Métodos de localização do bloco da categoria, na ordem da cascata (ver localizar_categoria)
+METODOS_LOCALIZAR_CATEGORIA = ["xpath_texto", "javascript_texto", "css_generico"]
+
+# Estado de prontidão da página. Na primeira chamada instala um MutationObserver que
+# registra o instante da última alteração do DOM; as chamadas seguintes apenas leem o estado.
+# arguments[0]: seletor dos cards, arguments[1]: seletor que deve estar presente,
+# arguments[2]: seletor que deve estar ausente (ou invisível)
+SCRIPT_ESTADO_PAGINA = """
+if (!window.__rpaObservador) {
+    window.__rpaUltimaMutacao = Date.now();
+    window.__rpaObservador = new MutationObserver(function() {
+        window.__rpaUltimaMutacao = Date.now();
+    });
+    window.__rpaObservador.observe(document.documentElement, {
+        childList: true, subtree: true, characterData: true
+    });
+}
+
+function visivel(el) {
+    return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+
+const cards = document.querySelectorAll(arguments[0]);
+return {
+    documentoCompleto: document.readyState === 'complete',
+    carregando: Array.from(document.querySelectorAll('.q-loading, .q-inner-loading')).some(visivel),
+    msSemMutacoes: Date.now() - window.__rpaUltimaMutacao,
+    presente: !arguments[1] || document.querySelector(arguments[1]) !== null,
+    ausente: !arguments[2] || !Array.from(document.querySelectorAll(arguments[2])).some(visivel),
+    assinatura: cards.length + '|' + (cards.length ? cards[0].textContent.trim().slice(0, 200) : '')
+};
+"""
+
+# Botão de próxima página habilitado: ícone 'fast_forward' ou texto contendo 'próxima'
+SCRIPT_BOTAO_PROXIMA = """
+const buttons = Array.from(document.querySelectorAll('button'));
+const nextButton = buttons.find(btn => {
+    const icon = btn.querySelector('i.material-icons');
+    return (icon && icon.textContent.includes('fast_forward')) || 
+           btn.textContent.toLowerCase().includes('próxima');
+});
+
+if (nextButton && !nextButton.disabled) {
+    return nextButton;
+}
+return null;
+"""
+
+# Bytes transferidos pelos recursos carregados desde a leitura anterior (Resource Timing).
+# Cada leitura limpa o buffer, então cada página conta apenas o que foi carregado para ela.
+SCRIPT_METRICAS_PAGINA = """
+const recursos = performance.getEntriesByType('resource');
+let bytes = 0;
+for (const recurso of recursos) {
+    bytes += recurso.transferSize || 0;
+}
+performance.clearResourceTimings();
+performance.setResourceTimingBufferSize(10000);
+return {recursos: recursos.length, bytes: bytes};
+"""
+
+# Modo enxuto: recursos que não são usados na extração e deixam de ser baixados
+# (padrões do Network.setBlockedURLs; as imagens são desativadas pelas configurações do Blink)
+URLS_BLOQUEADAS_MODO_ENXUTO = [
+    # Fontes
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Áudio e vídeo
+    "*.mp4", "*.webm", "*.ogg", "*.mp3", "*.m3u8",
+    # Fontes hospedadas e análise de terceiros
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*google-analytics.com*", "*googletagmanager.com*",
+    "*doubleclick.net*", "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*",
+]
+
+
+def navegador_fechado(erro):
+    """Indica se o erro é de janela do navegador fechada (tratado com o reinício do navegador)"""
+    mensagem = str(erro).lower()
+    return "no such window" in mensagem or "window not found" in mensagem
+
+
+class ImagensBloqueadas(Exception):
+    """O bloqueio de imagens do modo enxuto impediu a leitura das URLs das imagens dos cards"""
+
+
+class CategoriaInacessivel(Exception):
+    """Não foi possível abrir a categoria no catálogo (tratado com o reinício do navegador)"""
+
+
 class LeverosRPA:
     """Classe principal do RPA para extração de dados da Leveros Integra"""
     
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, extracao_em_lote=True, tempo_maximo_espera=10, workers=1,
+                 usar_cache_sessao=True, modo_http=False, retomar=False, formato_saida="jsonl",
+                 baixar_imagens=False, modo_enxuto=False, relatorio_paginas=False,
+                 versao_chromedriver=VERSAO_CHROMEDRIVER, capturar_html=False, reprocessar_snapshots=None,
+                 usar_cache_estrategias=True, usar_indice_navegacao=True, paginas_por_faixa=0, abas=1,
+                 prazo_pagina=60, prazo_categoria=30 * 60, orcamento_tentativas=20,
+                 reciclar_a_cada_paginas=400, limite_memoria_navegador_mb=4096):
         """Inicializa o RPA com as configurações básicas"""
         self.url_login = "https://leverosintegra.dev.br/login"
         self.usuario = "22429301000178@22429301000178"
@@ -52,13 +284,147 @@ class LeverosRPA:
             "Cassete", "Piso Teto", "VRF", "Ar Portátil", 
             "Climatizador", "Ventilador"
         ]
-        self.dados_produtos = []
         self.driver = None
         self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         self.arquivo_excel = f"ProdutosLeveros_{self.timestamp}.xlsx"
         self.arquivo_pdf = f"ProdutosLeveros_{self.timestamp}.pdf"
+        self.arquivo_delta = f"ProdutosLeveros_delta_{self.timestamp}.csv"
+        self.arquivo_historico = "historico_precos.sqlite3"
+        self.arquivo_catalogo = "catalogo_leveros.sqlite3"
         self.headless = headless
         
+        # Extrai todos os cards da página em uma única chamada JavaScript.
+        # Se desativado (ou se a chamada em lote falhar), extrai card a card.
+        self.extracao_em_lote = extracao_em_lote
+        
+        # Esperas por prontidão da página: retornam assim que o DOM fica estável
+        # (sem mutações por `janela_estabilidade_ms` e sem indicador de carregamento do Quasar),
+        # limitadas a `tempo_maximo_espera` segundos
+        self.tempo_maximo_espera = tempo_maximo_espera
+        self.janela_estabilidade_ms = 300
+        self.tempo_economizado_esperas = 0.0
+        # Esperas que passaram da espera fixa que substituíram (não descontadas da economia)
+        self.tempo_perdido_esperas = 0.0
+        
+        # Quantidade de sessões do navegador processando categorias em paralelo
+        self.workers = max(1, workers)
+        
+        # Cache em disco da sessão autenticada (cookies e localStorage). Navegadores novos ou
+        # reiniciados reutilizam a sessão e só fazem o login pelo formulário se ela for rejeitada.
+        self.usar_cache_sessao = usar_cache_sessao
+        self.arquivo_sessao = ".sessao_leveros.json"
+        self.validade_sessao = 8 * 60 * 60  # segundos
+        
+        # Extração sem navegador pela API JSON do SPA. Os endpoints são descobertos uma vez
+        # pelo log de rede do Chrome e salvos em `arquivo_api`; depois as páginas são buscadas
+        # diretamente, `paralelismo_http` por vez.
+        self.modo_http = modo_http
+        self.arquivo_api = "api_leveros.json"
+        self.paralelismo_http = 8
+        self.registrar_rede = False
+        
+        # Checkpoint em SQLite: cada página é gravada assim que extraída. Com `retomar`, a execução
+        # continua da primeira página pendente e, se tudo já foi extraído, apenas refaz as exportações.
+        self.retomar = retomar
+        self.arquivo_checkpoint = "checkpoint_leveros.sqlite3"
+        self.checkpoint = None
+        self.max_reinicios_categoria = 2
+        # Páginas cuja extração falhou, por categoria: não vão para o checkpoint, e a categoria não
+        # é marcada como concluída, para que --resume volte a elas
+        self.paginas_com_falha = {}
+        
+        # Saída incremental: cada página é gravada em `arquivo_saida` assim que extraída, em vez de
+        # acumular o catálogo em memória. As exportações leem a saída em blocos de `tamanho_bloco_exportacao`.
+        self.formato_saida = formato_saida
+        self.arquivo_saida = f"ProdutosLeveros_{self.timestamp}.{formato_saida}"
+        # Conjunto com os preços e o parcelamento também em colunas numéricas
+        self.arquivo_normalizado = f"ProdutosLeveros_normalizado_{self.timestamp}.{formato_saida}"
+        self.saida = None
+        self.tamanho_bloco_exportacao = 5000
+        # Os workers gravam as páginas só no checkpoint; elas são copiadas para a saída na ordem das
+        # categorias (processar_categorias_em_paralelo)
+        self.gravar_na_saida = True
+        
+        # Imagens dos produtos: baixadas em paralelo para um cache em disco endereçado pelo conteúdo,
+        # revalidadas com requisições condicionais, e com miniaturas incluídas no PDF e no Excel
+        self.baixar_imagens = baixar_imagens
+        self.diretorio_cache_imagens = ".cache_imagens"
+        self.miniaturas = {}
+        
+        # Modo enxuto: o navegador não baixa imagens, fontes, mídia e hosts de terceiros
+        # (a extração só lê o atributo src das imagens). Se uma página vier sem nenhuma URL de
+        # imagem, o navegador é reiniciado com as imagens liberadas e a categoria é repetida.
+        self.modo_enxuto = modo_enxuto
+        self.bloquear_imagens = True
+        self.urls_bloqueadas = list(URLS_BLOQUEADAS_MODO_ENXUTO)
+        
+        # Relatório por página (bytes transferidos e tempo de carregamento), sempre gerado no modo enxuto
+        self.relatorio_paginas = relatorio_paginas or modo_enxuto
+        self.arquivo_relatorio_paginas = f"RelatorioPaginas_{self.timestamp}.csv"
+        self.metricas_paginas = []
+        
+        # ChromeDriver de versão fixa, guardado em um cache local estável e conferido por SHA-256
+        # (leveros_driver). Com o cache pronto, a inicialização do navegador não acessa a rede.
+        self.versao_chromedriver = versao_chromedriver
+        self.diretorio_cache_driver = DIRETORIO_CACHE_DRIVER
+        
+        # Intervalos de tempo por fase (login, navegação, páginas, paginação, exportações) gravados em
+        # JSON Lines durante a execução, e contadores e histogramas no formato do Prometheus ao final
+        self.metricas = Metricas()
+        self.arquivo_intervalos = f"Intervalos_{self.timestamp}.jsonl"
+        self.arquivo_metricas = f"Metricas_{self.timestamp}.prom"
+        
+        # Modo de captura: o navegador só lê o HTML dos cards de cada página e o grava em
+        # `diretorio_snapshots`; a análise roda em um pool de `processos_analise` processos
+        # (leveros_parser). Com `reprocessar_snapshots`, um armazém já capturado é analisado de novo,
+        # sem navegador.
+        self.capturar_html = capturar_html
+        self.reprocessar_snapshots = reprocessar_snapshots
+        self.diretorio_snapshots = reprocessar_snapshots or f"Snapshots_{self.timestamp}"
+        self.snapshots = None
+        self.processos_analise = None  # padrão: quantidade de CPUs
+        self.analisador = None
+        
+        # Última estratégia de localização que funcionou (seletor dos cards e método de localização
+        # da categoria), por categoria, salva entre as execuções com contadores de acertos e falhas
+        self.usar_cache_estrategias = usar_cache_estrategias
+        self.arquivo_estrategias = ".estrategias_leveros.json"
+        self.estrategias = CacheEstrategias(self.arquivo_estrategias if usar_cache_estrategias else os.devnull)
+        
+        # URL (rota do SPA) de cada página de cada categoria, guardada na primeira visita. A retomada
+        # no meio de uma categoria e as novas tentativas abrem a página direto pela URL, sem voltar à
+        # página inicial e clicar em "próxima" até ela. Com `paginas_por_faixa`, os workers recebem
+        # faixas de páginas das categorias com total de páginas conhecido, em vez de categorias inteiras.
+        self.usar_indice_navegacao = usar_indice_navegacao
+        self.arquivo_indice_navegacao = "indice_navegacao.json"
+        self.indice_navegacao = IndiceNavegacao(self.arquivo_indice_navegacao if usar_indice_navegacao else os.devnull)
+        self.paginas_por_faixa = paginas_por_faixa
+        self.urls_antes_categoria = {}
+        
+        # Abas: um único navegador, com uma sessão, processa `abas` categorias ao mesmo tempo, uma
+        # por aba. Enquanto uma aba espera a próxima página carregar, as outras são extraídas.
+        self.abas = abas
+        
+        # Novas tentativas (leveros_resiliencia): espera exponencial com jitter, prazos por página e
+        # por categoria (segundos), um orçamento de novas tentativas compartilhado pelos workers e
+        # disjuntores que interrompem uma categoria, ou o site inteiro, quando a taxa de erros
+        # recentes passa do limite
+        self.prazo_pagina = prazo_pagina
+        self.prazo_categoria = prazo_categoria
+        self.orcamento_tentativas = OrcamentoTentativas(orcamento_tentativas)
+        self.politica_tentativas = PoliticaTentativas(orcamento=self.orcamento_tentativas, metricas=self.metricas)
+        self.disjuntor_site = Disjuntor("site", limiar=0.5, janela=30, minimo_chamadas=10, tempo_aberto=120,
+                                        ao_abrir=self.circuito_aberto)
+        self.disjuntores_categoria = {}
+        self.prazos_categoria = {}
+        self.trava_resiliencia = threading.Lock()
+        
+        # Monitor de saúde do navegador (leveros_saude): conta as páginas servidas e mede a memória
+        # do Chrome e o heap do JavaScript; ao atingir um limite, o navegador é reciclado entre duas
+        # páginas, com a mesma sessão e a partir da mesma página da categoria
+        self.monitor_navegador = MonitorNavegador(max_paginas=reciclar_a_cada_paginas,
+                                                  max_rss_mb=limite_memoria_navegador_mb)
+        
         # Seletores CSS para os elementos de interesse
         self.seletores = {
             "campo_usuario": "input[id^='f_'][aria-label='Informe seu usuário']",
@@ -96,55 +462,45 @@ class LeverosRPA:
             if self.headless:
                 opcoes.add_argument("--headless")
             
+            # Abas: as abas em segundo plano continuam carregando e renderizando sem limitação
+            if self.abas > 1:
+                opcoes.add_argument("--disable-background-timer-throttling")
+                opcoes.add_argument("--disable-renderer-backgrounding")
+                opcoes.add_argument("--disable-backgrounding-occluded-windows")
+            
+            # Modo enxuto: imagens desativadas (o atributo src continua no DOM)
+            if self.modo_enxuto and self.bloquear_imagens:
+                opcoes.add_argument("--blink-settings=imagesEnabled=false")
+            
+            # Log de rede (performance), usado para descobrir os endpoints da API
+            if self.registrar_rede:
+                opcoes.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            
             # Configuração específica para Mac com chips M1/M2
             if plataforma == "Darwin" and arquitetura == "arm64":
                 logger.info("Detectado Mac com chip Apple Silicon (M1/M2)")
                 opcoes.binary_location = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
-                
-                # Download direto do ChromeDriver para Mac ARM
-                temp_dir = tempfile.mkdtemp()
-                chromedriver_url = "https://storage.googleapis.com/chrome-for-testing-public/135.0.7049.42/mac-arm64/chromedriver-mac-arm64.zip"
-                zip_path = os.path.join(temp_dir, "chromedriver.zip")
-                
-                try:
-                    # Baixar o arquivo ZIP
-                    logger.info(f"Baixando ChromeDriver de {chromedriver_url}")
-                    response = requests.get(chromedriver_url)
-                    with open(zip_path, 'wb') as f:
-                        f.write(response.content)
-                    
-                    # Extrair o arquivo ZIP
-                    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                        zip_ref.extractall(temp_dir)
-                    
-                    # Procurar o executável chromedriver
-                    chromedriver_path = None
-                    for root, dirs, files in os.walk(temp_dir):
-                        if "chromedriver" in files:
-                            chromedriver_path = os.path.join(root, "chromedriver")
-                            break
-                    
-                    if not chromedriver_path:
-                        raise Exception("Não foi possível encontrar o executável chromedriver no pacote baixado")
-                    
-                    # Garantir que o executável tem permissões de execução
-                    os.chmod(chromedriver_path, 0o755)
-                    logger.info(f"ChromeDriver executável em: {chromedriver_path}")
-                    
-                    # Criar o driver com o executável
-                    service = Service(executable_path=chromedriver_path)
-                    self.driver = webdriver.Chrome(service=service, options=opcoes)
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao configurar ChromeDriver para M1/M2: {str(e)}")
-                    logger.error(traceback.format_exc())
-                    
-                    # Fallback para o método padrão
-                    logger.info("Tentando método alternativo com ChromeDriverManager")
-                    self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opcoes)
-            else:
-                # Configuração padrão para outras plataformas
-                self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opcoes)
+            
+            # ChromeDriver fixado (ou o da versão do Chrome instalado), do cache local, sem rede
+            # depois do primeiro download. Sem driver confiável, a inicialização falha.
+            inicio = time.perf_counter()
+            caminho_driver = resolver_chromedriver(self.versao_chromedriver, self.diretorio_cache_driver,
+                                                   binario_chrome=opcoes.binary_location or None)
+            logger.info(f"ChromeDriver em {caminho_driver} (resolvido em {time.perf_counter() - inicio:.3f}s)")
+            self.driver = webdriver.Chrome(service=Service(executable_path=caminho_driver), options=opcoes)
+            
+            # Modo enxuto: bloqueia fontes, mídia e hosts de terceiros
+            if self.modo_enxuto:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.urls_bloqueadas})
+                logger.info(f"Modo enxuto ativo: imagens {'bloqueadas' if self.bloquear_imagens else 'liberadas'}, "
+                            f"{len(self.urls_bloqueadas)} padrões de URL bloqueados.")
+            
+            # O monitor de saúde acompanha o ChromeDriver e os processos do Chrome abaixo dele
+            try:
+                self.monitor_navegador.iniciar(self.driver.service.process.pid)
+            except Exception:
+                self.monitor_navegador.iniciar(None)
             
             # Configurar tempos de espera
             self.driver.implicitly_wait(10)  # espera implícita de 10 segundos
@@ -156,12 +512,86 @@ class LeverosRPA:
             logger.error(f"Erro ao inicializar navegador: {str(e)}")
             return False
     
+    def estado_pagina(self, seletor_presente=None, seletor_ausente=None):
+        """Retorna o estado de prontidão da página atual (ver SCRIPT_ESTADO_PAGINA)"""
+        return self.driver.execute_script(SCRIPT_ESTADO_PAGINA, self.seletores["cards_produtos"],
+                                          seletor_presente, seletor_ausente)
+    
+    def pagina_pronta(self, seletor_presente=None, seletor_ausente=None, assinatura_anterior=None):
+        """Uma leitura do estado da página: o estado, se ela estiver pronta (ver aguardar_pagina_pronta), ou False"""
+        estado = self.estado_pagina(seletor_presente, seletor_ausente)
+        if not estado or not estado["documentoCompleto"] or estado["carregando"]:
+            return False
+        if not estado["presente"] or not estado["ausente"]:
+            return False
+        if assinatura_anterior is not None and estado["assinatura"] == assinatura_anterior:
+            return False
+        if estado["msSemMutacoes"] < self.janela_estabilidade_ms:
+            return False
+        return estado
+    
+    def aguardar_pagina_pronta(self, descricao, espera_fixa, seletor_presente=None,
+                               seletor_ausente=None, assinatura_anterior=None, tempo_maximo=None,
+                               opcional=False):
+        """
+        Aguarda até a página estar pronta, no lugar de um time.sleep fixo.
+        
+        A página é considerada pronta quando o documento terminou de carregar, não há
+        indicador de carregamento visível, o DOM está estável, o seletor_presente existe,
+        o seletor_ausente não está visível e, se informada, a assinatura dos cards é
+        diferente de assinatura_anterior (ou seja, o conjunto de cards mudou).
+        A espera é limitada a tempo_maximo segundos (padrão: tempo_maximo_espera). Com
+        opcional=True, não ficar pronta é um resultado esperado (por exemplo, um popup que
+        pode não aparecer) e não gera aviso.
+        Registra no log o tempo economizado em relação à espera fixa substituída, ou o tempo
+        perdido, quando a espera passou da espera fixa.
+        """
+        inicio = time.monotonic()
+        limite = self.tempo_maximo_espera if tempo_maximo is None else tempo_maximo
+        
+        def pagina_pronta(driver):
+            return self.pagina_pronta(seletor_presente, seletor_ausente, assinatura_anterior)
+        
+        estado = None
+        try:
+            estado = WebDriverWait(self.driver, limite, poll_frequency=0.1).until(pagina_pronta)
+        except TimeoutException:
+            if opcional:
+                logger.info(f"Página não atingiu o estado esperado ({descricao}) em {limite}s.")
+            else:
+                logger.warning(f"Página não ficou pronta ({descricao}) em {limite}s. Continuando...")
+        
+        decorrido = time.monotonic() - inicio
+        economia = espera_fixa - decorrido
+        if economia >= 0:
+            self.tempo_economizado_esperas += economia
+            logger.info(f"Página pronta ({descricao}) em {decorrido:.2f}s; "
+                        f"economia de {economia:.2f}s sobre a espera fixa de {espera_fixa:.0f}s.")
+        else:
+            self.tempo_perdido_esperas -= economia
+            logger.info(f"Página pronta ({descricao}) em {decorrido:.2f}s; "
+                        f"perda de {-economia:.2f}s sobre a espera fixa de {espera_fixa:.0f}s.")
+        return estado
+    
     def fazer_login(self):
-        """Realiza o login no sistema Leveros Integra"""
+        """Realiza o login no sistema Leveros Integra, reutilizando a sessão em cache quando possível"""
+        with self.metricas.intervalo("login") as intervalo:
+            if self.usar_cache_sessao and self.restaurar_sessao():
+                intervalo["origem"] = "sessao_em_cache"
+                return True
+            intervalo["origem"] = "formulario"
+            intervalo["sucesso"] = self.fazer_login_formulario()
+            return intervalo["sucesso"]
+    
+    def fazer_login_formulario(self):
+        """Realiza o login no sistema Leveros Integra pelo formulário"""
         try:
             logger.info("Acessando a página de login...")
             self.driver.get(self.url_login)
-            time.sleep(3)  # Aguarda o carregamento da página
+            
+            # Aguarda o formulário de login ser renderizado
+            self.aguardar_pagina_pronta("login", espera_fixa=3,
+                                        seletor_presente="input[aria-label='Informe seu usuário']")
             
             # Preenche o campo de usuário
             logger.info("Preenchendo campo de usuário...")
@@ -192,8 +622,10 @@ class LeverosRPA:
             # Trata o popup de boas-vindas com uma abordagem mais robusta
             try:
                 logger.info("Verificando se há popup de boas-vindas...")
-                # Aguarda um pouco para o popup aparecer completamente
-                time.sleep(2)
+                # Aguarda o popup aparecer (se ele não aparecer em 2s, segue sem ele)
+                self.aguardar_pagina_pronta("popup de boas-vindas", espera_fixa=2,
+                                            seletor_presente="div.q-dialog__backdrop",
+                                            tempo_maximo=2, opcional=True)
                 
                 # Verifica se existe o backdrop do diálogo
                 backdrop = self.driver.find_elements(By.CSS_SELECTOR, "div.q-dialog__backdrop")
@@ -220,7 +652,8 @@ class LeverosRPA:
                             self.driver.execute_script("arguments[0].click();", backdrop[0])
                     
                     # Aguarda o popup desaparecer
-                    time.sleep(1)
+                    self.aguardar_pagina_pronta("fechamento do popup de boas-vindas", espera_fixa=1,
+                                                seletor_ausente="div.q-dialog__backdrop")
                     logger.info("Popup de boas-vindas fechado com sucesso.")
                 else:
                     logger.info("Não foi detectado popup de boas-vindas.")
@@ -228,408 +661,1395 @@ class LeverosRPA:
                 logger.warning(f"Erro ao tentar fechar popup (não crítico): {str(e)}")
                 # Continuamos mesmo se não conseguir fechar o popup
             
+            if self.usar_cache_sessao:
+                self.salvar_sessao()
+            
             return True
         except Exception as e:
             logger.error(f"Erro durante o login: {str(e)}")
             return False
     
+    def url_origem(self):
+        """Retorna a origem (esquema e domínio) do site, onde a sessão é válida"""
+        url = urlparse(self.url_login)
+        return f"{url.scheme}://{url.netloc}/"
+    
+    def capturar_sessao(self):
+        """Cookies e localStorage/sessionStorage da sessão autenticada do navegador atual"""
+        return {
+            "criada_em": time.time(),
+            "usuario": self.usuario,
+            "origem": self.url_origem(),
+            "url_catalogo": self.driver.current_url,
+            "cookies": self.driver.get_cookies(),
+            "local_storage": self.driver.execute_script("return Object.assign({}, window.localStorage);"),
+            "session_storage": self.driver.execute_script("return Object.assign({}, window.sessionStorage);"),
+        }
+    
+    def salvar_sessao(self):
+        """Salva os cookies e o localStorage/sessionStorage da sessão autenticada no cache em disco"""
+        try:
+            sessao = self.capturar_sessao()
+            
+            # Grava em um arquivo temporário e substitui, para que workers em paralelo nunca leiam um arquivo parcial
+            arquivo_temporario = f"{self.arquivo_sessao}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(arquivo_temporario, 'w', encoding='utf-8') as f:
+                json.dump(sessao, f)
+            os.chmod(arquivo_temporario, 0o600)
+            os.replace(arquivo_temporario, self.arquivo_sessao)
+            logger.info(f"Sessão autenticada salva em {self.arquivo_sessao}")
+        except Exception as e:
+            logger.warning(f"Não foi possível salvar a sessão em cache (não crítico): {str(e)}")
+    
+    def carregar_sessao(self):
+        """Carrega a sessão em cache, se existir, estiver dentro da validade e for do mesmo usuário e site"""
+        try:
+            if not os.path.exists(self.arquivo_sessao):
+                return None
+            with open(self.arquivo_sessao, encoding='utf-8') as f:
+                sessao = json.load(f)
+        except Exception as e:
+            logger.warning(f"Cache de sessão ilegível. Ignorando: {str(e)}")
+            return None
+        
+        idade = time.time() - sessao.get("criada_em", 0)
+        if idade > self.validade_sessao:
+            logger.info(f"Sessão em cache expirada ({idade / 3600:.1f}h). Será feito novo login.")
+            return None
+        if sessao.get("usuario") != self.usuario or sessao.get("origem") != self.url_origem():
+            logger.info("Sessão em cache pertence a outro usuário ou site. Será feito novo login.")
+            return None
+        return sessao
+    
+    def invalidar_sessao(self):
+        """Remove a sessão em cache"""
+        try:
+            os.remove(self.arquivo_sessao)
+        except OSError:
+            pass
+    
+    def restaurar_sessao(self, sessao=None):
+        """
+        Injeta a sessão no navegador (por padrão, a do cache em disco) e vai direto ao catálogo.
+        Retorna False se a sessão for rejeitada.
+        """
+        do_cache = sessao is None
+        if do_cache:
+            sessao = self.carregar_sessao()
+        if not sessao:
+            return False
+        
+        try:
+            logger.info(f"Restaurando sessão autenticada {'do cache' if do_cache else 'do navegador anterior'}...")
+            
+            # Cookies e storage só podem ser definidos com o navegador na origem do site
+            self.driver.get(sessao["origem"])
+            for cookie in sessao["cookies"]:
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception as e:
+                    logger.warning(f"Cookie {cookie.get('name')} não pôde ser restaurado: {str(e)}")
+            
+            self.driver.execute_script("""
+                for (const [chave, valor] of Object.entries(arguments[0])) {
+                    window.localStorage.setItem(chave, valor);
+                }
+                for (const [chave, valor] of Object.entries(arguments[1])) {
+                    window.sessionStorage.setItem(chave, valor);
+                }
+            """, sessao["local_storage"], sessao["session_storage"])
+            
+            # Vai direto ao catálogo; se a sessão não for aceita o site volta para a tela de login
+            self.driver.get(sessao["url_catalogo"])
+            estado = self.aguardar_pagina_pronta("restauração da sessão", espera_fixa=3,
+                                                 seletor_presente="div.q-layout")
+            
+            na_tela_de_login = self.driver.execute_script(
+                "return document.querySelector(\"input[aria-label='Informe seu usuário']\") !== null;")
+            if estado and not na_tela_de_login and "/login" not in self.driver.current_url:
+                logger.info("Sessão restaurada. Login pelo formulário dispensado.")
+                return True
+            
+            logger.warning("Sessão rejeitada pelo site. Fazendo login pelo formulário...")
+        except Exception as e:
+            logger.warning(f"Erro ao restaurar sessão: {str(e)}. Fazendo login pelo formulário...")
+        
+        if do_cache:
+            self.invalidar_sessao()
+        return False
+    
     def navegar_para_categoria(self, categoria):
         """Navega para a página da categoria especificada"""
         try:
             logger.info(f"Navegando para a categoria: {categoria}")
             
-            # Aguardar um pouco para garantir que a página esteja totalmente carregada
-            time.sleep(3)
+            # Aguardar a página estar totalmente carregada
+            self.aguardar_pagina_pronta(f"categoria {categoria}", espera_fixa=3)
             
             # Verificar se existe algum popup ou overlay e tentar fechar
-            try:
-                backdrops = self.driver.find_elements(By.CSS_SELECTOR, "div.q-dialog__backdrop")
-                if backdrops:
-                    logger.info("Detectado overlay/popup. Tentando fechar...")
-                    self.driver.execute_script("arguments[0].click();", backdrops[0])
-                    time.sleep(1)
-            except Exception as e:
-                logger.warning(f"Erro ao tentar fechar overlay (não crítico): {str(e)}")
+            self.fechar_overlay()
             
-            # Tentar localizar o elemento da categoria de várias maneiras
+            # Tentar localizar o elemento da categoria de várias maneiras, começando pelo
+            # método que funcionou da última vez para esta categoria
             elemento_categoria = None
-            
-            # Método 1: Usando XPath com texto exato
-            try:
-                xpath = f"//div[contains(@class, 'text-teal-10') and contains(text(), '{categoria}')]"
-                elementos = self.driver.find_elements(By.XPATH, xpath)
-                if elementos:
-                    elemento_categoria = elementos[0]
-                    logger.info(f"Elemento da categoria {categoria} encontrado com método 1.")
-            except Exception:
-                pass
-            
-            # Método 2: Usando querySelector com JavaScript
-            if not elemento_categoria:
-                try:
-                    script = f"""
-                    return Array.from(document.querySelectorAll('div.text-teal-10')).find(el => 
-                        el.textContent.includes('{categoria}')
-                    );
-                    """
-                    elemento_categoria = self.driver.execute_script(script)
-                    if elemento_categoria:
-                        logger.info(f"Elemento da categoria {categoria} encontrado com método 2.")
-                except Exception:
-                    pass
-            
-            # Se ainda não encontrou, tenta um método mais genérico
-            if not elemento_categoria:
-                try:
-                    elementos = self.driver.find_elements(By.CSS_SELECTOR, "div.text-teal-10.q-pa-md.text-center")
-                    for el in elementos:
-                        if categoria.lower() in el.text.lower():
-                            elemento_categoria = el
-                            logger.info(f"Elemento da categoria {categoria} encontrado com método 3.")
-                            break
-                except Exception:
-                    pass
+            for metodo in self.estrategias.ordenar("categoria", categoria, METODOS_LOCALIZAR_CATEGORIA):
+                elemento_categoria = self.localizar_categoria(categoria, metodo)
+                if elemento_categoria:
+                    logger.info(f"Elemento da categoria {categoria} encontrado com o método {metodo}.")
+                    self.registrar_estrategia("categoria", categoria, metodo)
+                    break
             
             if not elemento_categoria:
                 raise Exception(f"Não foi possível encontrar o elemento da categoria {categoria}")
             
+            # URL antes do clique: se a página da categoria ficar nela, o site não tem rota por página
+            self.urls_antes_categoria[categoria] = self.driver.current_url
+            
             # Usar JavaScript para clicar no elemento (mais confiável para elementos sobrepostos)
             logger.info(f"Clicando na categoria {categoria} usando JavaScript...")
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elemento_categoria)
-            time.sleep(1)  # Aguardar um pouco após rolagem
+            self.aguardar_pagina_pronta("rolagem até a categoria", espera_fixa=1)
             self.driver.execute_script("arguments[0].click();", elemento_categoria)
             
-            # Aguardar carregamento dos produtos com retry
-            max_tentativas = 3
-            for tentativa in range(max_tentativas):
-                try:
-                    logger.info(f"Aguardando carregamento dos produtos (tentativa {tentativa+1}/{max_tentativas})...")
-                    WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.q-card.my-card"))
-                    )
-                    logger.info(f"Navegação para categoria {categoria} realizada com sucesso.")
-                    return True
-                except TimeoutException:
-                    if tentativa < max_tentativas - 1:
-                        logger.warning(f"Timeout ao aguardar produtos. Tentando novamente...")
-                        time.sleep(2)
-                    else:
-                        raise
+            # Aguardar carregamento dos produtos, com a política de novas tentativas
+            def aguardar_produtos():
+                logger.info("Aguardando carregamento dos produtos...")
+                WebDriverWait(self.driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.q-card.my-card"))
+                )
             
+            self.tentar(aguardar_produtos, "navegacao_categoria", categoria)
+            logger.info(f"Navegação para categoria {categoria} realizada com sucesso.")
             return True
         except Exception as e:
             logger.error(f"Erro ao navegar para a categoria {categoria}: {str(e)}")
             return False
     
-    def processar_categorias(self, categorias):
-        """Processa todas as categorias para extração de dados"""
-        todos_produtos = []
-        ultima_categoria_processada = None
+    def fechar_overlay(self):
+        """
+        Fecha o popup ou overlay aberto sobre a página, se houver (via JavaScript, para não pagar a
+        espera implícita quando não há overlay)
+        """
+        try:
+            backdrop = self.driver.execute_script("return document.querySelector('div.q-dialog__backdrop');")
+            if backdrop:
+                logger.info("Detectado overlay/popup. Tentando fechar...")
+                self.driver.execute_script("arguments[0].click();", backdrop)
+                self.aguardar_pagina_pronta("fechamento do overlay", espera_fixa=1,
+                                            seletor_ausente="div.q-dialog__backdrop")
+        except Exception as e:
+            logger.warning(f"Erro ao tentar fechar overlay (não crítico): {str(e)}")
+    
+    def ir_direto_para_pagina(self, categoria, pagina):
+        """
+        Abre a página da categoria pela URL do índice de navegação. Retorna False se a URL não for
+        conhecida ou não levar à página; nesse caso, a URL é descartada do índice e a navegação
+        volta aos cliques.
+        """
+        url = self.indice_navegacao.url(categoria, pagina)
+        if not url:
+            return False
+        with self.metricas.intervalo("navegacao_direta", categoria=categoria, pagina=pagina) as intervalo:
+            try:
+                logger.info(f"Abrindo a página {pagina} da categoria {categoria} pelo índice de navegação...")
+                self.driver.get(url)
+                self.aguardar_pagina_pronta(f"página {pagina} da categoria {categoria}", espera_fixa=3)
+                self.fechar_overlay()
+                WebDriverWait(self.driver, self.tempo_maximo_espera).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.seletores["cards_produtos"]))
+                )
+                if self.driver.current_url != url:
+                    raise Exception(f"redirecionado para {self.driver.current_url}")
+                intervalo["sucesso"] = True
+                return True
+            except Exception as e:
+                intervalo["sucesso"] = False
+                logger.warning(f"A URL do índice não levou à página {pagina} da categoria {categoria} "
+                               f"({str(e).splitlines()[0] if str(e) else type(e).__name__}). Navegando pelos cliques...")
+                # Um redirecionamento para o login é problema da sessão, não da URL
+                if not self.driver.current_url.startswith(self.url_login):
+                    self.indice_navegacao.descartar(categoria, pagina)
+                return False
+    
+    def registrar_url_pagina(self, categoria, pagina):
+        """Guarda no índice de navegação a URL da página atual, se ela for diferente da URL anterior à categoria"""
+        try:
+            url = self.driver.current_url
+        except Exception:
+            return
+        if url and url != self.urls_antes_categoria.get(categoria):
+            self.indice_navegacao.registrar(categoria, pagina, url)
+    
+    def localizar_categoria(self, categoria, metodo):
+        """Localiza o elemento da categoria com um dos METODOS_LOCALIZAR_CATEGORIA. Retorna None se não encontrar."""
+        try:
+            if metodo == "xpath_texto":
+                # Usando XPath com texto exato
+                xpath = f"//div[contains(@class, 'text-teal-10') and contains(text(), '{categoria}')]"
+                elementos = self.driver.find_elements(By.XPATH, xpath)
+                return elementos[0] if elementos else None
+            if metodo == "javascript_texto":
+                # Usando querySelector com JavaScript
+                script = f"""
+                return Array.from(document.querySelectorAll('div.text-teal-10')).find(el => 
+                    el.textContent.includes('{categoria}')
+                );
+                """
+                return self.driver.execute_script(script)
+            # Método mais genérico: texto dos blocos de categoria
+            for el in self.driver.find_elements(By.CSS_SELECTOR, "div.text-teal-10.q-pa-md.text-center"):
+                if categoria.lower() in el.text.lower():
+                    return el
+        except Exception:
+            pass
+        return None
+    
+    def registrar_estrategia(self, tipo, chave, estrategia):
+        """Registra no cache a estratégia que funcionou e conta o acerto ou a falha nas métricas"""
+        lembrada = self.estrategias.lembrada(tipo, chave)
+        resultado = self.estrategias.registrar(tipo, chave, estrategia)
+        self.metricas.contador("leveros_estrategias_total", tipo=tipo, resultado=resultado)
+        if resultado == "falha":
+            logger.warning(f"A estratégia lembrada para {tipo} '{chave}' ({lembrada}) não funcionou; "
+                           f"passando a usar {estrategia}.")
+    
+    def processar_categorias(self, categorias, gravar_na_saida=None):
+        """
+        Processa as categorias, gravando cada página na saída. Retorna o total de produtos das
+        categorias (sem gravar na saída, o total extraído nesta chamada).
         
-        for categoria in categorias:
-            produtos_da_categoria = []
+        `gravar_na_saida` substitui o atributo de mesmo nome durante a chamada: com False, as
+        páginas vão só para o checkpoint e quem chamou as copia para a saída na ordem das categorias.
+        """
+        if gravar_na_saida is not None and gravar_na_saida != self.gravar_na_saida:
+            anterior, self.gravar_na_saida = self.gravar_na_saida, gravar_na_saida
+            try:
+                return self.processar_categorias(categorias)
+            finally:
+                self.gravar_na_saida = anterior
+        
+        indice = 0
+        reinicios = 0
+        extraidos = {}
+        
+        while indice < len(categorias):
+            categoria = categorias[indice]
+            
+            # Categoria já concluída em uma execução anterior (--resume)
+            if self.checkpoint and self.checkpoint.categoria_concluida(categoria):
+                if self.gravar_na_saida:
+                    self.copiar_paginas_do_checkpoint(categoria)
+                logger.info(f"Categoria {categoria} já concluída no checkpoint "
+                            f"({self.saida.contagem_por_categoria.get(categoria, 0)} produtos).")
+                indice += 1
+                continue
+            
             logger.info(f"Iniciando processamento da categoria: {categoria}")
             
             try:
-                self.navegar_para_categoria(categoria)
+                with self.metricas.intervalo("categoria", categoria=categoria) as intervalo:
+                    intervalo["produtos"] = extraidos[categoria] = self.processar_categoria(categoria)
+                indice += 1
+                reinicios = 0
                 
-                pagina = 1
-                while True:
-                    logger.info(f"Processando página {pagina} da categoria {categoria}...")
-                    produtos_da_pagina = self.extrair_produtos_da_pagina(categoria)
-                    
-                    if produtos_da_pagina:
-                        produtos_da_categoria.extend(produtos_da_pagina)
-                        logger.info(f"Extraídos {len(produtos_da_pagina)} produtos da página {pagina}.")
-                    else:
-                        logger.warning(f"Nenhum produto encontrado na página {pagina} da categoria {categoria}.")
-                    
-                    # Verificar se existe próxima página
-                    proxima_pagina_existe = self.ir_para_proxima_pagina()
-                    if not proxima_pagina_existe:
-                        logger.info(f"Não há mais páginas para a categoria {categoria}.")
-                        break
-                    
-                    pagina += 1
+            except ImagensBloqueadas as e:
+                # O modo enxuto impediu a leitura das imagens: repete a categoria com as imagens liberadas
+                # (a partir da primeira página que não chegou ao checkpoint)
+                logger.warning(f"{str(e)} Reiniciando o navegador com as imagens liberadas...")
+                self.bloquear_imagens = False
+                if not self.reiniciar_navegador():
+                    indice += 1
+                    reinicios = 0
                 
-                # Atualizar a última categoria processada com sucesso
-                ultima_categoria_processada = categoria
-                todos_produtos.extend(produtos_da_categoria)
+            except (PrazoEsgotado, CircuitoAberto) as e:
+                # Site ou categoria degradados: a categoria é interrompida sem novas tentativas
+                logger.error(f"Categoria {categoria} interrompida: {str(e)}")
+                indice += 1
+                reinicios = 0
                 
             except Exception as e:
                 logger.error(f"Erro ao processar categoria {categoria}: {str(e)}")
                 logger.error(traceback.format_exc())
                 
-                # Se o erro for relacionado ao navegador fechado, tentar reiniciar
-                if "no such window" in str(e).lower() or "window not found" in str(e).lower():
-                    logger.warning("Navegador fechado ou travado. Tentando reiniciar...")
-                    try:
-                        # Fechar o navegador se ainda estiver aberto
-                        try:
-                            self.driver.quit()
-                        except:
-                            pass
-                        
-                        # Reiniciar o navegador
-                        self.inicializar_navegador()
-                        self.fazer_login()
-                        
-                        # Se estava no meio de uma categoria, continuar dela
-                        if ultima_categoria_processada != categoria:
-                            logger.info(f"Retomando processamento da categoria: {categoria}")
-                            # Tentar novamente esta categoria
-                            continue
-                    except Exception as reinit_error:
-                        logger.error(f"Erro ao reiniciar navegador: {str(reinit_error)}")
+                # Se o erro for relacionado ao navegador fechado ou a categoria não abriu, reiniciar e
+                # tentar a mesma categoria novamente (a partir da primeira página que não chegou ao
+                # checkpoint)
+                if (navegador_fechado(e) or isinstance(e, CategoriaInacessivel)) \
+                        and reinicios < self.max_reinicios_categoria:
+                    reinicios += 1
+                    logger.warning(f"Navegador fechado, travado ou sem acesso à categoria. Tentando reiniciar "
+                                   f"({reinicios}/{self.max_reinicios_categoria})...")
+                    if self.reiniciar_navegador():
+                        logger.info(f"Retomando processamento da categoria: {categoria}")
+                        continue
+                
+                indice += 1
+                reinicios = 0
         
-        return todos_produtos
+        if not self.gravar_na_saida:
+            return sum(extraidos.values())
+        return sum(self.saida.contagem_por_categoria.get(categoria, 0) for categoria in categorias)
     
-    def extrair_produtos_da_pagina(self, categoria):
-        """Extrai todos os produtos de uma página"""
-        logger.info(f"Extraindo produtos da página atual para a categoria {categoria}...")
-        produtos = []
+    def reiniciar_navegador(self):
+        """Fecha o navegador (se ainda estiver aberto), abre outro e refaz o login"""
+        self.metricas.contador("leveros_reinicios_navegador_total")
+        try:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            return self.inicializar_navegador() and self.fazer_login()
+        except Exception as e:
+            logger.error(f"Erro ao reiniciar navegador: {str(e)}")
+            return False
+    
+    def copiar_paginas_do_checkpoint(self, categoria, ate_pagina=None):
+        """Grava na saída as páginas da categoria que estão no checkpoint e ainda não foram gravadas nela"""
+        de_pagina = self.saida.ultima_pagina.get(categoria, 0) + 1
+        for pagina, produtos in self.checkpoint.paginas_da_categoria(categoria, de_pagina, ate_pagina):
+            self.saida.escrever_pagina(categoria, pagina, produtos)
+    
+    def processar_categoria(self, categoria, faixa=None):
+        """
+        Extrai todas as páginas de uma categoria, gravando cada uma no checkpoint e na saída assim
+        que termina. Retorna a quantidade de produtos da categoria.
         
-        max_tentativas = 3
-        tentativa = 1
+        Com `faixa` (primeira, última ou None), extrai só essas páginas e as grava apenas no
+        checkpoint: a saída recebe as páginas em ordem, copiadas do checkpoint quando todas as
+        faixas da categoria terminarem. Nesse caso, retorna a quantidade de produtos da faixa.
+        Sem gravar_na_saida (workers), as páginas também vão só para o checkpoint e o retorno é a
+        quantidade de produtos extraídos nesta chamada.
+        """
+        escrever_saida = not faixa and self.gravar_na_saida
+        if faixa:
+            pagina_inicial, pagina_final = faixa
+        else:
+            pagina_final = None
+            pagina_inicial = self.checkpoint.primeira_pagina_pendente(categoria) if self.checkpoint else 1
+            if pagina_inicial > 1:
+                if escrever_saida:
+                    self.copiar_paginas_do_checkpoint(categoria, ate_pagina=pagina_inicial - 1)
+                logger.info(f"Retomando a categoria {categoria} a partir da página {pagina_inicial} "
+                            f"(páginas anteriores já no checkpoint)...")
+        produtos_extraidos = 0
         
-        while tentativa <= max_tentativas:
-            try:
-                # Primeiro, vamos aguardar que a página carregue completamente
-                time.sleep(3)
-                
-                # Tentar diferentes seletores para encontrar os produtos
-                seletores = [
-                    'div.q-card.q-hoverable',
-                    'div.q-card',
-                    'div.my-card',
-                    'div.q-card.my-card',
-                    'div[class*="card"]'
-                ]
-                
-                cards = []
-                for seletor in seletores:
-                    logger.info(f"Tentando encontrar produtos com seletor: {seletor}")
-                    # Usar JavaScript para obter todos os cards de produtos
-                    js_script = f"""
-                    return document.querySelectorAll('{seletor}');
-                    """
-                    cards = self.driver.execute_script(js_script)
-                    if len(cards) > 0:
-                        logger.info(f"Encontrados {len(cards)} produtos com seletor: {seletor}")
-                        break
+        if self.relatorio_paginas:
+            # Descarta os recursos carregados antes da categoria
+            self.metricas_pagina()
+        inicio_carregamento = time.monotonic()
+        pagina = self.ir_para_pagina(categoria, pagina_inicial)
+        
+        # Modo de captura: páginas capturadas cuja análise ainda está no pool de processos
+        analises_pendentes = []
+        
+        if pagina < pagina_inicial:
+            # A categoria não tem mais páginas além das que já estão no checkpoint
+            logger.info(f"Não há mais páginas para a categoria {categoria}.")
+        else:
+            prazo_categoria = self.prazo_da_categoria(categoria)
+            while True:
+                if prazo_categoria.esgotado():
+                    raise PrazoEsgotado(prazo_categoria)
+                logger.info(f"Processando página {pagina} da categoria {categoria}...")
+                tempo_carregamento = time.monotonic() - inicio_carregamento
+                if self.capturar_html:
+                    with self.metricas.intervalo("captura_pagina", categoria=categoria, pagina=pagina):
+                        caminho_snapshot = self.capturar_pagina(categoria, pagina)
+                    analises_pendentes.append((pagina, self.analisador.submit(analisar_snapshot, caminho_snapshot)))
+                else:
+                    with self.metricas.intervalo("extracao_pagina", categoria=categoria, pagina=pagina) as intervalo:
+                        produtos_da_pagina = self.extrair_produtos_da_pagina(categoria)
+                        intervalo["sucesso"] = produtos_da_pagina is not None
+                        intervalo["produtos"] = len(produtos_da_pagina or ())
+                    self.gravar_pagina(categoria, pagina, produtos_da_pagina, escrever_saida)
+                    produtos_extraidos += len(produtos_da_pagina or ())
                 
-                # Se ainda não encontrou, tentar encontrar pelo conteúdo característico
-                if len(cards) == 0:
-                    logger.info("Tentando encontrar produtos pela estrutura interna...")
-                    js_script = """
-                    // Buscar elementos que provavelmente são cards de produtos
-                    let potentialCards = [];
-                    
-                    // Cards geralmente contêm preços
-                    document.querySelectorAll('div.text-h6.text-weight-bold.text-teal-9').forEach(priceEl => {
-                        let card = priceEl.closest('div.q-card') || priceEl.closest('div[class*="card"]');
-                        if (card && !potentialCards.includes(card)) {
-                            potentialCards.push(card);
-                        }
-                    });
-                    
-                    // Cards também podem conter informações de parcelamento
-                    document.querySelectorAll('div.text-caption.text-weight-bold').forEach(infoEl => {
-                        let card = infoEl.closest('div.q-card') || infoEl.closest('div[class*="card"]');
-                        if (card && !potentialCards.includes(card)) {
-                            potentialCards.push(card);
-                        }
-                    });
-                    
-                    return potentialCards;
-                    """
-                    cards = self.driver.execute_script(js_script)
-                
-                logger.info(f"Encontrados {len(cards)} produtos na página atual.")
-                
-                # Se não encontrou nenhum card, tentar rolar a página
-                if len(cards) == 0 and tentativa < max_tentativas:
-                    logger.info(f"Nenhum produto encontrado. Tentando rolar a página (tentativa {tentativa}/{max_tentativas})...")
-                    # Rolar para baixo
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                    time.sleep(2)
-                    # Rolar mais para baixo
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-                    tentativa += 1
-                    continue
+                if self.relatorio_paginas:
+                    self.registrar_metricas_pagina(categoria, pagina, tempo_carregamento)
                 
-                # Capturar screenshot para debug se necessário
-                if len(cards) == 0:
-                    logger.info("Capturando screenshot para análise...")
-                    try:
-                        screenshot_path = f"screenshot_categoria_{categoria}_pagina.png"
-                        self.driver.save_screenshot(screenshot_path)
-                        logger.info(f"Screenshot salvo em {screenshot_path}")
-                    except Exception as e:
-                        logger.error(f"Erro ao capturar screenshot: {str(e)}")
-                
-                # Extrair dados de cada card
-                for i, card in enumerate(cards, 1):
-                    logger.info(f"Processando produto {i}/{len(cards)}...")
-                    produto = self.extrair_dados_produto(card, categoria)
-                    if produto:
-                        # Verificar se o nome do produto contém "instalação" (case insensitive)
-                        nome_produto = produto.get("Nome do Produto", "").lower()
-                        if "instalacao" in nome_produto or "instalação" in nome_produto:
-                            logger.info(f"Produto ignorado por conter 'instalação' no nome: {produto.get('Nome do Produto')}")
-                        else:
-                            produtos.append(produto)
+                # Última página da faixa
+                if pagina_final is not None and pagina >= pagina_final:
+                    logger.info(f"Fim da faixa de páginas {pagina_inicial}-{pagina_final} da categoria {categoria}.")
+                    break
                 
-                # Se tivemos sucesso, sair do loop
-                break
+                # Verificar se existe próxima página
+                inicio_carregamento = time.monotonic()
+                proxima_pagina_existe = self.ir_para_proxima_pagina_medida(categoria, pagina)
+                if not proxima_pagina_existe:
+                    logger.info(f"Não há mais páginas para a categoria {categoria}.")
+                    self.indice_navegacao.registrar_total(categoria, pagina)
+                    break
                 
-            except Exception as e:
-                # Se for um erro de "no such window", propagar a exceção para ser tratada no nível superior
-                if "no such window" in str(e).lower() or "window not found" in str(e).lower():
-                    raise
-                    
-                logger.error(f"Erro ao extrair produtos da página (tentativa {tentativa}/{max_tentativas}): {str(e)}")
-                logger.error(traceback.format_exc())
+                pagina += 1
+                self.registrar_url_pagina(categoria, pagina)
                 
-                if tentativa < max_tentativas:
-                    logger.info(f"Tentando novamente em 3 segundos...")
-                    time.sleep(3)
-                    tentativa += 1
-                else:
-                    logger.error("Número máximo de tentativas atingido. Continuando com próxima etapa.")
-                    break
-    
-        logger.info(f"Extraídos {len(produtos)} produtos da página atual.")
-        return produtos
+                # Entre duas páginas: se o navegador atingiu um limite do monitor de saúde, é
+                # reciclado e volta a esta página com a mesma sessão
+                motivo = self.monitor_navegador.registrar_pagina(self.driver)
+                if motivo:
+                    self.reciclar_navegador(categoria, pagina, motivo)
+                    inicio_carregamento = time.monotonic()
+        
+        # As análises terminam enquanto o navegador segue para as próximas páginas; a gravação
+        # segue a ordem das páginas
+        for pagina_capturada, analise in analises_pendentes:
+            _, resultados = analise.result()
+            produtos_da_pagina = self.produtos_dos_resultados(resultados, categoria)
+            self.gravar_pagina(categoria, pagina_capturada, produtos_da_pagina, escrever_saida)
+            produtos_extraidos += len(produtos_da_pagina)
+        
+        if not faixa:
+            self.concluir_categoria(categoria, pagina)
+        if not escrever_saida:
+            return produtos_extraidos
+        return self.saida.contagem_por_categoria.get(categoria, 0)
     
-    def extrair_dados_produto(self, card, categoria):
-        """Extrai os dados de um card de produto"""
-        max_tentativas = 3
-        tentativa = 1
+    def ir_para_pagina(self, categoria, pagina_inicial):
+        """
+        Leva o navegador até a página da categoria: direto pela URL do índice de navegação ou, sem
+        ela, pela navegação até a categoria e pelos cliques em "próxima". Retorna a página alcançada,
+        menor que a pedida se a categoria tiver menos páginas. Se não conseguir abrir a categoria,
+        levanta uma exceção: a categoria fica pendente no checkpoint, em vez de ter os cards de
+        outra página gravados como a sua primeira página.
+        """
+        if pagina_inicial > 1 and self.ir_direto_para_pagina(categoria, pagina_inicial):
+            return pagina_inicial
+        
+        with self.metricas.intervalo("navegacao_categoria", categoria=categoria) as intervalo:
+            intervalo["sucesso"] = self.navegar_para_categoria(categoria)
+        if not intervalo["sucesso"]:
+            raise CategoriaInacessivel(f"Não foi possível navegar para a categoria {categoria}")
+        self.registrar_url_pagina(categoria, 1)
         
-        while tentativa <= max_tentativas:
+        # Avançar até a primeira página pendente
+        pagina = 1
+        while pagina < pagina_inicial:
+            if not self.ir_para_proxima_pagina_medida(categoria, pagina):
+                break
+            pagina += 1
+            self.registrar_url_pagina(categoria, pagina)
+        return pagina
+    
+    def reciclar_navegador(self, categoria, pagina, motivo):
+        """
+        Troca o navegador por um novo entre duas páginas: captura a sessão, fecha o navegador, abre
+        outro, restaura a sessão (ou faz login) e volta à página da categoria.
+        """
+        medicao = self.monitor_navegador.ultima_medicao
+        logger.info(f"Reciclando o navegador antes da página {pagina} da categoria {categoria} "
+                    f"(motivo: {motivo}; {medicao.get('paginas')} páginas, memória {medicao.get('rss_mb')} MB, "
+                    f"heap {medicao.get('heap_mb')} MB)...")
+        self.metricas.contador("leveros_reciclagens_navegador_total", motivo=motivo)
+        with self.metricas.intervalo("reciclagem_navegador", categoria=categoria, pagina=pagina, motivo=motivo,
+                                     **medicao) as intervalo:
             try:
-                # Aguardar um pouco para garantir que o card esteja totalmente carregado
-                time.sleep(0.5)
-                
-                # Usar JavaScript para extrair os dados mais confiáveis
-                script = """
-                function getTextOrDefault(card, selector, defaultValue = "N/A") {
-                    const el = card.querySelector(selector);
-                    return el ? el.textContent.trim() : defaultValue;
-                }
-                
-                function getAttributeOrDefault(card, selector, attribute, defaultValue = "N/A") {
-                    const el = card.querySelector(selector);
-                    return el ? (el.getAttribute(attribute) || defaultValue) : defaultValue;
-                }
-                
-                function findElementWithText(card, selector, text) {
-                    const elements = card.querySelectorAll(selector);
-                    for(let el of elements) {
-                        if(el.textContent && el.textContent.includes(text)) {
-                            return el.textContent.trim();
-                        }
-                    }
-                    return "";
-                }
-                
-                function getPublicImageUrl(privateUrl) {
-                    // Extrair o ID da imagem ou caminho da URL privada
-                    if (!privateUrl || privateUrl === 'N/A') return 'N/A';
-                    
-                    try {
-                        // Tentar extrair o nome do arquivo da URL
-                        const urlObj = new URL(privateUrl);
-                        const pathname = urlObj.pathname;
-                        const filename = pathname.split('/').pop();
-                        
-                        // Construir URL pública baseada no domínio de vendas da Leveros
-                        return `https://www.vendas.leveros.com.br/upload/produto/imagem/${filename}`;
-                    } catch (e) {
-                        // Se falhar, retornar a URL original
-                        return privateUrl;
-                    }
-                }
-                
-                const result = {};
-                
-                // Nome do produto
-                result.nome = getTextOrDefault(arguments[0], 'div.menuItems.text-caption.q-pt-sm.ellipsis-2-lines');
-                
-                // Voltagem
-                result.voltagem = getTextOrDefault(arguments[0], 'div.q-chip--outline');
-                
-                // Preço principal
-                result.precoPrincipal = getTextOrDefault(arguments[0], 'div.text-h6.text-weight-bold.text-teal-9');
-                
-                // Info de parcelamento
-                result.infoParcelamento = getTextOrDefault(arguments[0], 'div.text-caption.text-weight-bold');
-                
-                // Preço à vista (usando função personalizada para encontrar o elemento com o texto "à vista")
-                result.precoVista = findElementWithText(arguments[0], 'div.text-caption', 'à vista');
-                
-                // Se não encontrou "à vista", pega qualquer text-caption como fallback
-                if (!result.precoVista) {
-                    result.precoVista = getTextOrDefault(arguments[0], 'div.text-caption');
-                }
-                
-                // URL da imagem privada (área logada)
-                result.urlImagem = getAttributeOrDefault(arguments[0], 'div.q-img img', 'src');
-                
-                // URL pública da imagem
-                result.urlImagemPublica = getPublicImageUrl(result.urlImagem);
+                sessao = self.capturar_sessao()
+            except Exception as e:
+                logger.warning(f"Não foi possível capturar a sessão do navegador (não crítico): {str(e)}")
+                sessao = None
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            if not self.inicializar_navegador():
+                raise Exception("Não foi possível abrir o novo navegador na reciclagem")
+            if not ((sessao and self.restaurar_sessao(sessao)) or self.fazer_login()):
+                raise Exception("Não foi possível restaurar a sessão no novo navegador")
+            alcancada = self.ir_para_pagina(categoria, pagina)
+            intervalo["sucesso"] = alcancada == pagina
+        if alcancada != pagina:
+            raise Exception(f"O novo navegador não chegou à página {pagina} da categoria {categoria}")
+        logger.info(f"Navegador reciclado; continuando na página {pagina} da categoria {categoria}.")
+    
+    def gravar_pagina(self, categoria, pagina, produtos_da_pagina, escrever_saida=True):
+        """
+        Grava os produtos de uma página no checkpoint e, se `escrever_saida`, na saída. Uma página
+        cuja extração falhou (produtos_da_pagina None) não é gravada: fica registrada em
+        paginas_com_falha e a extração segue para a próxima página.
+        """
+        if produtos_da_pagina is None:
+            self.paginas_com_falha.setdefault(categoria, set()).add(pagina)
+            self.metricas.contador("leveros_paginas_com_falha_total", categoria=categoria)
+            logger.error(f"Página {pagina} da categoria {categoria} não foi extraída; fica pendente no checkpoint.")
+            return
+        self.paginas_com_falha.get(categoria, set()).discard(pagina)
+        
+        self.metricas.contador("leveros_paginas_extraidas_total", categoria=categoria)
+        self.metricas.contador("leveros_produtos_extraidos_total", len(produtos_da_pagina), categoria=categoria)
+        
+        if self.modo_enxuto and self.bloquear_imagens and produtos_da_pagina and \
+                all(valor_vazio(p.get("URL da Imagem")) for p in produtos_da_pagina):
+            raise ImagensBloqueadas(f"Nenhuma URL de imagem na página {pagina} da categoria "
+                                    f"{categoria} com as imagens bloqueadas.")
+        
+        if produtos_da_pagina:
+            logger.info(f"Extraídos {len(produtos_da_pagina)} produtos da página {pagina}.")
+        else:
+            logger.warning(f"Nenhum produto encontrado na página {pagina} da categoria {categoria}.")
+        
+        if self.checkpoint:
+            self.checkpoint.registrar_pagina(categoria, pagina, produtos_da_pagina)
+        if escrever_saida:
+            self.saida.escrever_pagina(categoria, pagina, produtos_da_pagina)
+    
+    def concluir_categoria(self, categoria, paginas):
+        """
+        Marca a categoria como concluída no checkpoint, a menos que alguma de suas páginas tenha
+        falhado nesta execução. Retorna se a categoria foi concluída.
+        """
+        falhas = sorted(self.paginas_com_falha.get(categoria, ()))
+        if falhas:
+            logger.warning(f"Categoria {categoria} terminou com {len(falhas)} página(s) com falha "
+                           f"({', '.join(map(str, falhas))}); não foi marcada como concluída e --resume "
+                           f"volta à página {falhas[0]}.")
+            return False
+        if self.checkpoint:
+            self.checkpoint.concluir_categoria(categoria, paginas)
+        return True
+    
+    def capturar_pagina(self, categoria, pagina):
+        """
+        Modo de captura: lê o HTML dos cards da página atual em uma única chamada JavaScript e o
+        grava no armazém de snapshots. Retorna o caminho do snapshot.
+        """
+        def capturar():
+            self.aguardar_pagina_pronta(f"produtos da categoria {categoria}", espera_fixa=3)
+            seletores = self.estrategias.ordenar("cards", categoria, SELETORES_CARDS)
+            return self.driver.execute_script(SCRIPT_CAPTURA_CARDS, seletores)
+        
+        captura = self.tentar(capturar, "captura_pagina", categoria, prazo=self.prazo_da_pagina(categoria),
+                              repetir_resultado=lambda captura: not captura["cards"],
+                              antes_de_repetir=self.rolar_pagina)
+        if captura["cards"]:
+            self.registrar_estrategia("cards", categoria, captura["seletor"])
+        
+        logger.info(f"Capturados {len(captura['cards'])} cards da página {pagina} (seletor: {captura['seletor']}).")
+        return self.snapshots.gravar(categoria, pagina, captura)
+    
+    def produtos_dos_resultados(self, resultados, categoria):
+        """Monta os produtos a partir dos campos extraídos dos cards, mescla duplicados e remove serviços"""
+        return self.filtrar_produtos(self.mesclar_produtos([self.montar_produto(r, categoria) for r in resultados]))
+    
+    def abrir_analisador(self):
+        """Pool de processos que analisa os snapshots (modo de captura e reprocessamento)"""
+        if self.analisador is None:
+            self.analisador = ProcessPoolExecutor(max_workers=self.processos_analise)
+        return self.analisador
+    
+    def fechar_analisador(self):
+        if self.analisador is not None:
+            self.analisador.shutdown()
+            self.analisador = None
+    
+    def processar_snapshots(self, categorias):
+        """
+        Reprocessa um armazém de snapshots já capturado, sem navegador: analisa as páginas de cada
+        categoria no pool de processos e as grava no checkpoint e na saída, em ordem de página.
+        Retorna o total de produtos das categorias.
+        """
+        self.abrir_analisador()
+        for categoria in categorias:
+            paginas = self.snapshots.paginas(categoria)
+            if not paginas:
+                logger.warning(f"Nenhum snapshot da categoria {categoria} em {self.snapshots.diretorio}.")
+                continue
+            logger.info(f"Reprocessando {len(paginas)} páginas da categoria {categoria}...")
+            analises = [(pagina, self.analisador.submit(analisar_snapshot, caminho)) for pagina, caminho in paginas]
+            for pagina, analise in analises:
+                with self.metricas.intervalo("analise_snapshot", categoria=categoria, pagina=pagina) as intervalo:
+                    _, resultados = analise.result()
+                    produtos_da_pagina = self.produtos_dos_resultados(resultados, categoria)
+                    intervalo["produtos"] = len(produtos_da_pagina)
+                self.gravar_pagina(categoria, pagina, produtos_da_pagina)
+            if self.checkpoint:
+                self.checkpoint.concluir_categoria(categoria, paginas[-1][0])
+        return sum(self.saida.contagem_por_categoria.get(categoria, 0) for categoria in categorias)
+    
+    def ir_para_proxima_pagina_medida(self, categoria, pagina):
+        """ir_para_proxima_pagina dentro de um intervalo de paginação"""
+        with self.metricas.intervalo("paginacao", categoria=categoria, de_pagina=pagina) as intervalo:
+            intervalo["avancou"] = self.ir_para_proxima_pagina()
+            return intervalo["avancou"]
+    
+    def metricas_pagina(self):
+        """Recursos e bytes transferidos desde a leitura anterior (ver SCRIPT_METRICAS_PAGINA)"""
+        try:
+            return self.driver.execute_script(SCRIPT_METRICAS_PAGINA)
+        except Exception as e:
+            logger.debug(f"Não foi possível ler as métricas da página: {str(e)}")
+            return {"recursos": 0, "bytes": 0}
+    
+    def registrar_metricas_pagina(self, categoria, pagina, tempo_carregamento):
+        """Registra os bytes transferidos e o tempo de carregamento de uma página para o relatório"""
+        metricas = self.metricas_pagina()
+        modo = "completo"
+        if self.modo_enxuto:
+            modo = "enxuto" if self.bloquear_imagens else "enxuto (com imagens)"
+        # list.append é atômico: a lista é compartilhada pelos workers
+        self.metricas_paginas.append({
+            "Categoria": categoria,
+            "Página": pagina,
+            "Modo": modo,
+            "Recursos": metricas["recursos"],
+            "Bytes Transferidos": metricas["bytes"],
+            "Tempo de Carregamento (s)": round(tempo_carregamento, 3),
+        })
+        logger.info(f"Página {pagina} da categoria {categoria}: {metricas['bytes'] / 1024:.1f} KB em "
+                    f"{metricas['recursos']} recursos, carregada em {tempo_carregamento:.2f}s.")
+    
+    def salvar_relatorio_paginas(self):
+        """Grava o relatório por página (bytes transferidos e tempo de carregamento) em CSV"""
+        try:
+            if not self.metricas_paginas:
+                return False
+            with open(self.arquivo_relatorio_paginas, "w", newline="", encoding="utf-8-sig") as f:
+                escritor = csv.DictWriter(f, fieldnames=list(self.metricas_paginas[0]))
+                escritor.writeheader()
+                escritor.writerows(self.metricas_paginas)
+            
+            paginas = len(self.metricas_paginas)
+            bytes_medio = sum(m["Bytes Transferidos"] for m in self.metricas_paginas) / paginas
+            tempo_medio = sum(m["Tempo de Carregamento (s)"] for m in self.metricas_paginas) / paginas
+            logger.info(f"Relatório de {paginas} páginas salvo em {self.arquivo_relatorio_paginas}: "
+                        f"média de {bytes_medio / 1024:.1f} KB e {tempo_medio:.2f}s por página.")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao salvar o relatório por página: {str(e)}")
+            return False
+    
+    def criar_trabalhador(self):
+        """Cria uma instância independente do RPA, com navegador e sessão próprios, para um worker"""
+        trabalhador = LeverosRPA(headless=self.headless, extracao_em_lote=self.extracao_em_lote,
+                                 tempo_maximo_espera=self.tempo_maximo_espera)
+        trabalhador.url_login = self.url_login
+        trabalhador.usuario = self.usuario
+        trabalhador.senha = self.senha
+        trabalhador.categorias = self.categorias
+        trabalhador.usar_cache_sessao = self.usar_cache_sessao
+        trabalhador.arquivo_sessao = self.arquivo_sessao
+        trabalhador.validade_sessao = self.validade_sessao
+        trabalhador.checkpoint = self.checkpoint
+        trabalhador.paginas_com_falha = self.paginas_com_falha
+        trabalhador.saida = self.saida
+        trabalhador.gravar_na_saida = False
+        trabalhador.modo_enxuto = self.modo_enxuto
+        trabalhador.bloquear_imagens = self.bloquear_imagens
+        trabalhador.urls_bloqueadas = self.urls_bloqueadas
+        trabalhador.relatorio_paginas = self.relatorio_paginas
+        trabalhador.metricas_paginas = self.metricas_paginas
+        trabalhador.versao_chromedriver = self.versao_chromedriver
+        trabalhador.diretorio_cache_driver = self.diretorio_cache_driver
+        trabalhador.metricas = self.metricas
+        trabalhador.estrategias = self.estrategias
+        trabalhador.indice_navegacao = self.indice_navegacao
+        trabalhador.prazo_pagina = self.prazo_pagina
+        trabalhador.prazo_categoria = self.prazo_categoria
+        trabalhador.orcamento_tentativas = self.orcamento_tentativas
+        trabalhador.politica_tentativas = self.politica_tentativas
+        trabalhador.disjuntor_site = self.disjuntor_site
+        trabalhador.disjuntores_categoria = self.disjuntores_categoria
+        trabalhador.prazos_categoria = self.prazos_categoria
+        trabalhador.trava_resiliencia = self.trava_resiliencia
+        trabalhador.monitor_navegador = self.monitor_navegador.novo()
+        trabalhador.capturar_html = self.capturar_html
+        trabalhador.snapshots = self.snapshots
+        trabalhador.analisador = self.analisador
+        return trabalhador
+    
+    def processar_categorias_em_paralelo(self, categorias, workers):
+        """
+        Processa as categorias com um pool de workers.
+        
+        Cada worker abre seu próprio navegador, faz login e consome categorias de uma fila
+        compartilhada. Falhas ficam isoladas no worker: se ele não conseguir iniciar a sessão,
+        as categorias continuam na fila para os demais; se falhar no meio de uma categoria,
+        ela é devolvida à fila e o worker reinicia o navegador e continua consumindo a fila (ou é
+        encerrado, se o reinício falhar). Tarefas que ainda estiverem na fila quando o pool
+        terminar são processadas por um worker substituto, em seguida. Cada tarefa é tentada no
+        máximo max_reinicios_categoria + 1 vezes.
+        
+        Os workers gravam as páginas só no checkpoint. Assim que uma categoria termina e todas as
+        anteriores também, suas páginas são copiadas do checkpoint para a saída; a saída fica na
+        ordem das categorias (e das páginas), como na execução sequencial, independentemente da
+        ordem em que os workers terminam.
+        
+        Com `paginas_por_faixa`, as categorias com total de páginas conhecido no índice de navegação
+        entram na fila como faixas de páginas, que os workers abrem direto pela URL. A categoria é
+        concluída quando todas as faixas terminam.
+        Retorna o total de produtos das categorias.
+        """
+        fila = queue.Queue()
+        tarefas_pendentes = {}  # índice da categoria -> tarefas (categoria inteira ou faixas) não encerradas
+        divididas = set()  # índices das categorias divididas em faixas
+        incompletas = set()  # índices das categorias com alguma faixa interrompida ou abandonada
+        trava = threading.Lock()
+        proxima = 0  # primeira categoria ainda não copiada para a saída
+        
+        def copiar_categorias_em_ordem(ate=None):
+            """
+            Copia para a saída as categorias encerradas a partir de `proxima`, parando na primeira
+            ainda pendente (ou, com `ate`, copiando todas até esse índice). Chamada com a trava.
+            """
+            nonlocal proxima
+            while proxima < len(categorias) and (tarefas_pendentes.get(proxima, 0) == 0 or
+                                                 (ate is not None and proxima < ate)):
+                categoria = categorias[proxima]
+                self.copiar_paginas_do_checkpoint(categoria)
+                if proxima in divididas and proxima not in incompletas and not tarefas_pendentes[proxima]:
+                    self.concluir_categoria(categoria, self.saida.ultima_pagina.get(categoria, 0))
+                logger.info(f"Categoria {categoria} gravada na saída com "
+                            f"{self.saida.contagem_por_categoria.get(categoria, 0)} produtos.")
+                proxima += 1
+        
+        def encerrar_tarefa(indice, faixa, completa=True):
+            with trava:
+                tarefas_pendentes[indice] -= 1
+                if faixa and not completa:
+                    incompletas.add(indice)
+                copiar_categorias_em_ordem()
+        
+        for indice, categoria in enumerate(categorias):
+            if self.checkpoint and self.checkpoint.categoria_concluida(categoria):
+                # Categoria já concluída em uma execução anterior (--resume)
+                logger.info(f"Categoria {categoria} já concluída no checkpoint.")
+                continue
+            faixas = self.faixas_da_categoria(categoria)
+            tarefas_pendentes[indice] = len(faixas)
+            if len(faixas) > 1:
+                logger.info(f"Categoria {categoria} dividida em {len(faixas)} faixas de páginas.")
+                divididas.add(indice)
+            for faixa in faixas:
+                fila.put((indice, categoria, faixa))
+        with trava:
+            copiar_categorias_em_ordem()
+        
+        tentativas = {}  # (índice da categoria, faixa) -> tentativas que terminaram em erro
+        
+        def executar_worker(numero):
+            trabalhador = self.criar_trabalhador()
+            try:
+                logger.info(f"[worker {numero}] Iniciando sessão do navegador...")
+                if not trabalhador.inicializar_navegador() or not trabalhador.fazer_login():
+                    logger.error(f"[worker {numero}] Não foi possível iniciar a sessão. Encerrando worker.")
+                    return
                 
-                return result;
-                """
+                while True:
+                    try:
+                        indice, categoria, faixa = fila.get_nowait()
+                    except queue.Empty:
+                        break
+                    
+                    descricao = f"categoria {categoria}"
+                    if faixa:
+                        descricao += f" (páginas {faixa[0]} a {faixa[1] or 'última'})"
+                    logger.info(f"[worker {numero}] Processando {descricao}")
+                    try:
+                        if faixa:
+                            with self.metricas.intervalo("faixa_paginas", categoria=categoria,
+                                                         de_pagina=faixa[0]) as intervalo:
+                                quantidade = intervalo["produtos"] = trabalhador.processar_categoria(categoria, faixa)
+                        else:
+                            quantidade = trabalhador.processar_categorias([categoria])
+                    except (PrazoEsgotado, CircuitoAberto) as e:
+                        # Site ou categoria degradados: não volta à fila
+                        logger.error(f"[worker {numero}] Interrompida a {descricao}: {str(e)}")
+                        encerrar_tarefa(indice, faixa, completa=False)
+                        continue
+                    except Exception as e:
+                        logger.error(f"[worker {numero}] Erro ao processar {descricao}: {str(e)}")
+                        logger.error(traceback.format_exc())
+                        with trava:
+                            tentativas[indice, faixa] = tentativas.get((indice, faixa), 0) + 1
+                            esgotada = tentativas[indice, faixa] > self.max_reinicios_categoria
+                        if esgotada:
+                            logger.error(f"[worker {numero}] Desistindo da {descricao} depois de "
+                                         f"{tentativas[indice, faixa]} tentativas.")
+                            encerrar_tarefa(indice, faixa, completa=False)
+                        else:
+                            logger.warning(f"[worker {numero}] Devolvendo {descricao} à fila.")
+                            fila.put((indice, categoria, faixa))
+                        logger.info(f"[worker {numero}] Reiniciando o navegador...")
+                        if not trabalhador.reiniciar_navegador():
+                            logger.error(f"[worker {numero}] Não foi possível reiniciar o navegador. Encerrando worker.")
+                            return
+                        continue
+                    
+                    logger.info(f"[worker {numero}] Concluída a {descricao}, com {quantidade} produtos.")
+                    encerrar_tarefa(indice, faixa)
+            except Exception as e:
+                logger.error(f"[worker {numero}] Erro inesperado: {str(e)}")
+                logger.error(traceback.format_exc())
+            finally:
+                trabalhador.finalizar()
+                with trava:
+                    self.tempo_economizado_esperas += trabalhador.tempo_economizado_esperas
+                    self.tempo_perdido_esperas += trabalhador.tempo_perdido_esperas
+        
+        tarefas = fila.qsize()
+        workers = min(workers, tarefas)
+        if workers:
+            logger.info(f"Processando {len(categorias)} categorias ({tarefas} tarefas) com {workers} workers...")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worker") as executor:
+                for numero in range(1, workers + 1):
+                    executor.submit(executar_worker, numero)
+        
+        # Tarefas devolvidas à fila depois que os demais workers já tinham terminado (ou que nenhum
+        # worker conseguiu iniciar a sessão): um worker substituto as processa
+        if not fila.empty():
+            logger.warning(f"{fila.qsize()} tarefas ainda na fila ao fim do pool. Iniciando um worker substituto...")
+            executar_worker(workers + 1)
+        
+        # Categorias que ficaram pendentes: o que estiver no checkpoint vai para a saída, em ordem
+        for indice, categoria in enumerate(categorias):
+            if tarefas_pendentes.get(indice):
+                logger.error(f"Categoria {categoria} não foi processada por nenhum worker.")
+        with trava:
+            copiar_categorias_em_ordem(ate=len(categorias))
+        
+        return sum(self.saida.contagem_por_categoria.get(categoria, 0) for categoria in categorias)
+    
+    def processar_categorias_em_abas(self, categorias, abas):
+        """
+        Processa as categorias em até `abas` abas do navegador atual, com a sessão já iniciada.
+        
+        O WebDriver controla uma aba por vez: o agendador percorre as abas em rodízio e, em cada
+        uma, verifica com uma única leitura do estado se a página pedida já carregou. Se sim, extrai
+        a página e clica em "próxima" (etapas_categoria_em_aba) e passa à aba seguinte sem esperar o
+        carregamento. Cada aba recebe a próxima categoria da fila quando termina a sua. As categorias
+        que falharem em uma aba são repetidas ao final na aba principal, com as novas tentativas e os
+        reinícios de processar_categorias, a partir do checkpoint.
+        
+        As abas gravam as páginas só no checkpoint; cada categoria é copiada para a saída quando ela
+        e todas as anteriores terminam, então a saída fica na ordem das categorias.
+        Retorna o total de produtos das categorias.
+        """
+        pendentes = deque()
+        encerradas = set()
+        for categoria in categorias:
+            if self.checkpoint and self.checkpoint.categoria_concluida(categoria):
+                # Categoria já concluída em uma execução anterior (--resume)
+                logger.info(f"Categoria {categoria} já concluída no checkpoint.")
+                encerradas.add(categoria)
+            else:
+                pendentes.append(categoria)
+        falhas = []
+        proxima = 0  # primeira categoria ainda não copiada para a saída
+        
+        def copiar_categorias_em_ordem():
+            nonlocal proxima
+            while proxima < len(categorias) and categorias[proxima] in encerradas:
+                self.copiar_paginas_do_checkpoint(categorias[proxima])
+                proxima += 1
+        
+        copiar_categorias_em_ordem()
+        self.gravar_na_saida = False
+        
+        # As abas novas abrem o catálogo com a sessão da aba principal
+        aba_principal = self.driver.current_window_handle
+        url_catalogo = self.driver.current_url
+        handles = [aba_principal]
+        for _ in range(min(abas, len(pendentes)) - 1):
+            self.driver.switch_to.new_window("tab")
+            self.driver.get(url_catalogo)
+            handles.append(self.driver.current_window_handle)
+        aba_atual = self.driver.current_window_handle
+        logger.info(f"Processando {len(pendentes)} categorias em {len(handles)} abas...")
+        
+        ativas = {}  # aba -> [categoria, etapas, assinatura dos cards antes do clique, limite da espera]
+        while pendentes or ativas:
+            avancou = False
+            for numero, aba in enumerate(handles, 1):
+                if aba not in ativas:
+                    if not pendentes:
+                        continue
+                    categoria = pendentes.popleft()
+                    logger.info(f"[aba {numero}] Processando categoria {categoria}")
+                    ativas[aba] = [categoria, self.etapas_categoria_em_aba(categoria), None, None]
+                categoria, etapas, assinatura_anterior, limite = ativas[aba]
+                try:
+                    if aba != aba_atual:
+                        self.driver.switch_to.window(aba)
+                        aba_atual = aba
+                    if assinatura_anterior is not None and \
+                            not self.pagina_pronta(assinatura_anterior=assinatura_anterior):
+                        if time.monotonic() < limite:
+                            continue
+                        logger.warning(f"[aba {numero}] Página não ficou pronta (próxima página da categoria "
+                                       f"{categoria}) em {self.tempo_maximo_espera}s. Continuando...")
+                    ativas[aba][2] = next(etapas)
+                    ativas[aba][3] = time.monotonic() + self.tempo_maximo_espera
+                except StopIteration as fim:
+                    del ativas[aba]
+                    logger.info(f"[aba {numero}] Categoria {categoria} concluída com {fim.value} produtos.")
+                    encerradas.add(categoria)
+                    copiar_categorias_em_ordem()
+                except (PrazoEsgotado, CircuitoAberto) as e:
+                    del ativas[aba]
+                    logger.error(f"[aba {numero}] Categoria {categoria} interrompida: {str(e)}")
+                    encerradas.add(categoria)
+                    copiar_categorias_em_ordem()
+                except Exception as e:
+                    del ativas[aba]
+                    logger.error(f"[aba {numero}] Erro ao processar categoria {categoria}: {str(e)}")
+                    logger.debug(traceback.format_exc())
+                    falhas.append(categoria)
+                avancou = True
+            if not avancou:
+                time.sleep(0.05)
+        
+        # Fecha as abas extras e volta à principal
+        try:
+            for aba in handles[1:]:
+                self.driver.switch_to.window(aba)
+                self.driver.close()
+            self.driver.switch_to.window(aba_principal)
+        except Exception as e:
+            logger.warning(f"Erro ao fechar as abas extras: {str(e)}")
+        
+        try:
+            if falhas:
+                logger.warning(f"Repetindo na aba principal as categorias que falharam: {', '.join(falhas)}")
+                # Só no checkpoint: a cópia abaixo as grava na saída junto com as demais, em ordem
+                self.processar_categorias(falhas, gravar_na_saida=False)
+        finally:
+            self.gravar_na_saida = True
+            encerradas.update(categorias)
+            copiar_categorias_em_ordem()
+        return sum(self.saida.contagem_por_categoria.get(categoria, 0) for categoria in categorias)
+    
+    def etapas_categoria_em_aba(self, categoria):
+        """
+        Processa uma categoria na aba atual, por etapas (gerador de processar_categorias_em_abas).
+        Depois de clicar em "próxima", produz a assinatura dos cards da página anterior e só continua
+        quando o agendador encontrar a nova página pronta. A navegação até a categoria (ou até a
+        primeira página pendente, pelo índice de navegação) é feita de uma vez. O valor de retorno
+        é a quantidade de produtos da categoria (sem gravar_na_saida, a extraída nesta chamada).
+        """
+        inicio_relogio = time.time()
+        inicio = time.perf_counter()
+        produtos_extraidos = 0
+        pagina_inicial = self.checkpoint.primeira_pagina_pendente(categoria) if self.checkpoint else 1
+        if pagina_inicial > 1:
+            if self.gravar_na_saida:
+                self.copiar_paginas_do_checkpoint(categoria, ate_pagina=pagina_inicial - 1)
+            logger.info(f"Retomando a categoria {categoria} a partir da página {pagina_inicial}...")
+        
+        if pagina_inicial > 1 and self.ir_direto_para_pagina(categoria, pagina_inicial):
+            pagina = pagina_inicial
+        else:
+            with self.metricas.intervalo("navegacao_categoria", categoria=categoria) as intervalo:
+                intervalo["sucesso"] = self.navegar_para_categoria(categoria)
+            if not intervalo["sucesso"]:
+                raise CategoriaInacessivel(f"Não foi possível navegar para a categoria {categoria}")
+            self.registrar_url_pagina(categoria, 1)
+            pagina = 1
+        
+        prazo_categoria = self.prazo_da_categoria(categoria)
+        while True:
+            if prazo_categoria.esgotado():
+                raise PrazoEsgotado(prazo_categoria)
+            if pagina >= pagina_inicial:
+                with self.metricas.intervalo("extracao_pagina", categoria=categoria, pagina=pagina) as intervalo:
+                    produtos_da_pagina = self.extrair_produtos_da_pagina(categoria)
+                    intervalo["sucesso"] = produtos_da_pagina is not None
+                    intervalo["produtos"] = len(produtos_da_pagina or ())
+                self.gravar_pagina(categoria, pagina, produtos_da_pagina, self.gravar_na_saida)
+                produtos_extraidos += len(produtos_da_pagina or ())
+            
+            botao_proxima = self.driver.execute_script(SCRIPT_BOTAO_PROXIMA)
+            if not botao_proxima:
+                logger.info(f"Não há mais páginas para a categoria {categoria}.")
+                self.indice_navegacao.registrar_total(categoria, pagina)
+                break
+            assinatura_anterior = self.estado_pagina()["assinatura"]
+            self.driver.execute_script("arguments[0].click();", botao_proxima)
+            yield assinatura_anterior
+            pagina += 1
+            self.registrar_url_pagina(categoria, pagina)
+        
+        self.concluir_categoria(categoria, pagina)
+        produtos = self.saida.contagem_por_categoria.get(categoria, 0) if self.gravar_na_saida else produtos_extraidos
+        # A categoria é intercalada com as outras abas, então o intervalo é registrado ao final
+        self.metricas.registrar_intervalo("categoria", inicio_relogio, time.perf_counter() - inicio,
+                                          categoria=categoria, produtos=produtos)
+        return produtos
+    
+    def tentar(self, funcao, etapa, categoria, prazo=None, **opcoes):
+        """
+        Executa uma etapa com a política de novas tentativas, dentro do prazo (por padrão, o da
+        categoria) e dos disjuntores do site e da categoria. Erros de janela fechada não são
+        repetidos: são tratados com o reinício do navegador.
+        """
+        return self.politica_tentativas.executar(
+            funcao, etapa, prazo=prazo or self.prazo_da_categoria(categoria),
+            disjuntores=(self.disjuntor_site, self.disjuntor_categoria(categoria)), fatal=navegador_fechado,
+            **opcoes)
+    
+    def disjuntor_categoria(self, categoria):
+        with self.trava_resiliencia:
+            if categoria not in self.disjuntores_categoria:
+                self.disjuntores_categoria[categoria] = Disjuntor(
+                    f"categoria {categoria}", limiar=0.5, janela=10, minimo_chamadas=4, tempo_aberto=300,
+                    ao_abrir=self.circuito_aberto)
+            return self.disjuntores_categoria[categoria]
+    
+    def prazo_da_categoria(self, categoria):
+        """Prazo da categoria, contado a partir do primeiro uso na execução (vale também para as novas tentativas)"""
+        with self.trava_resiliencia:
+            if categoria not in self.prazos_categoria:
+                self.prazos_categoria[categoria] = Prazo(self.prazo_categoria, f"da categoria {categoria}")
+            return self.prazos_categoria[categoria]
+    
+    def prazo_da_pagina(self, categoria):
+        """Prazo de uma página: o prazo por página, limitado pelo prazo da categoria"""
+        return Prazo.mais_proximo(Prazo(self.prazo_pagina, "da página"), self.prazo_da_categoria(categoria))
+    
+    def circuito_aberto(self, disjuntor):
+        self.metricas.contador("leveros_circuitos_abertos_total", circuito=disjuntor.nome)
+    
+    def rolar_pagina(self):
+        """Rola a página até o fim antes de uma nova tentativa (conteúdo carregado sob demanda)"""
+        logger.info("Nenhum produto encontrado. Rolando a página antes da nova tentativa...")
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    
+    def faixas_da_categoria(self, categoria):
+        """
+        Faixas de páginas (primeira, última ou None) em que a categoria é dividida entre os workers,
+        a partir da primeira página pendente no checkpoint. [None] se ela não for dividida.
+        """
+        if self.paginas_por_faixa < 1 or not self.checkpoint:
+            return [None]
+        de_pagina = self.checkpoint.primeira_pagina_pendente(categoria)
+        faixas = self.indice_navegacao.faixas(categoria, self.paginas_por_faixa, de_pagina)
+        return faixas if len(faixas) > 1 else [None]
+    
+    def requisicao_produtos(self, resultados, url_endpoint=None):
+        """
+        Identifica, no log de rede, a requisição JSON que trouxe os produtos exibidos na página.
+        Sem produtos na página, usa a requisição feita ao mesmo endpoint (url_endpoint) já conhecido.
+        Retorna (requisição, dados JSON, caminho da lista de produtos).
+        """
+        nomes = {r["nome"].strip() for r in resultados if r.get("nome") not in (None, "N/A")}
+        melhor = (None, None, None)
+        melhor_quantidade = 0
+        
+        for requisicao in leveros_api.requisicoes_json(self.driver.get_log("performance")):
+            try:
+                resposta = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": requisicao["id"]})
+                corpo = resposta["body"]
+                if resposta.get("base64Encoded"):
+                    corpo = base64.b64decode(corpo).decode("utf-8")
+                dados = json.loads(corpo)
+            except Exception:
+                continue
+            
+            if nomes:
+                caminho, quantidade = leveros_api.encontrar_lista_produtos(dados, nomes)
+                if quantidade > melhor_quantidade:
+                    melhor = (requisicao, dados, caminho)
+                    melhor_quantidade = quantidade
+            elif url_endpoint and leveros_api.modelo_requisicao(requisicao)["url"] == url_endpoint:
+                melhor = (requisicao, dados, None)
+        
+        return melhor
+    
+    def resultados_da_pagina(self):
+        """Executa o script de extração em lote sobre os cards da página atual"""
+        cards = self.driver.execute_script("return document.querySelectorAll(arguments[0]);",
+                                           self.seletores["cards_produtos"])
+        return self.driver.execute_script(SCRIPT_DADOS_PAGINA, cards)
+    
+    def descobrir_api(self, categorias):
+        """
+        Descobre os endpoints JSON do catálogo a partir do log de rede do Chrome.
+        
+        Para cada categoria, identifica a requisição cuja resposta contém os produtos exibidos;
+        na primeira categoria com mais de uma página, compara as requisições das páginas 1 e 2
+        para encontrar o parâmetro de paginação. Também aprende como cada campo do card é gerado
+        a partir do JSON. Requer o navegador iniciado com registrar_rede=True e o login feito.
+        """
+        configuracao = {
+            "descoberta_em": datetime.now().isoformat(timespec="seconds"),
+            "origem": self.url_origem(),
+            "categorias": {},
+            "paginacao": None,
+            "caminho_lista": None,
+            "campos": {},
+            "cabecalhos": {},
+            "cookies": [],
+        }
+        url_endpoint = None
+        pagina_2_observada = False
+        
+        # Descartar o que foi registrado antes da descoberta
+        self.driver.get_log("performance")
+        
+        for categoria in categorias:
+            logger.info(f"Descobrindo endpoint da categoria {categoria}...")
+            self.navegar_para_categoria(categoria)
+            self.aguardar_pagina_pronta(f"produtos da categoria {categoria}", espera_fixa=3)
+            
+            resultados = self.resultados_da_pagina()
+            requisicao, dados, caminho = self.requisicao_produtos(resultados, url_endpoint)
+            if requisicao is None:
+                logger.warning(f"Nenhuma requisição de produtos identificada para a categoria {categoria}.")
+                continue
+            
+            modelo = leveros_api.modelo_requisicao(requisicao)
+            configuracao["categorias"][categoria] = modelo
+            logger.info(f"Endpoint da categoria {categoria}: {modelo['metodo']} {requisicao['url']}")
+            
+            if caminho is not None and not configuracao["campos"]:
+                url_endpoint = modelo["url"]
+                configuracao["caminho_lista"] = caminho
+                configuracao["cabecalhos"] = leveros_api.cabecalhos_reutilizaveis(requisicao["cabecalhos"])
+                configuracao["campos"] = leveros_api.aprender_campos(
+                    resultados, leveros_api.obter_caminho(dados, caminho))
+            
+            # Observar a página 2 uma única vez para identificar o parâmetro de paginação
+            if not pagina_2_observada and resultados and self.ir_para_proxima_pagina():
+                requisicao_2, _, _ = self.requisicao_produtos(self.resultados_da_pagina(), url_endpoint)
+                if requisicao_2 is not None:
+                    pagina_2_observada = True
+                    configuracao["paginacao"] = leveros_api.aprender_paginacao(
+                        modelo, leveros_api.modelo_requisicao(requisicao_2))
+        
+        if configuracao["paginacao"] is None and configuracao["categorias"]:
+            primeiro_modelo = next(iter(configuracao["categorias"].values()))
+            configuracao["paginacao"] = leveros_api.aprender_paginacao(primeiro_modelo)
+        
+        configuracao["cookies"] = self.driver.get_cookies()
+        logger.info(f"Descoberta concluída: {len(configuracao['categorias'])}/{len(categorias)} categorias, "
+                    f"paginação: {configuracao['paginacao']}")
+        return configuracao
+    
+    def preparar_api(self, forcar=False):
+        """Garante que a configuração da API exista, descobrindo os endpoints com o Chrome se necessário"""
+        if not forcar and leveros_api.carregar_configuracao(self.arquivo_api):
+            return True
+        
+        logger.info("Descobrindo os endpoints da API com o Chrome...")
+        self.registrar_rede = True
+        try:
+            if not self.inicializar_navegador() or not self.fazer_login():
+                return False
+            configuracao = self.descobrir_api(self.categorias)
+            if not configuracao["campos"]:
+                logger.error("Não foi possível identificar a API de produtos.")
+                return False
+            leveros_api.salvar_configuracao(configuracao, self.arquivo_api)
+            logger.info(f"Configuração da API salva em {self.arquivo_api}")
+            return True
+        finally:
+            self.finalizar()
+            self.driver = None
+    
+    def processar_categorias_http(self, categorias):
+        """
+        Extrai as categorias diretamente pela API JSON descoberta, sem navegador, gravando cada
+        página na saída. Retorna o total de produtos das categorias.
+        """
+        configuracao = leveros_api.carregar_configuracao(self.arquivo_api)
+        cliente = leveros_api.ClienteApiLeveros(configuracao, paralelismo=self.paralelismo_http)
+        try:
+            for categoria in categorias:
+                if self.checkpoint and self.checkpoint.categoria_concluida(categoria):
+                    self.copiar_paginas_do_checkpoint(categoria)
+                    logger.info(f"Categoria {categoria} já concluída no checkpoint "
+                                f"({self.saida.contagem_por_categoria.get(categoria, 0)} produtos).")
+                    continue
                 
-                # Executar o script JavaScript
-                resultado = self.driver.execute_script(script, card)
-                
-                # Processar informações de parcelamento
-                info_parcelamento = resultado.get('infoParcelamento', 'N/A')
-                
-                # Extrair quantidade de parcelas e valor da parcela
-                qtd_parcelas = "N/A"
-                valor_parcela = "N/A"
-                
-                if 'de' in info_parcelamento:
-                    partes = info_parcelamento.split('de')
-                    qtd_parcelas = partes[0].strip()
-                    valor_parcela = partes[1].strip()
-                
-                # Criar dicionário com os dados do produto
-                produto = {
-                    "Categoria": categoria,
-                    "Nome do Produto": resultado.get('nome', 'N/A'),
-                    "Voltagem": resultado.get('voltagem', 'N/A'),
-                    "Preço Principal": resultado.get('precoPrincipal', 'N/A'),
-                    "Preço à Vista": resultado.get('precoVista', 'N/A'),
-                    "Qtd. Parcelas": qtd_parcelas,
-                    "Valor Parcela": valor_parcela,
-                    "URL da Imagem": resultado.get('urlImagem', 'N/A'),
-                    "URL Pública da Imagem": resultado.get('urlImagemPublica', 'N/A')
-                }
+                logger.info(f"Iniciando processamento da categoria: {categoria} (API)")
+                pagina_inicial = self.checkpoint.primeira_pagina_pendente(categoria) if self.checkpoint else 1
+                if pagina_inicial > 1:
+                    self.copiar_paginas_do_checkpoint(categoria, ate_pagina=pagina_inicial - 1)
                 
-                logger.info(f"Produto extraído: {resultado.get('nome', 'N/A')}")
-                return produto
+                def ao_concluir_pagina(pagina, resultados, categoria=categoria):
+                    produtos_da_pagina = self.produtos_dos_resultados(resultados, categoria)
+                    if self.checkpoint:
+                        self.checkpoint.registrar_pagina(categoria, pagina, produtos_da_pagina)
+                    self.saida.escrever_pagina(categoria, pagina, produtos_da_pagina)
+                    self.metricas.contador("leveros_paginas_extraidas_total", categoria=categoria)
+                    self.metricas.contador("leveros_produtos_extraidos_total", len(produtos_da_pagina),
+                                           categoria=categoria)
                 
+                ultima_pagina = cliente.extrair_categoria(categoria, pagina_inicial, ao_concluir_pagina)
+                if self.checkpoint:
+                    self.checkpoint.concluir_categoria(categoria, ultima_pagina)
+                logger.info(f"Extraídos {self.saida.contagem_por_categoria.get(categoria, 0)} produtos "
+                            f"da categoria {categoria}.")
+            return sum(self.saida.contagem_por_categoria.get(categoria, 0) for categoria in categorias)
+        finally:
+            cliente.fechar()
+    
+    def executar_modo_http(self):
+        """Extrai o catálogo pela API, redescobrindo os endpoints uma vez se a sessão capturada expirou"""
+        if not self.preparar_api():
+            raise Exception("Configuração da API indisponível")
+        try:
+            return self.processar_categorias_http(self.categorias)
+        except leveros_api.SessaoApiExpirada as e:
+            logger.warning(f"Sessão da API expirada ({str(e)}). Redescobrindo endpoints...")
+            if not self.preparar_api(forcar=True):
+                raise
+            return self.processar_categorias_http(self.categorias)
+    
+    def extrair_produtos_da_pagina(self, categoria):
+        """
+        Extrai todos os produtos de uma página, com a política de novas tentativas, dentro do prazo
+        da página. Prazo da página esgotado ou erro persistente: retorna None (a página falhou, o
+        que é diferente de uma página sem produtos, que retorna []) e a extração segue para a
+        próxima página. Prazo da categoria esgotado ou circuito aberto: a exceção é propagada e a
+        categoria é interrompida.
+        """
+        logger.info(f"Extraindo produtos da página atual para a categoria {categoria}...")
+        prazo = self.prazo_da_pagina(categoria)
+        
+        def extrair():
+            # Primeiro, vamos aguardar que a página carregue completamente
+            self.aguardar_pagina_pronta(f"produtos da categoria {categoria}", espera_fixa=3)
+            
+            # Tentar diferentes seletores para encontrar os produtos e, por último, o
+            # conteúdo característico dos cards; o seletor que funcionou da última vez
+            # nesta categoria é tentado primeiro
+            cards = []
+            for seletor in self.estrategias.ordenar("cards", categoria, SELETORES_CARDS + [ESTRATEGIA_ESTRUTURA]):
+                if seletor == ESTRATEGIA_ESTRUTURA:
+                    logger.info("Tentando encontrar produtos pela estrutura interna...")
+                    cards = self.driver.execute_script(SCRIPT_CARDS_ESTRUTURA)
+                else:
+                    logger.debug("Tentando encontrar produtos com seletor: %s", seletor)
+                    # Usar JavaScript para obter todos os cards de produtos (só os mais externos)
+                    cards = self.driver.execute_script(SCRIPT_CARDS_SELETOR, seletor)
+                if len(cards) > 0:
+                    logger.info(f"Encontrados {len(cards)} produtos com seletor: {seletor}")
+                    self.registrar_estrategia("cards", categoria, seletor)
+                    break
+            
+            logger.info(f"Encontrados {len(cards)} produtos na página atual.")
+            if not cards:
+                return cards, []
+            
+            # Extrair dados dos cards, mesclar registros duplicados do mesmo produto
+            # e descartar os serviços de instalação
+            return cards, self.filtrar_produtos(self.mesclar_produtos(self.extrair_dados_cards(cards, categoria, prazo)))
+        
+        produtos = []
+        try:
+            # Sem cards, a página é rolada e a busca é repetida
+            cards, produtos = self.tentar(extrair, "extracao_pagina", categoria, prazo=prazo,
+                                          repetir_resultado=lambda resultado: not resultado[0],
+                                          antes_de_repetir=self.rolar_pagina)
+            
+            # Capturar screenshot para debug se necessário
+            if len(cards) == 0:
+                logger.info("Capturando screenshot para análise...")
+                try:
+                    screenshot_path = f"screenshot_categoria_{categoria}_pagina.png"
+                    self.driver.save_screenshot(screenshot_path)
+                    logger.info(f"Screenshot salvo em {screenshot_path}")
+                except Exception as e:
+                    logger.error(f"Erro ao capturar screenshot: {str(e)}")
+        except PrazoEsgotado as e:
+            if e.prazo is self.prazo_da_categoria(categoria):
+                raise
+            logger.error(f"Extração da página interrompida: {str(e)}. Continuando com próxima etapa.")
+            return None
+        except CircuitoAberto:
+            raise
+        except Exception as e:
+            # Se for um erro de "no such window", propagar a exceção para ser tratada no nível superior
+            if navegador_fechado(e):
+                raise
+            logger.error(f"Erro ao extrair produtos da página: {str(e)}")
+            logger.error(traceback.format_exc())
+            logger.error("Número máximo de tentativas atingido. Continuando com próxima etapa.")
+            return None
+        
+        logger.info(f"Extraídos {len(produtos)} produtos da página atual.")
+        return produtos
+    
+    def extrair_dados_cards(self, cards, categoria, prazo=None):
+        """Extrai os dados dos cards em lote (uma chamada por página) ou, como alternativa, card a card"""
+        if self.extracao_em_lote and len(cards) > 0:
+            try:
+                return self.extrair_dados_pagina(cards, categoria)
             except Exception as e:
                 # Se for um erro de "no such window", propagar a exceção para ser tratada no nível superior
-                if "no such window" in str(e).lower() or "window not found" in str(e).lower():
+                if navegador_fechado(e):
                     raise
-                    
-                logger.error(f"Erro ao extrair dados do produto (tentativa {tentativa}/{max_tentativas}): {str(e)}")
-                logger.error(traceback.format_exc())
                 
-                if tentativa < max_tentativas:
-                    logger.info(f"Tentando novamente em 2 segundos...")
-                    time.sleep(2)
-                    tentativa += 1
-                else:
-                    logger.error("Número máximo de tentativas atingido. Retornando None.")
-                    return None
+                logger.warning(f"Falha na extração em lote ({str(e)}). Extraindo card a card...")
+        
+        produtos = []
+        for i, card in enumerate(cards, 1):
+            logger.debug("Processando produto %d/%d...", i, len(cards))
+            produto = self.extrair_dados_produto(card, categoria, prazo)
+            if produto:
+                produtos.append(produto)
+        return produtos
+    
+    def extrair_dados_pagina(self, cards, categoria):
+        """Extrai os dados de todos os cards da página com uma única chamada JavaScript"""
+        resultados = self.driver.execute_script(SCRIPT_DADOS_PAGINA, cards)
+        
+        produtos = []
+        for resultado in resultados:
+            produto = self.montar_produto(resultado, categoria)
+            logger.debug("Produto extraído: %s", produto['Nome do Produto'])
+            produtos.append(produto)
+        
+        logger.info(f"Dados de {len(produtos)} produtos extraídos em uma única chamada.")
+        return produtos
+    
+    def montar_produto(self, resultado, categoria):
+        """Monta o registro do produto a partir do resultado do script de extração"""
+        return produto_do_resultado(resultado, categoria)
+    
+    def mesclar_produtos(self, produtos):
+        """Mescla em um só registro os cards do mesmo produto (mesmo nome normalizado e imagem)"""
+        mesclados = mesclar_produtos(produtos)
+        if len(mesclados) < len(produtos):
+            logger.info(f"{len(produtos) - len(mesclados)} registros duplicados mesclados.")
+        return mesclados
+    
+    def filtrar_produtos(self, produtos):
+        """Remove os produtos que contêm "instalação" no nome (case insensitive)"""
+        filtrados = []
+        for produto in produtos:
+            nome_produto = produto.get("Nome do Produto", "").lower()
+            if "instalacao" in nome_produto or "instalação" in nome_produto:
+                logger.debug("Produto ignorado por conter 'instalação' no nome: %s", produto.get('Nome do Produto'))
+            else:
+                filtrados.append(produto)
+        return filtrados
+    
+    def extrair_dados_produto(self, card, categoria, prazo=None):
+        """
+        Extrai os dados de um card de produto, com a política de novas tentativas. Retorna None se
+        o card não puder ser lido.
+        """
+        def extrair():
+            # A página já passou pela espera de prontidão (DOM estável) antes da extração
+            return self.driver.execute_script(SCRIPT_DADOS_CARD, card)
+        
+        try:
+            resultado = self.tentar(extrair, "extracao_produto", categoria, prazo=prazo)
+        except (PrazoEsgotado, CircuitoAberto):
+            raise
+        except Exception as e:
+            # Se for um erro de "no such window", propagar a exceção para ser tratada no nível superior
+            if navegador_fechado(e):
+                raise
+            logger.error(f"Erro ao extrair dados do produto: {str(e)}")
+            logger.debug(traceback.format_exc())
+            logger.error("Número máximo de tentativas atingido. Retornando None.")
+            return None
+        
+        produto = self.montar_produto(resultado, categoria)
+        logger.debug("Produto extraído: %s", produto['Nome do Produto'])
+        return produto
     
     def ir_para_proxima_pagina(self):
         """Verifica se existe um botão de próxima página e clica nele se estiver disponível"""
@@ -637,30 +2057,21 @@ class LeverosRPA:
             logger.info("Verificando se existe próxima página...")
             
             # Usar JavaScript para verificar e clicar no botão de próxima página
-            script_check = """
-            const buttons = Array.from(document.querySelectorAll('button'));
-            // Procura botões com ícone 'fast_forward' ou com texto contendo 'próxima'
-            const nextButton = buttons.find(btn => {
-                const icon = btn.querySelector('i.material-icons');
-                return (icon && icon.textContent.includes('fast_forward')) || 
-                       btn.textContent.toLowerCase().includes('próxima');
-            });
-            
-            if (nextButton && !nextButton.disabled) {
-                return nextButton;
-            }
-            return null;
-            """
-            
-            botao_proxima = self.driver.execute_script(script_check)
+            botao_proxima = self.driver.execute_script(SCRIPT_BOTAO_PROXIMA)
             
             if botao_proxima:
                 logger.info("Botão de próxima página encontrado. Clicando...")
+                # Guardar a assinatura dos cards atuais para detectar a troca de página
+                assinatura_anterior = self.estado_pagina()["assinatura"]
+                
                 # Scrollar para o botão e clicar
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", botao_proxima)
-                time.sleep(1)
+                self.aguardar_pagina_pronta("rolagem até a paginação", espera_fixa=1)
                 self.driver.execute_script("arguments[0].click();", botao_proxima)
-                time.sleep(3)  # Aguardar carregamento da próxima página
+                
+                # Aguardar o carregamento da próxima página (troca do conjunto de cards)
+                self.aguardar_pagina_pronta("próxima página", espera_fixa=3,
+                                            assinatura_anterior=assinatura_anterior)
                 return True
             else:
                 logger.info("Não há mais páginas disponíveis.")
@@ -672,69 +2083,17 @@ class LeverosRPA:
             return False
     
     def salvar_dados_excel(self):
-        """Salva os dados extraídos em um arquivo Excel formatado"""
+        """Salva os dados extraídos em um arquivo Excel formatado, em uma única passada pela saída"""
         try:
-            if not self.dados_produtos:
+            if not self.saida or not self.saida.total:
                 logger.warning("Não há dados para salvar!")
                 return False
             
-            logger.info(f"Salvando {len(self.dados_produtos)} produtos no Excel...")
-            
-            # Cria um DataFrame com os dados coletados
-            df = pd.DataFrame(self.dados_produtos)
-            
-            # Cria um ExcelWriter para formatar o arquivo
-            writer = pd.ExcelWriter(self.arquivo_excel, engine='xlsxwriter')
-            
-            # Escreve a planilha principal com todos os produtos
-            df.to_excel(writer, sheet_name='Produtos Leveros', index=False)
-            
-            # Cria uma planilha para cada categoria
-            for categoria in self.categorias:
-                df_categoria = df[df['Categoria'] == categoria]
-                if not df_categoria.empty:
-                    # Limita o nome da planilha a 31 caracteres (limite do Excel)
-                    df_categoria.to_excel(writer, sheet_name=categoria[:31], index=False)
-            
-            # Cria uma planilha de resumo
-            resumo = df.groupby('Categoria').agg({
-                'Nome do Produto': 'count',
-            }).reset_index()
-            resumo.columns = ['Categoria', 'Quantidade de Produtos']
-            resumo.to_excel(writer, sheet_name='Resumo', index=False)
-            
-            # Formato para a planilha principal
-            workbook = writer.book
-            worksheet = writer.sheets['Produtos Leveros']
-            
-            # Formato para cabeçalhos
-            header_format = workbook.add_format({
-                'bold': True,
-                'text_wrap': True,
-                'valign': 'top',
-                'fg_color': '#4F6228',
-                'font_color': 'white',
-                'border': 1
-            })
-            
-            # Aplica o formato nos cabeçalhos
-            for col_num, value in enumerate(df.columns.values):
-                worksheet.write(0, col_num, value, header_format)
-            
-            # Ajusta a largura das colunas
-            worksheet.set_column('A:A', 15)  # Categoria
-            worksheet.set_column('B:B', 40)  # Nome do Produto
-            worksheet.set_column('C:C', 10)  # Voltagem
-            worksheet.set_column('D:E', 15)  # Preços
-            worksheet.set_column('F:G', 15)  # Parcelas
-            worksheet.set_column('H:H', 40)  # URL da Imagem
-            worksheet.set_column('I:I', 40)  # URL Pública da Imagem
-            
-            # Adiciona filtros automáticos
-            worksheet.autofilter(0, 0, len(df), len(df.columns) - 1)
-            
-            # Salva o arquivo
-            writer.close()
+            logger.info(f"Salvando {self.saida.total} produtos no Excel...")
+            
+            # Planilha principal, uma planilha por categoria e resumo, em memória constante
+            exportar_excel(self.saida, self.arquivo_excel, self.categorias, self.tamanho_bloco_exportacao,
+                           miniaturas=self.miniaturas)
             
             logger.info(f"Dados salvos com sucesso no arquivo: {self.arquivo_excel}")
             return True
@@ -767,130 +2126,338 @@ class LeverosRPA:
             pdf.cell(0, 6, txt=f"Data de geração: {agora.strftime('%d/%m/%Y %H:%M')}", ln=True)
             
             # Total de produtos
-            total_produtos = len(self.dados_produtos)
+            total_produtos = self.saida.total if self.saida else 0
             pdf.cell(0, 6, txt=f"Total de produtos: {total_produtos}", ln=True)
             
             pdf.ln(5)
             
-            # Agrupar produtos por categoria
-            produtos_por_categoria = {}
-            for produto in self.dados_produtos:
-                categoria = produto.get('Categoria', 'Sem Categoria')
-                if categoria not in produtos_por_categoria:
-                    produtos_por_categoria[categoria] = []
-                produtos_por_categoria[categoria].append(produto)
-            
-            # Iterar por categoria
-            for categoria in self.categorias:
-                if categoria in produtos_por_categoria:
-                    produtos_categoria = produtos_por_categoria[categoria]
-                    
+            # Uma única leitura da saída, em blocos: ela já está na ordem das categorias, então cada
+            # mudança de categoria abre uma nova seção
+            categoria_atual = None
+            for produto in (self.saida.produtos(self.tamanho_bloco_exportacao) if self.saida else ()):
+                categoria = produto.get('Categoria')
+                if categoria != categoria_atual:
+                    categoria_atual = categoria
+                    quantidade = self.saida.contagem_por_categoria.get(categoria, 0)
                     # Adicionar uma linha de categoria
                     pdf.set_font("Arial", "B", 12)
-                    pdf.cell(0, 10, f"Categoria: {categoria} ({len(produtos_categoria)} produtos)", 
+                    pdf.cell(0, 10, f"Categoria: {categoria} ({quantidade} produtos)", 
                              border=0, ln=True)
                     pdf.line(10, pdf.get_y(), 200, pdf.get_y())
                     pdf.ln(5)
+                
+                # Verificar se precisa adicionar uma nova página
+                if pdf.get_y() > 250:
+                    pdf.add_page()
+                
+                # Nome do Produto
+                pdf.set_font("Arial", "B", 10)
+                nome_produto = produto.get('Nome do Produto', 'N/A')
+                pdf.cell(0, 8, nome_produto, ln=True)
+                
+                # Miniatura da imagem (do cache), à direita das informações do produto
+                miniatura = miniatura_do_produto(self.miniaturas, produto)
+                if miniatura:
+                    pdf.image(miniatura, x=172, y=pdf.get_y(), w=28)
+                
+                # Informações do produto
+                pdf.set_font("Arial", "", 9)
+                
+                # Voltagem
+                voltagem = produto.get('Voltagem', 'N/A')
+                pdf.cell(0, 6, f"Voltagem: {voltagem}", ln=True)
+                
+                # Capacidade
+                btu = produto.get('BTU', 'N/A')
+                if btu != 'N/A':
+                    pdf.cell(0, 6, f"Capacidade: {btu}", ln=True)
+                
+                # Preço Principal
+                preco_principal = produto.get('Preço Principal', 'N/A')
+                pdf.cell(0, 6, f"Preço: {preco_principal}", ln=True)
+                
+                # Preço à Vista
+                preco_a_vista = produto.get('Preço à Vista', 'N/A')
+                pdf.cell(0, 6, f"Preço à Vista: {preco_a_vista}", ln=True)
+                
+                # Parcelamento
+                qtd_parcelas = produto.get('Qtd. Parcelas', 'N/A')
+                valor_parcela = produto.get('Valor Parcela', 'N/A')
+                if qtd_parcelas != 'N/A' and valor_parcela != 'N/A':
+                    pdf.cell(0, 6, f"Parcelamento: {qtd_parcelas}x de {valor_parcela}", ln=True)
+                
+                # Link da Imagem
+                img_url = produto.get('URL Pública da Imagem', 'N/A')
+                if img_url and img_url != 'N/A':
+                    pdf.ln(2)
+                    pdf.set_font("Arial", "", 9)
+                    pdf.cell(0, 6, "Segue link da foto do produto:", ln=True)
                     
-                    # Iterar pelos produtos da categoria
-                    for produto in produtos_categoria:
-                        # Verificar se precisa adicionar uma nova página
-                        if pdf.get_y() > 250:
-                            pdf.add_page()
-                        
-                        # Nome do Produto
-                        pdf.set_font("Arial", "B", 10)
-                        nome_produto = produto.get('Nome do Produto', 'N/A')
-                        pdf.cell(0, 8, nome_produto, ln=True)
-                        
-                        # Informações do produto
-                        pdf.set_font("Arial", "", 9)
-                        
-                        # Voltagem
-                        voltagem = produto.get('Voltagem', 'N/A')
-                        pdf.cell(0, 6, f"Voltagem: {voltagem}", ln=True)
-                        
-                        # Preço Principal
-                        preco_principal = produto.get('Preço Principal', 'N/A')
-                        pdf.cell(0, 6, f"Preço: {preco_principal}", ln=True)
-                        
-                        # Preço à Vista
-                        preco_a_vista = produto.get('Preço à Vista', 'N/A')
-                        pdf.cell(0, 6, f"Preço à Vista: {preco_a_vista}", ln=True)
-                        
-                        # Parcelamento
-                        qtd_parcelas = produto.get('Qtd. Parcelas', 'N/A')
-                        valor_parcela = produto.get('Valor Parcela', 'N/A')
-                        if qtd_parcelas != 'N/A' and valor_parcela != 'N/A':
-                            pdf.cell(0, 6, f"Parcelamento: {qtd_parcelas}x de {valor_parcela}", ln=True)
-                        
-                        # Link da Imagem
-                        img_url = produto.get('URL Pública da Imagem', 'N/A')
-                        if img_url and img_url != 'N/A':
-                            pdf.ln(2)
-                            pdf.set_font("Arial", "", 9)
-                            pdf.cell(0, 6, "Segue link da foto do produto:", ln=True)
-                            
-                            # Configurar fonte e cor para o link
-                            pdf.set_font("Arial", "BU", 9)  # Negrito e sublinhado
-                            pdf.set_text_color(0, 0, 255)  # Azul
-                            
-                            # Adicionar link clicável
-                            texto_link = "LINK PARA FOTO DO PRODUTO (Clique para visualizar)"
-                            pdf.cell(0, 6, texto_link, ln=True, link=img_url)
-                            
-                            # Restaurar fonte e cor
-                            pdf.set_text_color(0, 0, 0)  # Preto
-                            pdf.set_font("Arial", "", 9)  # Normal
-                        
-                        # Separador entre produtos
-                        pdf.ln(5)
-                        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-                        pdf.ln(5)
-            
+                    # Configurar fonte e cor para o link
+                    pdf.set_font("Arial", "BU", 9)  # Negrito e sublinhado
+                    pdf.set_text_color(0, 0, 255)  # Azul
+                    
+                    # Adicionar link clicável
+                    texto_link = "LINK PARA FOTO DO PRODUTO (Clique para visualizar)"
+                    pdf.cell(0, 6, texto_link, ln=True, link=img_url)
+                    
+                    # Restaurar fonte e cor
+                    pdf.set_text_color(0, 0, 0)  # Preto
+                    pdf.set_font("Arial", "", 9)  # Normal
+                
+                # Separador entre produtos
+                pdf.ln(5)
+                pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+                pdf.ln(5)
+    
             # Salvar o PDF
             pdf_path = os.path.join(os.getcwd(), filename)
             pdf.output(pdf_path)
             logging.info(f"Arquivo PDF salvo com sucesso: {pdf_path}")
+            return True
             
         except Exception as e:
             logging.error(f"Erro ao salvar PDF: {str(e)}")
             logging.error(traceback.format_exc())
+            return False
+    
+    def salvar_dados_normalizados(self):
+        """Grava os produtos com preços e parcelamento convertidos em colunas numéricas"""
+        try:
+            if not self.saida or not self.saida.total:
+                logger.warning("Não há dados para normalizar!")
+                return False
+            
+            total, com_invalidos = normalizar_saida(self.saida, self.arquivo_normalizado, self.formato_saida,
+                                                    self.tamanho_bloco_exportacao)
+            if com_invalidos:
+                logger.warning(f"{com_invalidos} de {total} produtos com preço ou parcelamento que não pôde ser "
+                               f"convertido (coluna campos_invalidos).")
+            logger.info(f"Dados normalizados salvos em {self.arquivo_normalizado}")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao normalizar os dados: {str(e)}")
+            return False
+    
+    def preparar_imagens(self):
+        """Baixa as imagens dos produtos para o cache em disco e gera as miniaturas usadas no PDF e no Excel"""
+        try:
+            # Imagens da área logada usam os cookies da sessão em cache, se houver
+            sessao = self.carregar_sessao() if self.usar_cache_sessao else None
+            cache = CacheImagens(self.diretorio_cache_imagens, paralelismo=self.paralelismo_http,
+                                 cookies=sessao["cookies"] if sessao else None)
+            try:
+                self.miniaturas = cache.preparar(self.saida.produtos(self.tamanho_bloco_exportacao))
+            finally:
+                cache.fechar()
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao preparar as imagens dos produtos: {str(e)}")
+            self.miniaturas = {}
+            return False
+    
+    def registrar_historico(self):
+        """Registra os preços da execução no histórico e exporta as diferenças em relação à execução anterior"""
+        try:
+            if not self.saida or not self.saida.total:
+                logger.warning("Não há dados para registrar no histórico!")
+                return False
+            
+            # Só as categorias concluídas no checkpoint (nesta execução ou, com --resume, na que ela
+            # retoma) podem ter produtos dados como removidos
+            concluidas = [categoria for categoria in self.categorias
+                          if self.checkpoint is None or self.checkpoint.categoria_concluida(categoria)]
+            if len(concluidas) < len(self.categorias):
+                logger.warning(f"Execução parcial: {len(self.categorias) - len(concluidas)} categorias não "
+                               f"concluídas ficam fora dos produtos removidos do histórico.")
+            
+            historico = HistoricoPrecos(self.arquivo_historico)
+            try:
+                execucao_id = historico.registrar_execucao(
+                    self.timestamp, self.saida.produtos(self.tamanho_bloco_exportacao), concluidas)
+                delta = historico.exportar_delta(execucao_id, self.arquivo_delta)
+            finally:
+                historico.fechar()
+            
+            logger.info(f"Histórico de preços atualizado: {len(delta['novos'])} novos, "
+                        f"{len(delta['removidos'])} removidos, {len(delta['reprecificados'])} reprecificados. "
+                        f"Diferenças salvas em {self.arquivo_delta}")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao registrar o histórico de preços: {str(e)}")
+            return False
+    
+    def registrar_catalogo(self):
+        """Carrega os produtos da execução no catálogo local pesquisável (leveros_catalogo.py)"""
+        try:
+            if not self.saida or not self.saida.total:
+                logger.warning("Não há dados para carregar no catálogo!")
+                return False
+            
+            catalogo = CatalogoProdutos(self.arquivo_catalogo)
+            try:
+                catalogo.carregar_execucao(self.timestamp, self.saida.produtos(self.tamanho_bloco_exportacao),
+                                           origem=self.arquivo_saida)
+            finally:
+                catalogo.fechar()
+            
+            logger.info(f"Catálogo pesquisável atualizado com {self.saida.total} produtos: {self.arquivo_catalogo}")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao carregar o catálogo pesquisável: {str(e)}")
+            return False
     
     def executar(self):
         """Executa o fluxo completo do RPA"""
         try:
             logger.info("Iniciando execução do RPA Leveros Integra...")
+            self.metricas.iniciar(self.arquivo_intervalos)
             
-            # Inicializa o navegador
-            if not self.inicializar_navegador():
-                logger.error("Não foi possível inicializar o navegador. Abortando execução.")
-                return False
+            # Checkpoint da extração (novo, ou o anterior com --resume)
+            self.abrir_checkpoint()
             
-            # Faz login no sistema
-            if not self.fazer_login():
-                logger.error("Não foi possível realizar o login. Abortando execução.")
-                self.finalizar()
-                return False
+            # Saída incremental: cada página é gravada assim que extraída
+            self.saida = criar_saida(self.formato_saida, self.arquivo_saida)
+            logger.info(f"Gravando os produtos em {self.arquivo_saida} à medida que são extraídos...")
+            
+            # Armazém de snapshots e pool de análise do modo de captura (ou do reprocessamento)
+            if self.capturar_html or self.reprocessar_snapshots:
+                self.snapshots = ArmazemSnapshots(self.diretorio_snapshots)
+                self.abrir_analisador()
+                logger.info(f"Snapshots das páginas em {self.diretorio_snapshots}")
+            
+            if self.retomar and self.checkpoint.concluido(self.categorias):
+                # Nada a extrair: reconstrói as exportações a partir do checkpoint
+                logger.info("Todas as categorias já estão no checkpoint. Gerando as exportações sem nova extração...")
+                self.processar_categorias(self.categorias)
+            elif self.reprocessar_snapshots:
+                # Sem navegador: analisa de novo as páginas já capturadas
+                self.processar_snapshots(self.categorias)
+            elif self.modo_http:
+                # Sem navegador: o Chrome só é usado para descobrir os endpoints na primeira execução
+                self.executar_modo_http()
+            elif self.workers > 1:
+                # Cada worker abre seu próprio navegador e faz seu próprio login
+                self.processar_categorias_em_paralelo(self.categorias, self.workers)
+            elif self.abas > 1:
+                # Um navegador e um login; uma categoria por aba
+                if not self.inicializar_navegador():
+                    logger.error("Não foi possível inicializar o navegador. Abortando execução.")
+                    return False
+                if not self.fazer_login():
+                    logger.error("Não foi possível realizar o login. Abortando execução.")
+                    self.finalizar()
+                    return False
+                self.processar_categorias_em_abas(self.categorias, self.abas)
+            else:
+                # Inicializa o navegador
+                if not self.inicializar_navegador():
+                    logger.error("Não foi possível inicializar o navegador. Abortando execução.")
+                    return False
+                
+                # Faz login no sistema
+                if not self.fazer_login():
+                    logger.error("Não foi possível realizar o login. Abortando execução.")
+                    self.finalizar()
+                    return False
+                
+                # Processa cada categoria
+                self.processar_categorias(self.categorias)
+            
+            self.saida.fechar()
+            self.fechar_analisador()
+            logger.info(f"{self.saida.total} produtos gravados em {self.arquivo_saida}")
             
-            # Processa cada categoria
-            self.dados_produtos = self.processar_categorias(self.categorias)
+            # Baixa as imagens e gera as miniaturas antes das exportações
+            if self.baixar_imagens:
+                with self.metricas.intervalo("imagens") as intervalo:
+                    intervalo["sucesso"] = self.preparar_imagens()
             
             # Salva os dados no Excel
-            self.salvar_dados_excel()
+            with self.metricas.intervalo("exportacao_excel") as intervalo:
+                intervalo["sucesso"] = self.salvar_dados_excel()
             
             # Salva os dados no PDF
-            self.salvar_dados_pdf()
+            with self.metricas.intervalo("exportacao_pdf") as intervalo:
+                intervalo["sucesso"] = self.salvar_dados_pdf()
+            
+            # Salva os preços e o parcelamento em colunas numéricas
+            with self.metricas.intervalo("exportacao_normalizada") as intervalo:
+                intervalo["sucesso"] = self.salvar_dados_normalizados()
+            
+            # Registra os preços no histórico e exporta apenas o que mudou desde a execução anterior
+            with self.metricas.intervalo("historico") as intervalo:
+                intervalo["sucesso"] = self.registrar_historico()
+            
+            # Carrega a execução no catálogo local com busca por texto e por atributos
+            with self.metricas.intervalo("catalogo") as intervalo:
+                intervalo["sucesso"] = self.registrar_catalogo()
+            
+            # Relatório de bytes e tempo de carregamento por página
+            if self.relatorio_paginas:
+                self.salvar_relatorio_paginas()
             
             # Finaliza a execução
             self.finalizar()
             
+            self.checkpoint.fechar()
+            
+            logger.info(f"Tempo total economizado pelas esperas de prontidão: {self.tempo_economizado_esperas:.1f}s "
+                        f"(esperas acima da espera fixa: {self.tempo_perdido_esperas:.1f}s)")
             logger.info("Execução do RPA concluída com sucesso!")
             return True
         except Exception as e:
             logger.error(f"Erro durante a execução do RPA: {str(e)}")
+            if self.saida:
+                self.saida.fechar()
             self.finalizar()
             return False
+        finally:
+            self.fechar_analisador()
+            self.salvar_estrategias()
+            self.salvar_indice_navegacao()
+            self.salvar_metricas()
+    
+    def salvar_estrategias(self):
+        """Salva o cache de estratégias de localização para as próximas execuções"""
+        if not self.usar_cache_estrategias:
+            return
+        try:
+            self.estrategias.salvar()
+            resumo = ", ".join(f"{tipo}: {acertos} acertos e {falhas} falhas"
+                               for tipo, (acertos, falhas) in sorted(self.estrategias.resumo().items()))
+            logger.info(f"Cache de estratégias salvo em {self.arquivo_estrategias} ({resumo or 'vazio'})")
+        except Exception as e:
+            logger.error(f"Erro ao salvar o cache de estratégias: {str(e)}")
+    
+    def salvar_indice_navegacao(self):
+        """Salva o índice de navegação direta para as próximas execuções"""
+        if not self.usar_indice_navegacao:
+            return
+        try:
+            self.indice_navegacao.salvar()
+            logger.info(f"Índice de navegação salvo em {self.arquivo_indice_navegacao}")
+        except Exception as e:
+            logger.error(f"Erro ao salvar o índice de navegação: {str(e)}")
+    
+    def salvar_metricas(self):
+        """Encerra a gravação dos intervalos e grava os contadores e histogramas da execução"""
+        try:
+            self.metricas.encerrar()
+            self.metricas.salvar_prometheus(self.arquivo_metricas)
+            logger.info(f"Intervalos salvos em {self.arquivo_intervalos} e métricas em {self.arquivo_metricas}")
+        except Exception as e:
+            logger.error(f"Erro ao salvar as métricas da execução: {str(e)}")
+    
+    def abrir_checkpoint(self):
+        """Abre o checkpoint da extração; sem --resume, descarta o progresso anterior"""
+        self.checkpoint = CheckpointExtracao(self.arquivo_checkpoint)
+        if self.retomar:
+            paginas, categorias = self.checkpoint.resumo()
+            logger.info(f"Retomando do checkpoint {self.arquivo_checkpoint}: {paginas} páginas gravadas, "
+                        f"{categorias} categorias concluídas.")
+        else:
+            self.checkpoint.iniciar(self.categorias)
     
     def finalizar(self):
         """Finaliza o navegador e libera recursos"""
@@ -905,10 +2472,80 @@ class LeverosRPA:
 
 if __name__ == "__main__":
     # Verifica argumentos de linha de comando
+    import argparse
     import sys
-    headless_mode = "--headless" in sys.argv
+    parser = argparse.ArgumentParser(description="RPA para extração de produtos da Leveros Integra")
+    parser.add_argument("--headless", action="store_true",
+                        help="executa o Chrome sem interface gráfica")
+    parser.add_argument("--por-card", action="store_true",
+                        help="extrai os produtos card a card em vez de uma chamada por página")
+    parser.add_argument("--tempo-maximo-espera", type=float, default=10, metavar="SEGUNDOS",
+                        help="limite das esperas de prontidão da página (padrão: 10)")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="número de navegadores processando categorias em paralelo (padrão: 1)")
+    parser.add_argument("--sem-cache-sessao", action="store_true",
+                        help="sempre faz login pelo formulário, sem reutilizar a sessão em cache")
+    parser.add_argument("--modo-http", action="store_true",
+                        help="extrai pela API JSON do catálogo, sem renderizar as páginas no navegador")
+    parser.add_argument("--redescobrir-api", action="store_true",
+                        help="descobre novamente os endpoints da API antes de extrair (com --modo-http)")
+    parser.add_argument("--resume", action="store_true",
+                        help="retoma a execução anterior a partir do checkpoint (primeira página pendente)")
+    parser.add_argument("--formato-saida", choices=FORMATOS_SAIDA, default="jsonl",
+                        help="formato do arquivo em que os produtos são gravados durante a extração (padrão: jsonl)")
+    parser.add_argument("--imagens", action="store_true",
+                        help="baixa as imagens dos produtos (com cache) e inclui miniaturas no PDF e no Excel")
+    parser.add_argument("--modo-enxuto", action="store_true",
+                        help="não baixa imagens, fontes, mídia e hosts de terceiros durante a navegação")
+    parser.add_argument("--relatorio-paginas", action="store_true",
+                        help="gera o relatório de bytes e tempo de carregamento por página (sempre no modo enxuto)")
+    parser.add_argument("--versao-chromedriver", default=VERSAO_CHROMEDRIVER, metavar="VERSAO",
+                        help=f"versão do ChromeDriver baixada uma vez para o cache local (padrão: {VERSAO_CHROMEDRIVER})")
+    parser.add_argument("--capturar-html", action="store_true",
+                        help="o navegador só captura o HTML dos cards; a análise roda em um pool de processos")
+    parser.add_argument("--reprocessar-snapshots", metavar="DIRETORIO",
+                        help="analisa de novo os snapshots de uma captura anterior, sem navegador")
+    parser.add_argument("--sem-cache-estrategias", action="store_true",
+                        help="não lê nem grava o cache das estratégias de localização que funcionaram")
+    parser.add_argument("--sem-indice-navegacao", action="store_true",
+                        help="não lê nem grava o índice de URLs das páginas; navega sempre pelos cliques")
+    parser.add_argument("--paginas-por-faixa", type=int, default=0, metavar="N",
+                        help="com --workers, divide as categorias já indexadas em faixas de N páginas entre os workers")
+    parser.add_argument("--abas", type=int, default=1, metavar="N",
+                        help="processa N categorias ao mesmo tempo em abas de um único navegador (padrão: 1)")
+    parser.add_argument("--prazo-pagina", type=float, default=60, metavar="SEGUNDOS",
+                        help="prazo da extração de uma página, com as novas tentativas (padrão: 60)")
+    parser.add_argument("--prazo-categoria", type=float, default=30 * 60, metavar="SEGUNDOS",
+                        help="prazo de uma categoria; esgotado, a categoria é interrompida (padrão: 1800)")
+    parser.add_argument("--orcamento-tentativas", type=int, default=20, metavar="N",
+                        help="novas tentativas disponíveis, compartilhadas pela execução; cada sucesso devolve 0,1 (padrão: 20)")
+    parser.add_argument("--reciclar-a-cada-paginas", type=int, default=400, metavar="N",
+                        help="recicla o navegador depois de N páginas (0 desativa; padrão: 400)")
+    parser.add_argument("--limite-memoria-navegador", type=float, default=4096, metavar="MB",
+                        help="recicla o navegador quando o Chrome passar de MB de memória (0 desativa; padrão: 4096)")
+    parser.add_argument("--url-login", metavar="URL",
+                        help="URL da página de login (por exemplo, a do servidor_mock.py)")
+    args = parser.parse_args()
     
     # Executa o RPA
-    logger.info(f"Iniciando RPA em modo {'headless' if headless_mode else 'normal'}")
-    rpa = LeverosRPA(headless=headless_mode)
+    logger.info(f"Iniciando RPA em modo {'headless' if args.headless else 'normal'}")
+    rpa = LeverosRPA(headless=args.headless, extracao_em_lote=not args.por_card,
+                     tempo_maximo_espera=args.tempo_maximo_espera, workers=args.workers,
+                     usar_cache_sessao=not args.sem_cache_sessao, modo_http=args.modo_http,
+                     retomar=args.resume, formato_saida=args.formato_saida,
+                     baixar_imagens=args.imagens, modo_enxuto=args.modo_enxuto,
+                     relatorio_paginas=args.relatorio_paginas,
+                     versao_chromedriver=args.versao_chromedriver, capturar_html=args.capturar_html,
+                     reprocessar_snapshots=args.reprocessar_snapshots,
+                     usar_cache_estrategias=not args.sem_cache_estrategias,
+                     usar_indice_navegacao=not args.sem_indice_navegacao,
+                     paginas_por_faixa=args.paginas_por_faixa, abas=args.abas,
+                     prazo_pagina=args.prazo_pagina, prazo_categoria=args.prazo_categoria,
+                     orcamento_tentativas=args.orcamento_tentativas,
+                     reciclar_a_cada_paginas=args.reciclar_a_cada_paginas,
+                     limite_memoria_navegador_mb=args.limite_memoria_navegador)
+    if args.url_login:
+        rpa.url_login = args.url_login
+    if args.modo_http and args.redescobrir_api and not rpa.preparar_api(forcar=True):
+        sys.exit(1)
     rpa.executar()
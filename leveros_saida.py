@@ -0,0 +1,205 @@
+"""
+Saída incremental dos produtos extraídos
+Cada página é gravada no destino assim que termina a extração, sem acumular o catálogo em memória.
+As exportações (Excel, PDF e histórico de preços) leem o destino em blocos ao final da execução.
+"""
+
+import csv
+import json
+import threading
+from leveros_produtos import COLUNAS_PRODUTO, COLUNAS_CATEGORICAS, Produto, como_produto
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet é opcional
+    pa = None
+    pq = None
+
+FORMATOS_SAIDA = ("jsonl", "csv", "parquet")
+
+
+class SaidaProdutos:
+    """
+    Destino dos produtos extraídos. Recebe as páginas à medida que terminam (de vários workers,
+    se for o caso) e permite relê-las em blocos. As subclasses implementam _gravar e _ler.
+    """
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho
+        self.trava = threading.Lock()
+        self.total = 0
+        self.contagem_por_categoria = {}
+        # Última página gravada de cada categoria
+        self.ultima_pagina = {}
+
+    def escrever_pagina(self, categoria, pagina, produtos):
+        """
+        Grava os produtos de uma página. Páginas da categoria já gravadas (por exemplo, ao repetir
+        uma categoria depois de reiniciar o navegador) são ignoradas. Retorna se a página foi gravada.
+        """
+        with self.trava:
+            if pagina <= self.ultima_pagina.get(categoria, 0):
+                return False
+            if produtos:
+                self._gravar(produtos)
+            self.total += len(produtos)
+            for produto in produtos:
+                categoria_produto = produto.get("Categoria")
+                self.contagem_por_categoria[categoria_produto] = \
+                    self.contagem_por_categoria.get(categoria_produto, 0) + 1
+            self.ultima_pagina[categoria] = pagina
+            return True
+
+    def ler_em_blocos(self, tamanho_bloco=5000, categoria=None):
+        """Lê os produtos gravados em listas de até tamanho_bloco registros, opcionalmente de uma categoria"""
+        bloco = []
+        for produto in self._ler():
+            if categoria is not None and produto.get("Categoria") != categoria:
+                continue
+            bloco.append(produto)
+            if len(bloco) >= tamanho_bloco:
+                yield bloco
+                bloco = []
+        if bloco:
+            yield bloco
+
+    def produtos(self, tamanho_bloco=5000, categoria=None):
+        """Itera os produtos gravados um a um (lidos em blocos), opcionalmente de uma categoria"""
+        for bloco in self.ler_em_blocos(tamanho_bloco, categoria):
+            yield from bloco
+
+    def fechar(self):
+        """Conclui a gravação. Depois de fechado, o destino continua disponível para leitura."""
+
+    def _gravar(self, produtos):
+        raise NotImplementedError
+
+    def _ler(self):
+        raise NotImplementedError
+
+
+class SaidaMemoria(SaidaProdutos):
+    """Mantém os produtos em uma lista (usado na verificação de paridade e em testes manuais)"""
+
+    def __init__(self):
+        super().__init__()
+        self.registros = []
+
+    def _gravar(self, produtos):
+        self.registros.extend(Produto.de_registro(produto) for produto in produtos)
+
+    def _ler(self):
+        return iter(list(self.registros))
+
+
+class SaidaJsonl(SaidaProdutos):
+    """Um produto por linha em JSON. Cada página é descarregada no disco assim que gravada."""
+
+    def __init__(self, caminho):
+        super().__init__(caminho)
+        self.arquivo = open(caminho, "w", encoding="utf-8")
+
+    def _gravar(self, produtos):
+        for produto in produtos:
+            self.arquivo.write(json.dumps(dict(produto), ensure_ascii=False) + "\n")
+        self.arquivo.flush()
+
+    def _ler(self):
+        with open(self.caminho, encoding="utf-8") as f:
+            for linha in f:
+                if linha.strip():
+                    yield Produto.de_registro(json.loads(linha))
+
+    def fechar(self):
+        with self.trava:
+            if not self.arquivo.closed:
+                self.arquivo.close()
+
+
+class SaidaCsv(SaidaProdutos):
+    """CSV com as colunas do registro de produto. Cada página é descarregada no disco assim que gravada."""
+
+    def __init__(self, caminho):
+        super().__init__(caminho)
+        self.arquivo = open(caminho, "w", newline="", encoding="utf-8-sig")
+        self.escritor = csv.DictWriter(self.arquivo, fieldnames=COLUNAS_PRODUTO, extrasaction="ignore")
+        self.escritor.writeheader()
+        self.arquivo.flush()
+
+    def _gravar(self, produtos):
+        self.escritor.writerows(produtos)
+        self.arquivo.flush()
+
+    def _ler(self):
+        with open(self.caminho, newline="", encoding="utf-8-sig") as f:
+            for registro in csv.DictReader(f):
+                yield Produto.de_registro(registro)
+
+    def fechar(self):
+        with self.trava:
+            if not self.arquivo.closed:
+                self.arquivo.close()
+
+
+class SaidaParquet(SaidaProdutos):
+    """
+    Parquet (requer pyarrow). Os produtos são acumulados até tamanho_grupo registros e gravados
+    como um row group. O arquivo só fica legível depois de fechado (o rodapé é escrito no fim);
+    até lá, as páginas extraídas estão no checkpoint. Categoria e Voltagem são colunas de
+    dicionário (cada valor distinto uma vez por row group, lidas como categorias no pandas).
+    """
+
+    def __init__(self, caminho, tamanho_grupo=10000):
+        if pq is None:
+            raise ImportError("A saída em Parquet requer o pacote pyarrow (pip install pyarrow)")
+        super().__init__(caminho)
+        self.tamanho_grupo = tamanho_grupo
+        self.esquema = pa.schema([
+            (coluna, pa.dictionary(pa.int32(), pa.string()) if coluna in COLUNAS_CATEGORICAS else pa.string())
+            for coluna in COLUNAS_PRODUTO
+        ])
+        self.escritor = pq.ParquetWriter(caminho, self.esquema)
+        self.pendentes = []
+
+    def _gravar(self, produtos):
+        self.pendentes.extend(produtos)
+        if len(self.pendentes) >= self.tamanho_grupo:
+            self._descarregar()
+
+    def _descarregar(self):
+        if not self.pendentes:
+            return
+        # Uma lista por coluna, montada direto dos registros (zip transpõe linhas em colunas)
+        linhas = (como_produto(produto).valores() for produto in self.pendentes)
+        colunas = [
+            pa.array([None if valor is None else str(valor) for valor in valores], type=campo.type)
+            for campo, valores in zip(self.esquema, zip(*linhas))
+        ]
+        self.escritor.write_table(pa.Table.from_arrays(colunas, schema=self.esquema))
+        self.pendentes = []
+
+    def _ler(self):
+        arquivo = pq.ParquetFile(self.caminho)
+        for lote in arquivo.iter_batches(batch_size=5000, columns=COLUNAS_PRODUTO):
+            colunas = [lote.column(coluna).to_pylist() for coluna in COLUNAS_PRODUTO]
+            for valores in zip(*colunas):
+                yield Produto(*valores)
+
+    def fechar(self):
+        with self.trava:
+            if self.escritor is not None:
+                self._descarregar()
+                self.escritor.close()
+                self.escritor = None
+
+
+def criar_saida(formato, caminho):
+    """Cria o destino dos produtos no formato informado (jsonl, csv ou parquet)"""
+    if formato == "jsonl":
+        return SaidaJsonl(caminho)
+    if formato == "csv":
+        return SaidaCsv(caminho)
+    if formato == "parquet":
+        return SaidaParquet(caminho)
+    raise ValueError(f"Formato de saída desconhecido: {formato} (use um de {', '.join(FORMATOS_SAIDA)})")
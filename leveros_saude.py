@@ -0,0 +1,149 @@
+"""
+Monitor de saúde do navegador
+Uma sessão do Chrome que roda por horas acumula memória (processos de renderização, heap do
+JavaScript do SPA) até ficar lenta ou cair com "no such window". O monitor conta as páginas
+servidas pelo navegador atual e, a cada `intervalo_verificacao` páginas, mede a memória residente
+somada do ChromeDriver e de todos os processos do Chrome e o heap do JavaScript da aba. Quando um
+limite é atingido, indica o motivo para o RPA reciclar o navegador entre duas páginas.
+
+A memória da árvore de processos é lida com o psutil, se instalado, ou pelo /proc (Linux); sem
+nenhum dos dois, só os limites de páginas e de heap valem.
+"""
+
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Heap do JavaScript da aba (performance.memory, só no Chrome), em bytes
+SCRIPT_HEAP_JS = "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+
+
+def processos_descendentes(pid):
+    """PIDs dos descendentes de um processo, pelo /proc (Linux)"""
+    filhos = {}
+    for nome in os.listdir("/proc"):
+        if not nome.isdigit():
+            continue
+        try:
+            with open(f"/proc/{nome}/stat") as f:
+                # O nome do processo pode ter espaços; o PID do pai é o 2º campo depois dele
+                pai = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        filhos.setdefault(pai, []).append(int(nome))
+    descendentes, pendentes = [], [pid]
+    while pendentes:
+        for filho in filhos.get(pendentes.pop(), []):
+            descendentes.append(filho)
+            pendentes.append(filho)
+    return descendentes
+
+
+def rss_arvore_mb(pid):
+    """
+    Memória residente somada do processo e de todos os descendentes, em MB (psutil ou /proc).
+    None se não for possível medir.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    total = 0
+    if psutil is not None:
+        try:
+            processo = psutil.Process(pid)
+            processos = [processo] + processo.children(recursive=True)
+        except psutil.Error:
+            return None
+        for p in processos:
+            try:
+                total += p.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+    if not os.path.isdir("/proc"):
+        return None
+    tamanho_pagina = os.sysconf("SC_PAGE_SIZE")
+    for processo in [pid] + processos_descendentes(pid):
+        try:
+            with open(f"/proc/{processo}/statm") as f:
+                total += int(f.read().split()[1]) * tamanho_pagina
+        except (OSError, IndexError, ValueError):
+            pass
+    return total / (1024 * 1024)
+
+
+class MonitorNavegador:
+    """
+    Limites (None desativa o limite):
+    - max_paginas: páginas servidas pelo mesmo navegador;
+    - max_rss_mb: memória somada do ChromeDriver e do Chrome;
+    - max_crescimento_rss: memória em relação à primeira medição do navegador (por exemplo, 3.0);
+    - max_heap_mb: heap do JavaScript da aba atual.
+    """
+
+    def __init__(self, max_paginas=400, max_rss_mb=4096, max_crescimento_rss=3.0, max_heap_mb=1024,
+                 intervalo_verificacao=5):
+        self.max_paginas = max_paginas
+        self.max_rss_mb = max_rss_mb
+        self.max_crescimento_rss = max_crescimento_rss
+        self.max_heap_mb = max_heap_mb
+        self.intervalo_verificacao = intervalo_verificacao
+        self.pid = None
+        self.paginas = 0
+        self.rss_inicial_mb = None
+        self.ultima_medicao = {}
+
+    def novo(self):
+        """Monitor com os mesmos limites, para outro navegador (por exemplo, de um worker)"""
+        return MonitorNavegador(self.max_paginas, self.max_rss_mb, self.max_crescimento_rss,
+                                self.max_heap_mb, self.intervalo_verificacao)
+
+    def iniciar(self, pid):
+        """Começa a acompanhar um navegador novo (pid do ChromeDriver, pai dos processos do Chrome)"""
+        self.pid = pid
+        self.paginas = 0
+        self.rss_inicial_mb = None
+        self.ultima_medicao = {}
+
+    def medir(self, driver):
+        """{"paginas", "rss_mb", "heap_mb"} do navegador atual (None no que não puder ser medido)"""
+        rss = rss_arvore_mb(self.pid) if self.pid else None
+        try:
+            heap = driver.execute_script(SCRIPT_HEAP_JS)
+        except Exception:
+            heap = None
+        self.ultima_medicao = {
+            "paginas": self.paginas,
+            "rss_mb": round(rss, 1) if rss is not None else None,
+            "heap_mb": round(heap / (1024 * 1024), 1) if heap else None,
+        }
+        return self.ultima_medicao
+
+    def registrar_pagina(self, driver):
+        """
+        Conta uma página servida e, a cada `intervalo_verificacao` páginas, mede a memória.
+        Retorna o motivo para reciclar o navegador ("paginas", "rss", "crescimento_rss" ou "heap")
+        ou None.
+        """
+        self.paginas += 1
+        if self.max_paginas and self.paginas >= self.max_paginas:
+            self.medir(driver)
+            return "paginas"
+        if self.paginas % self.intervalo_verificacao:
+            return None
+
+        medicao = self.medir(driver)
+        logger.debug("Saúde do navegador: %s", medicao)
+        rss, heap = medicao["rss_mb"], medicao["heap_mb"]
+        if rss is not None:
+            if self.rss_inicial_mb is None:
+                self.rss_inicial_mb = rss
+            if self.max_rss_mb and rss >= self.max_rss_mb:
+                return "rss"
+            if self.max_crescimento_rss and rss >= self.rss_inicial_mb * self.max_crescimento_rss:
+                return "crescimento_rss"
+        if heap is not None and self.max_heap_mb and heap >= self.max_heap_mb:
+            return "heap"
+        return None
@@ -0,0 +1,451 @@
+"""
+Servidor local que simula o site Leveros Integra
+Serve um SPA simplificado com a mesma marcação (classes do Quasar) usada pelos seletores do RPA
+(formulário de login, diálogo de boas-vindas, blocos de categoria, grade paginada de cards e botão
+fast_forward) e a API JSON de onde os cards são carregados. O tamanho do catálogo, o tamanho da
+página e a latência das respostas são configuráveis. Com cards aninhados, cada produto é
+renderizado como no site real: um card com o chip de voltagem e o preço, contendo um segundo card
+do mesmo produto com o chip de BTUs e o preço escrito como "R$ R$ ... à prazo". Usa apenas a
+biblioteca padrão.
+"""
+
+import re
+import json
+import time
+import random
+import html
+import hashlib
+import logging
+import secrets
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+CATEGORIAS = [
+    "Inverter", "Convencional", "Multi-Split", "Ar Janela",
+    "Cassete", "Piso Teto", "VRF", "Ar Portátil",
+    "Climatizador", "Ventilador"
+]
+
+USUARIO = "22429301000178@22429301000178"
+SENHA = "22429301000178@22429301000178"
+
+# PNG de 1x1 pixel servido para qualquer imagem de produto
+IMAGEM_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+ETAG_IMAGEM = '"' + hashlib.sha256(IMAGEM_PNG).hexdigest()[:16] + '"'
+DATA_IMAGEM = "Tue, 08 Apr 2025 09:00:00 GMT"
+
+PAGINA_LOGIN = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head><meta charset="utf-8"><title>Leveros Integra - Login</title></head>
+<body>
+<div id="q-app">
+  <div class="q-page flex flex-center">
+    <label class="q-field"><input id="f_usuario" aria-label="Informe seu usuário" type="text"></label>
+    <label class="q-field"><input id="f_senha" aria-label="Informe sua senha" type="password"></label>
+    <button id="entrar" class="q-btn" type="button"><span class="block">Entrar</span></button>
+    <div id="erro" class="text-negative"></div>
+  </div>
+</div>
+<script>
+document.querySelector('#entrar').addEventListener('click', async function () {
+  const resposta = await fetch('/api/login', {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({
+      usuario: document.querySelector('#f_usuario').value,
+      senha: document.querySelector('#f_senha').value
+    })
+  });
+  if (!resposta.ok) {
+    document.querySelector('#erro').textContent = 'Usuário ou senha inválidos';
+    return;
+  }
+  const dados = await resposta.json();
+  localStorage.setItem('token', dados.token);
+  location.href = '/catalogo';
+});
+</script>
+</body>
+</html>
+"""
+
+PAGINA_CATALOGO = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head><meta charset="utf-8"><title>Leveros Integra - Catálogo</title></head>
+<body>
+<div id="q-app">
+  <div class="q-layout">
+    <div id="categorias" class="row">__CATEGORIAS__</div>
+    <div id="carregando" class="q-inner-loading" style="display: none">Carregando...</div>
+    <div id="produtos" class="row"></div>
+    <div class="q-pagination">
+      <button id="proxima" class="q-btn" type="button" disabled><i class="material-icons">fast_forward</i></button>
+    </div>
+  </div>
+</div>
+__DIALOGO__
+<script>
+const token = localStorage.getItem('token');
+if (!token) {
+  location.replace('/login');
+}
+
+// Com rotas, a categoria e a página ficam na URL (como no modo history do vue-router) e a
+// página pode ser aberta diretamente por ela
+const ROTAS = __ROTAS__;
+let categoria = null;
+let pagina = 1;
+let totalPaginas = 0;
+
+function formatar(valor) {
+  return valor.toLocaleString('pt-BR', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+}
+
+function escapar(texto) {
+  const div = document.createElement('div');
+  div.textContent = texto;
+  return div.innerHTML;
+}
+
+// Marcação dos cards, a mesma de renderizar_card no servidor
+const MODELO_CARD = __MODELO_CARD__;
+const CARDS_ANINHADOS = __CARDS_ANINHADOS__;
+
+function chip(texto) {
+  return texto ? `<div class="q-chip row inline no-wrap items-center q-chip--outline"><div class="q-chip__content">${escapar(texto)}</div></div>` : '';
+}
+
+function preencher(valores) {
+  return MODELO_CARD.replace(/\{(\w+)\}/g, (_, campo) => valores[campo]);
+}
+
+function renderizarCard(produto) {
+  const valores = {
+    classes: 'q-card--bordered',
+    imagem: `${location.origin}/storage/produtos/${produto.imagem}`,
+    descricao: escapar(produto.descricao),
+    chips: chip(produto.voltagem) + chip(produto.btus ? `${produto.btus} BTUs` : ''),
+    preco: `R$ ${formatar(produto.precoPrazo)}`,
+    parcelamento: `${produto.parcelas}x de R$ ${formatar(produto.valorParcela)} sem juros`,
+    vista: `ou R$ ${formatar(produto.precoVista)} à vista`,
+    interno: '',
+  };
+  if (CARDS_ANINHADOS) {
+    const interno = Object.assign({}, valores, {
+      classes: 'q-card--flat',
+      chips: chip(produto.btus ? `${produto.btus} BTUs` : ''),
+      preco: `R$ R$ ${formatar(produto.precoPrazo)} à prazo`,
+    });
+    valores.chips = chip(produto.voltagem);
+    valores.interno = preencher(interno);
+  }
+  return preencher(valores);
+}
+
+async function carregar() {
+  document.querySelector('#carregando').style.display = 'block';
+  const resposta = await fetch(
+    `/api/produtos?categoria=${encodeURIComponent(categoria)}&pagina=${pagina}`,
+    {headers: {'Authorization': 'Bearer ' + token}}
+  );
+  if (resposta.status === 401) {
+    localStorage.removeItem('token');
+    location.replace('/login');
+    return;
+  }
+  const dados = await resposta.json();
+  totalPaginas = dados.totalPaginas;
+  if (ROTAS) {
+    history.replaceState(null, '', `/catalogo?categoria=${encodeURIComponent(categoria)}&pagina=${pagina}`);
+  }
+  document.querySelector('#produtos').innerHTML = dados.produtos.map(renderizarCard).join('');
+  document.querySelector('#proxima').disabled = pagina >= totalPaginas;
+  document.querySelector('#carregando').style.display = 'none';
+}
+
+document.querySelectorAll('#categorias div.text-teal-10').forEach(function (el) {
+  el.addEventListener('click', function () {
+    categoria = el.textContent.trim();
+    pagina = 1;
+    carregar();
+  });
+});
+
+const parametros = new URLSearchParams(location.search);
+if (ROTAS && parametros.get('categoria')) {
+  categoria = parametros.get('categoria');
+  pagina = parseInt(parametros.get('pagina'), 10) || 1;
+  carregar();
+}
+
+// Diálogo de boas-vindas: fecha pelo botão ou pelo backdrop e sai do DOM, como no Quasar
+const dialogo = document.querySelector('#boas-vindas');
+if (dialogo) {
+  const fechar = function () { dialogo.remove(); };
+  dialogo.querySelector('.q-dialog__backdrop').addEventListener('click', fechar);
+  dialogo.querySelector('button').addEventListener('click', fechar);
+}
+
+document.querySelector('#proxima').addEventListener('click', function () {
+  if (pagina < totalPaginas) {
+    pagina += 1;
+    carregar();
+  }
+});
+</script>
+</body>
+</html>
+"""
+
+# Card de produto. No modo de cards aninhados, {interno} é um segundo card do mesmo produto
+MODELO_CARD = """<div class="q-card {classes} my-card">
+  <div class="q-img q-img--menu"><img class="q-img__image" src="{imagem}"></div>
+  <div class="q-card__section">
+    <div class="menuItems text-caption q-pt-sm ellipsis-2-lines">{descricao}</div>
+    {chips}
+    <div class="text-h6 text-weight-bold text-teal-9">{preco}</div>
+    <div class="text-caption text-weight-bold">{parcelamento}</div>
+    <div class="text-caption">{vista}</div>
+    {interno}
+  </div>
+</div>"""
+
+DIALOGO_BOAS_VINDAS = """<div id="boas-vindas" class="q-dialog">
+  <div class="q-dialog__backdrop fixed-full" style="position: fixed; inset: 0; background: rgba(0,0,0,.4); z-index: 6000"></div>
+  <div class="q-dialog__inner" style="position: fixed; top: 30%; left: 30%; z-index: 6001">
+    <div class="q-card q-dialog-plugin">
+      <div class="q-card__section">Bem-vindo à Leveros Integra!</div>
+      <button class="q-btn" type="button"><i class="material-icons">close</i></button>
+    </div>
+  </div>
+</div>"""
+
+
+def formatar_reais(valor):
+    """1234.5 -> '1.234,50', como toLocaleString('pt-BR') no SPA"""
+    return f"{valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def renderizar_card(produto, origem, aninhado=False):
+    """HTML do card de um produto, o mesmo que o SPA renderiza (renderizarCard)"""
+    def chip(texto):
+        return (f'<div class="q-chip row inline no-wrap items-center q-chip--outline">'
+                f'<div class="q-chip__content">{html.escape(texto, quote=False)}</div></div>') if texto else ""
+
+    def preencher(valores):
+        return re.sub(r"\{(\w+)\}", lambda campo: valores[campo.group(1)], MODELO_CARD)
+
+    chip_btus = chip(f"{produto['btus']} BTUs" if produto["btus"] else "")
+    valores = {
+        "classes": "q-card--bordered",
+        "imagem": f"{origem}/storage/produtos/{produto['imagem']}",
+        "descricao": html.escape(produto["descricao"], quote=False),
+        "chips": chip(produto["voltagem"]) + chip_btus,
+        "preco": f"R$ {formatar_reais(produto['precoPrazo'])}",
+        "parcelamento": f"{produto['parcelas']}x de R$ {formatar_reais(produto['valorParcela'])} sem juros",
+        "vista": f"ou R$ {formatar_reais(produto['precoVista'])} à vista",
+        "interno": "",
+    }
+    if aninhado:
+        interno = dict(valores, classes="q-card--flat", chips=chip_btus,
+                       preco=f"R$ R$ {formatar_reais(produto['precoPrazo'])} à prazo")
+        valores["chips"] = chip(produto["voltagem"])
+        valores["interno"] = preencher(interno)
+    return preencher(valores)
+
+
+def gerar_catalogo(produtos_por_categoria=30, categorias_vazias=("Ventilador",)):
+    """Gera um catálogo determinístico: {categoria: [produto, ...]}"""
+    marcas = ["Springer Midea", "LG", "Daikin", "Fujitsu", "Elgin", "Gree", "Samsung", "TCL"]
+    capacidades = [9000, 12000, 18000, 24000, 30000, 36000]
+    catalogo = {}
+    for indice_categoria, categoria in enumerate(CATEGORIAS):
+        produtos = []
+        quantidade = 0 if categoria in categorias_vazias else produtos_por_categoria
+        for i in range(quantidade):
+            semente = indice_categoria * 1000 + i
+            marca = marcas[semente % len(marcas)]
+            btus = capacidades[semente % len(capacidades)]
+            ciclo = "Quente/Frio" if semente % 3 == 0 else "Só Frio"
+            voltagem = "220V" if semente % 4 else "127V"
+            if i % 15 == 14:
+                descricao = f"Instalação de Ar-Condicionado {categoria} {btus:,} BTUs".replace(",", ".")
+            else:
+                descricao = (f"Ar-Condicionado {categoria} {marca} Modelo {semente:05d} "
+                             f"{btus:,} BTUs {ciclo} {voltagem}").replace(",", ".")
+            preco_prazo = round(1499 + (semente * 37) % 9000 + 0.9, 2)
+            parcelas = 8 if preco_prazo > 2000 else 4
+            produtos.append({
+                "id": semente,
+                "descricao": descricao,
+                "voltagem": f"{voltagem[:-1]}  V" if semente % 5 else "",
+                "btus": btus if semente % 7 else None,
+                "precoPrazo": preco_prazo,
+                "precoVista": round(preco_prazo * 0.95, 2),
+                "parcelas": parcelas,
+                "valorParcela": round(preco_prazo / parcelas, 2),
+                "imagem": f"produto-{semente:05d}.webp",
+            })
+        catalogo[categoria] = produtos
+    return catalogo
+
+
+def criar_servidor(host="127.0.0.1", porta=8765, produtos_por_categoria=30, tamanho_pagina=12,
+                   latencia=0.0, variacao_latencia=0.0, dialogo_boas_vindas=True, rotas=True,
+                   cards_aninhados=False):
+    """
+    Cria o servidor HTTP simulado (sem iniciá-lo).
+    Cada resposta (exceto as imagens) espera `latencia` segundos, mais um valor aleatório de até
+    `variacao_latencia` segundos. Com `dialogo_boas_vindas`, o catálogo abre com o diálogo de
+    boas-vindas sobre a página. Com `rotas`, a categoria e a página aparecem na URL do catálogo
+    (/catalogo?categoria=...&pagina=...), que abre diretamente nelas; sem rotas, a URL não muda.
+    Com `cards_aninhados`, cada card de produto contém um segundo card do mesmo produto (ver
+    renderizar_card).
+    """
+    catalogo = gerar_catalogo(produtos_por_categoria)
+    tokens = set()
+    trava = threading.Lock()
+    blocos_categoria = "".join(
+        f'<div class="col-3 text-teal-10 q-pa-md text-center">{categoria}</div>' for categoria in CATEGORIAS
+    )
+    pagina_catalogo = PAGINA_CATALOGO.replace("__CATEGORIAS__", blocos_categoria).replace(
+        "__DIALOGO__", DIALOGO_BOAS_VINDAS if dialogo_boas_vindas else "").replace(
+        "__ROTAS__", "true" if rotas else "false").replace(
+        "__MODELO_CARD__", json.dumps(MODELO_CARD)).replace(
+        "__CARDS_ANINHADOS__", "true" if cards_aninhados else "false")
+
+    class Manipulador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, formato, *args):
+            logger.debug(formato % args)
+
+        def responder(self, status, corpo, tipo="text/html; charset=utf-8", cabecalhos=None):
+            if isinstance(corpo, str):
+                corpo = corpo.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(corpo)))
+            for nome, valor in (cabecalhos or {}).items():
+                self.send_header(nome, valor)
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def responder_json(self, status, dados):
+            self.responder(status, json.dumps(dados, ensure_ascii=False), "application/json; charset=utf-8")
+
+        def autenticado(self):
+            autorizacao = self.headers.get("Authorization", "")
+            with trava:
+                return autorizacao.startswith("Bearer ") and autorizacao[7:] in tokens
+
+        def simular_latencia(self):
+            if latencia or variacao_latencia:
+                time.sleep(latencia + random.uniform(0, variacao_latencia))
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if not url.path.startswith("/storage/"):
+                self.simular_latencia()
+            if url.path in ("/", "/index.html"):
+                self.responder(302, "", cabecalhos={"Location": "/catalogo"})
+            elif url.path == "/login":
+                self.responder(200, PAGINA_LOGIN)
+            elif url.path == "/catalogo":
+                self.responder(200, pagina_catalogo)
+            elif url.path.startswith("/storage/produtos/"):
+                # Suporta requisições condicionais, como um servidor de arquivos estáticos
+                cabecalhos = {"ETag": ETAG_IMAGEM, "Last-Modified": DATA_IMAGEM}
+                if self.headers.get("If-None-Match") == ETAG_IMAGEM:
+                    self.responder(304, b"", "image/png", cabecalhos)
+                else:
+                    self.responder(200, IMAGEM_PNG, "image/png", cabecalhos)
+            elif url.path == "/api/produtos":
+                if not self.autenticado():
+                    self.responder_json(401, {"erro": "não autenticado"})
+                    return
+                parametros = parse_qs(url.query)
+                categoria = parametros.get("categoria", [""])[0]
+                pagina = int(parametros.get("pagina", ["1"])[0])
+                produtos = catalogo.get(categoria, [])
+                total_paginas = (len(produtos) + tamanho_pagina - 1) // tamanho_pagina
+                inicio = (pagina - 1) * tamanho_pagina
+                self.responder_json(200, {
+                    "produtos": produtos[inicio:inicio + tamanho_pagina],
+                    "pagina": pagina,
+                    "totalPaginas": total_paginas,
+                })
+            else:
+                self.responder(404, "Não encontrado", "text/plain; charset=utf-8")
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            tamanho = int(self.headers.get("Content-Length", 0))
+            corpo = self.rfile.read(tamanho) if tamanho else b""
+            self.simular_latencia()
+            if url.path == "/api/login":
+                try:
+                    dados = json.loads(corpo or b"{}")
+                except ValueError:
+                    dados = {}
+                if dados.get("usuario") == USUARIO and dados.get("senha") == SENHA:
+                    token = secrets.token_hex(16)
+                    with trava:
+                        tokens.add(token)
+                    self.responder_json(200, {"token": token})
+                else:
+                    self.responder_json(401, {"erro": "credenciais inválidas"})
+            else:
+                self.responder(404, "Não encontrado", "text/plain; charset=utf-8")
+
+    servidor = ThreadingHTTPServer((host, porta), Manipulador)
+    servidor.daemon_threads = True
+    servidor.catalogo = catalogo
+    return servidor
+
+
+def iniciar_em_segundo_plano(**kwargs):
+    """Inicia o servidor simulado em uma thread e retorna (servidor, url_base)"""
+    kwargs.setdefault("porta", 0)
+    servidor = criar_servidor(**kwargs)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    host, porta = servidor.server_address[:2]
+    return servidor, f"http://{host}:{porta}"
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Servidor local que simula o site Leveros Integra")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--produtos-por-categoria", type=int, default=30)
+    parser.add_argument("--tamanho-pagina", type=int, default=12)
+    parser.add_argument("--latencia", type=float, default=0.0, metavar="SEGUNDOS",
+                        help="atraso de cada resposta (exceto imagens)")
+    parser.add_argument("--variacao-latencia", type=float, default=0.0, metavar="SEGUNDOS",
+                        help="atraso aleatório adicional de até SEGUNDOS")
+    parser.add_argument("--sem-boas-vindas", action="store_true", help="não exibe o diálogo de boas-vindas")
+    parser.add_argument("--sem-rotas", action="store_true",
+                        help="não reflete a categoria e a página na URL do catálogo")
+    parser.add_argument("--cards-aninhados", action="store_true",
+                        help="renderiza cada produto como um card dentro de outro, como no site real")
+    args = parser.parse_args()
+
+    servidor = criar_servidor(args.host, args.porta, args.produtos_por_categoria, args.tamanho_pagina,
+                              args.latencia, args.variacao_latencia, not args.sem_boas_vindas,
+                              not args.sem_rotas, args.cards_aninhados)
+    logger.info(f"Servidor simulado em http://{args.host}:{args.porta}/login")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
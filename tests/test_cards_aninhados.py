@@ -0,0 +1,98 @@
+import lxml.html
+
+import servidor_mock
+from leveros_parser import ArmazemSnapshots, analisar_snapshot, extrair_dados_card_html, xpath_classes
+from leveros_produtos import limpar_preco, mesclar_produtos, produto_do_resultado
+
+ORIGEM = "http://127.0.0.1:8765"
+XPATH_CARDS = xpath_classes("div", "q-card")
+XPATH_CARD_ANCESTRAL = "ancestor::div[contains(concat(' ', normalize-space(@class), ' '), ' q-card ')]"
+
+
+def pagina(produtos, aninhado=True):
+    """Grade de cards como o SPA simulado a renderiza"""
+    cards = "".join(servidor_mock.renderizar_card(produto, ORIGEM, aninhado) for produto in produtos)
+    return lxml.html.document_fromstring(f'<html><body><div id="produtos" class="row">{cards}</div></body></html>')
+
+
+def produtos_do_catalogo():
+    return servidor_mock.gerar_catalogo(20)["Inverter"]
+
+
+def linhas(cards, categoria="Inverter"):
+    return mesclar_produtos([produto_do_resultado(extrair_dados_card_html(card), categoria) for card in cards])
+
+
+def test_limpar_preco():
+    assert limpar_preco("R$ R$ 7.999,00 à prazo") == "R$ 7.999,00"
+    assert limpar_preco("R$ 7.999,00") == "R$ 7.999,00"
+    assert limpar_preco("R$R$ 1.499,90") == "R$ 1.499,90"
+    assert limpar_preco("N/A") == "N/A"
+
+
+def test_card_externo_tem_voltagem_btu_e_preco_do_card_de_fora():
+    produto = next(p for p in produtos_do_catalogo() if p["voltagem"] and p["btus"])
+    documento = pagina([produto])
+    externo = documento.xpath("//div[@id='produtos']/div")[0]
+
+    dados = extrair_dados_card_html(externo)
+    assert dados["voltagem"] == produto["voltagem"]
+    assert dados["btu"] == f"{produto['btus']} BTUs"
+    assert dados["precoPrincipal"] == f"R$ {servidor_mock.formatar_reais(produto['precoPrazo'])}"
+
+
+def test_apenas_cards_externos_gera_uma_linha_por_produto():
+    # Mesmo filtro de apenasCardsExternos: descarta os cards contidos em outro card
+    produtos = produtos_do_catalogo()
+    documento = pagina(produtos)
+    externos = [card for card in documento.xpath(XPATH_CARDS)
+                if not card.xpath(XPATH_CARD_ANCESTRAL)]
+    assert len(externos) == len(produtos)
+
+    resultado = linhas(externos)
+    assert len(resultado) == len(produtos)
+    for produto, linha in zip(produtos, resultado):
+        assert linha["Nome do Produto"] == produto["descricao"]
+        assert linha["Voltagem"] == (produto["voltagem"] or "N/A")
+        assert linha["BTU"] == (f"{produto['btus']} BTUs" if produto["btus"] else "N/A")
+        assert linha["Preço Principal"] == f"R$ {servidor_mock.formatar_reais(produto['precoPrazo'])}"
+
+
+def test_cards_interno_e_externo_sao_mesclados_em_uma_linha():
+    # Sem o filtro, o seletor div.q-card encontra os dois cards de cada produto
+    produtos = produtos_do_catalogo()
+    todos = pagina(produtos).xpath(XPATH_CARDS)
+    assert len(todos) == 2 * len(produtos)
+
+    resultado = linhas(todos)
+    assert len(resultado) == len(produtos)
+    com_os_dois = [linha for produto, linha in zip(produtos, resultado) if produto["voltagem"] and produto["btus"]]
+    assert com_os_dois
+    assert all(linha["Voltagem"] != "N/A" and linha["BTU"] != "N/A" for linha in com_os_dois)
+    assert all(not linha["Preço Principal"].startswith("R$ R$") for linha in resultado)
+
+
+def test_mesclar_produtos_completa_campos_ausentes():
+    com_voltagem = {"Categoria": "Inverter", "Nome do Produto": "Ar  Springer  9000", "Voltagem": "220V",
+                    "BTU": "N/A", "Preço Principal": "R$ 2.000,00", "URL da Imagem": "https://img/a.webp"}
+    com_btu = {"Categoria": "Inverter", "Nome do Produto": "ar springer 9000", "Voltagem": "N/A",
+               "BTU": "9000 BTUs", "Preço Principal": "R$ 1.000,00", "URL da Imagem": "https://img/a.webp"}
+    outra_imagem = dict(com_btu, **{"URL da Imagem": "https://img/b.webp"})
+
+    resultado = mesclar_produtos([com_voltagem, com_btu, outra_imagem])
+    assert len(resultado) == 2
+    assert resultado[0]["Voltagem"] == "220V"
+    assert resultado[0]["BTU"] == "9000 BTUs"
+    assert resultado[0]["Preço Principal"] == "R$ 2.000,00"
+
+
+def test_snapshot_de_cards_aninhados(tmp_path):
+    produtos = produtos_do_catalogo()
+    cards = [servidor_mock.renderizar_card(produto, ORIGEM, aninhado=True) for produto in produtos]
+    caminho = ArmazemSnapshots(str(tmp_path)).gravar("Inverter", 1, {"seletor": "div.q-card", "cards": cards})
+
+    metadados, resultados = analisar_snapshot(caminho)
+    assert metadados["categoria"] == "Inverter"
+    resultado = mesclar_produtos([produto_do_resultado(r, "Inverter") for r in resultados])
+    assert [linha["Nome do Produto"] for linha in resultado] == [produto["descricao"] for produto in produtos]
+    assert all(linha["BTU"] != "N/A" for produto, linha in zip(produtos, resultado) if produto["btus"])
@@ -0,0 +1,54 @@
+import pytest
+
+# leveros_catalogo converte os preços com leveros_normalizacao, que usa o pandas
+pytest.importorskip("pandas")
+
+from leveros_catalogo import CatalogoProdutos, extrair_atributos, interpretar_consulta
+
+
+@pytest.mark.parametrize("nome, marca", [
+    ("Ar-Condicionado Split Inverter 12.000 BTUs [SPRINGER-MIDEA] 220V", "Springer Midea"),
+    ("Ar-Condicionado Split HW Inverter Springer Midea Xtreme Save Connect 9.000 BTUs", "Springer Midea"),
+    ("Ar-Condicionado Split Springer 9.000 BTUs Só Frio", "Springer"),
+    ("Ventilador de Mesa Britania 40cm", "Britânia"),
+])
+def test_marca_do_nome(nome, marca):
+    assert extrair_atributos(nome)["marca"] == marca
+
+
+@pytest.mark.parametrize("consulta, filtros", [
+    ("9000", {"btus": 9000}),
+    ("12K", {"btus": 12000}),
+    ("12k inverter", {"btus": 12000, "inverter": True}),
+    ("12.000", {"btus": 12000}),
+    ("18000 R-410A", {"btus": 18000, "refrigerante": "R-410A"}),
+    ("springer-midea 9000 220V", {"btus": 9000, "voltagem": "220V", "marca": "Springer Midea"}),
+    ("12.000 BTUs inverter 220V daikin", {"btus": 12000, "inverter": True, "voltagem": "220V", "marca": "Daikin"}),
+])
+def test_consulta_com_capacidade(consulta, filtros):
+    assert interpretar_consulta(consulta) == ("", filtros)
+
+
+def test_codigo_de_modelo_nao_e_capacidade():
+    assert interpretar_consulta("modelo 00001") == ("modelo 00001", {})
+
+
+def test_busca_por_marca_acha_a_marca_composta(tmp_path):
+    catalogo = CatalogoProdutos(str(tmp_path / "catalogo.sqlite3"))
+    nomes = ["Ar-Condicionado Split Inverter Springer Midea Xtreme 9.000 BTUs 220V",
+             "Ar-Condicionado Split Inverter 12.000 BTUs [SPRINGER-MIDEA] 220V",
+             "Ar-Condicionado Split Springer 18.000 BTUs Só Frio 220V",
+             "Ar-Condicionado Split Midea 9.000 BTUs 220V",
+             "Ar-Condicionado Split LG Dual Inverter 9.000 BTUs 220V"]
+    catalogo.carregar_execucao("1", [{"Categoria": "Split", "Nome do Produto": nome, "Preço Principal": "R$ 2.000,00"}
+                                     for nome in nomes])
+
+    def marcas(texto, **filtros):
+        return sorted(produto["marca"] for produto in catalogo.buscar(texto, **filtros))
+
+    assert marcas("springer") == ["Springer", "Springer Midea", "Springer Midea"]
+    assert marcas("midea") == ["Midea", "Springer Midea", "Springer Midea"]
+    assert marcas("springer midea 9000") == ["Springer Midea"]
+    assert marcas("", marca="spring") == ["Springer", "Springer Midea", "Springer Midea"]
+    assert marcas("lg") == ["LG"]
+    catalogo.fechar()
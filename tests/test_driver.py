@@ -0,0 +1,96 @@
+import io
+import json
+import zipfile
+import hashlib
+
+import pytest
+
+import leveros_driver
+from leveros_driver import ChecksumInvalido, ResolvedorChromeDriver, Sha256NaoFixado
+
+EXECUTAVEL = b"#!/bin/sh\necho chromedriver\n"
+
+
+def pacote():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as arquivo:
+        arquivo.writestr("chromedriver-linux64/chromedriver", EXECUTAVEL)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    urls = []
+
+    def baixar(url, destino, timeout=60):
+        urls.append(url)
+        with open(destino, "wb") as f:
+            f.write(pacote())
+
+    monkeypatch.setattr(leveros_driver, "baixar_pacote", baixar)
+    monkeypatch.delenv("CHROMEDRIVER", raising=False)
+    monkeypatch.delenv("LEVEROS_CHROMEDRIVER_SHA256", raising=False)
+    monkeypatch.delenv("LEVEROS_CHROMEDRIVER_EXIGIR_SHA256", raising=False)
+    return urls
+
+
+def test_sem_sha256_fixado_registra_o_primeiro_download(tmp_path, downloads, monkeypatch, caplog):
+    monkeypatch.setattr(leveros_driver, "SHA256_PACOTES", {})
+    caminho = ResolvedorChromeDriver("135.0.7049.42", str(tmp_path), "linux64").resolver()
+    assert open(caminho, "rb").read() == EXECUTAVEL
+    assert "Não há SHA-256 fixado" in caplog.text
+
+    manifesto = json.load(open(tmp_path / "135.0.7049.42" / "linux64" / "manifesto.json"))
+    assert manifesto["sha256_pacote"] == hashlib.sha256(pacote()).hexdigest()
+    assert ResolvedorChromeDriver("135.0.7049.42", str(tmp_path), "linux64").resolver() == caminho
+    assert len(downloads) == 1
+
+
+def test_sem_sha256_fixado_exigido_nao_baixa(tmp_path, downloads, monkeypatch):
+    monkeypatch.setattr(leveros_driver, "SHA256_PACOTES", {})
+    monkeypatch.setenv("LEVEROS_CHROMEDRIVER_EXIGIR_SHA256", "1")
+    with pytest.raises(Sha256NaoFixado):
+        ResolvedorChromeDriver("135.0.7049.42", str(tmp_path), "linux64").resolver()
+    assert downloads == []
+
+
+def test_baixa_uma_vez_com_sha256_fixado(tmp_path, downloads):
+    sha256 = hashlib.sha256(pacote()).hexdigest()
+    caminho = ResolvedorChromeDriver("135.0.7049.42", str(tmp_path), "linux64", sha256).resolver()
+    assert open(caminho, "rb").read() == EXECUTAVEL
+
+    assert ResolvedorChromeDriver("135.0.7049.42", str(tmp_path), "linux64", sha256).resolver() == caminho
+    assert len(downloads) == 1
+
+
+def test_pacote_diferente_do_fixado(tmp_path, downloads):
+    with pytest.raises(ChecksumInvalido):
+        ResolvedorChromeDriver("135.0.7049.42", str(tmp_path), "linux64", "0" * 64).resolver()
+
+
+def test_carregar_sha256_fixados(tmp_path):
+    caminho = tmp_path / "chromedriver_sha256.json"
+    caminho.write_text(json.dumps({"135.0.7049.42": {"linux64": "a" * 64, "win64": "b" * 64}}))
+    assert leveros_driver.carregar_sha256_fixados(str(caminho)) == {
+        ("135.0.7049.42", "linux64"): "a" * 64, ("135.0.7049.42", "win64"): "b" * 64}
+    assert leveros_driver.carregar_sha256_fixados(str(tmp_path / "ausente.json")) == {}
+
+
+def test_versao_do_driver_para_outro_chrome(tmp_path, monkeypatch):
+    monkeypatch.setattr(leveros_driver, "SHA256_PACOTES", {("134.0.6998.35", "linux64"): "a" * 64,
+                                                          ("134.0.6998.165", "linux64"): "b" * 64})
+    assert leveros_driver.versao_chromedriver_para("134.0.6998.178", str(tmp_path), "linux64") == "134.0.6998.165"
+
+    # Sem versão fixada, usa a guardada no cache, sem consultar a rede
+    (tmp_path / "versoes.json").write_text(json.dumps({"133": "133.0.6943.141"}))
+    assert leveros_driver.versao_chromedriver_para("133.0.6943.98", str(tmp_path), "linux64") == "133.0.6943.141"
+
+
+def test_chrome_de_outra_versao_usa_o_driver_dela(tmp_path, downloads, monkeypatch):
+    monkeypatch.setattr(leveros_driver, "SHA256_PACOTES", {})
+    monkeypatch.setattr(leveros_driver, "versao_chrome_instalado", lambda binario=None: "133.0.6943.98")
+    (tmp_path / "versoes.json").write_text(json.dumps({"133": "133.0.6943.141"}))
+
+    caminho = leveros_driver.resolver_chromedriver("135.0.7049.42", str(tmp_path))
+    assert "133.0.6943.141" in caminho
+    assert downloads == [leveros_driver.URL_CHROMEDRIVER.format(versao="133.0.6943.141", plataforma="linux64")]
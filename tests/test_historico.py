@@ -0,0 +1,138 @@
+import sqlite3
+
+from leveros_historico import HistoricoPrecos
+
+
+def produto(categoria, nome, preco, imagem=None):
+    return {
+        "Categoria": categoria,
+        "Nome do Produto": nome,
+        "Preço Principal": preco,
+        "Preço à Vista": f"{preco} à vista",
+        "Qtd. Parcelas": "10x",
+        "Valor Parcela": "R$ 100,00",
+        "URL da Imagem": imagem or f"https://img/{nome}.png",
+    }
+
+
+def nomes(linhas):
+    return sorted((linha["categoria"], linha["nome"]) for linha in linhas)
+
+
+def test_delta_novos_removidos_e_reprecificados(tmp_path):
+    historico = HistoricoPrecos(str(tmp_path / "historico.sqlite3"))
+    historico.registrar_execucao("1", [produto("Split", "A", "R$ 1.000,00"), produto("Split", "B", "R$ 2.000,00")])
+    atual = historico.registrar_execucao("2", [produto("Split", "B", "R$ 1.900,00"), produto("Split", "C", "R$ 3.000,00")])
+
+    delta = historico.delta(atual)
+    assert nomes(delta["novos"]) == [("Split", "C")]
+    assert nomes(delta["removidos"]) == [("Split", "A")]
+    assert nomes(delta["reprecificados"]) == [("Split", "B")]
+    assert delta["reprecificados"][0]["preco_principal_anterior"] == "R$ 2.000,00"
+    assert delta["reprecificados"][0]["preco_principal"] == "R$ 1.900,00"
+
+
+def test_delta_sem_execucao_anterior(tmp_path):
+    historico = HistoricoPrecos(str(tmp_path / "historico.sqlite3"))
+    atual = historico.registrar_execucao("1", [produto("Split", "A", "R$ 1.000,00")])
+
+    delta = historico.delta(atual)
+    assert nomes(delta["novos"]) == [("Split", "A")]
+    assert delta["removidos"] == [] and delta["reprecificados"] == []
+
+
+def test_execucao_parcial_so_remove_das_categorias_concluidas(tmp_path):
+    historico = HistoricoPrecos(str(tmp_path / "historico.sqlite3"))
+    historico.registrar_execucao("1", [produto("Split", "A", "R$ 1.000,00"), produto("Split", "B", "R$ 1.000,00"),
+                                       produto("Janela", "J", "R$ 900,00")])
+    # Janela foi interrompida: nenhum produto dela chegou à saída
+    parcial = historico.registrar_execucao("2", [produto("Split", "A", "R$ 1.000,00")], categorias_concluidas=["Split"])
+
+    delta = historico.delta(parcial)
+    assert nomes(delta["removidos"]) == [("Split", "B")]
+    assert delta["novos"] == []
+
+    # A execução seguinte, completa, não dá os produtos de Janela como novos: eles já existiam
+    completa = historico.registrar_execucao("3", [produto("Split", "A", "R$ 1.000,00"), produto("Janela", "J", "R$ 900,00"),
+                                                  produto("Janela", "K", "R$ 950,00")])
+    delta = historico.delta(completa)
+    assert nomes(delta["novos"]) == [("Janela", "K")]
+    assert delta["removidos"] == []
+
+
+def test_categoria_comparada_com_a_ultima_execucao_que_a_concluiu(tmp_path):
+    historico = HistoricoPrecos(str(tmp_path / "historico.sqlite3"))
+    historico.registrar_execucao("1", [produto("Split", "A", "R$ 1.000,00"), produto("Janela", "J", "R$ 900,00"),
+                                       produto("Janela", "K", "R$ 800,00")])
+    parcial = historico.registrar_execucao("2", [produto("Split", "A", "R$ 1.000,00")], categorias_concluidas=["Split"])
+    completa = historico.registrar_execucao("3", [produto("Split", "A", "R$ 1.100,00"), produto("Janela", "J", "R$ 950,00")])
+
+    delta = historico.delta(completa)
+    assert delta["novos"] == []
+    assert nomes(delta["removidos"]) == [("Janela", "K")]
+    assert nomes(delta["reprecificados"]) == [("Janela", "J"), ("Split", "A")]
+    janela = next(linha for linha in delta["reprecificados"] if linha["categoria"] == "Janela")
+    assert (janela["preco_principal_anterior"], janela["preco_principal"]) == ("R$ 900,00", "R$ 950,00")
+
+    # Com a execução de comparação explícita, todas as categorias são comparadas com ela
+    delta = historico.delta(completa, anterior_id=parcial)
+    assert nomes(delta["reprecificados"]) == [("Split", "A")]
+    assert delta["removidos"] == [] and delta["novos"] == []
+
+
+def test_execucao_sem_categorias_concluidas_nao_remove_nada(tmp_path):
+    historico = HistoricoPrecos(str(tmp_path / "historico.sqlite3"))
+    historico.registrar_execucao("1", [produto("Split", "A", "R$ 1.000,00")])
+    parcial = historico.registrar_execucao("2", [], categorias_concluidas=[])
+
+    assert historico.delta(parcial)["removidos"] == []
+
+
+def test_produto_em_duas_categorias_e_acompanhado_em_cada_uma(tmp_path):
+    historico = HistoricoPrecos(str(tmp_path / "historico.sqlite3"))
+    historico.registrar_execucao("1", [produto("Split", "A", "R$ 1.000,00", "https://img/a.png"),
+                                       produto("Multi", "A", "R$ 1.100,00", "https://img/a.png")])
+    atual = historico.registrar_execucao("2", [produto("Split", "A", "R$ 1.000,00", "https://img/a.png"),
+                                               produto("Multi", "A", "R$ 1.200,00", "https://img/a.png")])
+
+    delta = historico.delta(atual)
+    assert delta["novos"] == [] and delta["removidos"] == []
+    assert nomes(delta["reprecificados"]) == [("Multi", "A")]
+
+    linhas = historico.historico_produto("a")
+    assert [(linha["timestamp"], linha["categoria"], linha["preco_principal"]) for linha in linhas] == [
+        ("1", "Multi", "R$ 1.100,00"), ("2", "Multi", "R$ 1.200,00"),
+        ("1", "Split", "R$ 1.000,00"), ("2", "Split", "R$ 1.000,00"),
+    ]
+
+
+def test_historico_produto_compara_nome_normalizado(tmp_path):
+    historico = HistoricoPrecos(str(tmp_path / "historico.sqlite3"))
+    historico.registrar_execucao("1", [produto("Split", "Ar Condicionado Elgin", "R$ 1.000,00")])
+    historico.registrar_execucao("2", [produto("Split", "AR CONDICIONADO  ELGIN", "R$ 1.050,00",
+                                               "https://img/Ar Condicionado Elgin.png")])
+
+    linhas = historico.historico_produto("ar condicionado elgin")
+    assert [linha["preco_principal"] for linha in linhas] == ["R$ 1.000,00", "R$ 1.050,00"]
+    assert historico.historico_produto("Ar Condicionado Elgin", url_imagem="https://img/outra.png") == []
+
+
+def test_banco_antigo_e_migrado(tmp_path):
+    caminho = str(tmp_path / "historico.sqlite3")
+    conexao = sqlite3.connect(caminho)
+    conexao.executescript("""
+        CREATE TABLE execucoes (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL UNIQUE,
+                                registrada_em TEXT NOT NULL, total_produtos INTEGER NOT NULL);
+        CREATE TABLE produtos (id INTEGER PRIMARY KEY AUTOINCREMENT, nome_normalizado TEXT NOT NULL,
+                               url_imagem TEXT NOT NULL, nome TEXT NOT NULL, categoria TEXT,
+                               UNIQUE (nome_normalizado, url_imagem));
+        INSERT INTO execucoes VALUES (1, '1', '2025-01-01T00:00:00', 1);
+        INSERT INTO produtos VALUES (7, 'a', 'https://img/A.png', 'A', 'Split');
+    """)
+    conexao.close()
+
+    historico = HistoricoPrecos(caminho)
+    atual = historico.registrar_execucao("2", [produto("Split", "A", "R$ 1.000,00")], categorias_concluidas=["Split"])
+    assert historico.categorias_concluidas(atual) == ["Split"]
+    assert historico.categorias_concluidas(1) is None
+    assert historico.conexao.execute("SELECT produto_id FROM precos").fetchone()[0] == 7
@@ -0,0 +1,63 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from leveros_normalizacao import CAMPOS_NUMERICOS, normalizar_precos, normalizar_produto
+from leveros_produtos import COLUNAS_PRODUTO
+
+# Textos de cada coluna de origem: os documentados, ausentes e malformados
+TEXTOS = {
+    "Preço Principal": ["R$ 7.999,00", "R$ 999,88", "R$ 1500", "R$ R$ 12.345,6", "R$ 1.234.567,89",
+                        "N/A", "", "  ", None, "sob consulta", "R$ abc", "7.999,00"],
+    "Preço à Vista": ["ou R$ 7.599,05 à vista", "ou R$ 950,00 à vista", "N/A", None, "à vista", "ou R$ -"],
+    "Qtd. Parcelas": ["8x", "10 x", "12X", "N/A", None, "", "x8", "oito vezes"],
+    "Valor Parcela": ["R$ 999,88 sem juros", "R$ 99,9", "N/A", None, "sem juros", "R$"],
+}
+
+
+def produtos():
+    """Um produto por combinação em rodízio dos textos de cada coluna"""
+    quantidade = max(len(textos) for textos in TEXTOS.values()) * 2
+    return [{coluna: textos[(indice * (posicao + 1)) % len(textos)] for posicao, (coluna, textos) in
+             enumerate(TEXTOS.items())} | {"Nome do Produto": f"Produto {indice}"} for indice in range(quantidade)]
+
+
+def valor(celula):
+    return None if pd.isna(celula) else celula
+
+
+def test_documentados():
+    normalizado = normalizar_produto({"Preço Principal": "R$ 7.999,00", "Preço à Vista": "ou R$ 7.599,05 à vista",
+                                      "Qtd. Parcelas": "8x", "Valor Parcela": "R$ 999,88 sem juros"})
+    assert (normalizado["preco_principal"], normalizado["preco_vista"], normalizado["parcelas"],
+            normalizado["valor_parcela"], normalizado["campos_invalidos"]) == (7999.0, 7599.05, 8, 999.88, "")
+
+    normalizado = normalizar_produto({"Preço Principal": "N/A", "Preço à Vista": "sob consulta",
+                                      "Qtd. Parcelas": "oito vezes", "Valor Parcela": None})
+    assert normalizado["preco_principal"] is None and normalizado["valor_parcela"] is None
+    assert normalizado["campos_invalidos"] == "preco_vista,parcelas"
+
+
+def test_vetorizado_igual_ao_por_produto():
+    registros = produtos()
+    df = normalizar_precos(pd.DataFrame([[registro.get(coluna) for coluna in COLUNAS_PRODUTO] for registro in registros],
+                                        columns=COLUNAS_PRODUTO))
+
+    for indice, registro in enumerate(registros):
+        esperado = normalizar_produto(registro)
+        linha = df.iloc[indice]
+        for coluna, origem, _, _ in CAMPOS_NUMERICOS:
+            obtido = valor(linha[coluna])
+            if esperado[coluna] is None:
+                assert obtido is None, (origem, registro[origem])
+            else:
+                assert obtido == pytest.approx(esperado[coluna], rel=1e-12), (origem, registro[origem])
+        assert linha["campos_invalidos"] == esperado["campos_invalidos"], registro
+
+
+def test_coluna_de_origem_ausente():
+    df = normalizar_precos(pd.DataFrame({"Preço Principal": ["R$ 7.999,00", "R$ abc"]}))
+    esperados = [normalizar_produto({"Preço Principal": texto}) for texto in ("R$ 7.999,00", "R$ abc")]
+    assert [valor(celula) for celula in df["preco_principal"]] == [esperado["preco_principal"] for esperado in esperados]
+    assert [valor(celula) for celula in df["valor_parcela"]] == [None, None]
+    assert list(df["campos_invalidos"]) == [esperado["campos_invalidos"] for esperado in esperados]
@@ -0,0 +1,221 @@
+import pytest
+
+import leveros_resiliencia
+from leveros_resiliencia import (CircuitoAberto, Disjuntor, OrcamentoTentativas, PoliticaTentativas, Prazo,
+                                 PrazoEsgotado)
+
+
+class RelogioFalso:
+    """Substitui o módulo time em leveros_resiliencia: o sleep só avança o relógio"""
+
+    def __init__(self):
+        self.agora = 1000.0
+        self.esperas = []
+
+    def monotonic(self):
+        return self.agora
+
+    def sleep(self, segundos):
+        self.esperas.append(segundos)
+        self.agora += segundos
+
+    def avancar(self, segundos):
+        self.agora += segundos
+
+
+class JitterNoTeto:
+    """Substitui o módulo random: o jitter sempre sorteia o teto da espera"""
+
+    @staticmethod
+    def uniform(inicio, fim):
+        return fim
+
+
+class MetricasFalsas:
+    def __init__(self):
+        self.contadores = []
+
+    def contador(self, nome, valor=1, **rotulos):
+        self.contadores.append((nome, rotulos))
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = RelogioFalso()
+    monkeypatch.setattr(leveros_resiliencia, "time", relogio)
+    monkeypatch.setattr(leveros_resiliencia, "random", JitterNoTeto)
+    return relogio
+
+
+def falhas(quantidade, resultado="ok"):
+    """Função que falha `quantidade` vezes e depois retorna `resultado`"""
+    chamadas = []
+
+    def funcao():
+        chamadas.append(1)
+        if len(chamadas) <= quantidade:
+            raise ValueError(f"falha {len(chamadas)}")
+        return resultado
+
+    funcao.chamadas = chamadas
+    return funcao
+
+
+def test_espera_exponencial_limitada_ao_teto(relogio):
+    politica = PoliticaTentativas(espera_inicial=0.5, espera_maxima=8.0, multiplicador=2.0)
+    assert [politica.espera(tentativa) for tentativa in range(1, 8)] == [0.5, 1.0, 2.0, 4.0, 8.0, 8.0, 8.0]
+
+
+def test_novas_tentativas_ate_o_sucesso(relogio):
+    metricas = MetricasFalsas()
+    politica = PoliticaTentativas(tentativas=4, espera_inicial=0.5, metricas=metricas)
+    funcao = falhas(2)
+
+    assert politica.executar(funcao, "pagina") == "ok"
+    assert len(funcao.chamadas) == 3
+    assert relogio.esperas == [0.5, 1.0]
+    assert metricas.contadores == [("leveros_tentativas_repetidas_total", {"etapa": "pagina"})] * 2
+
+
+def test_tentativas_esgotadas_propagam_o_ultimo_erro(relogio):
+    funcao = falhas(10)
+    with pytest.raises(ValueError, match="falha 3"):
+        PoliticaTentativas(tentativas=3).executar(funcao, "pagina")
+    assert len(relogio.esperas) == 2
+
+
+def test_erro_fatal_nao_e_repetido(relogio):
+    funcao = falhas(10)
+    with pytest.raises(ValueError):
+        PoliticaTentativas(tentativas=5).executar(funcao, "pagina", fatal=lambda erro: True)
+    assert len(funcao.chamadas) == 1
+    assert relogio.esperas == []
+
+
+def test_resultado_repetido_retorna_o_ultimo(relogio):
+    resultados = iter([[], [], []])
+    resultado = PoliticaTentativas(tentativas=3).executar(lambda: next(resultados), "cards",
+                                                          repetir_resultado=lambda cards: not cards)
+    assert resultado == []
+    assert len(relogio.esperas) == 2
+
+
+def test_orcamento_consumido_e_recarregado():
+    orcamento = OrcamentoTentativas(maximo=2, recarga_por_sucesso=0.5)
+    assert orcamento.consumir() and orcamento.consumir()
+    assert not orcamento.consumir()
+
+    orcamento.registrar_sucesso()
+    assert not orcamento.consumir()
+    orcamento.registrar_sucesso()
+    assert orcamento.consumir()
+
+    for _ in range(10):
+        orcamento.registrar_sucesso()
+    assert orcamento.fichas == 2
+
+
+def test_orcamento_esgotado_interrompe_as_tentativas(relogio):
+    metricas = MetricasFalsas()
+    orcamento = OrcamentoTentativas(maximo=1)
+    politica = PoliticaTentativas(tentativas=5, orcamento=orcamento, metricas=metricas)
+
+    with pytest.raises(ValueError, match="falha 2"):
+        politica.executar(falhas(10), "pagina")
+    assert len(relogio.esperas) == 1
+    assert ("leveros_tentativas_negadas_total", {"etapa": "pagina", "motivo": "orcamento"}) in metricas.contadores
+
+    # Um sucesso devolve só uma fração da ficha
+    assert politica.executar(lambda: "ok", "pagina") == "ok"
+    with pytest.raises(ValueError, match="falha 1"):
+        politica.executar(falhas(10), "pagina")
+
+
+def test_disjuntor_abre_meio_abre_e_fecha(relogio):
+    abertos = []
+    disjuntor = Disjuntor("site", limiar=0.5, janela=10, minimo_chamadas=4, tempo_aberto=60,
+                          ao_abrir=abertos.append)
+    for sucesso in (True, False, True):
+        disjuntor.registrar(sucesso)
+    assert disjuntor.estado == Disjuntor.FECHADO
+    disjuntor.registrar(False)
+    assert disjuntor.estado == Disjuntor.ABERTO
+    assert abertos == [disjuntor]
+    assert not disjuntor.permitir()
+
+    relogio.avancar(59)
+    assert not disjuntor.permitir()
+    relogio.avancar(1)
+    assert disjuntor.permitir()
+    assert disjuntor.estado == Disjuntor.MEIO_ABERTO
+    # Só uma chamada de teste por vez
+    assert not disjuntor.permitir()
+
+    disjuntor.registrar(True)
+    assert disjuntor.estado == Disjuntor.FECHADO
+    assert disjuntor.taxa_erros() == 0.0
+    assert disjuntor.permitir()
+
+
+def test_disjuntor_reabre_se_a_chamada_de_teste_falha(relogio):
+    disjuntor = Disjuntor("categoria", minimo_chamadas=2, tempo_aberto=30)
+    disjuntor.registrar(False)
+    disjuntor.registrar(False)
+    relogio.avancar(30)
+    assert disjuntor.permitir()
+
+    disjuntor.registrar(False)
+    assert disjuntor.estado == Disjuntor.ABERTO
+    assert disjuntor.aberto_em == relogio.agora
+    relogio.avancar(29)
+    assert not disjuntor.permitir()
+
+
+def test_circuito_aberto_nao_chama_a_funcao(relogio):
+    disjuntor = Disjuntor("site", minimo_chamadas=1)
+    disjuntor.registrar(False)
+    funcao = falhas(0)
+    with pytest.raises(CircuitoAberto):
+        PoliticaTentativas().executar(funcao, "pagina", disjuntores=[disjuntor])
+    assert funcao.chamadas == []
+
+
+def test_falhas_da_politica_alimentam_o_disjuntor(relogio):
+    disjuntor = Disjuntor("site", limiar=0.5, minimo_chamadas=3)
+    with pytest.raises(CircuitoAberto):
+        PoliticaTentativas(tentativas=5).executar(falhas(10), "pagina", disjuntores=[disjuntor])
+    assert disjuntor.estado == Disjuntor.ABERTO
+    assert len(relogio.esperas) == 3
+
+
+def test_prazo(relogio):
+    pagina = Prazo(10, "da página")
+    categoria = Prazo(60, "da categoria")
+    assert pagina.restante() == 10
+    assert Prazo.mais_proximo(None, categoria, pagina) is pagina
+    assert Prazo.mais_proximo(None) is None
+    assert Prazo(None).restante() == float("inf")
+
+    relogio.avancar(10)
+    assert pagina.esgotado()
+    assert pagina.restante() == 0.0
+    assert not categoria.esgotado()
+
+
+def test_prazo_conferido_antes_da_espera(relogio):
+    # A espera (2s) passaria do prazo (1,5s): falha sem dormir
+    prazo = Prazo(1.5, "da página")
+    funcao = falhas(10)
+    with pytest.raises(PrazoEsgotado):
+        PoliticaTentativas(tentativas=5, espera_inicial=2.0).executar(funcao, "pagina", prazo=prazo)
+    assert len(funcao.chamadas) == 1
+    assert relogio.esperas == []
+
+
+def test_prazo_esgotado_nao_chama_a_funcao(relogio):
+    prazo = Prazo(5, "da categoria")
+    relogio.avancar(5)
+    funcao = falhas(0)
+    with pytest.raises(PrazoEsgotado):
+        PoliticaTentativas().executar(funcao, "pagina", prazo=prazo)
+    assert funcao.chamadas == []
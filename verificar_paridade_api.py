@@ -0,0 +1,147 @@
+"""
+Verificação de paridade entre a extração pelo navegador e a extração pela API
+Sobe o servidor simulado (servidor_mock.py), extrai o catálogo pelos dois caminhos e compara
+os registros campo a campo. Com --captura, compara também o modo de captura (HTML dos cards
+analisado fora do navegador) com a extração pelo navegador. Com --cards-aninhados, o servidor
+renderiza cada produto como um card dentro de outro (como no site real) e a verificação exige
+também uma única linha por produto, com Voltagem e BTU preenchidos. Termina com código 1 se houver
+qualquer diferença.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import servidor_mock
+from leveros_rpa import LeverosRPA, logger
+import leveros_api
+from leveros_saida import SaidaMemoria
+from leveros_parser import ArmazemSnapshots
+from leveros_produtos import normalizar_nome, valor_vazio
+
+
+def comparar_registros(produtos_navegador, produtos_api, limite=20, nome_outro="API"):
+    """Compara as duas listas de registros na ordem e retorna a lista de diferenças encontradas"""
+    diferencas = []
+    if len(produtos_navegador) != len(produtos_api):
+        diferencas.append(f"Quantidade de produtos: navegador={len(produtos_navegador)}, "
+                          f"{nome_outro}={len(produtos_api)}")
+
+    for indice, (navegador, api) in enumerate(zip(produtos_navegador, produtos_api)):
+        for campo in navegador:
+            if navegador[campo] != api.get(campo):
+                diferencas.append(f"Produto {indice} ({navegador.get('Nome do Produto')}), campo '{campo}': "
+                                  f"navegador={navegador[campo]!r}, {nome_outro}={api.get(campo)!r}")
+                if len(diferencas) >= limite:
+                    return diferencas
+    return diferencas
+
+
+def verificar_linhas_por_produto(produtos, catalogo, limite=20, caminho="navegador"):
+    """
+    Confere que cada produto do catálogo simulado (exceto os de instalação) gerou exatamente uma
+    linha, com Voltagem e BTU preenchidos quando o produto os tem. Retorna a lista de diferenças.
+    """
+    diferencas = []
+    linhas = {}
+    for produto in produtos:
+        linhas.setdefault((produto["Categoria"], normalizar_nome(produto["Nome do Produto"])), []).append(produto)
+
+    for categoria, itens in catalogo.items():
+        for item in itens:
+            nome = normalizar_nome(item["descricao"])
+            if "instalacao" in nome:
+                continue
+            encontradas = linhas.get((categoria, nome), [])
+            if len(encontradas) != 1:
+                diferencas.append(f"{item['descricao']} ({categoria}): {len(encontradas)} linhas no {caminho}, esperada 1")
+            elif item["voltagem"] and valor_vazio(encontradas[0]["Voltagem"]):
+                diferencas.append(f"{item['descricao']} ({categoria}): Voltagem vazia no {caminho}")
+            elif item["btus"] and valor_vazio(encontradas[0]["BTU"]):
+                diferencas.append(f"{item['descricao']} ({categoria}): BTU vazio no {caminho}")
+            if len(diferencas) >= limite:
+                return diferencas
+    return diferencas
+
+
+def verificar_paridade(produtos_por_categoria=30, headless=True, captura=False, cards_aninhados=False):
+    """
+    Extrai o catálogo simulado pelo navegador e pela API (e, com `captura`, pelo modo de captura)
+    e retorna a lista de diferenças. Com `cards_aninhados`, confere também que cada produto gerou
+    uma única linha com Voltagem e BTU (verificar_linhas_por_produto).
+    """
+    produtos_captura = None
+    servidor, url_base = servidor_mock.iniciar_em_segundo_plano(produtos_por_categoria=produtos_por_categoria,
+                                                                 cards_aninhados=cards_aninhados)
+    diretorio = tempfile.mkdtemp(prefix="paridade_leveros_")
+    try:
+        rpa = LeverosRPA(headless=headless, usar_cache_sessao=False)
+        rpa.url_login = f"{url_base}/login"
+        rpa.arquivo_api = os.path.join(diretorio, "api_leveros.json")
+        rpa.registrar_rede = True
+
+        if not rpa.inicializar_navegador() or not rpa.fazer_login():
+            raise Exception("Não foi possível iniciar a sessão no servidor simulado")
+        try:
+            logger.info("Extraindo o catálogo simulado pelo navegador...")
+            rpa.saida = SaidaMemoria()
+            rpa.processar_categorias(rpa.categorias)
+            produtos_navegador = rpa.saida.registros
+
+            if captura:
+                logger.info("Extraindo o catálogo simulado pelo modo de captura...")
+                rpa.capturar_html = True
+                rpa.snapshots = ArmazemSnapshots(os.path.join(diretorio, "snapshots"))
+                rpa.abrir_analisador()
+                try:
+                    rpa.saida = SaidaMemoria()
+                    rpa.processar_categorias(rpa.categorias)
+                    produtos_captura = rpa.saida.registros
+                finally:
+                    rpa.fechar_analisador()
+                    rpa.capturar_html = False
+
+            logger.info("Descobrindo a API do catálogo simulado...")
+            leveros_api.salvar_configuracao(rpa.descobrir_api(rpa.categorias), rpa.arquivo_api)
+        finally:
+            rpa.finalizar()
+
+        logger.info("Extraindo o catálogo simulado pela API...")
+        rpa.saida = SaidaMemoria()
+        rpa.processar_categorias_http(rpa.categorias)
+        produtos_api = rpa.saida.registros
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+    diferencas = comparar_registros(produtos_navegador, produtos_api)
+    if produtos_captura is not None:
+        diferencas += comparar_registros(produtos_navegador, produtos_captura, nome_outro="captura")
+    if cards_aninhados:
+        catalogo = servidor_mock.gerar_catalogo(produtos_por_categoria)
+        diferencas += verificar_linhas_por_produto(produtos_navegador, catalogo)
+        if produtos_captura is not None:
+            diferencas += verificar_linhas_por_produto(produtos_captura, catalogo, caminho="captura")
+    return diferencas
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Compara a extração pelo navegador com a extração pela API")
+    parser.add_argument("--produtos-por-categoria", type=int, default=30)
+    parser.add_argument("--com-interface", action="store_true", help="mostra o navegador durante a verificação")
+    parser.add_argument("--captura", action="store_true",
+                        help="compara também o modo de captura (análise do HTML fora do navegador)")
+    parser.add_argument("--cards-aninhados", action="store_true",
+                        help="renderiza cada produto como um card dentro de outro e exige uma linha por produto")
+    args = parser.parse_args()
+
+    diferencas = verificar_paridade(args.produtos_por_categoria, headless=not args.com_interface,
+                                    captura=args.captura, cards_aninhados=args.cards_aninhados)
+    if diferencas:
+        for diferenca in diferencas:
+            logger.error(diferenca)
+        logger.error("Paridade NÃO confirmada entre os caminhos de extração.")
+        sys.exit(1)
+    logger.info("Paridade confirmada: todos os caminhos de extração produziram os mesmos registros.")